@@ -0,0 +1,26 @@
+"""Admission control and load shedding."""
+
+from app.admission.controller import (
+    POOL_SATURATED,
+    QUEUE_FULL,
+    QUEUE_TIMEOUT,
+    AdmissionController,
+    AdmissionMetrics,
+)
+from app.admission.limits import PoolWaitTracker, TokenBuckets, pool_wait
+from app.admission.middleware import AdmissionMiddleware
+from app.admission.priority import Priority, classify
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionMetrics",
+    "AdmissionMiddleware",
+    "POOL_SATURATED",
+    "PoolWaitTracker",
+    "Priority",
+    "QUEUE_FULL",
+    "QUEUE_TIMEOUT",
+    "TokenBuckets",
+    "classify",
+    "pool_wait",
+]
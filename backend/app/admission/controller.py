@@ -0,0 +1,154 @@
+"""Admission decisions: in-flight limits, priority queueing and shedding."""
+
+import asyncio
+import heapq
+import itertools
+from collections import Counter
+from dataclasses import dataclass, field
+
+from app.admission.limits import PoolWaitTracker, TokenBuckets, pool_wait
+from app.admission.priority import PRIORITY_SHARES, Priority
+
+# Reasons a request is shed instead of admitted.
+QUEUE_FULL = "queue_full"
+QUEUE_TIMEOUT = "queue_timeout"
+POOL_SATURATED = "pool_saturated"
+
+
+@dataclass
+class AdmissionMetrics:
+    """Running totals of admission decisions in this process."""
+
+    admitted: int = 0
+    queued: int = 0
+    rate_limited: int = 0
+    peak_in_flight: int = 0
+    shed: Counter = field(default_factory=Counter)
+    admitted_by_priority: Counter = field(default_factory=Counter)
+
+
+class AdmissionController:
+    """Bounds the requests in flight and decides who waits and who is shed.
+
+    A request of a given priority is admitted while fewer than its share of
+    ``max_in_flight`` requests are running. Otherwise it waits in a queue
+    ordered by priority, then arrival, for at most ``queue_timeout`` seconds.
+    When the queue holds ``max_queue`` requests, or the database pool wait
+    exceeds ``max_pool_wait`` seconds for READ and BROWSE requests, requests
+    are shed at once instead. The caller sends a 503 for every shed request
+    and must call :meth:`release` once for every admitted one.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int = 50,
+        queue_timeout: float = 1.0,
+        max_pool_wait: float = 0.25,
+        client_rate: float = 0.0,
+        client_burst: int = 20,
+        retry_after: int = 1,
+        pool: PoolWaitTracker = pool_wait,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_pool_wait = max_pool_wait
+        self.retry_after = retry_after
+        self.pool = pool
+        self.buckets = TokenBuckets(client_rate, client_burst) if client_rate else None
+        self.metrics = AdmissionMetrics()
+        self.in_flight = 0
+        self._waiting: Counter = Counter()
+        self._queue: list[tuple[Priority, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(self._waiting.values())
+
+    def capacity(self, priority: Priority) -> int:
+        """In-flight requests above which ``priority`` has to wait."""
+        return max(1, int(self.max_in_flight * PRIORITY_SHARES[priority]))
+
+    def check_rate(self, client: str) -> float:
+        """Seconds ``client`` has to wait before its next request, or 0."""
+        if self.buckets is None:
+            return 0.0
+        wait = self.buckets.take(client)
+        if wait:
+            self.metrics.rate_limited += 1
+        return wait
+
+    async def acquire(self, priority: Priority) -> str | None:
+        """Wait for a slot; returns ``None`` once admitted, else why it was shed."""
+        if priority >= Priority.READ and self.pool.current() > self.max_pool_wait:
+            return self._shed(POOL_SATURATED)
+        ahead = sum(self._waiting[p] for p in Priority if p <= priority)
+        if not ahead and self.in_flight < self.capacity(priority):
+            self._admit(priority)
+            return None
+        if self.waiting >= self.max_queue:
+            return self._shed(QUEUE_FULL)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._arrivals), future))
+        self._waiting[priority] += 1
+        self.metrics.queued += 1
+        try:
+            await asyncio.wait({future}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            self._abandon(priority, future)
+            raise
+        if future.done():
+            return None
+        self._abandon(priority, future)
+        return self._shed(QUEUE_TIMEOUT)
+
+    def release(self) -> None:
+        """Free the slot of a finished request and admit waiting ones."""
+        self.in_flight -= 1
+        while self._queue:
+            priority, _, future = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            if self.in_flight >= self.capacity(priority):
+                break
+            heapq.heappop(self._queue)
+            self._waiting[priority] -= 1
+            self._admit(priority)
+            future.set_result(None)
+
+    def status(self) -> dict:
+        """Current load and running totals, as served by the admission API."""
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "pool_wait_ms": round(self.pool.current() * 1000, 3),
+            "admitted": self.metrics.admitted,
+            "queued": self.metrics.queued,
+            "rate_limited": self.metrics.rate_limited,
+            "peak_in_flight": self.metrics.peak_in_flight,
+            "shed": dict(self.metrics.shed),
+            "admitted_by_priority": dict(self.metrics.admitted_by_priority),
+        }
+
+    def _admit(self, priority: Priority) -> None:
+        self.in_flight += 1
+        self.metrics.admitted += 1
+        self.metrics.admitted_by_priority[priority.name.lower()] += 1
+        self.metrics.peak_in_flight = max(self.metrics.peak_in_flight, self.in_flight)
+
+    def _abandon(self, priority: Priority, future: asyncio.Future) -> None:
+        """Leave the queue; a slot granted in the meantime is given back."""
+        if future.done():
+            self.release()
+        else:
+            future.cancel()
+            self._waiting[priority] -= 1
+
+    def _shed(self, reason: str) -> str:
+        self.metrics.shed[reason] += 1
+        return reason
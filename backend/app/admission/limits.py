@@ -0,0 +1,74 @@
+"""Per-client rate limits and connection pool pressure."""
+
+import math
+import time
+from collections import OrderedDict
+
+
+class TokenBuckets:
+    """One token bucket per client, refilled at ``rate`` tokens per second.
+
+    Only the ``max_clients`` most recently seen clients are tracked; a client
+    dropped from the table comes back with a full bucket, which is what it
+    would have after being idle anyway.
+    """
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def take(self, client: str, now: float | None = None) -> float:
+        """Take a token for ``client``.
+
+        Returns 0 when the request may proceed, otherwise the seconds until
+        the next token is available.
+        """
+        now = time.monotonic() if now is None else now
+        tokens, updated = self._buckets.pop(client, (float(self.burst), now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[client] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class PoolWaitTracker:
+    """Moving average of how long requests wait for a database connection.
+
+    Each observation moves the average by ``weight``; between observations
+    it decays with the given half-life, so pressure that is no longer
+    measured (for example because the requests were shed) fades out.
+    """
+
+    def __init__(self, weight: float = 0.2, half_life: float = 1.0):
+        self.weight = weight
+        self.half_life = half_life
+        self._average = 0.0
+        self._updated = time.monotonic()
+
+    def observe(self, seconds: float, now: float | None = None) -> None:
+        """Record one connection checkout that took ``seconds``."""
+        now = time.monotonic() if now is None else now
+        current = self.current(now)
+        self._average = current + self.weight * (seconds - current)
+        self._updated = now
+
+    def current(self, now: float | None = None) -> float:
+        """The decayed average wait in seconds."""
+        now = time.monotonic() if now is None else now
+        elapsed = max(0.0, now - self._updated)
+        return self._average * math.pow(0.5, elapsed / self.half_life)
+
+    def reset(self) -> None:
+        self._average = 0.0
+        self._updated = time.monotonic()
+
+
+pool_wait = PoolWaitTracker()
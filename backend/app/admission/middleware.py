@@ -0,0 +1,51 @@
+"""ASGI middleware applying admission control to API requests."""
+
+import math
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.admission.controller import AdmissionController
+from app.admission.priority import EXEMPT_PATHS, classify
+
+
+class AdmissionMiddleware:
+    """Rate limit, queue or shed each HTTP request before it reaches a route.
+
+    Clients over their rate get a 429 and requests shed under load a 503,
+    both with a ``Retry-After`` header, without touching the database.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or EXEMPT_PATHS.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        wait = self.controller.check_rate(client[0] if client else "unknown")
+        if wait:
+            response = JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+            await response(scope, receive, send)
+            return
+
+        reason = await self.controller.acquire(classify(scope["method"], scope["path"]))
+        if reason is not None:
+            response = JSONResponse(
+                {"detail": "Server is busy, try again later", "reason": reason},
+                status_code=503,
+                headers={"Retry-After": str(self.controller.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
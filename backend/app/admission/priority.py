@@ -0,0 +1,54 @@
+"""Priority classes of API requests."""
+
+import re
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    """Request priority; lower values are admitted first."""
+
+    CRITICAL = 0
+    WRITE = 1
+    READ = 2
+    BROWSE = 3
+
+
+# Share of the in-flight limit each priority may fill on its own. The rest
+# is headroom only more important requests can use, so a browsing spike
+# never takes the last connections from pickups and returns.
+PRIORITY_SHARES = {
+    Priority.CRITICAL: 1.0,
+    Priority.WRITE: 0.9,
+    Priority.READ: 0.75,
+    Priority.BROWSE: 0.5,
+}
+
+# First match wins; anything else is READ for GET and HEAD, WRITE otherwise.
+PRIORITY_RULES: list[tuple[str, re.Pattern, Priority]] = [
+    # Customers waiting at the counter.
+    (
+        "POST",
+        re.compile(r"^/api/v1/bookings/[^/]+/(pickup|return)$"),
+        Priority.CRITICAL,
+    ),
+    # Catalog browsing, price shopping and back-office reporting.
+    ("GET", re.compile(r"^/api/v1/cars(/|$)"), Priority.BROWSE),
+    ("POST", re.compile(r"^/api/v1/quotes$"), Priority.BROWSE),
+    ("GET", re.compile(r"^/api/v1/(reports|analytics)/"), Priority.BROWSE),
+]
+
+# Never queued or shed: liveness checks, traffic metrics, API docs and event
+# streams, which stay open for as long as the client listens and use no
+# database connection.
+EXEMPT_PATHS = re.compile(
+    r"^/(health|docs|redoc|openapi\.json"
+    r"|api/v1/(admission|single-flight|events(/status)?))$"
+)
+
+
+def classify(method: str, path: str) -> Priority:
+    """Priority of a request to ``path`` with HTTP ``method``."""
+    for rule_method, pattern, priority in PRIORITY_RULES:
+        if method == rule_method and pattern.match(path):
+            return priority
+    return Priority.READ if method in ("GET", "HEAD") else Priority.WRITE
@@ -0,0 +1,15 @@
+"""Vectorized fleet analytics on columnar booking intervals."""
+
+from app.analytics.occupancy import (
+    BookingIntervals,
+    category_occupancy,
+    idle_streaks,
+    occupancy_matrix,
+)
+
+__all__ = [
+    "BookingIntervals",
+    "occupancy_matrix",
+    "idle_streaks",
+    "category_occupancy",
+]
@@ -0,0 +1,93 @@
+"""Occupancy kernels over cars × days.
+
+Bookings are handled as parallel arrays of car codes and half-open
+``[start, end)`` day numbers (days since 1970-01-01) rather than as ORM
+objects, and every kernel works on whole arrays: occupancy is derived from a
+difference array with a cumulative sum, idle streaks from the edges of the
+resulting matrix.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class BookingIntervals:
+    """Booked intervals as columnar arrays.
+
+    ``car[i]`` indexes the car list the intervals were loaded for, and the
+    i-th booking covers the days ``start[i] <= day < end[i]``.
+    """
+
+    car: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.car)
+
+
+def occupancy_matrix(
+    intervals: BookingIntervals, cars: int, first_day: int, days: int
+) -> np.ndarray:
+    """Boolean ``cars × days`` matrix of booked days from ``first_day`` on.
+
+    Each interval adds +1 at its (clipped) start and -1 at its end in a flat
+    difference array with one spare column per car; a cumulative sum along
+    the days then gives the number of bookings covering every cell.
+    """
+    start = np.clip(intervals.start - first_day, 0, days)
+    end = np.clip(intervals.end - first_day, 0, days)
+    inside = start < end
+    width = days + 1
+    row = intervals.car[inside] * width
+    size = cars * width
+    diff = np.bincount(row + start[inside], minlength=size) - np.bincount(
+        row + end[inside], minlength=size
+    )
+    covering = diff.reshape(cars, width)[:, :days].cumsum(axis=1)
+    return covering > 0
+
+
+def idle_streaks(
+    occupied: np.ndarray, min_days: int = 1
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Runs of consecutive idle days in an occupancy matrix.
+
+    Returns parallel arrays of car row, first idle day offset and run length
+    for every run of at least ``min_days``, in row-major order.
+    """
+    cars, days = occupied.shape
+    padded = np.zeros((cars, days + 2), dtype=np.int8)
+    padded[:, 1:-1] = ~occupied
+    edges = np.diff(padded, axis=1)
+    # Rises and falls alternate within each row and np.nonzero scans in
+    # row-major order, so the k-th rise pairs with the k-th fall.
+    car, first = np.nonzero(edges == 1)
+    _, stop = np.nonzero(edges == -1)
+    length = stop - first
+    keep = length >= min_days
+    return car[keep], first[keep], length[keep]
+
+
+def category_occupancy(
+    occupied: np.ndarray, categories: np.ndarray, count: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Share of each category's cars booked on each day.
+
+    ``categories`` holds a category code below ``count`` per car row.
+    Returns the ``count × days`` occupancy curves and the number of cars per
+    category; categories without cars get a curve of zeros.
+    """
+    membership = np.zeros((count, len(categories)), dtype=np.float32)
+    membership[categories, np.arange(len(categories))] = 1
+    booked = membership @ occupied.astype(np.float32)
+    sizes = membership.sum(axis=1)
+    curves = np.divide(
+        booked,
+        sizes[:, None],
+        out=np.zeros_like(booked),
+        where=sizes[:, None] > 0,
+    )
+    return curves, sizes.astype(np.int64)
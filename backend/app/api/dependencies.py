@@ -1,40 +1,224 @@
 """Shared API dependencies."""
 
+from datetime import timedelta
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Header, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
+from app.events import EventBroadcaster, EventPublisher, broadcaster
+from app.repositories.analytics import AnalyticsRepository
 from app.repositories.booking import BookingRepository
 from app.repositories.car import CarRepository
+from app.repositories.change import ChangeRepository
 from app.repositories.customer import CustomerRepository
+from app.repositories.idempotency import IdempotencyRepository
+from app.repositories.job import JobRepository
+from app.repositories.memory import (
+    InMemoryBookingRepository,
+    InMemoryCarRepository,
+    InMemoryChangeRepository,
+    InMemoryCustomerRepository,
+    InMemoryRollupRepository,
+    InMemoryStore,
+    memory_store,
+)
+from app.repositories.rollup import RollupRepository
+from app.services.analytics import AnalyticsService
 from app.services.booking import BookingService
 from app.services.car import CarService
+from app.services.change import ChangeService
 from app.services.customer import CustomerService
+from app.services.dashboard import DashboardService
+from app.services.idempotency import IdempotencyService, request_fingerprint
+from app.services.job import JobService
+from app.services.quote import QuoteService
+from app.services.report import ReportService
 
 DbSession = Annotated[AsyncSession, Depends(get_db)]
 
 
-def get_car_service(db: DbSession) -> CarService:
+def get_memory_store() -> InMemoryStore:
+    """Get the process-wide store of the in-memory backend."""
+    return memory_store
+
+
+MemoryStore = Annotated[InMemoryStore, Depends(get_memory_store)]
+
+
+def get_car_repository(db: DbSession, store: MemoryStore) -> CarRepository:
+    """Get car repository dependency for the configured backend."""
+    if settings.repository_backend == "memory":
+        return InMemoryCarRepository(store)
+    return CarRepository(db)
+
+
+def get_customer_repository(db: DbSession, store: MemoryStore) -> CustomerRepository:
+    """Get customer repository dependency for the configured backend."""
+    if settings.repository_backend == "memory":
+        return InMemoryCustomerRepository(store)
+    return CustomerRepository(db)
+
+
+def get_booking_repository(db: DbSession, store: MemoryStore) -> BookingRepository:
+    """Get booking repository dependency for the configured backend."""
+    if settings.repository_backend == "memory":
+        return InMemoryBookingRepository(store)
+    return BookingRepository(db)
+
+
+def get_rollup_repository(db: DbSession, store: MemoryStore) -> RollupRepository:
+    """Get rollup repository dependency for the configured backend."""
+    if settings.repository_backend == "memory":
+        return InMemoryRollupRepository(store)
+    return RollupRepository(db)
+
+
+def get_change_repository(db: DbSession, store: MemoryStore) -> ChangeRepository:
+    """Get change journal repository dependency for the configured backend."""
+    if settings.repository_backend == "memory":
+        return InMemoryChangeRepository(store)
+    return ChangeRepository(db)
+
+
+def get_broadcaster() -> EventBroadcaster:
+    """Get the process-wide broadcaster of car and booking events."""
+    return broadcaster
+
+
+BroadcasterDep = Annotated[EventBroadcaster, Depends(get_broadcaster)]
+
+
+def get_event_publisher(db: DbSession, events: BroadcasterDep) -> EventPublisher:
+    """Get the publisher broadcasting events when the request commits."""
+    if settings.repository_backend == "memory":
+        return EventPublisher(events)
+    return EventPublisher(events, db)
+
+
+EventPublisherDep = Annotated[EventPublisher, Depends(get_event_publisher)]
+
+
+CarRepositoryDep = Annotated[CarRepository, Depends(get_car_repository)]
+CustomerRepositoryDep = Annotated[
+    CustomerRepository, Depends(get_customer_repository)
+]
+BookingRepositoryDep = Annotated[BookingRepository, Depends(get_booking_repository)]
+RollupRepositoryDep = Annotated[RollupRepository, Depends(get_rollup_repository)]
+ChangeRepositoryDep = Annotated[ChangeRepository, Depends(get_change_repository)]
+
+
+def get_car_service(
+    cars: CarRepositoryDep,
+    changes: ChangeRepositoryDep,
+    events: EventPublisherDep,
+) -> CarService:
     """Get car service dependency."""
-    return CarService(CarRepository(db))
+    return CarService(cars, changes, events)
 
 
-def get_customer_service(db: DbSession) -> CustomerService:
+def get_customer_service(
+    customers: CustomerRepositoryDep, changes: ChangeRepositoryDep
+) -> CustomerService:
     """Get customer service dependency."""
-    return CustomerService(CustomerRepository(db))
+    return CustomerService(customers, changes)
 
 
-def get_booking_service(db: DbSession) -> BookingService:
+def get_booking_service(
+    bookings: BookingRepositoryDep,
+    cars: CarRepositoryDep,
+    customers: CustomerRepositoryDep,
+    rollups: RollupRepositoryDep,
+    changes: ChangeRepositoryDep,
+    events: EventPublisherDep,
+) -> BookingService:
     """Get booking service dependency."""
     return BookingService(
-        booking_repository=BookingRepository(db),
-        car_repository=CarRepository(db),
-        customer_repository=CustomerRepository(db),
+        booking_repository=bookings,
+        car_repository=cars,
+        customer_repository=customers,
+        rollup_repository=rollups,
+        change_repository=changes,
+        event_publisher=events,
+        pricing_rules=settings.pricing,
+    )
+
+
+def get_change_service(changes: ChangeRepositoryDep) -> ChangeService:
+    """Get change feed service dependency."""
+    return ChangeService(changes)
+
+
+def get_report_service(rollups: RollupRepositoryDep) -> ReportService:
+    """Get report service dependency."""
+    return ReportService(rollups)
+
+
+def get_quote_service(cars: CarRepositoryDep) -> QuoteService:
+    """Get quote service dependency."""
+    return QuoteService(cars, settings.pricing)
+
+
+def get_dashboard_service(
+    cars: CarRepositoryDep,
+    customers: CustomerRepositoryDep,
+    bookings: BookingRepositoryDep,
+    rollups: RollupRepositoryDep,
+) -> DashboardService:
+    """Get dashboard service dependency."""
+    return DashboardService(
+        car_repository=cars,
+        customer_repository=customers,
+        booking_repository=bookings,
+        rollup_repository=rollups,
+        ttl=settings.dashboard_cache_ttl,
+    )
+
+
+def get_job_service(db: DbSession) -> JobService:
+    """Get job service dependency."""
+    return JobService(JobRepository(db), settings.job_max_attempts)
+
+
+def get_analytics_service(db: DbSession) -> AnalyticsService:
+    """Get analytics service dependency."""
+    return AnalyticsService(AnalyticsRepository(db))
+
+
+async def get_idempotency_service(
+    request: Request,
+    db: DbSession,
+    idempotency_key: Annotated[
+        str | None,
+        Header(
+            min_length=1,
+            max_length=255,
+            description="Client-chosen key; retries with it replay the response",
+        ),
+    ] = None,
+) -> IdempotencyService:
+    """Get the idempotency service for the current request."""
+    return IdempotencyService(
+        IdempotencyRepository(db),
+        key=idempotency_key,
+        fingerprint=request_fingerprint(
+            request.method, request.url.path, await request.body()
+        ),
+        ttl=timedelta(hours=settings.idempotency_key_ttl_hours),
     )
 
 
 CarServiceDep = Annotated[CarService, Depends(get_car_service)]
 CustomerServiceDep = Annotated[CustomerService, Depends(get_customer_service)]
 BookingServiceDep = Annotated[BookingService, Depends(get_booking_service)]
+ChangeServiceDep = Annotated[ChangeService, Depends(get_change_service)]
+ReportServiceDep = Annotated[ReportService, Depends(get_report_service)]
+QuoteServiceDep = Annotated[QuoteService, Depends(get_quote_service)]
+DashboardServiceDep = Annotated[DashboardService, Depends(get_dashboard_service)]
+JobServiceDep = Annotated[JobService, Depends(get_job_service)]
+AnalyticsServiceDep = Annotated[AnalyticsService, Depends(get_analytics_service)]
+IdempotencyServiceDep = Annotated[
+    IdempotencyService, Depends(get_idempotency_service)
+]
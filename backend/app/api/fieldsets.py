@@ -0,0 +1,53 @@
+"""Sparse fieldsets: the ``fields`` query parameter of read endpoints."""
+
+from collections.abc import Callable, Collection
+from typing import Any, TypeVar
+
+from fastapi import Query
+from pydantic import BaseModel
+
+from app.exceptions import ValidationException
+
+Schema = TypeVar("Schema", bound=BaseModel)
+
+
+def field_selector(schema: type[BaseModel]) -> Callable[..., frozenset[str]]:
+    """Dependency parsing ``fields`` into a subset of ``schema``'s fields.
+
+    An empty set, the default, stands for every field.
+    """
+    names = tuple(schema.model_fields)
+
+    def parse_fields(
+        fields: str | None = Query(
+            None, description=f"Comma-separated fields to return: {', '.join(names)}"
+        ),
+    ) -> frozenset[str]:
+        """Parse and validate the ``fields`` query parameter."""
+        if not fields:
+            return frozenset()
+        selected = frozenset(name.strip() for name in fields.split(",") if name.strip())
+        unknown = sorted(selected.difference(names))
+        if unknown:
+            raise ValidationException(
+                f"Unknown fields {', '.join(unknown)}; "
+                f"expected any of: {', '.join(names)}"
+            )
+        return selected
+
+    return parse_fields
+
+
+def sparse(schema: type[Schema], obj: Any, fields: Collection[str]) -> Schema:
+    """Response of ``schema`` with only ``fields`` of ``obj`` set.
+
+    Each value is validated on its own, so attributes that were never loaded
+    are never read. Routes returning it set ``response_model_exclude_unset``
+    to leave the other fields out of the body.
+    """
+    response = schema.model_construct()
+    for name in fields:
+        schema.__pydantic_validator__.validate_assignment(
+            response, name, getattr(obj, name), from_attributes=True
+        )
+    return response
@@ -0,0 +1,16 @@
+"""Admission control API endpoints."""
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app.schemas.admission import AdmissionStatusResponse
+
+router = APIRouter()
+
+
+@router.get("", response_model=AdmissionStatusResponse)
+async def get_admission_status(request: Request):
+    """Get the admission controller's load and totals since the server started."""
+    controller = getattr(request.app.state, "admission", None)
+    if controller is None:
+        raise HTTPException(status_code=404, detail="Admission control is disabled")
+    return controller.status()
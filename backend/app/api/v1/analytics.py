@@ -0,0 +1,52 @@
+"""Fleet analytics API endpoints."""
+
+from datetime import date
+
+from fastapi import APIRouter, Query
+
+from app.api.dependencies import AnalyticsServiceDep
+from app.schemas.analytics import (
+    IdleStreak,
+    OccupancyResponse,
+    UtilizationMatrixResponse,
+)
+from app.schemas.car import CarCategory
+
+router = APIRouter()
+
+
+@router.get("/occupancy", response_model=OccupancyResponse)
+async def occupancy_curves(
+    service: AnalyticsServiceDep,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    category: CarCategory | None = None,
+):
+    """Daily share of booked cars per category."""
+    return await service.occupancy_curves(start_date, end_date, category=category)
+
+
+@router.get("/idle-streaks", response_model=list[IdleStreak])
+async def idle_streaks(
+    service: AnalyticsServiceDep,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    min_days: int = Query(7, ge=1),
+    category: CarCategory | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Runs of consecutive idle days of at least ``min_days``, longest first."""
+    return await service.idle_streaks(
+        start_date, end_date, min_days=min_days, category=category, limit=limit
+    )
+
+
+@router.get("/utilization-matrix", response_model=UtilizationMatrixResponse)
+async def utilization_matrix(
+    service: AnalyticsServiceDep,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    category: CarCategory | None = None,
+):
+    """Booked flag of every car on every day of the period."""
+    return await service.utilization_matrix(start_date, end_date, category=category)
@@ -1,61 +1,179 @@
 """Booking API endpoints."""
 
-from fastapi import APIRouter, HTTPException
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Annotated
 
-from app.api.dependencies import BookingServiceDep
-from app.schemas.booking import BookingCreate, BookingResponse, BookingStatus
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from app.api.dependencies import BookingServiceDep, IdempotencyServiceDep
+from app.api.fieldsets import field_selector, sparse
+from app.exceptions import ValidationException
+from app.models.booking import Booking
+from app.schemas.booking import (
+    BOOKING_INCLUDES,
+    BookingCreate,
+    BookingExpandedResponse,
+    BookingResponse,
+    BookingStatus,
+)
+from app.schemas.common import CountResponse
+from app.services.idempotency import IdempotencyService
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[BookingResponse])
+def parse_include(
+    include: str | None = Query(
+        None, description="Comma-separated relations to embed: car, customer"
+    ),
+) -> frozenset[str]:
+    """Parse and validate the ``include`` query parameter."""
+    if not include:
+        return frozenset()
+    names = frozenset(name.strip() for name in include.split(",") if name.strip())
+    unknown = sorted(names.difference(BOOKING_INCLUDES))
+    if unknown:
+        raise ValidationException(
+            f"Unknown include {', '.join(unknown)}; "
+            f"expected any of: {', '.join(BOOKING_INCLUDES)}"
+        )
+    return names
+
+
+IncludeDep = Annotated[frozenset[str], Depends(parse_include)]
+FieldsDep = Annotated[frozenset[str], Depends(field_selector(BookingResponse))]
+
+
+@dataclass
+class BookingFilters:
+    """Query parameters narrowing down the booking collection."""
+
+    status: BookingStatus | None = None
+    car_id: str | None = None
+    customer_id: str | None = None
+    archived: bool = False
+
+
+FiltersDep = Annotated[BookingFilters, Depends()]
+
+
+def expand(
+    booking: Booking, include: frozenset[str], fields: frozenset[str] = frozenset()
+) -> BookingExpandedResponse:
+    """Build a response embedding only the loaded relations in ``include``.
+
+    With ``fields``, only those booking fields are set besides the relations.
+    """
+    if fields:
+        return sparse(BookingExpandedResponse, booking, fields | include)
+    data = {name: getattr(booking, name) for name in BookingResponse.model_fields}
+    for name in include:
+        data[name] = getattr(booking, name)
+    return BookingExpandedResponse.model_validate(data, from_attributes=True)
+
+
+@router.get(
+    "",
+    response_model=list[BookingExpandedResponse],
+    response_model_exclude_unset=True,
+)
 async def list_bookings(
     service: BookingServiceDep,
-    status: BookingStatus | None = None,
-    car_id: str | None = None,
-    customer_id: str | None = None,
+    filters: FiltersDep,
+    include: IncludeDep,
+    fields: FieldsDep,
+    response: Response,
 ):
     """List all bookings with optional filters."""
-    return await service.get_bookings(status=status, car_id=car_id, customer_id=customer_id)
+    bookings = await service.get_bookings(
+        **asdict(filters), include=include, fields=fields
+    )
+    response.headers["X-Total-Count"] = str(len(bookings))
+    return [expand(booking, include, fields) for booking in bookings]
+
 
+@router.head("", response_class=Response)
+async def head_bookings(service: BookingServiceDep, filters: FiltersDep):
+    """Count the bookings a list request would return, without a body."""
+    count = await service.count_bookings(**asdict(filters))
+    return Response(headers={"X-Total-Count": str(count)})
 
-@router.get("/{booking_id}", response_model=BookingResponse)
-async def get_booking(booking_id: str, service: BookingServiceDep):
+
+@router.get("/count", response_model=CountResponse)
+async def count_bookings(service: BookingServiceDep, filters: FiltersDep):
+    """Count the bookings matching the list filters."""
+    return CountResponse(count=await service.count_bookings(**asdict(filters)))
+
+
+@router.get(
+    "/{booking_id}",
+    response_model=BookingExpandedResponse,
+    response_model_exclude_unset=True,
+)
+async def get_booking(
+    booking_id: str,
+    service: BookingServiceDep,
+    include: IncludeDep,
+    fields: FieldsDep,
+    archived: bool = Query(False, description="Also look among archived bookings"),
+):
     """Get a booking by ID."""
-    booking = await service.get_booking(booking_id)
+    booking = await service.get_booking(
+        booking_id, include=include, fields=fields, archived=archived
+    )
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
-    return booking
+    return expand(booking, include, fields)
 
 
 @router.post("", response_model=BookingResponse, status_code=201)
-async def create_booking(data: BookingCreate, service: BookingServiceDep):
+async def create_booking(
+    data: BookingCreate,
+    service: BookingServiceDep,
+    idempotency: IdempotencyServiceDep,
+):
     """Create a new booking (reservation)."""
-    return await service.create_booking(data)
+    return await idempotency.run(
+        lambda: service.create_booking(data), BookingResponse, status_code=201
+    )
+
+
+async def transition(
+    action: Callable[[str], Awaitable[Booking | None]],
+    booking_id: str,
+    idempotency: IdempotencyService,
+):
+    """Run a lifecycle ``action`` on a booking once per idempotency key."""
+
+    async def run() -> Booking:
+        booking = await action(booking_id)
+        if not booking:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        return booking
+
+    return await idempotency.run(run, BookingResponse)
 
 
 @router.post("/{booking_id}/pickup", response_model=BookingResponse)
-async def pickup_car(booking_id: str, service: BookingServiceDep):
+async def pickup_car(
+    booking_id: str, service: BookingServiceDep, idempotency: IdempotencyServiceDep
+):
     """Start rental (reserved -> active)."""
-    booking = await service.pickup_car(booking_id)
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-    return booking
+    return await transition(service.pickup_car, booking_id, idempotency)
 
 
 @router.post("/{booking_id}/return", response_model=BookingResponse)
-async def return_car(booking_id: str, service: BookingServiceDep):
+async def return_car(
+    booking_id: str, service: BookingServiceDep, idempotency: IdempotencyServiceDep
+):
     """Complete rental (active -> completed)."""
-    booking = await service.return_car(booking_id)
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-    return booking
+    return await transition(service.return_car, booking_id, idempotency)
 
 
 @router.post("/{booking_id}/cancel", response_model=BookingResponse)
-async def cancel_booking(booking_id: str, service: BookingServiceDep):
+async def cancel_booking(
+    booking_id: str, service: BookingServiceDep, idempotency: IdempotencyServiceDep
+):
     """Cancel a booking."""
-    booking = await service.cancel_booking(booking_id)
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-    return booking
+    return await transition(service.cancel_booking, booking_id, idempotency)
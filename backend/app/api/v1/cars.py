@@ -1,32 +1,87 @@
 """Car API endpoints."""
 
+from dataclasses import asdict, dataclass
 from datetime import date
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from app.api.dependencies import CarServiceDep, BookingServiceDep
-from app.schemas.car import CarCategory, CarCreate, CarResponse, CarStatus, CarUpdate
+from app.api.fieldsets import field_selector, sparse
+from app.schemas.car import (
+    CarCategory,
+    CarCreate,
+    CarResponse,
+    CarSort,
+    CarStatus,
+    CarUpdate,
+)
+from app.schemas.common import CountResponse
 
 router = APIRouter()
 
+FieldsDep = Annotated[frozenset[str], Depends(field_selector(CarResponse))]
 
-@router.get("", response_model=list[CarResponse])
+
+@dataclass
+class CarFilters:
+    """Query parameters narrowing down the car collection."""
+
+    status: CarStatus | None = None
+    category: CarCategory | None = None
+    make: Annotated[
+        str | None, Query(max_length=100, description="Make prefix")
+    ] = None
+    model: Annotated[
+        str | None, Query(max_length=100, description="Model prefix")
+    ] = None
+    min_year: int | None = None
+    max_year: int | None = None
+    min_rate: Annotated[float | None, Query(ge=0)] = None
+    max_rate: Annotated[float | None, Query(ge=0)] = None
+
+
+FiltersDep = Annotated[CarFilters, Depends()]
+
+
+@router.get("", response_model=list[CarResponse], response_model_exclude_unset=True)
 async def list_cars(
     service: CarServiceDep,
-    status: CarStatus | None = None,
-    category: CarCategory | None = None,
+    filters: FiltersDep,
+    fields: FieldsDep,
+    response: Response,
+    sort: CarSort | None = None,
 ):
-    """List all cars with optional filters."""
-    return await service.get_cars(status=status, category=category)
+    """List all cars with optional filters and ordering."""
+    cars = await service.get_cars(**asdict(filters), sort=sort, fields=fields)
+    response.headers["X-Total-Count"] = str(len(cars))
+    if not fields:
+        return cars
+    return [sparse(CarResponse, car, fields) for car in cars]
 
 
-@router.get("/{car_id}", response_model=CarResponse)
-async def get_car(car_id: str, service: CarServiceDep):
+@router.head("", response_class=Response)
+async def head_cars(service: CarServiceDep, filters: FiltersDep):
+    """Count the cars a list request would return, without a body."""
+    count = await service.count_cars(**asdict(filters))
+    return Response(headers={"X-Total-Count": str(count)})
+
+
+@router.get("/count", response_model=CountResponse)
+async def count_cars(service: CarServiceDep, filters: FiltersDep):
+    """Count the cars matching the list filters."""
+    return CountResponse(count=await service.count_cars(**asdict(filters)))
+
+
+@router.get(
+    "/{car_id}", response_model=CarResponse, response_model_exclude_unset=True
+)
+async def get_car(car_id: str, service: CarServiceDep, fields: FieldsDep):
     """Get a car by ID."""
-    car = await service.get_car(car_id)
+    car = await service.get_car(car_id, fields=fields)
     if not car:
         raise HTTPException(status_code=404, detail="Car not found")
-    return car
+    return sparse(CarResponse, car, fields) if fields else car
 
 
 @router.post("", response_model=CarResponse, status_code=201)
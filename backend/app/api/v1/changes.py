@@ -0,0 +1,18 @@
+"""Change feed API endpoints."""
+
+from fastapi import APIRouter, Query
+
+from app.api.dependencies import ChangeServiceDep
+from app.schemas.change import ChangeFeedResponse
+
+router = APIRouter()
+
+
+@router.get("", response_model=ChangeFeedResponse)
+async def list_changes(
+    service: ChangeServiceDep,
+    since: int = Query(0, ge=0, description="Cursor returned as `next` before"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Cars, customers and bookings written after ``since``, oldest first."""
+    return await service.get_changes(since, limit)
@@ -1,26 +1,97 @@
 """Customer API endpoints."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Annotated
 
-from app.api.dependencies import CustomerServiceDep
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from app.api.dependencies import BookingServiceDep, CustomerServiceDep
+from app.api.fieldsets import field_selector, sparse
+from app.api.v1.bookings import IncludeDep, expand
+from app.schemas.booking import CustomerBookingsResponse
+from app.schemas.common import CountResponse
 from app.schemas.customer import CustomerCreate, CustomerResponse, CustomerUpdate
 
 router = APIRouter()
 
+FieldsDep = Annotated[frozenset[str], Depends(field_selector(CustomerResponse))]
+
 
-@router.get("", response_model=list[CustomerResponse])
-async def list_customers(service: CustomerServiceDep):
+@router.get(
+    "", response_model=list[CustomerResponse], response_model_exclude_unset=True
+)
+async def list_customers(
+    service: CustomerServiceDep, fields: FieldsDep, response: Response
+):
     """List all customers."""
-    return await service.get_customers()
+    customers = await service.get_customers(fields=fields)
+    response.headers["X-Total-Count"] = str(len(customers))
+    if not fields:
+        return customers
+    return [sparse(CustomerResponse, customer, fields) for customer in customers]
+
+
+@router.head("", response_class=Response)
+async def head_customers(service: CustomerServiceDep):
+    """Count the customers a list request would return, without a body."""
+    count = await service.count_customers()
+    return Response(headers={"X-Total-Count": str(count)})
+
+
+@router.get("/count", response_model=CountResponse)
+async def count_customers(service: CustomerServiceDep):
+    """Count all customers."""
+    return CountResponse(count=await service.count_customers())
+
+
+@router.get("/search", response_model=list[CustomerResponse])
+async def search_customers(
+    service: CustomerServiceDep,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Search customers by name, email, phone or driver license prefix."""
+    return await service.search_customers(q, limit=limit)
 
 
-@router.get("/{customer_id}", response_model=CustomerResponse)
-async def get_customer(customer_id: str, service: CustomerServiceDep):
+@router.get(
+    "/{customer_id}",
+    response_model=CustomerResponse,
+    response_model_exclude_unset=True,
+)
+async def get_customer(
+    customer_id: str, service: CustomerServiceDep, fields: FieldsDep
+):
     """Get a customer by ID."""
-    customer = await service.get_customer(customer_id)
+    customer = await service.get_customer(customer_id, fields=fields)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
-    return customer
+    return sparse(CustomerResponse, customer, fields) if fields else customer
+
+
+@router.get(
+    "/{customer_id}/bookings",
+    response_model=CustomerBookingsResponse,
+    response_model_exclude_unset=True,
+)
+async def get_customer_bookings(
+    customer_id: str,
+    service: BookingServiceDep,
+    include: IncludeDep,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="`next` of the previous page"),
+    archived: bool = False,
+):
+    """Page through a customer's bookings, latest first, with their totals."""
+    page = await service.get_customer_bookings(
+        customer_id, limit, cursor=cursor, include=include, archived=archived
+    )
+    if page is None:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    return CustomerBookingsResponse(
+        bookings=[expand(booking, include) for booking in page.bookings],
+        next=page.next,
+        summary=page.summary,
+    )
 
 
 @router.post("", response_model=CustomerResponse, status_code=201)
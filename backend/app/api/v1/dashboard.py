@@ -0,0 +1,20 @@
+"""Dashboard API endpoints."""
+
+from datetime import date
+
+from fastapi import APIRouter, Query
+
+from app.api.dependencies import DashboardServiceDep
+from app.schemas.dashboard import DashboardSummaryResponse
+
+router = APIRouter()
+
+
+@router.get("/summary", response_model=DashboardSummaryResponse)
+async def dashboard_summary(
+    service: DashboardServiceDep,
+    start_date: date | None = Query(None, description="Defaults to the 1st"),
+    end_date: date | None = Query(None, description="Defaults to today"),
+):
+    """Fleet, customer and booking KPIs, with revenue over a period."""
+    return await service.summary(start_date, end_date)
@@ -0,0 +1,50 @@
+"""Status event push API endpoints."""
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import BroadcasterDep
+from app.config import settings
+from app.events import EventFilter, event_stream
+from app.schemas.booking import BookingStatus
+from app.schemas.car import CarCategory, CarStatus
+from app.schemas.event import EventStreamStatusResponse
+
+router = APIRouter()
+
+
+@router.get("", response_class=StreamingResponse)
+async def stream_events(
+    broadcaster: BroadcasterDep,
+    car_id: str | None = Query(None, description="Only events of this car"),
+    category: CarCategory | None = Query(
+        None, description="Only car events of this category"
+    ),
+    status: CarStatus | BookingStatus | None = Query(
+        None, description="Only cars or bookings entering this status"
+    ),
+):
+    """Server-Sent Events stream of car and booking status changes.
+
+    Each committed write to a car or booking is sent as a ``car`` or
+    ``booking`` event with the record's new state. A client that falls
+    behind gets an ``overflow`` event and is disconnected.
+    """
+    subscription = broadcaster.subscribe(
+        EventFilter(
+            car_id=car_id,
+            category=category.value if category else None,
+            status=status.value if status else None,
+        )
+    )
+    return StreamingResponse(
+        event_stream(subscription, settings.event_heartbeat),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/status", response_model=EventStreamStatusResponse)
+async def get_event_stream_status(broadcaster: BroadcasterDep):
+    """Get the number of subscribers and events delivered and dropped."""
+    return broadcaster.status()
@@ -0,0 +1,73 @@
+"""Background job API endpoints."""
+
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from app.api.dependencies import JobServiceDep
+from app.jobs import sweeper
+from app.schemas.job import (
+    JobCreate,
+    JobResponse,
+    JobResultResponse,
+    JobStatus,
+    SweepMetricsResponse,
+)
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[JobResponse])
+async def list_jobs(
+    service: JobServiceDep,
+    status: JobStatus | None = None,
+    kind: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """List the most recent jobs."""
+    return await service.get_jobs(status=status, kind=kind, limit=limit)
+
+
+@router.post("", response_model=JobResponse, status_code=202)
+async def create_job(data: JobCreate, service: JobServiceDep):
+    """Queue a background job."""
+    return await service.enqueue(data)
+
+
+@router.get("/sweeper", response_model=SweepMetricsResponse)
+async def get_sweeper_metrics():
+    """Get the booking sweeper's totals since the server started."""
+    return sweeper.metrics
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, service: JobServiceDep):
+    """Get the status of a job."""
+    job = await service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}/result", response_model=JobResultResponse)
+async def get_job_result(job_id: str, service: JobServiceDep):
+    """Get the result of a finished job."""
+    job = await service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status not in (JobStatus.SUCCEEDED, JobStatus.FAILED):
+        raise HTTPException(status_code=409, detail="Job has not finished yet")
+    return job
+
+
+@router.get("/{job_id}/download")
+async def download_job_file(job_id: str, service: JobServiceDep):
+    """Download the file produced by a finished job, such as an export."""
+    job = await service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    path = (job.result or {}).get("path")
+    if job.status != JobStatus.SUCCEEDED or not path or not Path(path).is_file():
+        raise HTTPException(status_code=404, detail="Job has no file to download")
+    return FileResponse(path, filename=Path(path).name)
@@ -0,0 +1,14 @@
+"""Quote API endpoints."""
+
+from fastapi import APIRouter
+
+from app.api.dependencies import QuoteServiceDep
+from app.schemas.quote import QuoteBatchResponse, QuoteRequest
+
+router = APIRouter()
+
+
+@router.post("", response_model=QuoteBatchResponse)
+async def create_quotes(data: QuoteRequest, service: QuoteServiceDep):
+    """Price a batch of (car, date range) pairs."""
+    return QuoteBatchResponse(quotes=await service.quote(data.items))
@@ -0,0 +1,42 @@
+"""Report API endpoints."""
+
+from datetime import date
+
+from fastapi import APIRouter, Query
+
+from app.api.dependencies import ReportServiceDep
+from app.schemas.car import CarCategory
+from app.schemas.report import CarUtilizationRow, CategoryRevenueRow, RentalLengthRow
+
+router = APIRouter()
+
+
+@router.get("/revenue", response_model=list[CategoryRevenueRow])
+async def revenue_by_category(
+    service: ReportServiceDep,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+):
+    """Daily revenue per car category."""
+    return await service.revenue_by_category(start_date, end_date)
+
+
+@router.get("/utilization", response_model=list[CarUtilizationRow])
+async def utilization_by_car(
+    service: ReportServiceDep,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    category: CarCategory | None = None,
+):
+    """Booked share of the period for every car, busiest first."""
+    return await service.utilization_by_car(start_date, end_date, category=category)
+
+
+@router.get("/rental-length", response_model=list[RentalLengthRow])
+async def rental_length_by_category(
+    service: ReportServiceDep,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+):
+    """Average length of rentals started in the period, per category."""
+    return await service.rental_length_by_category(start_date, end_date)
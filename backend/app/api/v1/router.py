@@ -2,10 +2,34 @@
 
 from fastapi import APIRouter
 
-from app.api.v1 import cars, customers, bookings
+from app.api.v1 import (
+    admission,
+    analytics,
+    bookings,
+    cars,
+    changes,
+    customers,
+    dashboard,
+    events,
+    jobs,
+    quotes,
+    reports,
+    singleflight,
+)
 
 router = APIRouter(prefix="/api/v1")
 
 router.include_router(cars.router, prefix="/cars", tags=["Cars"])
 router.include_router(customers.router, prefix="/customers", tags=["Customers"])
 router.include_router(bookings.router, prefix="/bookings", tags=["Bookings"])
+router.include_router(quotes.router, prefix="/quotes", tags=["Quotes"])
+router.include_router(reports.router, prefix="/reports", tags=["Reports"])
+router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+router.include_router(changes.router, prefix="/changes", tags=["Changes"])
+router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
+router.include_router(events.router, prefix="/events", tags=["Events"])
+router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+router.include_router(admission.router, prefix="/admission", tags=["Admission"])
+router.include_router(
+    singleflight.router, prefix="/single-flight", tags=["Single-flight"]
+)
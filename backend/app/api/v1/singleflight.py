@@ -0,0 +1,16 @@
+"""Single-flight request coalescing API endpoints."""
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app.schemas.singleflight import SingleFlightStatusResponse
+
+router = APIRouter()
+
+
+@router.get("", response_model=SingleFlightStatusResponse)
+async def get_single_flight_status(request: Request):
+    """Get how many requests each coalesced endpoint computed and shared."""
+    coalescer = getattr(request.app.state, "single_flight", None)
+    if coalescer is None:
+        raise HTTPException(status_code=404, detail="Request coalescing is disabled")
+    return coalescer.status()
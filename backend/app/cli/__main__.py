@@ -0,0 +1,5 @@
+"""Allow running the CLI with ``python -m app.cli``."""
+
+from app.cli.main import main
+
+main()
@@ -0,0 +1,547 @@
+"""Micro-benchmarks for operating decisions.
+
+``startup`` measures what a freshly started worker pays before it can
+serve: importing the application, checking the schema version, and the
+wall time from launching ``uvicorn`` to the first successful response.
+Each run uses a new process, so nothing is shared between runs.
+
+``writes`` measures booking write throughput: concurrent clients, each
+with its own session, create non-overlapping bookings through
+:class:`BookingService` against a freshly migrated database. Pass
+``--database-url`` more than once to compare backends side by side, e.g.
+SQLite against PostgreSQL. The database is written to, so point it at a
+throwaway instance.
+
+``compression`` measures what response compression costs and saves: a
+``GET /bookings`` body of ``--rows`` synthetic bookings is compressed with
+every available coding, in the chunks a streamed response would use, and
+the CPU time is set against the transfer time saved on a ``--link-mbps``
+link.
+
+``msgpack`` compares MessagePack with JSON on the same body: the time to
+encode and decode it in each format, the size of each, and what the API
+spends translating a JSON response to MessagePack.
+
+``keys`` compares the former random UUID4 text keys with the 16-byte UUIDv7
+keys: ``--rows`` rows shaped like bookings, a primary key and two indexed
+foreign keys, are inserted into a scratch table with each kind of key,
+reporting insert throughput and the size of the table and its indexes.
+"""
+
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import Column, Date, MetaData, String, Table, insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker
+from sqlalchemy.types import TypeEngine
+
+from app.compression import CODECS
+from app.config import settings
+from app.database import create_engine
+from app.events import EventPublisher, broadcaster
+from app.formats.negotiation import json_to_msgpack, msgpack
+from app.migrations import migrate, schema_version
+from app.models import Car, Customer
+from app.models.keys import BinaryKey, uuid7
+from app.repositories.booking import BookingRepository
+from app.repositories.car import CarRepository
+from app.repositories.change import ChangeRepository
+from app.repositories.customer import CustomerRepository
+from app.repositories.rollup import RollupRepository
+from app.schemas.booking import BookingCreate
+from app.services.booking import BookingService
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+_IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def _summary(label: str, seconds: list[float]) -> str:
+    ms = sorted(s * 1000 for s in seconds)
+    return (
+        f"{label:<16} min {ms[0]:8.1f} ms   median {statistics.median(ms):8.1f} ms"
+        f"   max {ms[-1]:8.1f} ms"
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: dict[str, str]) -> float:
+    """Seconds a new interpreter spends importing ``app.main``."""
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SNIPPET],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_first_response(env: dict[str, str], timeout: float = 60.0) -> float:
+    """Seconds from launching ``uvicorn`` to the first 200 from ``/health``."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited before serving a request")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        raise RuntimeError(f"No response from {url} within {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def measure_schema_check(database_url: str) -> float:
+    """Seconds to read the schema version over a new connection."""
+    engine = create_engine(database_url)
+    try:
+        started = time.perf_counter()
+        await schema_version(engine)
+        return time.perf_counter() - started
+    finally:
+        await engine.dispose()
+
+
+async def _create_fleet(
+    session_maker: async_sessionmaker[AsyncSession], cars: int
+) -> tuple[list[str], str]:
+    """Insert ``cars`` cars and one customer with collision-free keys."""
+    tag = uuid.uuid4().hex[:8].upper()
+    async with session_maker() as session:
+        fleet = [
+            Car(
+                make="Bench",
+                model="Writer",
+                year=2024,
+                license_plate=f"B{tag}{number:05d}",
+                daily_rate=50.0,
+            )
+            for number in range(cars)
+        ]
+        customer = Customer(
+            first_name="Bench",
+            last_name="Writer",
+            email=f"bench-{tag.lower()}@example.com",
+            phone="555-0100",
+            driver_license=f"BENCH{tag}",
+        )
+        session.add_all([*fleet, customer])
+        await session.commit()
+        return [car.id for car in fleet], customer.id
+
+
+async def _book(
+    session_maker: async_sessionmaker[AsyncSession], data: BookingCreate
+) -> None:
+    """Create one booking in its own session and transaction."""
+    async with session_maker() as session:
+        service = BookingService(
+            booking_repository=BookingRepository(session),
+            car_repository=CarRepository(session),
+            customer_repository=CustomerRepository(session),
+            rollup_repository=RollupRepository(session),
+            change_repository=ChangeRepository(session),
+            event_publisher=EventPublisher(broadcaster, session),
+            pricing_rules=settings.pricing,
+        )
+        await service.create_booking(data)
+        await session.commit()
+
+
+async def measure_writes(
+    database_url: str, bookings: int, concurrency: int
+) -> tuple[float, int]:
+    """Seconds to create ``bookings`` bookings and the number that failed.
+
+    Each client books its own car for one night every other day (booked
+    ranges include both end dates), so every request is valid and failures
+    come from the backend alone (e.g. SQLite's ``database is locked`` under
+    concurrent writers).
+    """
+    engine = create_engine(database_url)
+    try:
+        await migrate(engine)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        car_ids, customer_id = await _create_fleet(session_maker, concurrency)
+        first_day = date.today() + timedelta(days=1)
+        queue: asyncio.Queue[BookingCreate] = asyncio.Queue()
+        for number in range(bookings):
+            nights = 2 * (number // concurrency)
+            start = first_day + timedelta(days=nights)
+            queue.put_nowait(
+                BookingCreate(
+                    car_id=car_ids[number % concurrency],
+                    customer_id=customer_id,
+                    start_date=start,
+                    end_date=start + timedelta(days=1),
+                )
+            )
+        failures = 0
+
+        async def client() -> None:
+            nonlocal failures
+            while not queue.empty():
+                data = queue.get_nowait()
+                try:
+                    await _book(session_maker, data)
+                except Exception:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return time.perf_counter() - started, failures
+    finally:
+        await engine.dispose()
+
+
+# Key layouts compared by the ``keys`` benchmark: column type and generator.
+KEY_LAYOUTS: dict[str, tuple[TypeEngine, Callable[[], str]]] = {
+    "uuid4 text": (String(36), lambda: str(uuid.uuid4())),
+    "uuid7 binary": (BinaryKey(), uuid7),
+}
+
+
+async def _table_sizes(conn: AsyncConnection, table: str) -> tuple[int, int]:
+    """Bytes used by ``table`` and by all its indexes."""
+    if conn.dialect.name == "postgresql":
+        result = await conn.execute(
+            text("SELECT pg_table_size(:name), pg_indexes_size(:name)"),
+            {"name": table},
+        )
+        return tuple(result.one())
+    if conn.dialect.name == "sqlite":
+        result = await conn.execute(
+            text(
+                "SELECT coalesce(sum(pgsize) FILTER (WHERE name = :name), 0), "
+                "coalesce(sum(pgsize) FILTER (WHERE name != :name), 0) "
+                "FROM dbstat WHERE name = :name OR name IN "
+                "(SELECT name FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = :name)"
+            ),
+            {"name": table},
+        )
+        return tuple(result.one())
+    raise ValueError(f"Table sizes are not supported on {conn.dialect.name}")
+
+
+async def measure_keys(
+    database_url: str, layout: str, rows: int, batch_size: int = 1000
+) -> tuple[float, int, int]:
+    """Seconds to insert ``rows`` rows keyed by ``layout``, and their size.
+
+    Rows go into a scratch ``bench_keys`` table, ``batch_size`` per
+    transaction, and reference random cars and customers the way bookings
+    do. Returns the seconds, then the bytes of the table and its indexes.
+    The table is dropped afterwards.
+    """
+    key_type, new_key = KEY_LAYOUTS[layout]
+    metadata = MetaData()
+    table = Table(
+        "bench_keys",
+        metadata,
+        Column("id", key_type, primary_key=True),
+        Column("car_id", key_type, nullable=False, index=True),
+        Column("customer_id", key_type, nullable=False, index=True),
+        Column("start_date", Date, nullable=False),
+    )
+    rng = random.Random(0)
+    cars = [new_key() for _ in range(max(1, rows // 100))]
+    customers = [new_key() for _ in range(max(1, rows // 10))]
+    first_day = date(2024, 1, 1)
+    engine = create_engine(database_url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.drop_all)
+            await conn.run_sync(metadata.create_all)
+        started = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            batch = [
+                {
+                    "id": new_key(),
+                    "car_id": rng.choice(cars),
+                    "customer_id": rng.choice(customers),
+                    "start_date": first_day + timedelta(days=rng.randrange(730)),
+                }
+                for _ in range(min(batch_size, rows - offset))
+            ]
+            async with engine.begin() as conn:
+                await conn.execute(insert(table), batch)
+        seconds = time.perf_counter() - started
+        async with engine.begin() as conn:
+            table_bytes, index_bytes = await _table_sizes(conn, table.name)
+            await conn.run_sync(metadata.drop_all)
+        return seconds, table_bytes, index_bytes
+    finally:
+        await engine.dispose()
+
+
+def booking_list_payload(rows: int, seed: int = 0) -> bytes:
+    """A ``GET /bookings`` response body with ``rows`` synthetic bookings."""
+    rng = random.Random(seed)
+    cars = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(max(1, rows // 50))]
+    customers = [
+        str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(max(1, rows // 5))
+    ]
+    statuses = ["reserved", "active", "completed", "completed", "cancelled"]
+    first_day = date(2024, 1, 1)
+    bookings = []
+    for _ in range(rows):
+        start = first_day + timedelta(days=rng.randrange(730))
+        days = rng.randint(1, 14)
+        bookings.append(
+            {
+                "car_id": rng.choice(cars),
+                "customer_id": rng.choice(customers),
+                "start_date": start.isoformat(),
+                "end_date": (start + timedelta(days=days)).isoformat(),
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "actual_return_date": None,
+                "total_cost": round(days * rng.uniform(30, 250), 2),
+                "status": rng.choice(statuses),
+                "created_at": datetime.combine(
+                    start - timedelta(days=rng.randrange(60)), datetime.min.time()
+                ).isoformat(),
+            }
+        )
+    # Serialized the way FastAPI's JSONResponse does.
+    return json.dumps(bookings, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def measure_compression(
+    payload: bytes, coding: str, chunk_size: int = 65536
+) -> tuple[float, int]:
+    """Seconds to compress ``payload`` chunk by chunk, and its encoded size."""
+    compressor = CODECS[coding]()
+    size = 0
+    started = time.perf_counter()
+    for offset in range(0, len(payload), chunk_size):
+        size += len(compressor.compress(payload[offset : offset + chunk_size]))
+    size += len(compressor.flush())
+    return time.perf_counter() - started, size
+
+
+def _best_time(runs: int, work: Callable[[], object]) -> float:
+    seconds = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        work()
+        seconds.append(time.perf_counter() - started)
+    return min(seconds)
+
+
+def bench_msgpack(args: argparse.Namespace) -> None:
+    """Report encode and decode times and sizes of MessagePack against JSON."""
+    if msgpack is None:
+        raise SystemExit("MessagePack needs the msgpack extra")
+    payload = booking_list_payload(args.rows)
+    document = json.loads(payload)
+    packed = msgpack.packb(document)
+    print(f"GET /bookings with {args.rows} bookings, best of {args.runs} runs")
+    formats = {
+        "json": (
+            payload,
+            lambda: json.dumps(document, ensure_ascii=False, separators=(",", ":")),
+            lambda: json.loads(payload),
+        ),
+        "msgpack": (
+            packed,
+            lambda: msgpack.packb(document),
+            lambda: msgpack.unpackb(packed),
+        ),
+    }
+    for name, (body, encode, decode) in formats.items():
+        print(
+            f"{name:<8} {len(body) / 1e6:8.2f} MB"
+            f"   encode {_best_time(args.runs, encode) * 1000:7.1f} ms"
+            f"   decode {_best_time(args.runs, decode) * 1000:7.1f} ms"
+        )
+    translate = _best_time(args.runs, lambda: json_to_msgpack(payload))
+    print(f"JSON response to MessagePack in the API: {translate * 1000:.1f} ms")
+
+
+def bench_startup(args: argparse.Namespace) -> None:
+    """Report import, schema check and first-response times."""
+    for database_url in args.database_url:
+        env = {**os.environ, "DATABASE_URL": database_url}
+        imports = [measure_import(env) for _ in range(args.runs)]
+        checks = [
+            asyncio.run(measure_schema_check(database_url))
+            for _ in range(args.runs)
+        ]
+        responses = [measure_first_response(env) for _ in range(args.runs)]
+        print(f"Startup over {args.runs} runs against {database_url}")
+        print(_summary("import app.main", imports))
+        print(_summary("schema check", checks))
+        print(_summary("first response", responses))
+
+
+def bench_writes(args: argparse.Namespace) -> None:
+    """Report booking write throughput per database."""
+    print(
+        f"{args.bookings} bookings from {args.concurrency} concurrent clients, "
+        f"best of {args.runs} runs"
+    )
+    for database_url in args.database_url:
+        results = [
+            asyncio.run(measure_writes(database_url, args.bookings, args.concurrency))
+            for _ in range(args.runs)
+        ]
+        seconds, failures = min(results)
+        print(
+            f"{database_url}\n"
+            f"    {(args.bookings - failures) / seconds:10.1f} bookings/s"
+            f"   {seconds * 1000:8.1f} ms   {failures} failed"
+        )
+
+
+def bench_keys(args: argparse.Namespace) -> None:
+    """Report insert throughput and storage per key layout and database."""
+    print(f"{args.rows} rows per run, best of {args.runs} runs")
+    for database_url in args.database_url:
+        print(database_url)
+        for layout in KEY_LAYOUTS:
+            results = [
+                asyncio.run(measure_keys(database_url, layout, args.rows))
+                for _ in range(args.runs)
+            ]
+            seconds, table_bytes, index_bytes = min(results)
+            print(
+                f"    {layout:<14} {args.rows / seconds:10.1f} rows/s"
+                f"   table {table_bytes / 1e6:8.2f} MB"
+                f"   indexes {index_bytes / 1e6:8.2f} MB"
+            )
+
+
+def bench_compression(args: argparse.Namespace) -> None:
+    """Report compression ratio, CPU time and transfer time saved per coding."""
+    payload = booking_list_payload(args.rows)
+    link_bytes_per_second = args.link_mbps * 1_000_000 / 8
+    plain_transfer = len(payload) / link_bytes_per_second
+    print(
+        f"GET /bookings with {args.rows} bookings: {len(payload) / 1e6:.2f} MB, "
+        f"{plain_transfer * 1000:.0f} ms at {args.link_mbps:g} Mbit/s; "
+        f"best of {args.runs} runs"
+    )
+    for coding in CODECS:
+        seconds, size = min(
+            measure_compression(payload, coding) for _ in range(args.runs)
+        )
+        transfer = size / link_bytes_per_second
+        throughput = len(payload) / seconds / 1e6
+        print(
+            f"{coding:<6} {size / 1e6:8.2f} MB  {1 - size / len(payload):6.1%} saved"
+            f"   cpu {seconds * 1000:7.1f} ms ({throughput:6.1f} MB/s)"
+            f"   transfer {transfer * 1000:7.0f} ms"
+            f"   net saving {(plain_transfer - transfer - seconds) * 1000:7.0f} ms"
+        )
+
+
+BENCHMARKS: dict[str, Callable[[argparse.Namespace], None]] = {
+    "compression": bench_compression,
+    "keys": bench_keys,
+    "msgpack": bench_msgpack,
+    "startup": bench_startup,
+    "writes": bench_writes,
+}
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    """Register the ``bench`` subcommand."""
+    parser = subparsers.add_parser(
+        "bench",
+        help="Run operational micro-benchmarks",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--database-url",
+        action="append",
+        help=(
+            "Database to run against; repeat to compare several "
+            "(default: the configured DATABASE_URL)"
+        ),
+    )
+    parser.add_argument(
+        "--bookings",
+        type=int,
+        default=1000,
+        help="Bookings to create per run (writes)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Concurrent clients (writes)",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=20000,
+        help="Bookings in the response body (compression, msgpack) or rows (keys)",
+    )
+    parser.add_argument(
+        "--link-mbps",
+        type=float,
+        default=10.0,
+        help="Link speed the transfer times assume (compression)",
+    )
+    parser.set_defaults(handler=handle)
+
+
+def handle(args: argparse.Namespace) -> None:
+    """Run the ``bench`` subcommand."""
+    if args.runs < 1:
+        raise SystemExit("--runs must be positive")
+    if args.bookings < 1 or args.concurrency < 1:
+        raise SystemExit("--bookings and --concurrency must be positive")
+    if args.rows < 1 or args.link_mbps <= 0:
+        raise SystemExit("--rows and --link-mbps must be positive")
+    args.database_url = args.database_url or [settings.database_url]
+    BENCHMARKS[args.benchmark](args)
@@ -0,0 +1,27 @@
+"""Command-line entry point."""
+
+import argparse
+from collections.abc import Sequence
+
+from app.cli import bench, migrate, rebuild, seed
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the top-level argument parser with all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="rent-a-car",
+        description="Operational tools for the Rent a Car backend",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate.register(subparsers)
+    seed.register(subparsers)
+    rebuild.register(subparsers)
+    bench.register(subparsers)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Parse arguments and run the selected subcommand."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    args.handler(args)
@@ -0,0 +1,63 @@
+"""Bring the database schema up to date.
+
+Applies every migration newer than the database's schema version, each in
+its own transaction. Databases created before the schema was versioned are
+adopted: existing tables and indexes are kept and only missing ones are
+added. Run this once per deployment before starting the API with
+AUTO_MIGRATE=false.
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.migrations import LATEST_VERSION, MIGRATIONS, migrate, schema_version
+
+
+async def run_migrate(target: int | None, status_only: bool) -> None:
+    """Apply pending migrations, or only report the schema version."""
+    engine = create_async_engine(settings.database_url)
+    try:
+        current = await schema_version(engine)
+        if status_only:
+            print(f"Schema version {current} of {LATEST_VERSION}")
+            for migration in MIGRATIONS:
+                state = "applied" if migration.version <= current else "pending"
+                print(f"  {migration.version:>3}  {state:<8} {migration.description}")
+            return
+        applied = await migrate(engine, target)
+    finally:
+        await engine.dispose()
+
+    for migration in applied:
+        print(f"Applied {migration.version}: {migration.description}")
+    if not applied:
+        print(f"Schema is up to date (version {current})")
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    """Register the ``migrate`` subcommand."""
+    parser = subparsers.add_parser(
+        "migrate",
+        help="Apply pending schema migrations",
+        description=__doc__,
+    )
+    parser.add_argument(
+        "--to",
+        type=int,
+        default=None,
+        help="Stop after this version (default: the latest)",
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Only show the current version and pending migrations",
+    )
+    parser.set_defaults(handler=handle)
+
+
+def handle(args: argparse.Namespace) -> None:
+    """Run the ``migrate`` subcommand."""
+    asyncio.run(run_migrate(args.to, args.status))
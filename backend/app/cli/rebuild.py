@@ -0,0 +1,93 @@
+"""Rebuild derived data from the source tables.
+
+Derived structures are normally maintained incrementally as the API writes;
+rebuilding them is needed after restoring, bulk-loading or vacuuming a
+database, or when adding them to a database created before they existed.
+"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from app.config import settings
+from app.models.customer import SEARCH_INDEX_DDL
+from app.repositories.rollup import RollupRepository
+
+
+async def rebuild_search_index(conn: AsyncConnection) -> None:
+    """Create the customer search index if missing and repopulate it."""
+    if conn.dialect.name != "sqlite":
+        return
+    for statement in SEARCH_INDEX_DDL:
+        await conn.execute(text(statement))
+    await conn.execute(
+        text("INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')")
+    )
+
+
+async def ensure_search_index(conn: AsyncConnection) -> None:
+    """Rebuild the customer search index if it or any of its triggers is missing.
+
+    ``create_all`` only creates the index together with a new ``customers``
+    table, so an index or trigger dropped later is only restored here.
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    present = await conn.scalar(
+        text(
+            "SELECT count(*) FROM sqlite_master WHERE name IN ('customers_fts', "
+            "'customers_fts_insert', 'customers_fts_delete', 'customers_fts_update')"
+        )
+    )
+    if present < len(SEARCH_INDEX_DDL):
+        await rebuild_search_index(conn)
+
+
+async def rebuild_rollups(conn: AsyncConnection) -> None:
+    """Recompute the daily reporting rollups from the bookings table."""
+    session = AsyncSession(bind=conn)
+    await RollupRepository(session).rebuild()
+    await session.close()
+
+
+TARGETS: dict[str, Callable[[AsyncConnection], Awaitable[None]]] = {
+    "rollups": rebuild_rollups,
+    "search-index": rebuild_search_index,
+}
+
+
+async def run_rebuild(targets: list[str]) -> None:
+    """Rebuild each of ``targets`` in its own transaction."""
+    engine = create_async_engine(settings.database_url)
+    try:
+        for target in targets:
+            async with engine.begin() as conn:
+                await TARGETS[target](conn)
+    finally:
+        await engine.dispose()
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    """Register the ``rebuild`` subcommand."""
+    parser = subparsers.add_parser(
+        "rebuild",
+        help="Rebuild derived data such as search indexes and rollups",
+        description=__doc__,
+    )
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        choices=sorted(TARGETS),
+        help="What to rebuild (default: everything)",
+    )
+    parser.set_defaults(handler=handle)
+
+
+def handle(args: argparse.Namespace) -> None:
+    """Run the ``rebuild`` subcommand."""
+    targets = args.targets or sorted(TARGETS)
+    asyncio.run(run_rebuild(targets))
+    print(f"Rebuilt {', '.join(targets)}")
@@ -0,0 +1,12 @@
+"""Negotiated response compression."""
+
+from app.compression.codecs import CODECS, KNOWN_CODINGS, available, negotiate
+from app.compression.middleware import CompressionMiddleware
+
+__all__ = [
+    "CODECS",
+    "CompressionMiddleware",
+    "KNOWN_CODINGS",
+    "available",
+    "negotiate",
+]
@@ -0,0 +1,92 @@
+"""Content codings responses can be compressed with.
+
+gzip is always available. brotli (``br``) and zstd need the optional
+``brotli`` and ``zstandard`` packages (the ``compression`` extra) and are
+skipped without them.
+"""
+
+import zlib
+from collections.abc import Callable
+from typing import Protocol
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class Compressor(Protocol):
+    """Incremental compressor producing one encoded stream."""
+
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _BrotliCompressor:
+    """brotli's compressor behind the zlib-style interface."""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+# gzip uses zlib's default level. brotli and zstd levels favour speed, as
+# responses are compressed on every request: higher levels shrink JSON by a
+# few percent more at several times the CPU cost.
+CODECS: dict[str, Callable[[], Compressor]] = {
+    "gzip": lambda: zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS),
+}
+if brotli is not None:
+    CODECS["br"] = lambda: _BrotliCompressor(quality=4)
+if zstandard is not None:
+    CODECS["zstd"] = lambda: zstandard.ZstdCompressor(level=3).compressobj()
+
+KNOWN_CODINGS = ("zstd", "br", "gzip")
+
+
+def available(codings: list[str]) -> list[str]:
+    """The codings of ``codings`` that can be used, in the same order."""
+    unknown = sorted(set(codings).difference(KNOWN_CODINGS))
+    if unknown:
+        raise ValueError(
+            f"Unknown content codings {', '.join(unknown)}; "
+            f"expected any of: {', '.join(KNOWN_CODINGS)}"
+        )
+    return [coding for coding in codings if coding in CODECS]
+
+
+def negotiate(accept_encoding: str, codings: list[str]) -> str | None:
+    """Pick a coding of ``codings`` for an ``Accept-Encoding`` header.
+
+    The client's highest quality value wins; among equal values, the order
+    of ``codings`` decides. ``None`` means the response stays uncompressed.
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if name:
+            weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for coding in codings:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
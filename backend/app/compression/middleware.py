@@ -0,0 +1,101 @@
+"""ASGI middleware compressing responses with a negotiated coding."""
+
+import re
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.compression.codecs import CODECS, Compressor, available, negotiate
+
+# Text formats, and MessagePack whose bodies are mostly strings, are worth
+# compressing. Event streams must reach the client as soon as each event is
+# written, so they are left alone.
+COMPRESSIBLE_TYPES = re.compile(
+    r"^(text/(?!event-stream)"
+    r"|application/(json|[^;]*\+json|x-ndjson|xml|javascript|msgpack))"
+)
+
+
+class CompressionMiddleware:
+    """Compress response bodies for clients that accept it.
+
+    Bodies are compressed chunk by chunk as the application sends them, so
+    streamed responses are compressed without being buffered. A response
+    sent in one piece smaller than ``min_size`` bytes is sent as is.
+    """
+
+    def __init__(self, app: ASGIApp, codings: list[str], min_size: int = 1024):
+        self.app = app
+        self.codings = available(codings)
+        self.min_size = min_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        coding = None
+        if scope["type"] == "http" and self.codings:
+            accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+            coding = negotiate(accept_encoding, self.codings)
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, CompressingSender(send, coding, self.min_size))
+
+
+class CompressingSender:
+    """The ``send`` of one response, compressing its body on the way."""
+
+    def __init__(self, send: Send, coding: str, min_size: int):
+        self.send = send
+        self.coding = coding
+        self.min_size = min_size
+        self.start: Message | None = None
+        self.compressor: Compressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if self.passthrough:
+            await self.send(message)
+        elif message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers or not (
+                COMPRESSIBLE_TYPES.match(headers.get("content-type", ""))
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+        elif message["type"] == "http.response.body":
+            await self._send_body(message)
+        else:
+            await self.send(message)
+
+    async def _send_body(self, message: Message) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.min_size:
+                await self.send(start)
+                await self.send(message)
+                self.passthrough = True
+                return
+            self.compressor = CODECS[self.coding]()
+            headers["Content-Encoding"] = self.coding
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.compressor.compress(body) + self.compressor.flush()
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({**message, "body": body})
+                return
+            await self.send(start)
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.flush()
+        if chunk or not more_body:
+            await self.send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
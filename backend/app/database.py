@@ -1,15 +1,49 @@
 """Database connection and session management."""
 
+import time
 from collections.abc import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
+from app.admission.limits import pool_wait
 from app.config import settings
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-)
+
+def create_engine(database_url: str | None = None) -> AsyncEngine:
+    """Create an engine with the configured connection pool.
+
+    In-memory SQLite databases live in a single connection, so they keep
+    SQLAlchemy's static pool.
+    """
+    url = make_url(database_url or settings.database_url)
+    in_memory = url.get_backend_name() == "sqlite" and url.database in (
+        None,
+        "",
+        ":memory:",
+    )
+    options = {}
+    if not in_memory:
+        options = {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+        }
+    return create_async_engine(
+        url,
+        echo=settings.debug,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        **options,
+    )
+
+
+engine = create_engine()
 
 async_session_maker = async_sessionmaker(
     engine,
@@ -21,6 +55,11 @@ async_session_maker = async_sessionmaker(
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency that provides a database session."""
     async with async_session_maker() as session:
+        if settings.repository_backend == "sql":
+            # Check out the connection up front to feed admission control.
+            started = time.perf_counter()
+            await session.connection()
+            pool_wait.observe(time.perf_counter() - started)
         try:
             yield session
             await session.commit()
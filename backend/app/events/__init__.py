@@ -0,0 +1,25 @@
+"""Push of car and booking status changes to subscribers."""
+
+from app.events.broadcaster import (
+    BroadcastMetrics,
+    EventBroadcaster,
+    EventFilter,
+    StatusEvent,
+    Subscription,
+    broadcaster,
+)
+from app.events.publisher import EventPublisher, booking_event, car_event
+from app.events.stream import event_stream
+
+__all__ = [
+    "BroadcastMetrics",
+    "EventBroadcaster",
+    "EventFilter",
+    "EventPublisher",
+    "StatusEvent",
+    "Subscription",
+    "booking_event",
+    "broadcaster",
+    "car_event",
+    "event_stream",
+]
@@ -0,0 +1,210 @@
+"""In-process fan-out of car and booking status events to subscribers."""
+
+import asyncio
+import json
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class StatusEvent:
+    """The state of a car or booking right after a committed write."""
+
+    entity: str
+    id: str
+    car_id: str
+    status: str
+    # Cars only; bookings are matched by their car, not its category.
+    category: str | None = None
+    customer_id: str | None = None
+    deleted: bool = False
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """Which events a subscriber gets; unset criteria match everything."""
+
+    car_id: str | None = None
+    category: str | None = None
+    status: str | None = None
+
+    def matches(self, event: StatusEvent) -> bool:
+        return (
+            (self.car_id is None or event.car_id == self.car_id)
+            and (self.category is None or event.category == self.category)
+            and (self.status is None or event.status == self.status)
+        )
+
+
+class Subscription:
+    """A subscriber's bounded queue of matching events.
+
+    :meth:`get` returns ``None`` once the subscription is closed, either by
+    the subscriber, by the broadcaster shutting down, or because the queue
+    filled up and the subscriber was dropped (then :attr:`dropped` is set).
+    """
+
+    def __init__(self, broadcaster: "EventBroadcaster", filter: EventFilter):
+        self.broadcaster = broadcaster
+        self.filter = filter
+        self.dropped = False
+        self.closed = False
+        self._queue: asyncio.Queue[StatusEvent | None] = asyncio.Queue(
+            broadcaster.queue_size
+        )
+
+    async def get(self) -> StatusEvent | None:
+        """The next event, waiting for one; ``None`` when closed."""
+        if self.closed and self._queue.empty():
+            return None
+        return await self._queue.get()
+
+    def close(self) -> None:
+        """Stop receiving events."""
+        self.broadcaster.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _offer(self, event: StatusEvent) -> bool:
+        """Queue ``event``; ``False`` if the queue is full."""
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def _end(self) -> None:
+        """Wake the subscriber with the closing ``None``.
+
+        A dropped subscriber loses its backlog: it has to catch up from the
+        change feed anyway.
+        """
+        self.closed = True
+        if self.dropped:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        if not self._queue.full():
+            self._queue.put_nowait(None)
+
+
+@dataclass
+class BroadcastMetrics:
+    """Running totals of the broadcaster in this process."""
+
+    subscribed: int = 0
+    published: int = 0
+    delivered: int = 0
+    dropped: int = 0
+
+
+class EventBroadcaster:
+    """Fans events out to subscribers, each with a queue of ``queue_size``.
+
+    Publishing never waits: a subscriber whose queue is full is dropped
+    instead of buffering without limit. Subscribers are indexed by their
+    most selective criterion (car, then category, then status), so an event
+    is only matched against the subscribers that can want it and thousands
+    of idle subscribers to other cars cost nothing per event.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self.metrics = BroadcastMetrics()
+        self._count = 0
+        self._all: set[Subscription] = set()
+        self._by_car: defaultdict[str, set[Subscription]] = defaultdict(set)
+        self._by_category: defaultdict[str, set[Subscription]] = defaultdict(set)
+        self._by_status: defaultdict[str, set[Subscription]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def subscribe(self, filter: EventFilter = EventFilter()) -> Subscription:
+        """Start receiving the events matching ``filter``."""
+        subscription = Subscription(self, filter)
+        self._bucket(filter).add(subscription)
+        self._count += 1
+        self.metrics.subscribed += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering to ``subscription`` and wake it if it waits."""
+        if subscription.closed:
+            return
+        self._bucket(subscription.filter).discard(subscription)
+        self._prune(subscription.filter)
+        self._count -= 1
+        subscription._end()
+
+    def publish(self, event: StatusEvent) -> None:
+        """Queue ``event`` for every matching subscriber."""
+        self.metrics.published += 1
+        candidates = [self._all]
+        for index, key in (
+            (self._by_car, event.car_id),
+            (self._by_category, event.category),
+            (self._by_status, event.status),
+        ):
+            if key in index:
+                candidates.append(index[key])
+        slow = []
+        for bucket in candidates:
+            for subscription in bucket:
+                if not subscription.filter.matches(event):
+                    continue
+                if subscription._offer(event):
+                    self.metrics.delivered += 1
+                else:
+                    slow.append(subscription)
+        for subscription in slow:
+            subscription.dropped = True
+            self.metrics.dropped += 1
+            self.unsubscribe(subscription)
+
+    def close(self) -> None:
+        """End every subscription, e.g. at shutdown."""
+        buckets = [
+            self._all,
+            *self._by_car.values(),
+            *self._by_category.values(),
+            *self._by_status.values(),
+        ]
+        for subscription in [s for bucket in buckets for s in bucket]:
+            self.unsubscribe(subscription)
+
+    def status(self) -> dict:
+        """Current subscribers and running totals."""
+        return {"subscribers": len(self), **asdict(self.metrics)}
+
+    def _bucket(self, filter: EventFilter) -> set[Subscription]:
+        if filter.car_id is not None:
+            return self._by_car[filter.car_id]
+        if filter.category is not None:
+            return self._by_category[filter.category]
+        if filter.status is not None:
+            return self._by_status[filter.status]
+        return self._all
+
+    def _prune(self, filter: EventFilter) -> None:
+        """Forget the empty index entry of ``filter``'s bucket."""
+        for index, key in (
+            (self._by_car, filter.car_id),
+            (self._by_category, filter.category),
+            (self._by_status, filter.status),
+        ):
+            if key is not None:
+                if not index[key]:
+                    del index[key]
+                return
+
+
+broadcaster = EventBroadcaster(settings.event_queue_size)
@@ -0,0 +1,73 @@
+"""Publishing status events once the writes behind them are committed."""
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.events.broadcaster import EventBroadcaster, StatusEvent
+
+
+def car_event(car, deleted: bool = False) -> StatusEvent:
+    """Event announcing the current state of ``car``.
+
+    Any object with the car's ``id``, ``status`` and ``category`` will do,
+    such as a row returned by a bulk ``UPDATE``.
+    """
+    return StatusEvent(
+        entity="car",
+        id=car.id,
+        car_id=car.id,
+        status=car.status.value,
+        category=car.category.value,
+        deleted=deleted,
+    )
+
+
+def booking_event(booking) -> StatusEvent:
+    """Event announcing the current state of ``booking``.
+
+    Any object with the booking's ``id``, ``car_id``, ``customer_id`` and
+    ``status`` will do, such as a row returned by a bulk ``UPDATE``.
+    """
+    return StatusEvent(
+        entity="booking",
+        id=booking.id,
+        car_id=booking.car_id,
+        status=booking.status.value,
+        customer_id=booking.customer_id,
+    )
+
+
+class EventPublisher:
+    """Collects the events of a transaction and broadcasts them on commit.
+
+    Subscribers that re-read a record when told about it must see the new
+    state, and must never hear of a write that was rolled back. Without a
+    ``session`` (the in-memory backend, which has no transactions) events
+    are broadcast at once.
+    """
+
+    def __init__(
+        self, broadcaster: EventBroadcaster, session: AsyncSession | None = None
+    ):
+        self.broadcaster = broadcaster
+        self.session = session
+        self._pending: list[StatusEvent] = []
+        if session is not None:
+            event.listen(session.sync_session, "after_commit", self._flush)
+            event.listen(session.sync_session, "after_rollback", self._discard)
+
+    def publish(self, *events: StatusEvent) -> None:
+        """Broadcast ``events`` once the current transaction commits."""
+        if self.session is None:
+            for status_event in events:
+                self.broadcaster.publish(status_event)
+        else:
+            self._pending.extend(events)
+
+    def _flush(self, session) -> None:
+        pending, self._pending = self._pending, []
+        for status_event in pending:
+            self.broadcaster.publish(status_event)
+
+    def _discard(self, session) -> None:
+        self._pending.clear()
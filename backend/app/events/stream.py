@@ -0,0 +1,33 @@
+"""Server-Sent Events rendering of a subscription."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from app.events.broadcaster import Subscription
+
+# Sent when a subscriber was dropped for falling behind; clients reconnect
+# and catch up from the change feed.
+OVERFLOW = "event: overflow\ndata: {}\n\n"
+
+
+async def event_stream(
+    subscription: Subscription, heartbeat: float
+) -> AsyncIterator[str]:
+    """SSE messages of ``subscription`` until it closes.
+
+    A comment line goes out after ``heartbeat`` idle seconds so proxies do
+    not time out the connection. The subscription is closed when the client
+    goes away and the stream is cancelled.
+    """
+    with subscription:
+        while True:
+            try:
+                status_event = await asyncio.wait_for(subscription.get(), heartbeat)
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if status_event is None:
+                if subscription.dropped:
+                    yield OVERFLOW
+                return
+            yield f"event: {status_event.entity}\ndata: {status_event.to_json()}\n\n"
@@ -0,0 +1,19 @@
+"""Negotiated MessagePack request and response bodies."""
+
+from app.formats.middleware import MessagePackMiddleware
+from app.formats.negotiation import (
+    MSGPACK_BODY_PATHS,
+    MSGPACK_TYPES,
+    json_to_msgpack,
+    msgpack_to_json,
+    prefers_msgpack,
+)
+
+__all__ = [
+    "MSGPACK_BODY_PATHS",
+    "MSGPACK_TYPES",
+    "MessagePackMiddleware",
+    "json_to_msgpack",
+    "msgpack_to_json",
+    "prefers_msgpack",
+]
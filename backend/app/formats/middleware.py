@@ -0,0 +1,120 @@
+"""ASGI middleware serving MessagePack to clients that ask for it."""
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.formats.negotiation import (
+    MSGPACK_BODY_PATHS,
+    MSGPACK_TYPES,
+    json_to_msgpack,
+    media_type,
+    msgpack,
+    msgpack_to_json,
+    prefers_msgpack,
+)
+
+
+class MessagePackMiddleware:
+    """Translate between MessagePack on the wire and the JSON API.
+
+    MessagePack request bodies to the bulk endpoints are decoded to JSON
+    before the application sees them. JSON responses to clients preferring
+    ``application/msgpack`` in ``Accept`` are re-encoded as MessagePack.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if media_type(headers.get("content-type", "")) in MSGPACK_TYPES:
+            if msgpack is None or not MSGPACK_BODY_PATHS.match(scope["path"]):
+                response = JSONResponse(
+                    {"detail": "MessagePack request bodies are not supported here"},
+                    status_code=415,
+                )
+                await response(scope, receive, send)
+                return
+            body = b""
+            more_body = True
+            while more_body:
+                message = await receive()
+                body += message.get("body", b"")
+                more_body = message.get("more_body", False)
+            try:
+                body = msgpack_to_json(body)
+            except (ValueError, TypeError):
+                response = JSONResponse(
+                    {"detail": "Request body is not valid MessagePack"},
+                    status_code=400,
+                )
+                await response(scope, receive, send)
+                return
+            scope = {**scope, "headers": _replace_body_headers(scope, len(body))}
+            receive = _replay(body, receive)
+
+        if msgpack is None:
+            await self.app(scope, receive, send)
+        else:
+            wanted = prefers_msgpack(headers.get("accept", ""))
+            await self.app(scope, receive, MessagePackSender(send, wanted))
+
+
+def _replace_body_headers(scope: Scope, length: int) -> list[tuple[bytes, bytes]]:
+    headers = MutableHeaders(scope={"headers": list(scope["headers"])})
+    headers["content-type"] = "application/json"
+    headers["content-length"] = str(length)
+    return headers.raw
+
+
+def _replay(body: bytes, receive: Receive) -> Receive:
+    """A ``receive`` yielding ``body`` once, then the original messages."""
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replay
+
+
+class MessagePackSender:
+    """The ``send`` of one response, re-encoding JSON as MessagePack."""
+
+    def __init__(self, send: Send, wanted: bool):
+        self.send = send
+        self.wanted = wanted
+        self.start: Message | None = None
+        self.chunks: list[bytes] = []
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            if media_type(headers.get("content-type", "")) == "application/json":
+                # The same URL can answer in either format.
+                headers.add_vary_header("Accept")
+                if self.wanted:
+                    self.start = message
+                    return
+        elif message["type"] == "http.response.body" and self.start is not None:
+            self.chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(self.chunks)
+            if body:
+                body = json_to_msgpack(body)
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["content-type"] = "application/msgpack"
+            headers["content-length"] = str(len(body))
+            await self.send(self.start)
+            self.start = None
+            message = {"type": "http.response.body", "body": body}
+        await self.send(message)
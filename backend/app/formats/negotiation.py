@@ -0,0 +1,88 @@
+"""Choosing between JSON and MessagePack bodies.
+
+MessagePack needs the optional ``msgpack`` package (the ``msgpack`` extra);
+without it every response is JSON and MessagePack request bodies are
+refused.
+"""
+
+import json
+import re
+import uuid
+from datetime import datetime, time, timezone
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_TYPES = (
+    "application/msgpack",
+    "application/x-msgpack",
+    "application/vnd.msgpack",
+)
+JSON_RANGES = ("application/json", "application/*", "*/*")
+
+# Endpoints taking MessagePack request bodies: the bulk ones, whose bodies
+# are large enough for parsing to matter.
+MSGPACK_BODY_PATHS = re.compile(r"^/api/v1/quotes$")
+
+
+def media_type(content_type: str) -> str:
+    """The media type of a ``Content-Type`` header, without parameters."""
+    return content_type.partition(";")[0].strip().lower()
+
+
+def prefers_msgpack(accept: str) -> bool:
+    """Whether an ``Accept`` header ranks MessagePack above JSON.
+
+    JSON stays the default: MessagePack is only chosen when the client gives
+    it a higher quality value than anything JSON would satisfy.
+    """
+    if msgpack is None or "msgpack" not in accept:
+        return False
+    weights: dict[str, float] = {}
+    for part in accept.split(","):
+        name, *params = part.split(";")
+        weight = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    msgpack_weight = max(weights.get(name, 0.0) for name in MSGPACK_TYPES)
+    json_weight = max(weights.get(name, 0.0) for name in JSON_RANGES)
+    return msgpack_weight > json_weight
+
+
+def json_to_msgpack(body: bytes) -> bytes:
+    """Re-encode a JSON document as MessagePack."""
+    return msgpack.packb(json.loads(body))
+
+
+def msgpack_to_json(body: bytes) -> bytes:
+    """Re-encode a MessagePack document as JSON.
+
+    Besides the JSON types, request bodies may use MessagePack's native
+    types: timestamps for dates and datetimes, and 16-byte binaries for
+    UUIDs. They become the strings the JSON API expects.
+    """
+    document = msgpack.unpackb(body, timestamp=3)
+    return json.dumps(document, default=_json_default, separators=(",", ":")).encode()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # A timestamp at midnight UTC is a date; as "YYYY-MM-DD" it is valid
+        # for date fields and still means midnight for datetime fields.
+        if value.tzinfo is timezone.utc and value.time() == time():
+            return value.date().isoformat()
+        return value.isoformat()
+    if isinstance(value, bytes):
+        if len(value) == 16:
+            return str(uuid.UUID(bytes=value))
+        return value.decode()
+    raise TypeError(f"{type(value).__name__} is not supported")
@@ -0,0 +1,18 @@
+"""Durable background jobs backed by the ``jobs`` table."""
+
+from app.jobs import handlers
+from app.jobs.registry import JOB_HANDLERS, JobContext, job
+from app.jobs.sweeper import BookingSweeper, SweepResult, sweep_bookings
+from app.jobs.worker import JobWorkerPool, notify_workers
+
+__all__ = [
+    "BookingSweeper",
+    "JOB_HANDLERS",
+    "JobContext",
+    "JobWorkerPool",
+    "handlers",
+    "job",
+    "notify_workers",
+    "SweepResult",
+    "sweep_bookings",
+]
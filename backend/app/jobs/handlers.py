@@ -0,0 +1,115 @@
+"""Built-in job kinds."""
+
+import asyncio
+import csv
+import io
+from dataclasses import asdict
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import select
+
+from app.cli.rebuild import TARGETS
+from app.config import settings
+from app.jobs.registry import JobContext, job
+from app.jobs.sweeper import sweep_bookings
+from app.models.booking import Booking, BookingStatus
+
+EXPORT_COLUMNS = (
+    "id",
+    "car_id",
+    "customer_id",
+    "start_date",
+    "end_date",
+    "actual_return_date",
+    "total_cost",
+    "status",
+    "created_at",
+)
+
+
+@job("rebuild")
+async def rebuild(context: JobContext, payload: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild derived data, like ``rent-a-car rebuild``."""
+    targets = payload.get("targets") or sorted(TARGETS)
+    unknown = sorted(set(targets) - TARGETS.keys())
+    if unknown:
+        raise ValueError(f"Unknown rebuild targets: {', '.join(unknown)}")
+    for target in targets:
+        async with context.session_maker() as session:
+            await TARGETS[target](await session.connection())
+            await session.commit()
+    return {"targets": targets}
+
+
+def format_csv(rows: list[tuple], header: tuple[str, ...] | None = None) -> str:
+    """Render rows as CSV text; runs in the job process pool."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _append(path: Path, text: str) -> None:
+    with path.open("a", encoding="utf-8", newline="") as file:
+        file.write(text)
+
+
+@job("export-bookings")
+async def export_bookings(
+    context: JobContext, payload: dict[str, Any]
+) -> dict[str, Any]:
+    """Export bookings to a CSV file under ``settings.export_dir``.
+
+    Rows are read in keyset-paginated chunks, each in its own short
+    transaction, so the export never holds the database for long; CSV
+    rendering runs in the process pool.
+    """
+    status = BookingStatus(payload["status"]) if payload.get("status") else None
+    chunk_size = int(payload.get("chunk_size", 10_000))
+    directory = Path(settings.export_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"bookings-{context.job_id}.csv"
+    path.write_text(format_csv([], EXPORT_COLUMNS), encoding="utf-8")
+
+    columns = [getattr(Booking, name) for name in EXPORT_COLUMNS]
+    last_id = ""
+    exported = 0
+    while True:
+        query = (
+            select(*columns)
+            .where(Booking.id > last_id)
+            .order_by(Booking.id)
+            .limit(chunk_size)
+        )
+        if status is not None:
+            query = query.where(Booking.status == status)
+        async with context.session_maker() as session:
+            rows = [
+                (*row[:7], row.status.value, row.created_at)
+                for row in (await session.execute(query)).all()
+            ]
+        if not rows:
+            break
+        text = await context.run_in_process(format_csv, rows)
+        await asyncio.to_thread(_append, path, text)
+        exported += len(rows)
+        last_id = rows[-1][0]
+    return {"path": str(path), "rows": exported}
+
+
+@job("sweep-bookings")
+async def sweep(context: JobContext, payload: dict[str, Any]) -> dict[str, Any]:
+    """Run one booking lifecycle sweep now, with the configured grace periods."""
+    result = await sweep_bookings(
+        context.session_maker,
+        date.today(),
+        no_show_grace_days=settings.no_show_grace_days,
+        overdue_grace_days=settings.overdue_grace_days,
+        batch_size=settings.sweep_batch_size,
+        archive_after_months=settings.archive_after_months,
+    )
+    return asdict(result)
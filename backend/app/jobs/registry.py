@@ -0,0 +1,50 @@
+"""Job kinds and the context their handlers run in."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+T = TypeVar("T")
+
+
+@dataclass
+class JobContext:
+    """What a running job gets besides its payload.
+
+    Handlers open their own short-lived sessions from ``session_maker``
+    rather than holding one for the whole job.
+    """
+
+    job_id: str
+    attempt: int
+    session_maker: async_sessionmaker[AsyncSession]
+    process_pool: Executor | None = None
+
+    async def run_in_process(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run CPU-bound ``fn`` in the process pool (or a thread without one).
+
+        ``fn`` and its arguments must be picklable.
+        """
+        if self.process_pool is None:
+            return await asyncio.to_thread(fn, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.process_pool, fn, *args)
+
+
+JobHandler = Callable[[JobContext, dict[str, Any]], Awaitable[dict[str, Any] | None]]
+
+JOB_HANDLERS: dict[str, JobHandler] = {}
+
+
+def job(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the decorated coroutine as the handler of ``kind`` jobs."""
+
+    def register(handler: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = handler
+        return handler
+
+    return register
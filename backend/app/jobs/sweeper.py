@@ -0,0 +1,247 @@
+"""Periodic sweep of bookings whose dates passed without pickup or return.
+
+Reservations not picked up within a grace period after their start expire,
+so they stop blocking availability and drop out of the reporting rollups.
+Active rentals not returned within a grace period after their end are
+flagged as overdue. Every booking and car changed is recorded in the
+change journal, whose superseded entries are compacted afterwards, and
+pushed to event subscribers. When enabled, bookings finished more than a
+number of months ago are moved to the archive table. Stored responses to
+idempotent requests are purged once they expire. Every step is a bounded,
+set-based ``UPDATE``, ``INSERT`` or ``DELETE`` in its own short transaction;
+no booking is loaded into Python.
+"""
+
+import asyncio
+import logging
+import time
+from calendar import monthrange
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.events import EventPublisher, booking_event, broadcaster, car_event
+from app.models.change import ChangeEntity
+from app.repositories.booking import BookingRepository
+from app.repositories.car import CarRepository
+from app.repositories.change import ChangeRepository
+from app.repositories.idempotency import IdempotencyRepository
+from app.repositories.rollup import RollupRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SweepResult:
+    """What one sweep changed."""
+
+    expired: int = 0
+    overdue: int = 0
+    released: int = 0
+    archived: int = 0
+    purged: int = 0
+    compacted: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class SweepMetrics:
+    """Running totals of every sweep in this process."""
+
+    runs: int = 0
+    failures: int = 0
+    expired: int = 0
+    overdue: int = 0
+    released: int = 0
+    archived: int = 0
+    purged: int = 0
+    compacted: int = 0
+    last_run_at: datetime | None = None
+    last_result: SweepResult | None = None
+    last_error: str | None = None
+
+
+metrics = SweepMetrics()
+
+
+def months_before(day: date, months: int) -> date:
+    """The same day of the month ``months`` months before ``day``.
+
+    Clamped to the last day of shorter months.
+    """
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    month += 1
+    return day.replace(
+        year=year, month=month, day=min(day.day, monthrange(year, month)[1])
+    )
+
+
+async def sweep_bookings(
+    session_maker: async_sessionmaker[AsyncSession],
+    today: date,
+    no_show_grace_days: int = 1,
+    overdue_grace_days: int = 0,
+    batch_size: int = 1000,
+    now: datetime | None = None,
+    archive_after_months: int = 0,
+) -> SweepResult:
+    """Expire no-shows, flag overdue rentals and release idle rented cars.
+
+    With ``archive_after_months``, archives the bookings finished before
+    that many months ago. Also purges the idempotency keys that expired
+    before ``now`` and compacts the change journal.
+    """
+    started = time.perf_counter()
+    result = SweepResult()
+    now = now or datetime.utcnow()
+    metrics.last_run_at = now
+    try:
+        while True:
+            async with session_maker() as session:
+                expired = await BookingRepository(session).expire_no_shows(
+                    today - timedelta(days=no_show_grace_days), batch_size
+                )
+                await RollupRepository(session).retract(expired)
+                await ChangeRepository(session).record(
+                    ChangeEntity.BOOKING, [row.id for row in expired]
+                )
+                EventPublisher(broadcaster, session).publish(
+                    *map(booking_event, expired)
+                )
+                await session.commit()
+            result.batches += 1
+            result.expired += len(expired)
+            if len(expired) < batch_size:
+                break
+
+        while True:
+            async with session_maker() as session:
+                overdue = await BookingRepository(session).mark_overdue(
+                    today - timedelta(days=overdue_grace_days), batch_size
+                )
+                await ChangeRepository(session).record(
+                    ChangeEntity.BOOKING, [row.id for row in overdue]
+                )
+                EventPublisher(broadcaster, session).publish(
+                    *map(booking_event, overdue)
+                )
+                await session.commit()
+            result.batches += 1
+            result.overdue += len(overdue)
+            if len(overdue) < batch_size:
+                break
+
+        while True:
+            async with session_maker() as session:
+                released = await CarRepository(session).release_unrented(batch_size)
+                await ChangeRepository(session).record(
+                    ChangeEntity.CAR, [row.id for row in released]
+                )
+                EventPublisher(broadcaster, session).publish(
+                    *map(car_event, released)
+                )
+                await session.commit()
+            result.batches += 1
+            result.released += len(released)
+            if len(released) < batch_size:
+                break
+
+        if archive_after_months > 0:
+            cutoff = months_before(today, archive_after_months)
+            while True:
+                async with session_maker() as session:
+                    archived = await BookingRepository(session).archive_finished(
+                        cutoff, batch_size, now
+                    )
+                    await session.commit()
+                result.batches += 1
+                result.archived += archived
+                if archived < batch_size:
+                    break
+
+        while True:
+            async with session_maker() as session:
+                purged = await IdempotencyRepository(session).purge_expired(
+                    now, batch_size
+                )
+                await session.commit()
+            result.batches += 1
+            result.purged += purged
+            if purged < batch_size:
+                break
+
+        while True:
+            async with session_maker() as session:
+                compacted = await ChangeRepository(session).compact(batch_size)
+                await session.commit()
+            result.batches += 1
+            result.compacted += compacted
+            if compacted < batch_size:
+                break
+    except Exception as exc:
+        metrics.failures += 1
+        metrics.last_error = f"{type(exc).__name__}: {exc}"
+        raise
+
+    result.seconds = time.perf_counter() - started
+    metrics.runs += 1
+    metrics.expired += result.expired
+    metrics.overdue += result.overdue
+    metrics.released += result.released
+    metrics.archived += result.archived
+    metrics.purged += result.purged
+    metrics.compacted += result.compacted
+    metrics.last_result = result
+    metrics.last_error = None
+    logger.info("Booking sweep: %s", asdict(result))
+    return result
+
+
+class BookingSweeper:
+    """Runs :func:`sweep_bookings` every ``interval`` seconds."""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        interval: float = 3600.0,
+        no_show_grace_days: int = 1,
+        overdue_grace_days: int = 0,
+        batch_size: int = 1000,
+        archive_after_months: int = 0,
+    ):
+        self.session_maker = session_maker
+        self.interval = interval
+        self.no_show_grace_days = no_show_grace_days
+        self.overdue_grace_days = overdue_grace_days
+        self.batch_size = batch_size
+        self.archive_after_months = archive_after_months
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Start sweeping, beginning right away; a zero interval disables it."""
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._loop(), name="booking-sweeper")
+
+    async def stop(self) -> None:
+        """Stop sweeping."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await sweep_bookings(
+                    self.session_maker,
+                    date.today(),
+                    no_show_grace_days=self.no_show_grace_days,
+                    overdue_grace_days=self.overdue_grace_days,
+                    batch_size=self.batch_size,
+                    archive_after_months=self.archive_after_months,
+                )
+            except Exception:
+                logger.exception("Booking sweep failed")
+            await asyncio.sleep(self.interval)
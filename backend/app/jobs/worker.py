@@ -0,0 +1,200 @@
+"""Asyncio worker pool executing queued jobs."""
+
+import asyncio
+import logging
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.jobs.registry import JOB_HANDLERS, JobContext
+from app.models.job import Job, JobStatus
+from app.repositories.job import JobRepository
+
+logger = logging.getLogger(__name__)
+
+_pools: "weakref.WeakSet[JobWorkerPool]" = weakref.WeakSet()
+
+
+def notify_workers() -> None:
+    """Wake idle workers of every running pool to look for new jobs."""
+    for pool in list(_pools):
+        pool.notify()
+
+
+class JobWorkerPool:
+    """Runs queued jobs on ``concurrency`` asyncio tasks.
+
+    Each worker claims one due job at a time, runs its handler outside any
+    request and records the outcome. Failed attempts are re-queued after an
+    exponential backoff of ``retry_backoff * 2 ** (attempt - 1)`` seconds
+    until the job's ``max_attempts`` is used up.
+
+    A claimed job is leased to its worker for ``lease`` seconds, and the
+    worker renews the lease every third of that while the handler runs.
+    Running jobs whose lease ran out, because their process stopped or hung,
+    are re-queued on :meth:`start` and whenever a worker is idle. Jobs other
+    live processes are running keep their lease and are never run twice.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+        retry_backoff: float = 2.0,
+        process_workers: int = 0,
+        lease: float = 60.0,
+    ):
+        self.session_maker = session_maker
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.retry_backoff = retry_backoff
+        self.process_workers = process_workers
+        self.lease = lease
+        self.process_pool: ProcessPoolExecutor | None = None
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Recover interrupted jobs and start the workers."""
+        await self._recover()
+        if self.process_workers:
+            # Forking a process that runs aiosqlite threads can deadlock.
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"job-worker-{n}")
+            for n in range(self.concurrency)
+        ]
+        _pools.add(self)
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs they were running are re-queued on lease expiry."""
+        _pools.discard(self)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.process_pool is not None:
+            self.process_pool.shutdown(cancel_futures=True)
+            self.process_pool = None
+
+    def notify(self) -> None:
+        """Wake idle workers."""
+        self._wakeup.set()
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+                if job is not None:
+                    await self._run(job)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Leaving the session rolled its transaction back. A job
+                # claimed before the error is re-queued once its lease ends.
+                logger.exception("Job worker iteration failed")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except TimeoutError:
+                await self._recover()
+            self._wakeup.clear()
+
+    async def _recover(self) -> None:
+        """Re-queue running jobs whose lease ran out."""
+        async with self.session_maker() as session:
+            requeued = await JobRepository(session).requeue_expired(datetime.utcnow())
+            await session.commit()
+        if requeued:
+            logger.info("Re-queued %d interrupted jobs", requeued)
+
+    async def _claim(self) -> Job | None:
+        async with self.session_maker() as session:
+            now = datetime.utcnow()
+            job = await JobRepository(session).claim_next(
+                now, now + timedelta(seconds=self.lease)
+            )
+            await session.commit()
+            return job
+
+    async def _heartbeat(self, job: Job) -> None:
+        """Renew the lease of ``job`` until cancelled."""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                async with self.session_maker() as session:
+                    renewed = await JobRepository(session).extend_lease(
+                        job.id,
+                        job.attempts,
+                        datetime.utcnow() + timedelta(seconds=self.lease),
+                    )
+                    await session.commit()
+            except Exception:
+                logger.exception("Renewing the lease of job %s failed", job.id)
+                continue
+            if not renewed:
+                logger.warning("Job %s lost its lease", job.id)
+                return
+
+    async def _run(self, job: Job) -> None:
+        context = JobContext(
+            job_id=job.id,
+            attempt=job.attempts,
+            session_maker=self.session_maker,
+            process_pool=self.process_pool,
+        )
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            handler = JOB_HANDLERS.get(job.kind)
+            if handler is None:
+                raise LookupError(f"Unknown job kind '{job.kind}'")
+            result = await handler(context, job.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            await self._record_failure(job, exc)
+        else:
+            await self._record(
+                job, status=JobStatus.SUCCEEDED, result=result, error=None
+            )
+        finally:
+            heartbeat.cancel()
+
+    async def _record_failure(self, job: Job, exc: Exception) -> None:
+        error = f"{type(exc).__name__}: {exc}"
+        if job.attempts < job.max_attempts:
+            delay = self.retry_backoff * 2 ** (job.attempts - 1)
+            await self._record(
+                job,
+                status=JobStatus.QUEUED,
+                error=error,
+                run_after=datetime.utcnow() + timedelta(seconds=delay),
+                finished_at=None,
+            )
+        else:
+            await self._record(job, status=JobStatus.FAILED, error=error)
+
+    async def _record(self, job: Job, **values) -> None:
+        values.setdefault("finished_at", datetime.utcnow())
+        values["locked_until"] = None
+        async with self.session_maker() as session:
+            stored = await session.get(Job, job.id)
+            if stored is None:
+                return
+            if stored.status != JobStatus.RUNNING or stored.attempts != job.attempts:
+                # The lease ran out and the job was queued or claimed again.
+                logger.warning("Job %s lost its lease; outcome dropped", job.id)
+                return
+            for name, value in values.items():
+                setattr(stored, name, value)
+            await session.commit()
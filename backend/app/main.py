@@ -4,19 +4,50 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.admission import AdmissionController, AdmissionMiddleware
 from app.api.v1.router import router as api_v1_router
+from app.compression import CompressionMiddleware
 from app.config import settings
-from app.database import engine
+from app.database import async_session_maker, engine
+from app.events import broadcaster
 from app.exceptions.handlers import register_exception_handlers
-from app.models import Base
+from app.formats import MessagePackMiddleware
+from app.jobs import BookingSweeper, JobWorkerPool
+from app.migrations import check_schema
+from app.singleflight import RequestCoalescer, SingleFlightMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown events."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    yield
+    await check_schema(engine, auto_migrate=settings.auto_migrate)
+
+    job_pool = JobWorkerPool(
+        async_session_maker,
+        concurrency=settings.job_workers,
+        poll_interval=settings.job_poll_interval,
+        retry_backoff=settings.job_retry_backoff,
+        process_workers=settings.job_process_workers,
+        lease=settings.job_lease_seconds,
+    )
+    sweeper = BookingSweeper(
+        async_session_maker,
+        interval=settings.sweep_interval,
+        no_show_grace_days=settings.no_show_grace_days,
+        overdue_grace_days=settings.overdue_grace_days,
+        batch_size=settings.sweep_batch_size,
+        archive_after_months=settings.archive_after_months,
+    )
+    await job_pool.start()
+    await sweeper.start()
+    app.state.job_pool = job_pool
+    try:
+        yield
+    finally:
+        # Open event streams would otherwise keep the server from stopping.
+        broadcaster.close()
+        await sweeper.stop()
+        await job_pool.stop()
 
 
 app = FastAPI(
@@ -28,6 +59,36 @@ app = FastAPI(
 
 register_exception_handlers(app)
 
+if settings.admission_enabled:
+    admission = AdmissionController(
+        max_in_flight=settings.admission_max_in_flight
+        or settings.db_pool_size + settings.db_max_overflow,
+        max_queue=settings.admission_max_queue,
+        queue_timeout=settings.admission_queue_timeout,
+        max_pool_wait=settings.admission_max_pool_wait,
+        client_rate=settings.admission_client_rate,
+        client_burst=settings.admission_client_burst,
+        retry_after=settings.admission_retry_after,
+    )
+    app.state.admission = admission
+    app.add_middleware(AdmissionMiddleware, controller=admission)
+
+app.add_middleware(MessagePackMiddleware)
+
+if settings.compression_codings:
+    app.add_middleware(
+        CompressionMiddleware,
+        codings=settings.compression_codings,
+        min_size=settings.compression_min_size,
+    )
+
+# Added last so it runs first: requests that share a response do no
+# database work, take no admission slot and reuse its compressed body.
+if settings.single_flight_endpoints:
+    single_flight = RequestCoalescer(settings.single_flight_endpoints)
+    app.state.single_flight = single_flight
+    app.add_middleware(SingleFlightMiddleware, coalescer=single_flight)
+
 app.include_router(api_v1_router)
 
 
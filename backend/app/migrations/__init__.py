@@ -0,0 +1,19 @@
+"""Versioned schema migrations."""
+
+from app.migrations.runner import (
+    SchemaVersionError,
+    check_schema,
+    migrate,
+    schema_version,
+)
+from app.migrations.versions import LATEST_VERSION, MIGRATIONS, Migration
+
+__all__ = [
+    "LATEST_VERSION",
+    "MIGRATIONS",
+    "Migration",
+    "SchemaVersionError",
+    "check_schema",
+    "migrate",
+    "schema_version",
+]
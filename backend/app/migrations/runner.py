@@ -0,0 +1,103 @@
+"""Applying migrations and checking the schema version."""
+
+import logging
+
+from sqlalchemy import Column, Integer, MetaData, Table, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.migrations.versions import LATEST_VERSION, MIGRATIONS, Migration
+
+logger = logging.getLogger(__name__)
+
+# A single row holding the version of the last applied migration.
+schema_version_table = Table(
+    "schema_version",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema does not match what the application expects."""
+
+
+async def schema_version(engine: AsyncEngine) -> int:
+    """Version of the last migration applied to the database (0 if none)."""
+    async with engine.connect() as conn:
+        try:
+            version = await conn.scalar(select(schema_version_table.c.version))
+        except (OperationalError, ProgrammingError):
+            # No version table yet.
+            return 0
+    return version or 0
+
+
+async def migrate(engine: AsyncEngine, target: int | None = None) -> list[Migration]:
+    """Apply pending migrations up to ``target`` (default: all).
+
+    Each migration runs in its own transaction together with the version
+    bump. Concurrent runs, such as several workers starting at once, queue
+    on the version row's lock and skip what another run already applied.
+    """
+    target = LATEST_VERSION if target is None else target
+    async with engine.begin() as conn:
+        dialect = conn.dialect.name
+        if dialect not in _INSERTS:
+            raise ValueError(f"Migrations are not supported on {dialect}")
+        await conn.run_sync(schema_version_table.create, checkfirst=True)
+        await conn.execute(
+            _INSERTS[dialect](schema_version_table)
+            .values(id=1, version=0)
+            .on_conflict_do_nothing()
+        )
+
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version > target:
+            break
+        async with engine.begin() as conn:
+            # Writing first takes the lock before the version is read.
+            await conn.execute(
+                update(schema_version_table).values(
+                    version=schema_version_table.c.version
+                )
+            )
+            current = await conn.scalar(select(schema_version_table.c.version))
+            if current >= migration.version:
+                continue
+            logger.info(
+                "Applying migration %d: %s", migration.version, migration.description
+            )
+            await migration.apply(conn)
+            await conn.execute(
+                update(schema_version_table).values(version=migration.version)
+            )
+        applied.append(migration)
+    return applied
+
+
+async def check_schema(engine: AsyncEngine, auto_migrate: bool = False) -> None:
+    """Make sure the database is at :data:`LATEST_VERSION`.
+
+    An up-to-date database costs a single one-row query. An outdated one is
+    migrated when ``auto_migrate`` is set and rejected otherwise.
+    """
+    version = await schema_version(engine)
+    if version == LATEST_VERSION:
+        return
+    if version > LATEST_VERSION:
+        raise SchemaVersionError(
+            f"Database schema version {version} is newer than this application "
+            f"({LATEST_VERSION})"
+        )
+    if not auto_migrate:
+        raise SchemaVersionError(
+            f"Database schema version {version} is behind {LATEST_VERSION}; "
+            "run `rent-a-car migrate`"
+        )
+    await migrate(engine)
@@ -0,0 +1,569 @@
+"""The schema history, one migration per change, oldest first.
+
+Every step checks what already exists before creating it, so databases
+created by ``create_all`` before the schema was versioned are adopted by
+simply running all migrations against them.
+
+Steps never read the models: each one spells out the tables, indexes and
+SQL of its version, as they were when it was written. Replaying the
+history therefore builds the same database whatever the models look like
+today, and every step finds the schema its predecessors left.
+"""
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    MetaData,
+    Numeric,
+    SmallInteger,
+    String,
+    Table,
+    Text,
+    inspect,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.models.keys import CANONICAL_UUID, key_bytes
+
+MigrationStep = Callable[[AsyncConnection], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One versioned schema change."""
+
+    version: int
+    description: str
+    apply: MigrationStep
+
+
+# Enum types, stored by member name, with the members of their first version.
+_BOOKING_STATUSES = ("RESERVED", "ACTIVE", "COMPLETED", "CANCELLED")
+_CAR_CATEGORIES = ("ECONOMY", "STANDARD", "LUXURY", "SUV")
+_CAR_STATUSES = ("AVAILABLE", "RENTED", "MAINTENANCE")
+
+
+def _key(name: str, *args, **kwargs) -> Column:
+    """A key column as it was stored before version 12: UUID text."""
+    return Column(name, String(36), *args, nullable=False, **kwargs)
+
+
+def _key_targets(metadata: MetaData) -> None:
+    """Declare, without creating them, the tables foreign keys point at."""
+    Table("cars", metadata, _key("id", primary_key=True))
+    Table("customers", metadata, _key("id", primary_key=True))
+
+
+def _create_tables(define: Callable[[MetaData], list[Table]]) -> MigrationStep:
+    """Create the tables ``define`` declares, with their indexes, unless they exist.
+
+    ``define`` declares them in a new :class:`MetaData` on every run.
+    """
+
+    async def apply(conn: AsyncConnection) -> None:
+        metadata = MetaData()
+        tables = define(metadata)
+        await conn.run_sync(metadata.create_all, tables=tables)
+
+    return apply
+
+
+def _create_indexes(*indexes: tuple[str, str, str]) -> MigrationStep:
+    """Create the ``(name, table, expressions)`` indexes unless they exist."""
+
+    async def apply(conn: AsyncConnection) -> None:
+        for name, table, expressions in indexes:
+            await conn.execute(
+                text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({expressions})")
+            )
+
+    return apply
+
+
+def _rental_tables(metadata: MetaData) -> list[Table]:
+    cars = Table(
+        "cars",
+        metadata,
+        _key("id", primary_key=True),
+        Column("make", String(100), nullable=False),
+        Column("model", String(100), nullable=False),
+        Column("year", Integer, nullable=False),
+        Column("license_plate", String(20), unique=True, nullable=False),
+        Column("daily_rate", Numeric(10, 2), nullable=False),
+        Column("category", Enum(*_CAR_CATEGORIES, name="carcategory"), nullable=False),
+        Column("status", Enum(*_CAR_STATUSES, name="carstatus"), nullable=False),
+        Column("created_at", DateTime, nullable=False),
+    )
+    customers = Table(
+        "customers",
+        metadata,
+        _key("id", primary_key=True),
+        Column("first_name", String(100), nullable=False),
+        Column("last_name", String(100), nullable=False),
+        Column("email", String(255), unique=True, nullable=False),
+        Column("phone", String(20), nullable=False),
+        Column("driver_license", String(50), nullable=False),
+        Column("created_at", DateTime, nullable=False),
+    )
+    bookings = Table(
+        "bookings",
+        metadata,
+        _key("id", primary_key=True),
+        _key("car_id", ForeignKey("cars.id")),
+        _key("customer_id", ForeignKey("customers.id")),
+        Column("start_date", Date, nullable=False),
+        Column("end_date", Date, nullable=False),
+        Column("actual_return_date", Date, nullable=True),
+        Column("total_cost", Numeric(10, 2), nullable=False),
+        Column(
+            "status", Enum(*_BOOKING_STATUSES, name="bookingstatus"), nullable=False
+        ),
+        Column("created_at", DateTime, nullable=False),
+    )
+    return [cars, customers, bookings]
+
+
+_SEARCH_COLUMNS = "first_name, last_name, email, phone, driver_license"
+_NEW_VALUES = "new.first_name, new.last_name, new.email, new.phone, new.driver_license"
+_OLD_VALUES = "old.first_name, old.last_name, old.email, old.phone, old.driver_license"
+
+_SEARCH_INDEX_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5("
+    f"{_SEARCH_COLUMNS}, content='customers', content_rowid='rowid', "
+    f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS customers_fts_insert AFTER INSERT ON customers "
+    f"BEGIN INSERT INTO customers_fts(rowid, {_SEARCH_COLUMNS}) "
+    f"VALUES (new.rowid, {_NEW_VALUES}); END",
+    f"CREATE TRIGGER IF NOT EXISTS customers_fts_delete AFTER DELETE ON customers "
+    f"BEGIN INSERT INTO customers_fts(customers_fts, rowid, {_SEARCH_COLUMNS}) "
+    f"VALUES ('delete', old.rowid, {_OLD_VALUES}); END",
+    f"CREATE TRIGGER IF NOT EXISTS customers_fts_update AFTER UPDATE ON customers "
+    f"BEGIN INSERT INTO customers_fts(customers_fts, rowid, {_SEARCH_COLUMNS}) "
+    f"VALUES ('delete', old.rowid, {_OLD_VALUES}); "
+    f"INSERT INTO customers_fts(rowid, {_SEARCH_COLUMNS}) "
+    f"VALUES (new.rowid, {_NEW_VALUES}); END",
+]
+
+
+async def _customer_search_index(conn: AsyncConnection) -> None:
+    if conn.dialect.name != "sqlite":
+        return
+    present = await conn.scalar(
+        text(
+            "SELECT count(*) FROM sqlite_master WHERE name IN ('customers_fts', "
+            "'customers_fts_insert', 'customers_fts_delete', 'customers_fts_update')"
+        )
+    )
+    if present == len(_SEARCH_INDEX_DDL):
+        return
+    for statement in _SEARCH_INDEX_DDL:
+        await conn.execute(text(statement))
+    await conn.execute(
+        text("INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')")
+    )
+
+
+def _rollup_table(metadata: MetaData) -> list[Table]:
+    rollups = Table(
+        "daily_rollups",
+        metadata,
+        Column("day", Date, primary_key=True),
+        _key("car_id", primary_key=True),
+        Column("category", Enum(*_CAR_CATEGORIES, name="carcategory"), nullable=True),
+        Column("booked_days", Integer, nullable=False),
+        Column("revenue", Numeric(12, 2), nullable=False),
+        Column("rentals", Integer, nullable=False),
+        Column("rental_days", Integer, nullable=False),
+    )
+    return [rollups]
+
+
+# The rollup rebuild of version 4, over the bookings table of that version.
+# See RollupRepository.rebuild for how it works.
+_ROLLUP_BACKFILL = {
+    "sqlite": """
+INSERT INTO daily_rollups
+    (day, car_id, category, booked_days, revenue, rentals, rental_days)
+WITH RECURSIVE effective AS MATERIALIZED (
+    SELECT b.car_id, c.category,
+           CAST(julianday(b.start_date) AS INTEGER) AS first_day,
+           CAST(julianday(
+               CASE WHEN b.status = 'COMPLETED' AND b.actual_return_date IS NOT NULL
+                    THEN max(b.actual_return_date, date(b.start_date, '+1 day'))
+                    ELSE b.end_date END
+           ) - julianday(b.start_date) AS INTEGER) AS days,
+           CAST(round(b.total_cost * 100) AS INTEGER) AS cents
+    FROM bookings b LEFT JOIN cars c ON c.id = b.car_id
+    WHERE b.status != 'CANCELLED' AND b.end_date > b.start_date
+),
+offsets(n) AS MATERIALIZED (
+    SELECT 0
+    UNION ALL
+    SELECT n + 1 FROM offsets WHERE n + 1 < (SELECT max(days) FROM effective)
+)
+SELECT date(day + 0.5), car_id, category, booked_days, revenue, rentals, rental_days
+FROM (
+    SELECT e.first_day + o.n AS day, e.car_id, max(e.category) AS category,
+           count(*) AS booked_days,
+           sum(e.cents / e.days
+               + CASE WHEN o.n = 0 THEN e.cents % e.days ELSE 0 END) / 100.0
+               AS revenue,
+           sum(o.n = 0) AS rentals,
+           sum(CASE WHEN o.n = 0 THEN e.days ELSE 0 END) AS rental_days
+    FROM effective e JOIN offsets o ON o.n < e.days
+    GROUP BY day, e.car_id
+)
+""",
+    "postgresql": """
+INSERT INTO daily_rollups
+    (day, car_id, category, booked_days, revenue, rentals, rental_days)
+SELECT e.start_date + o.n, e.car_id, max(e.category), count(*),
+       sum(e.cents / e.days
+           + CASE WHEN o.n = 0 THEN e.cents % e.days ELSE 0 END) / 100.0,
+       count(*) FILTER (WHERE o.n = 0),
+       sum(CASE WHEN o.n = 0 THEN e.days ELSE 0 END)
+FROM (
+    SELECT b.car_id, c.category, b.start_date,
+           CASE WHEN b.status = 'COMPLETED' AND b.actual_return_date IS NOT NULL
+                THEN greatest(b.actual_return_date, b.start_date + 1)
+                ELSE b.end_date END - b.start_date AS days,
+           CAST(round(b.total_cost * 100) AS BIGINT) AS cents
+    FROM bookings b LEFT JOIN cars c ON c.id = b.car_id
+    WHERE b.status != 'CANCELLED' AND b.end_date > b.start_date
+) e
+CROSS JOIN LATERAL generate_series(0, e.days - 1) AS o(n)
+GROUP BY e.start_date + o.n, e.car_id
+""",
+}
+
+
+async def _daily_rollups(conn: AsyncConnection) -> None:
+    await _create_tables(_rollup_table)(conn)
+    # Bookings made before rollups existed, or bulk-loaded without them, have
+    # never been rolled up. Rollups that already have rows are maintained
+    # incrementally and are left alone: rebuilding them takes minutes on
+    # millions of bookings.
+    never_rolled_up = await conn.scalar(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM bookings) "
+            "AND NOT EXISTS (SELECT 1 FROM daily_rollups)"
+        )
+    )
+    if never_rolled_up:
+        await conn.execute(text(_ROLLUP_BACKFILL[conn.dialect.name]))
+
+
+def _job_table(metadata: MetaData) -> list[Table]:
+    jobs = Table(
+        "jobs",
+        metadata,
+        Column("id", String(36), primary_key=True),
+        Column("kind", String(50), nullable=False),
+        Column(
+            "status",
+            Enum("QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="jobstatus"),
+            nullable=False,
+        ),
+        Column("payload", JSON, nullable=False),
+        Column("result", JSON, nullable=True),
+        Column("error", Text, nullable=True),
+        Column("attempts", Integer, nullable=False),
+        Column("max_attempts", Integer, nullable=False),
+        Column("run_after", DateTime, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+        Column("started_at", DateTime, nullable=True),
+        Column("finished_at", DateTime, nullable=True),
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
+    return [jobs]
+
+
+async def _booking_lifecycle(conn: AsyncConnection) -> None:
+    if conn.dialect.name == "postgresql":
+        for status in ("OVERDUE", "EXPIRED"):
+            await conn.execute(
+                text(f"ALTER TYPE bookingstatus ADD VALUE IF NOT EXISTS '{status}'")
+            )
+    await _create_indexes(
+        ("ix_bookings_status_start_date", "bookings", "status, start_date")
+    )(conn)
+
+
+_OVERLAP_CONSTRAINT_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    "ALTER TABLE bookings ADD CONSTRAINT bookings_no_overlap EXCLUDE USING gist "
+    "(car_id WITH =, daterange(start_date, end_date, '[]') WITH &&) "
+    "WHERE (status IN ('RESERVED', 'ACTIVE', 'OVERDUE'))",
+]
+
+
+async def _booking_overlap_constraint(conn: AsyncConnection) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+    present = await conn.scalar(
+        text(
+            "SELECT count(*) FROM pg_constraint "
+            "WHERE conname = 'bookings_no_overlap'"
+        )
+    )
+    if not present:
+        for statement in _OVERLAP_CONSTRAINT_DDL:
+            await conn.execute(text(statement))
+
+
+def _idempotency_table(metadata: MetaData) -> list[Table]:
+    keys = Table(
+        "idempotency_keys",
+        metadata,
+        Column("key", String(255), primary_key=True),
+        Column("fingerprint", LargeBinary(32), nullable=False),
+        Column("status_code", SmallInteger, nullable=True),
+        Column("body", Text, nullable=True),
+        Column("expires_at", DateTime, nullable=False),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+    return [keys]
+
+
+def _change_table(metadata: MetaData) -> list[Table]:
+    changes = Table(
+        "changes",
+        metadata,
+        Column(
+            "seq",
+            BigInteger().with_variant(Integer, "sqlite"),
+            primary_key=True,
+            autoincrement=True,
+        ),
+        Column(
+            "entity",
+            Enum("CAR", "CUSTOMER", "BOOKING", name="changeentity"),
+            nullable=False,
+        ),
+        Column("entity_id", String(36), nullable=False),
+        Column("deleted", Boolean, nullable=False),
+        Column("changed_at", DateTime, nullable=False),
+        Index("ix_changes_entity_entity_id_seq", "entity", "entity_id", "seq"),
+        sqlite_autoincrement=True,
+    )
+    return [changes]
+
+
+def _archive_table(metadata: MetaData) -> list[Table]:
+    _key_targets(metadata)
+    archive = Table(
+        "bookings_archive",
+        metadata,
+        _key("id", primary_key=True),
+        _key("car_id", ForeignKey("cars.id")),
+        _key("customer_id", ForeignKey("customers.id")),
+        Column("start_date", Date, nullable=False),
+        Column("end_date", Date, nullable=False),
+        Column("actual_return_date", Date, nullable=True),
+        Column("total_cost", Numeric(10, 2), nullable=False),
+        Column(
+            "status",
+            Enum(*_BOOKING_STATUSES, "OVERDUE", "EXPIRED", name="bookingstatus"),
+            nullable=False,
+        ),
+        Column("created_at", DateTime, nullable=False),
+        Column("archived_at", DateTime, nullable=False),
+        Index(
+            "ix_bookings_archive_customer_id_start_date", "customer_id", "start_date"
+        ),
+        Index("ix_bookings_archive_car_id_start_date", "car_id", "start_date"),
+    )
+    return [archive]
+
+
+# Rows converted per statement when moving SQLite keys to their binary form.
+_KEY_BATCH = 10_000
+
+_UUID_PATTERN = f"^{CANONICAL_UUID.pattern}$"
+
+# The key columns of each table at version 12.
+_KEY_COLUMNS = {
+    "cars": ["id"],
+    "customers": ["id"],
+    "daily_rollups": ["car_id"],
+    "bookings": ["id", "car_id", "customer_id"],
+    "bookings_archive": ["id", "car_id", "customer_id"],
+}
+
+
+async def _binary_keys(conn: AsyncConnection) -> None:
+    """Store keys written as UUID text in their 16-byte form.
+
+    Existing keys keep their value, so IDs held by clients stay valid; only
+    new keys are UUIDv7. See :func:`app.models.keys.key_bytes` for IDs that
+    are not UUIDs.
+    """
+    if conn.dialect.name == "postgresql":
+        await _binary_keys_postgresql(conn)
+        return
+    # SQLite keeps the declared column types; a BLOB is stored as such in a
+    # column declared VARCHAR, so converting the values is enough.
+    for table, columns in _KEY_COLUMNS.items():
+        is_text = " OR ".join(f"typeof({column}) = 'text'" for column in columns)
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        last = 0
+        while True:
+            result = await conn.exec_driver_sql(
+                f"SELECT rowid, {', '.join(columns)} FROM {table} "
+                f"WHERE rowid > ? AND ({is_text}) ORDER BY rowid LIMIT ?",
+                (last, _KEY_BATCH),
+            )
+            rows = result.all()
+            if not rows:
+                break
+            await conn.exec_driver_sql(
+                f"UPDATE {table} SET {assignments} WHERE rowid = ?",
+                [
+                    (*(key_bytes(value) for value in values), rowid)
+                    for rowid, *values in rows
+                ],
+            )
+            last = rows[-1][0]
+
+
+async def _binary_keys_postgresql(conn: AsyncConnection) -> None:
+    result = await conn.execute(
+        text(
+            "SELECT table_name, column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND data_type != 'bytea'"
+        )
+    )
+    pending = set(map(tuple, result.all()))
+    convert = [
+        (table, column)
+        for table, columns in _KEY_COLUMNS.items()
+        for column in columns
+        if (table, column) in pending
+    ]
+    if not convert:
+        return
+    # Both ends of a foreign key must have the same type at all times, so the
+    # keys referencing converted columns are dropped and added back after.
+    result = await conn.execute(
+        text(
+            "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) "
+            "FROM pg_constraint WHERE contype = 'f' "
+            "AND confrelid IN ('cars'::regclass, 'customers'::regclass)"
+        )
+    )
+    foreign_keys = result.all()
+    for table, name, _ in foreign_keys:
+        await conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {name}"))
+    for table, column in convert:
+        await conn.execute(
+            text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE bytea USING "
+                f"CASE WHEN {column} ~ '{_UUID_PATTERN}' "
+                f"THEN decode(replace({column}, '-', ''), 'hex') "
+                # LEGACY_TAG, twice for 15 bytes; see key_bytes().
+                f"WHEN octet_length({column}) = 15 "
+                f"THEN decode('0000', 'hex') || convert_to({column}, 'UTF8') "
+                f"ELSE decode('00', 'hex') || convert_to({column}, 'UTF8') END"
+            )
+        )
+    for table, name, definition in foreign_keys:
+        await conn.execute(
+            text(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+        )
+
+
+async def _job_leases(conn: AsyncConnection) -> None:
+    columns = await conn.run_sync(
+        lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns("jobs")}
+    )
+    if "locked_until" not in columns:
+        column_type = DateTime().compile(dialect=conn.dialect)
+        await conn.execute(
+            text(f"ALTER TABLE jobs ADD COLUMN locked_until {column_type}")
+        )
+
+
+async def _sortable_make_model_index(conn: AsyncConnection) -> None:
+    # Only PostgreSQL's index changes: it now compares in the "C" collation,
+    # which the make and model prefix ranges rely on.
+    if conn.dialect.name != "postgresql":
+        return
+    await conn.execute(text("DROP INDEX IF EXISTS ix_cars_make_model"))
+    await _create_indexes(
+        (
+            "ix_cars_make_model",
+            "cars",
+            'lower(make) COLLATE "C", lower(model) COLLATE "C"',
+        )
+    )(conn)
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "Cars, customers and bookings", _create_tables(_rental_tables)),
+    Migration(2, "Customer full-text search index", _customer_search_index),
+    Migration(
+        3,
+        "Car catalog search indexes",
+        _create_indexes(
+            (
+                "ix_cars_status_category_daily_rate",
+                "cars",
+                "status, category, daily_rate",
+            ),
+            ("ix_cars_status_daily_rate", "cars", "status, daily_rate"),
+            ("ix_cars_status_year", "cars", "status, year"),
+            ("ix_cars_make_model", "cars", "lower(make), lower(model)"),
+        ),
+    ),
+    Migration(4, "Daily reporting rollups", _daily_rollups),
+    Migration(
+        5,
+        "Booking interval index",
+        _create_indexes(
+            (
+                "ix_bookings_car_interval",
+                "bookings",
+                "car_id, start_date, end_date, status, actual_return_date",
+            )
+        ),
+    ),
+    Migration(6, "Background jobs", _create_tables(_job_table)),
+    Migration(7, "Overdue and expired bookings", _booking_lifecycle),
+    Migration(8, "Booking overlap exclusion constraint", _booking_overlap_constraint),
+    Migration(9, "Idempotency keys", _create_tables(_idempotency_table)),
+    Migration(10, "Change journal", _create_tables(_change_table)),
+    Migration(11, "Booking archive", _create_tables(_archive_table)),
+    Migration(12, "Binary UUID keys", _binary_keys),
+    Migration(
+        13,
+        "Customer booking history index",
+        _create_indexes(
+            (
+                "ix_bookings_customer_id_start_date",
+                "bookings",
+                "customer_id, start_date",
+            )
+        ),
+    ),
+    Migration(14, "Job leases", _job_leases),
+    Migration(
+        15,
+        "Car make and model index in code point order",
+        _sortable_make_model_index,
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
@@ -1,8 +1,23 @@
 """SQLAlchemy models."""
 
+from app.models.archive import ArchivedBooking
 from app.models.base import Base
 from app.models.booking import Booking
 from app.models.car import Car
+from app.models.change import Change
 from app.models.customer import Customer
+from app.models.idempotency import IdempotencyRecord
+from app.models.job import Job
+from app.models.rollup import DailyRollup
 
-__all__ = ["Base", "Car", "Customer", "Booking"]
+__all__ = [
+    "Base",
+    "Car",
+    "Customer",
+    "Booking",
+    "ArchivedBooking",
+    "DailyRollup",
+    "Change",
+    "Job",
+    "IdempotencyRecord",
+]
@@ -0,0 +1,58 @@
+"""Archived booking model."""
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, Numeric
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+from app.models.booking import Booking, BookingStatus
+from app.models.keys import BinaryKey
+
+if False:  # TYPE_CHECKING alternative for runtime
+    from app.models.car import Car
+    from app.models.customer import Customer
+
+
+class ArchivedBooking(Base):
+    """A finished booking moved out of ``bookings`` by the archiver.
+
+    Has every column of :class:`~app.models.booking.Booking`, so the same
+    schemas serialize both, plus the time it was archived. Only history
+    reads that ask for it look here; overlap checks, the sweeper and the
+    dashboard only see live bookings. Rollup contributions are left as they
+    were when a booking is archived.
+    """
+
+    __tablename__ = "bookings_archive"
+    __table_args__ = (
+        Index(
+            "ix_bookings_archive_customer_id_start_date", "customer_id", "start_date"
+        ),
+        Index("ix_bookings_archive_car_id_start_date", "car_id", "start_date"),
+    )
+
+    id: Mapped[str] = mapped_column(BinaryKey, primary_key=True)
+    car_id: Mapped[str] = mapped_column(
+        BinaryKey, ForeignKey("cars.id"), nullable=False
+    )
+    customer_id: Mapped[str] = mapped_column(
+        BinaryKey, ForeignKey("customers.id"), nullable=False
+    )
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False)
+    actual_return_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    total_cost: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
+    status: Mapped[BookingStatus] = mapped_column(
+        Enum(BookingStatus), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    car: Mapped["Car"] = relationship()
+    customer: Mapped["Customer"] = relationship()
+
+    rental_end = Booking.rental_end
+
+    def __repr__(self) -> str:
+        return f"<ArchivedBooking {self.id} - {self.status.value}>"
@@ -1,13 +1,22 @@
 """Booking model."""
 
 import enum
-import uuid
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, Numeric, String
+from sqlalchemy import (
+    DDL,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Numeric,
+    event,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.models.keys import BinaryKey, uuid7
 
 if False:  # TYPE_CHECKING alternative for runtime
     from app.models.car import Car
@@ -19,23 +28,51 @@ class BookingStatus(str, enum.Enum):
 
     RESERVED = "reserved"
     ACTIVE = "active"
+    OVERDUE = "overdue"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
+    EXPIRED = "expired"
+
+
+# Bookings that still hold their car for their dates.
+OPEN_STATUSES = (BookingStatus.RESERVED, BookingStatus.ACTIVE, BookingStatus.OVERDUE)
+# Bookings that never became a rental and count for nothing in reports.
+VOID_STATUSES = (BookingStatus.CANCELLED, BookingStatus.EXPIRED)
+# Bookings that will never change again and may be archived.
+FINISHED_STATUSES = (BookingStatus.COMPLETED, *VOID_STATUSES)
+# Bookings whose car was picked up, and so were paid for.
+RENTED_STATUSES = (BookingStatus.ACTIVE, BookingStatus.OVERDUE, BookingStatus.COMPLETED)
 
 
 class Booking(Base):
     """Booking model representing a car rental reservation."""
 
     __tablename__ = "bookings"
-
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
+    __table_args__ = (
+        # Serves per-car overlap checks and, as a covering index, the
+        # per-car interval scans of fleet analytics.
+        Index(
+            "ix_bookings_car_interval",
+            "car_id",
+            "start_date",
+            "end_date",
+            "status",
+            "actual_return_date",
+        ),
+        # Lets the lifecycle sweeper find stale reserved and active bookings
+        # without scanning the booking history.
+        Index("ix_bookings_status_start_date", "status", "start_date"),
+        # Serves a customer's booking history, newest first, one page at a
+        # time, and its summary.
+        Index("ix_bookings_customer_id_start_date", "customer_id", "start_date"),
     )
+
+    id: Mapped[str] = mapped_column(BinaryKey, primary_key=True, default=uuid7)
     car_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("cars.id"), nullable=False
+        BinaryKey, ForeignKey("cars.id"), nullable=False
     )
     customer_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("customers.id"), nullable=False
+        BinaryKey, ForeignKey("customers.id"), nullable=False
     )
     start_date: Mapped[date] = mapped_column(Date, nullable=False)
     end_date: Mapped[date] = mapped_column(Date, nullable=False)
@@ -51,5 +88,38 @@ class Booking(Base):
     car: Mapped["Car"] = relationship(back_populates="bookings")
     customer: Mapped["Customer"] = relationship(back_populates="bookings")
 
+    @property
+    def rental_end(self) -> date:
+        """Day the car became (or will become) free again.
+
+        Completed bookings end on their actual return date, but always cover
+        at least their first day; all others end on ``end_date``.
+        """
+        if self.status == BookingStatus.COMPLETED and self.actual_return_date:
+            return max(self.actual_return_date, self.start_date + timedelta(days=1))
+        return self.end_date
+
     def __repr__(self) -> str:
         return f"<Booking {self.id} - {self.status.value}>"
+
+
+# On PostgreSQL the database itself rules out double bookings: open bookings
+# of the same car may not share a day (both ends inclusive, like
+# BookingRepository.get_overlapping_bookings). The GiST index behind the
+# constraint also serves that query's range overlap test.
+OVERLAP_CONSTRAINT = "bookings_no_overlap"
+_open_names = ", ".join(f"'{status.name}'" for status in OPEN_STATUSES)
+
+OVERLAP_CONSTRAINT_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    f"ALTER TABLE bookings ADD CONSTRAINT {OVERLAP_CONSTRAINT} EXCLUDE USING gist "
+    f"(car_id WITH =, daterange(start_date, end_date, '[]') WITH &&) "
+    f"WHERE (status IN ({_open_names}))",
+]
+
+for _statement in OVERLAP_CONSTRAINT_DDL:
+    event.listen(
+        Booking.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
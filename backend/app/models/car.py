@@ -1,18 +1,42 @@
 """Car model."""
 
 import enum
-import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, Integer, Numeric, String
+from sqlalchemy import DateTime, Enum, Index, Integer, Numeric, String
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.functions import GenericFunction
 
 from app.models.base import Base
+from app.models.keys import BinaryKey, uuid7
 
 if False:  # TYPE_CHECKING alternative for runtime
     from app.models.booking import Booking
 
 
+class sortable_lower(GenericFunction):
+    """``lower()`` of a string, compared and indexed in code point order.
+
+    That is SQLite's default. PostgreSQL compares text by the database's
+    collation, under which a range such as ``>= 'to' AND < 'to\U0010ffff'``
+    is not a prefix match, so it uses the ``"C"`` collation there.
+    """
+
+    type = String()
+    inherit_cache = True
+
+
+@compiles(sortable_lower)
+def _compile_sortable_lower(element, compiler, **kw):
+    return f"lower({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(sortable_lower, "postgresql")
+def _compile_sortable_lower_postgresql(element, compiler, **kw):
+    return f'lower({compiler.process(element.clauses, **kw)}) COLLATE "C"'
+
+
 class CarCategory(str, enum.Enum):
     """Car category enumeration."""
 
@@ -34,10 +58,15 @@ class Car(Base):
     """Car model representing a vehicle in the rental fleet."""
 
     __tablename__ = "cars"
-
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
+    __table_args__ = (
+        # Catalog browsing: available cars, optionally in one category,
+        # filtered and ordered by price or by year.
+        Index("ix_cars_status_category_daily_rate", "status", "category", "daily_rate"),
+        Index("ix_cars_status_daily_rate", "status", "daily_rate"),
+        Index("ix_cars_status_year", "status", "year"),
     )
+
+    id: Mapped[str] = mapped_column(BinaryKey, primary_key=True, default=uuid7)
     make: Mapped[str] = mapped_column(String(100), nullable=False)
     model: Mapped[str] = mapped_column(String(100), nullable=False)
     year: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -57,3 +86,7 @@ class Car(Base):
 
     def __repr__(self) -> str:
         return f"<Car {self.make} {self.model} ({self.license_plate})>"
+
+
+# Case-insensitive make/model prefix search (see CarRepository.get_filtered).
+Index("ix_cars_make_model", sortable_lower(Car.make), sortable_lower(Car.model))
@@ -0,0 +1,51 @@
+"""Change journal model."""
+
+import enum
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Enum, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ChangeEntity(str, enum.Enum):
+    """Kinds of records tracked by the change journal."""
+
+    CAR = "car"
+    CUSTOMER = "customer"
+    BOOKING = "booking"
+
+
+class Change(Base):
+    """One write to a car, customer or booking, in commit order.
+
+    Clients keep the highest ``seq`` they have seen and ask for everything
+    after it to stay in sync. Writers take a lock before appending (see
+    :meth:`~app.repositories.change.ChangeRepository.record`), so a higher
+    ``seq`` is never committed before a lower one and a cursor can not skip
+    over a change still in flight.
+    """
+
+    __tablename__ = "changes"
+    __table_args__ = (
+        # Finding the entries a later write to the same record superseded.
+        Index("ix_changes_entity_entity_id_seq", "entity", "entity_id", "seq"),
+        # Sequence numbers are never reused, even after compaction.
+        {"sqlite_autoincrement": True},
+    )
+
+    seq: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    entity: Mapped[ChangeEntity] = mapped_column(Enum(ChangeEntity), nullable=False)
+    entity_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<Change {self.seq} {self.entity.value} {self.entity_id}>"
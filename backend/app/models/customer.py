@@ -1,12 +1,12 @@
 """Customer model."""
 
-import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import DDL, DateTime, String, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.models.keys import BinaryKey, uuid7
 
 if False:  # TYPE_CHECKING alternative for runtime
     from app.models.booking import Booking
@@ -17,9 +17,7 @@ class Customer(Base):
 
     __tablename__ = "customers"
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(BinaryKey, primary_key=True, default=uuid7)
     first_name: Mapped[str] = mapped_column(String(100), nullable=False)
     last_name: Mapped[str] = mapped_column(String(100), nullable=False)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
@@ -33,3 +31,42 @@ class Customer(Base):
 
     def __repr__(self) -> str:
         return f"<Customer {self.first_name} {self.last_name} ({self.email})>"
+
+
+# Full-text search index over the columns front-desk staff look customers up
+# by. It is an external-content FTS5 table keyed by the customers rowid and
+# kept in sync by triggers, so the text itself is stored only once.
+SEARCH_COLUMNS = ("first_name", "last_name", "email", "phone", "driver_license")
+
+_columns = ", ".join(SEARCH_COLUMNS)
+_new_values = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+_old_values = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+
+SEARCH_INDEX_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5("
+    f"{_columns}, content='customers', content_rowid='rowid', "
+    f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS customers_fts_insert AFTER INSERT ON customers "
+    f"BEGIN INSERT INTO customers_fts(rowid, {_columns}) "
+    f"VALUES (new.rowid, {_new_values}); END",
+    f"CREATE TRIGGER IF NOT EXISTS customers_fts_delete AFTER DELETE ON customers "
+    f"BEGIN INSERT INTO customers_fts(customers_fts, rowid, {_columns}) "
+    f"VALUES ('delete', old.rowid, {_old_values}); END",
+    f"CREATE TRIGGER IF NOT EXISTS customers_fts_update AFTER UPDATE ON customers "
+    f"BEGIN INSERT INTO customers_fts(customers_fts, rowid, {_columns}) "
+    f"VALUES ('delete', old.rowid, {_old_values}); "
+    f"INSERT INTO customers_fts(rowid, {_columns}) "
+    f"VALUES (new.rowid, {_new_values}); END",
+]
+
+for _statement in SEARCH_INDEX_DDL:
+    event.listen(
+        Customer.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    Customer.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS customers_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,31 @@
+"""Idempotency key model."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, LargeBinary, SmallInteger, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class IdempotencyRecord(Base):
+    """The stored response to a request sent with an ``Idempotency-Key``.
+
+    The row is written in the same transaction as the work the request did,
+    so a key is only ever recorded together with its effects. Retries of the
+    same request within ``expires_at`` get ``body`` back instead of running
+    again.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (Index("ix_idempotency_keys_expires_at", "expires_at"),)
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # SHA-256 of the method, path and body of the first request.
+    fingerprint: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
+    status_code: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    body: Mapped[str | None] = mapped_column(Text, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyRecord {self.key} - {self.status_code}>"
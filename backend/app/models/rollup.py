@@ -0,0 +1,37 @@
+"""Daily rollup model."""
+
+from datetime import date
+
+from sqlalchemy import Date, Enum, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+from app.models.car import CarCategory
+from app.models.keys import BinaryKey
+
+
+class DailyRollup(Base):
+    """Pre-aggregated booking activity of one car on one day.
+
+    Every booking except cancelled and expired ones contributes one
+    ``booked_days`` unit and an even share of its ``total_cost`` to each day
+    it covers, and counts as a rental (with its length in ``rental_days``) on
+    its first day. Rows are maintained incrementally by ``BookingService``
+    and the booking sweeper, and can be rebuilt from the bookings table with
+    ``rent-a-car rebuild rollups``.
+    """
+
+    __tablename__ = "daily_rollups"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    car_id: Mapped[str] = mapped_column(BinaryKey, primary_key=True)
+    category: Mapped[CarCategory | None] = mapped_column(
+        Enum(CarCategory), nullable=True
+    )
+    booked_days: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    revenue: Mapped[float] = mapped_column(Numeric(12, 2), default=0, nullable=False)
+    rentals: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rental_days: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<DailyRollup {self.day} {self.car_id}>"
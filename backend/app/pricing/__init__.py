@@ -0,0 +1,19 @@
+"""Rental pricing rules and the vectorized quote engine."""
+
+from app.pricing.engine import (
+    DurationDiscount,
+    PricingRules,
+    Quotes,
+    Season,
+    price,
+    quote_total,
+)
+
+__all__ = [
+    "Season",
+    "DurationDiscount",
+    "PricingRules",
+    "Quotes",
+    "price",
+    "quote_total",
+]
@@ -0,0 +1,155 @@
+"""Vectorized rental pricing.
+
+A rental is priced per day: each day costs the car's daily rate times a
+weekend multiplier (on weekend days) and a season multiplier (on days inside
+a season). The sum over all days is then reduced by the discount of the
+longest duration tier the rental reaches. Quotes are computed for whole
+batches at once by expanding every rental into its days with NumPy, so the
+same code prices one booking or thousands of search results.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Annotated
+
+import numpy as np
+from pydantic import BaseModel, Field, field_validator
+
+# Any leap year works: it is only used to enumerate every month/day pair.
+_REFERENCE_YEAR = 2000
+
+
+class Season(BaseModel):
+    """A recurring period of the year with its own price multiplier.
+
+    ``start`` and ``end`` are inclusive ``MM-DD`` dates; a season whose end
+    comes before its start wraps around the new year.
+    """
+
+    start: str
+    end: str
+    multiplier: float = Field(..., gt=0)
+
+    @field_validator("start", "end")
+    @classmethod
+    def _valid_month_day(cls, value: str) -> str:
+        date.fromisoformat(f"{_REFERENCE_YEAR}-{value}")
+        return value
+
+
+class DurationDiscount(BaseModel):
+    """Fractional discount for rentals of at least ``min_days`` days."""
+
+    min_days: int = Field(..., ge=1)
+    discount: float = Field(..., ge=0, lt=1)
+
+
+class PricingRules(BaseModel):
+    """Pricing configuration; the defaults charge the plain daily rate."""
+
+    weekend_multiplier: float = Field(1.0, gt=0)
+    weekend_days: list[Annotated[int, Field(ge=0, le=6)]] = Field(
+        default=[5, 6], description="Monday is 0"
+    )
+    seasons: list[Season] = []
+    duration_discounts: list[DurationDiscount] = []
+
+    def season_table(self) -> np.ndarray:
+        """Multiplier for every (month - 1, day - 1); overlapping seasons
+        use the highest multiplier."""
+        table = np.ones((12, 31))
+        for season in self.seasons:
+            start = date.fromisoformat(f"{_REFERENCE_YEAR}-{season.start}")
+            end = date.fromisoformat(f"{_REFERENCE_YEAR}-{season.end}")
+            first, last = start.timetuple().tm_yday, end.timetuple().tm_yday
+            days = np.arange(1, 367)
+            inside = (
+                (days >= first) & (days <= last)
+                if first <= last
+                else (days >= first) | (days <= last)
+            )
+            dates = np.datetime64(f"{_REFERENCE_YEAR}-01-01", "D") + (
+                days[inside] - 1
+            ).astype("timedelta64[D]")
+            months = dates.astype("datetime64[M]")
+            rows = months.astype(np.int64) % 12
+            cols = (dates - months).astype(np.int64)
+            table[rows, cols] = np.maximum(table[rows, cols], season.multiplier)
+        return table
+
+
+@dataclass
+class Quotes:
+    """Prices of a batch of rentals as parallel arrays."""
+
+    days: np.ndarray
+    subtotal: np.ndarray
+    discount: np.ndarray
+    total: np.ndarray
+
+
+def _day_factors(rules: PricingRules, days: np.ndarray) -> np.ndarray:
+    """Combined weekend and season multiplier of each day number."""
+    factors = np.ones(len(days))
+    if rules.weekend_multiplier != 1.0:
+        # Day 0 (1970-01-01) was a Thursday.
+        weekday = (days + 3) % 7
+        weekend = np.isin(weekday, rules.weekend_days)
+        factors[weekend] = rules.weekend_multiplier
+    if rules.seasons:
+        dates = days.astype("datetime64[D]")
+        months = dates.astype("datetime64[M]")
+        rows = months.astype(np.int64) % 12
+        cols = (dates - months).astype(np.int64)
+        factors *= rules.season_table()[rows, cols]
+    return factors
+
+
+def price(
+    rules: PricingRules,
+    daily_rates: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+) -> Quotes:
+    """Price rentals from ``starts`` up to, but excluding, ``ends``.
+
+    ``starts`` and ``ends`` are ``datetime64[D]`` arrays (or day numbers)
+    with ``starts < ends``. Amounts are rounded to cents.
+    """
+    starts = np.asarray(starts, dtype="datetime64[D]").astype(np.int64)
+    ends = np.asarray(ends, dtype="datetime64[D]").astype(np.int64)
+    daily_rates = np.asarray(daily_rates, dtype=np.float64)
+    days = ends - starts
+
+    if rules.weekend_multiplier == 1.0 and not rules.seasons:
+        weighted_days = days.astype(np.float64)
+    else:
+        rental = np.repeat(np.arange(len(days)), days)
+        offset = np.arange(len(rental)) - np.repeat(np.cumsum(days) - days, days)
+        factors = _day_factors(rules, starts[rental] + offset)
+        weighted_days = np.bincount(rental, weights=factors, minlength=len(days))
+    subtotal = np.round(daily_rates * weighted_days, 2)
+
+    rate = np.zeros(len(days))
+    if rules.duration_discounts:
+        tiers = sorted(rules.duration_discounts, key=lambda tier: tier.min_days)
+        min_days = np.array([tier.min_days for tier in tiers])
+        discounts = np.array([tier.discount for tier in tiers])
+        tier = np.searchsorted(min_days, days, side="right") - 1
+        rate = np.where(tier >= 0, discounts[np.maximum(tier, 0)], 0.0)
+    discount = np.round(subtotal * rate, 2)
+
+    return Quotes(
+        days=days,
+        subtotal=subtotal,
+        discount=discount,
+        total=np.round(subtotal - discount, 2),
+    )
+
+
+def quote_total(
+    rules: PricingRules, daily_rate: float, start_date: date, end_date: date
+) -> float:
+    """Total price of a single rental, as :func:`price` computes it."""
+    quotes = price(rules, [daily_rate], [start_date], [end_date])
+    return float(quotes.total[0])
@@ -4,5 +4,20 @@ from app.repositories.base import BaseRepository
 from app.repositories.car import CarRepository
 from app.repositories.customer import CustomerRepository
 from app.repositories.booking import BookingRepository
+from app.repositories.rollup import RollupRepository
+from app.repositories.analytics import AnalyticsRepository
+from app.repositories.job import JobRepository
+from app.repositories.idempotency import IdempotencyRepository
+from app.repositories.change import ChangeRepository
 
-__all__ = ["BaseRepository", "CarRepository", "CustomerRepository", "BookingRepository"]
+__all__ = [
+    "BaseRepository",
+    "CarRepository",
+    "CustomerRepository",
+    "BookingRepository",
+    "RollupRepository",
+    "AnalyticsRepository",
+    "JobRepository",
+    "IdempotencyRepository",
+    "ChangeRepository",
+]
@@ -0,0 +1,115 @@
+"""Analytics repository for loading booking intervals as arrays."""
+
+from datetime import date
+
+import numpy as np
+from sqlalchemy import Select, String, and_, case, cast, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analytics import BookingIntervals
+from app.models.archive import ArchivedBooking
+from app.models.booking import VOID_STATUSES, Booking, BookingStatus
+from app.models.car import Car, CarCategory
+
+# Dates are rendered as fixed-width 'YYYY-MM-DD' text.
+_DATE_WIDTH = 10
+
+
+def _concat(column):
+    """Concatenate ``column`` over a group without separators."""
+    return func.aggregate_strings(column, "")
+
+
+def _day_numbers(chunks: list[str], width: int = _DATE_WIDTH) -> np.ndarray:
+    """Parse concatenated fixed-width dates into days since 1970-01-01."""
+    raw = np.frombuffer("".join(chunks).encode("ascii"), dtype=f"S{width}")
+    return raw.astype("datetime64[D]").astype(np.int64)
+
+
+class AnalyticsRepository:
+    """Repository for bulk, columnar reads used by fleet analytics."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_cars(self, category: CarCategory | None = None) -> list[Car]:
+        """Cars to analyze, in the order their codes refer to."""
+        query = select(Car).order_by(Car.id)
+        if category is not None:
+            query = query.where(Car.category == category)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def load_intervals(
+        self,
+        cars: list[Car],
+        start: date,
+        end: date,
+        category: CarCategory | None = None,
+    ) -> BookingIntervals:
+        """Non-cancelled bookings of ``cars`` touching ``[start, end]``.
+
+        ``cars`` must be the result of :meth:`get_cars` for the same
+        ``category``. Rather than one row per booking, the database returns
+        one row per car with its booking dates concatenated as fixed-width
+        text, which NumPy decodes in bulk; fetching millions of individual
+        rows would dominate the run time. Completed bookings end on their
+        actual return date (see :attr:`Booking.rental_end`). Archived
+        bookings are included; a car may then have a row from each table.
+        """
+        rows = []
+        for model in (Booking, ArchivedBooking):
+            query = self._intervals_query(model, start, end, category)
+            rows.extend((await self.session.execute(query)).all())
+
+        codes = {car.id: code for code, car in enumerate(cars)}
+        rows = [row for row in rows if row[0] in codes]
+        counts = [len(row[1]) // _DATE_WIDTH for row in rows]
+        car = np.repeat(
+            np.array([codes[row[0]] for row in rows], dtype=np.int64), counts
+        )
+        starts = _day_numbers([row[1] for row in rows])
+        ends = _day_numbers([row[2] for row in rows])
+        returns = _day_numbers([row[3] for row in rows])
+        flags = "".join(row[4] for row in rows).encode("ascii")
+        is_returned = np.frombuffer(flags, dtype="S1") == b"1"
+        ends = np.where(is_returned, np.maximum(returns, starts + 1), ends)
+        return BookingIntervals(car=car, start=starts, end=ends)
+
+    @staticmethod
+    def _intervals_query(
+        model: type[Booking | ArchivedBooking],
+        start: date,
+        end: date,
+        category: CarCategory | None,
+    ) -> Select:
+        """Per car of ``model``'s table, its concatenated booking dates."""
+        returned = and_(
+            model.status == BookingStatus.COMPLETED,
+            model.actual_return_date.isnot(None),
+        )
+        query = (
+            select(
+                model.car_id,
+                _concat(cast(model.start_date, String)),
+                _concat(cast(model.end_date, String)),
+                _concat(
+                    cast(
+                        func.coalesce(model.actual_return_date, model.end_date),
+                        String,
+                    )
+                ),
+                _concat(case((returned, "1"), else_="0")),
+            )
+            .where(
+                model.status.notin_(VOID_STATUSES),
+                model.start_date <= end,
+                or_(model.end_date >= start, model.actual_return_date >= start),
+            )
+            .group_by(model.car_id)
+        )
+        if category is not None:
+            query = query.where(
+                model.car_id.in_(select(Car.id).where(Car.category == category))
+            )
+        return query
@@ -1,9 +1,12 @@
 """Base repository with common CRUD operations."""
 
+from collections.abc import Collection
 from typing import Generic, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql.base import ExecutableOption
 
 from app.models.base import Base
 
@@ -17,18 +20,41 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
         self.session = session
 
-    async def get_by_id(self, id: str) -> ModelType | None:
-        """Get a single record by ID."""
+    def only(self, fields: Collection[str]) -> list[ExecutableOption]:
+        """Loader options restricting a SELECT to the ``fields`` columns.
+
+        The primary key is always loaded; no ``fields`` means every column.
+        Reading any other attribute of the loaded objects raises instead of
+        emitting a lazy load.
+        """
+        if not fields:
+            return []
+        columns = [getattr(self.model, name) for name in sorted(fields)]
+        return [load_only(*columns, raiseload=True)]
+
+    async def get_by_id(
+        self, id: str, fields: Collection[str] = ()
+    ) -> ModelType | None:
+        """Get a single record by ID, loading only ``fields`` if given."""
         result = await self.session.execute(
-            select(self.model).where(self.model.id == id)
+            select(self.model).where(self.model.id == id).options(*self.only(fields))
         )
         return result.scalar_one_or_none()
 
-    async def get_all(self) -> list[ModelType]:
-        """Get all records."""
-        result = await self.session.execute(select(self.model))
+    async def get_all(self, fields: Collection[str] = ()) -> list[ModelType]:
+        """Get all records, loading only ``fields`` if given."""
+        result = await self.session.execute(
+            select(self.model).options(*self.only(fields))
+        )
         return list(result.scalars().all())
 
+    async def count(self) -> int:
+        """Count all records."""
+        result = await self.session.execute(
+            select(func.count()).select_from(self.model)
+        )
+        return result.scalar_one()
+
     async def create(self, obj: ModelType) -> ModelType:
         """Create a new record."""
         self.session.add(obj)
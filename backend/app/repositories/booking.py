@@ -1,20 +1,96 @@
 """Booking repository for data access."""
 
-from datetime import date
+from collections.abc import Collection
+from datetime import date, datetime
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy.sql.base import ExecutableOption
 
-from app.models.booking import Booking, BookingStatus
+from app.models.archive import ArchivedBooking
+from app.models.booking import (
+    FINISHED_STATUSES,
+    OPEN_STATUSES,
+    VOID_STATUSES,
+    Booking,
+    BookingStatus,
+)
 from app.repositories.base import BaseRepository
 
 
 class BookingRepository(BaseRepository[Booking]):
-    """Repository for Booking model operations."""
+    """Repository for Booking model operations.
+
+    Reads only see live bookings unless they pass ``archived=True``, which
+    also looks in the archive of finished bookings (see
+    :meth:`archive_finished`).
+    """
 
     def __init__(self, session: AsyncSession):
         super().__init__(Booking, session)
 
+    def only(
+        self,
+        fields: Collection[str],
+        include: Collection[str] = (),
+        model: type[Booking | ArchivedBooking] = Booking,
+    ) -> list[ExecutableOption]:
+        """Loader options for ``fields`` plus the foreign keys ``include`` needs."""
+        if not fields:
+            return []
+        fields = {*fields}.union(
+            column.key
+            for name in include
+            for column in getattr(model, name).property.local_columns
+        )
+        columns = [getattr(model, name) for name in sorted(fields)]
+        return [load_only(*columns, raiseload=True)]
+
+    @staticmethod
+    def _models(archived: bool) -> tuple[type[Booking | ArchivedBooking], ...]:
+        """The tables a read looks in, live bookings first."""
+        return (Booking, ArchivedBooking) if archived else (Booking,)
+
+    async def get_by_id(
+        self,
+        id: str,
+        include: Collection[str] = (),
+        fields: Collection[str] = (),
+        archived: bool = False,
+    ) -> Booking | ArchivedBooking | None:
+        """Get a booking by ID, joining in the requested relationships.
+
+        Only the ``fields`` columns of the booking are loaded if given. With
+        ``archived``, a booking missing from the live table is looked up in
+        the archive.
+        """
+        for model in self._models(archived):
+            query = select(model).where(model.id == id)
+            query = query.options(*self.only(fields, include, model))
+            for name in include:
+                query = query.options(joinedload(getattr(model, name)))
+            result = await self.session.execute(query)
+            booking = result.scalar_one_or_none()
+            if booking is not None:
+                return booking
+        return None
+
     async def get_by_car_id(self, car_id: str) -> list[Booking]:
         """Get all bookings for a specific car."""
         result = await self.session.execute(
@@ -37,25 +113,35 @@ class BookingRepository(BaseRepository[Booking]):
         exclude_booking_id: str | None = None,
     ) -> list[Booking]:
         """Get bookings that overlap with the given date range for a car."""
-        query = select(Booking).where(
-            and_(
-                Booking.car_id == car_id,
-                Booking.status.in_([BookingStatus.RESERVED, BookingStatus.ACTIVE]),
-                or_(
-                    and_(
-                        Booking.start_date <= start_date,
-                        Booking.end_date >= start_date,
-                    ),
-                    and_(
-                        Booking.start_date <= end_date,
-                        Booking.end_date >= end_date,
-                    ),
-                    and_(
-                        Booking.start_date >= start_date,
-                        Booking.end_date <= end_date,
-                    ),
+        if self.session.get_bind().dialect.name == "postgresql":
+            # The same expressions as the bookings_no_overlap constraint, with
+            # constants inlined so the planner can match its partial GiST
+            # index even in generic plans of cached statements.
+            open_statuses = Booking.status.in_(
+                bindparam("open_statuses", OPEN_STATUSES, literal_execute=True)
+            )
+            inclusive = literal_column("'[]'")
+            overlaps = func.daterange(
+                Booking.start_date, Booking.end_date, inclusive
+            ).op("&&")(func.daterange(start_date, end_date, inclusive))
+        else:
+            open_statuses = Booking.status.in_(OPEN_STATUSES)
+            overlaps = or_(
+                and_(
+                    Booking.start_date <= start_date,
+                    Booking.end_date >= start_date,
+                ),
+                and_(
+                    Booking.start_date <= end_date,
+                    Booking.end_date >= end_date,
+                ),
+                and_(
+                    Booking.start_date >= start_date,
+                    Booking.end_date <= end_date,
                 ),
             )
+        query = select(Booking).where(
+            and_(Booking.car_id == car_id, open_statuses, overlaps)
         )
 
         if exclude_booking_id:
@@ -64,21 +150,254 @@ class BookingRepository(BaseRepository[Booking]):
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def expire_no_shows(self, started_before: date, limit: int) -> list:
+        """Expire up to ``limit`` reservations never picked up before their start.
+
+        Returns the ID, car, customer, status, dates and cost of each expired
+        booking.
+        """
+        return await self._transition(
+            BookingStatus.RESERVED,
+            BookingStatus.EXPIRED,
+            Booking.start_date < started_before,
+            limit,
+        )
+
+    async def mark_overdue(self, ended_before: date, limit: int) -> list:
+        """Flag up to ``limit`` active rentals due back before ``ended_before``."""
+        return await self._transition(
+            BookingStatus.ACTIVE,
+            BookingStatus.OVERDUE,
+            Booking.end_date < ended_before,
+            limit,
+        )
+
+    async def _transition(
+        self,
+        current: BookingStatus,
+        new: BookingStatus,
+        condition: ColumnElement[bool],
+        limit: int,
+    ) -> list:
+        """Move up to ``limit`` bookings matching ``condition`` to ``new``.
+
+        A single ``UPDATE`` without loading the bookings; the status check is
+        repeated in its ``WHERE`` so concurrent sweeps never move a booking
+        twice.
+        """
+        batch = (
+            select(Booking.id)
+            .where(Booking.status == current, condition)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            update(Booking)
+            .where(Booking.id.in_(batch), Booking.status == current)
+            .values(status=new)
+            .returning(
+                Booking.id,
+                Booking.car_id,
+                Booking.customer_id,
+                Booking.status,
+                Booking.start_date,
+                Booking.end_date,
+                Booking.total_cost,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.all())
+
     async def get_filtered(
         self,
         status: BookingStatus | None = None,
         car_id: str | None = None,
         customer_id: str | None = None,
-    ) -> list[Booking]:
-        """Get bookings with optional filters."""
-        query = select(Booking)
+        include: Collection[str] = (),
+        fields: Collection[str] = (),
+        archived: bool = False,
+    ) -> list[Booking | ArchivedBooking]:
+        """Get bookings with optional filters.
 
+        Each relationship named in ``include`` is loaded with one extra
+        ``SELECT ... IN`` query, regardless of the number of bookings. Only
+        the ``fields`` columns of the bookings are loaded if given. With
+        ``archived``, matching archived bookings follow the live ones.
+        """
+        bookings: list[Booking | ArchivedBooking] = []
+        for model in self._models(archived):
+            query = self.filtered_query(
+                status=status, car_id=car_id, customer_id=customer_id, model=model
+            ).options(*self.only(fields, include, model))
+            for name in include:
+                query = query.options(selectinload(getattr(model, name)))
+            result = await self.session.execute(query)
+            bookings.extend(result.scalars().all())
+        return bookings
+
+    def filtered_query(
+        self,
+        status: BookingStatus | None = None,
+        car_id: str | None = None,
+        customer_id: str | None = None,
+        model: type[Booking | ArchivedBooking] = Booking,
+    ) -> Select:
+        """Build the SELECT behind :meth:`get_filtered` on ``model``'s table."""
+        query = select(model)
         if status is not None:
-            query = query.where(Booking.status == status)
+            query = query.where(model.status == status)
         if car_id is not None:
-            query = query.where(Booking.car_id == car_id)
+            query = query.where(model.car_id == car_id)
         if customer_id is not None:
-            query = query.where(Booking.customer_id == customer_id)
+            query = query.where(model.customer_id == customer_id)
+        return query
+
+    async def get_customer_history(
+        self,
+        customer_id: str,
+        limit: int,
+        before: tuple[date, str] | None = None,
+        include: Collection[str] = (),
+        archived: bool = False,
+    ) -> list[Booking | ArchivedBooking]:
+        """Up to ``limit`` bookings of a customer, latest start date first.
+
+        Keyset pagination: ``before`` is the ``(start_date, id)`` of the last
+        booking of the previous page, and every query reads its page straight
+        off the ``(customer_id, start_date)`` index however deep it is. With
+        ``archived``, both tables are read that way and merged.
+        """
+        bookings: list[Booking | ArchivedBooking] = []
+        for model in self._models(archived):
+            query = (
+                select(model)
+                .where(model.customer_id == customer_id)
+                .order_by(model.start_date.desc(), model.id.desc())
+                .limit(limit)
+            )
+            if before is not None:
+                query = query.where(tuple_(model.start_date, model.id) < before)
+            for name in include:
+                query = query.options(selectinload(getattr(model, name)))
+            result = await self.session.execute(query)
+            bookings.extend(result.scalars().all())
+        bookings.sort(key=lambda b: (b.start_date, b.id), reverse=True)
+        return bookings[:limit]
+
+    async def customer_totals(self, customer_id: str, archived: bool = False) -> list:
+        """Count, summed cost and latest start of a customer's bookings by status.
+
+        One aggregate query over the ``(customer_id, start_date)`` index,
+        over the archive too with ``archived``. Statuses without bookings
+        are left out.
+        """
+        bookings = union_all(
+            *(
+                select(model.status, model.total_cost, model.start_date).where(
+                    model.customer_id == customer_id
+                )
+                for model in self._models(archived)
+            )
+        ).subquery()
+        result = await self.session.execute(
+            select(
+                bookings.c.status,
+                func.count().label("bookings"),
+                func.sum(bookings.c.total_cost).label("spend"),
+                func.max(bookings.c.start_date).label("last_start"),
+            ).group_by(bookings.c.status)
+        )
+        return list(result.all())
+
+    async def count_filtered(
+        self,
+        status: BookingStatus | None = None,
+        car_id: str | None = None,
+        customer_id: str | None = None,
+        archived: bool = False,
+    ) -> int:
+        """Count the bookings :meth:`get_filtered` would return.
+
+        Runs ``SELECT count(*)`` with the same conditions; counts by status
+        or car are answered from an index without reading the table.
+        """
+        count = 0
+        for model in self._models(archived):
+            query = self.filtered_query(
+                status=status, car_id=car_id, customer_id=customer_id, model=model
+            )
+            result = await self.session.execute(
+                query.with_only_columns(func.count(), maintain_column_froms=True)
+            )
+            count += result.scalar_one()
+        return count
+
+    async def archive_finished(
+        self, ended_before: date, limit: int, now: datetime
+    ) -> int:
+        """Move up to ``limit`` bookings finished before ``ended_before``.
 
+        Completed, cancelled and expired bookings whose end date, and actual
+        return date if any, fall before ``ended_before`` are copied to the
+        archive and deleted from ``bookings`` with two set-based statements.
+        Returns how many were moved.
+        """
+        result = await self.session.execute(
+            select(Booking.id)
+            .where(
+                Booking.status.in_(FINISHED_STATUSES),
+                # Lets the (status, start_date) index narrow the scan.
+                Booking.start_date < ended_before,
+                Booking.end_date < ended_before,
+                or_(
+                    Booking.actual_return_date.is_(None),
+                    Booking.actual_return_date < ended_before,
+                ),
+            )
+            .limit(limit)
+        )
+        ids = list(result.scalars().all())
+        if not ids:
+            return 0
+        columns = list(Booking.__table__.columns)
+        await self.session.execute(
+            insert(ArchivedBooking).from_select(
+                [column.key for column in columns] + ["archived_at"],
+                select(*columns, literal(now, ArchivedBooking.archived_at.type))
+                .where(Booking.id.in_(ids)),
+            )
+        )
+        await self.session.execute(
+            delete(Booking)
+            .where(Booking.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        return len(ids)
+
+    async def count_by_status(self) -> dict[BookingStatus, int]:
+        """Number of bookings in each status, including empty ones."""
+        result = await self.session.execute(
+            select(Booking.status, func.count()).group_by(Booking.status)
+        )
+        return {status: 0 for status in BookingStatus} | dict(result.all())
+
+    async def count_scheduled(self, day: date) -> tuple[int, int]:
+        """Bookings starting and ending on ``day``, except void ones."""
+        starts = Booking.start_date == day
+        ends = Booking.end_date == day
+        result = await self.session.execute(
+            select(
+                func.count().filter(starts), func.count().filter(ends)
+            ).where(or_(starts, ends), Booking.status.notin_(VOID_STATUSES))
+        )
+        pickups, returns = result.one()
+        return pickups, returns
+
+    async def get_recent(
+        self, limit: int, include: Collection[str] = ()
+    ) -> list[Booking]:
+        """The ``limit`` most recently created bookings, newest first."""
+        query = select(Booking).order_by(Booking.created_at.desc()).limit(limit)
+        for name in include:
+            query = query.options(selectinload(getattr(Booking, name)))
         result = await self.session.execute(query)
         return list(result.scalars().all())
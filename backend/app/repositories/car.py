@@ -1,10 +1,53 @@
 """Car repository for data access."""
 
-from sqlalchemy import select
+import string
+import sys
+from collections.abc import Collection
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    String,
+    and_,
+    func,
+    literal,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.car import Car, CarCategory, CarStatus
+from app.models.booking import Booking, BookingStatus
+from app.models.car import Car, CarCategory, CarStatus, sortable_lower
 from app.repositories.base import BaseRepository
+from app.schemas.car import CarSort
+
+SORT_COLUMNS = {
+    CarSort.DAILY_RATE: Car.daily_rate.asc(),
+    CarSort.DAILY_RATE_DESC: Car.daily_rate.desc(),
+    CarSort.YEAR: Car.year.asc(),
+    CarSort.YEAR_DESC: Car.year.desc(),
+}
+
+# SQLite's lower() only folds ASCII letters; the in-memory backend folds the
+# same way.
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# The highest code point, a noncharacter; no stored text contains it.
+MAX_CHAR = chr(sys.maxunicode)
+
+
+def prefix_match(column, prefix: str) -> ColumnElement[bool]:
+    """Case-insensitive prefix match as an index-friendly range on lower().
+
+    Every string starting with the folded prefix sorts between the prefix
+    itself and the prefix followed by the highest code point. The prefix is
+    folded by the database, like the column.
+    """
+    lowered = sortable_lower(literal(prefix, String))
+    return and_(
+        sortable_lower(column) >= lowered,
+        sortable_lower(column) < lowered.concat(MAX_CHAR),
+    )
 
 
 class CarRepository(BaseRepository[Car]):
@@ -20,18 +63,143 @@ class CarRepository(BaseRepository[Car]):
         )
         return result.scalar_one_or_none()
 
-    async def get_filtered(
+    async def get_by_ids(self, ids: list[str]) -> list[Car]:
+        """Get the cars among ``ids`` that exist, in no particular order."""
+        result = await self.session.execute(select(Car).where(Car.id.in_(ids)))
+        return list(result.scalars().all())
+
+    def filtered_query(
         self,
         status: CarStatus | None = None,
         category: CarCategory | None = None,
-    ) -> list[Car]:
-        """Get cars with optional filters."""
-        query = select(Car)
+        make: str | None = None,
+        model: str | None = None,
+        min_year: int | None = None,
+        max_year: int | None = None,
+        min_rate: float | None = None,
+        max_rate: float | None = None,
+        sort: CarSort | None = None,
+        fields: Collection[str] = (),
+    ) -> Select[tuple[Car]]:
+        """Build the SELECT behind :meth:`get_filtered`."""
+        query = select(Car).options(*self.only(fields))
 
         if status is not None:
             query = query.where(Car.status == status)
         if category is not None:
             query = query.where(Car.category == category)
+        if make:
+            query = query.where(prefix_match(Car.make, make))
+        if model:
+            query = query.where(prefix_match(Car.model, model))
+        if min_year is not None:
+            query = query.where(Car.year >= min_year)
+        if max_year is not None:
+            query = query.where(Car.year <= max_year)
+        if min_rate is not None:
+            query = query.where(Car.daily_rate >= min_rate)
+        if max_rate is not None:
+            query = query.where(Car.daily_rate <= max_rate)
+        if sort is not None:
+            query = query.order_by(SORT_COLUMNS[sort])
+
+        return query
+
+    async def release_unrented(self, limit: int) -> list:
+        """Mark up to ``limit`` rented cars without an open rental as available.
+
+        An open rental is an active or overdue booking. Returns the ID,
+        status and category of each released car.
+        """
+        rental = (
+            select(Booking.id)
+            .where(
+                Booking.car_id == Car.id,
+                Booking.status.in_([BookingStatus.ACTIVE, BookingStatus.OVERDUE]),
+            )
+            .exists()
+        )
+        batch = (
+            select(Car.id)
+            .where(Car.status == CarStatus.RENTED, ~rental)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            update(Car)
+            .where(Car.id.in_(batch), Car.status == CarStatus.RENTED)
+            .values(status=CarStatus.AVAILABLE)
+            .returning(Car.id, Car.status, Car.category)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.all())
 
+    async def get_filtered(
+        self,
+        status: CarStatus | None = None,
+        category: CarCategory | None = None,
+        make: str | None = None,
+        model: str | None = None,
+        min_year: int | None = None,
+        max_year: int | None = None,
+        min_rate: float | None = None,
+        max_rate: float | None = None,
+        sort: CarSort | None = None,
+        fields: Collection[str] = (),
+    ) -> list[Car]:
+        """Get cars with optional filters and ordering.
+
+        ``make`` and ``model`` are case-insensitive prefixes; year and rate
+        bounds are inclusive. Only the ``fields`` columns are loaded if given.
+        """
+        query = self.filtered_query(
+            status=status,
+            category=category,
+            make=make,
+            model=model,
+            min_year=min_year,
+            max_year=max_year,
+            min_rate=min_rate,
+            max_rate=max_rate,
+            sort=sort,
+            fields=fields,
+        )
         result = await self.session.execute(query)
         return list(result.scalars().all())
+
+    async def count_filtered(
+        self,
+        status: CarStatus | None = None,
+        category: CarCategory | None = None,
+        make: str | None = None,
+        model: str | None = None,
+        min_year: int | None = None,
+        max_year: int | None = None,
+        min_rate: float | None = None,
+        max_rate: float | None = None,
+    ) -> int:
+        """Count the cars :meth:`get_filtered` would return.
+
+        Runs ``SELECT count(*)`` with the same conditions, which the filter
+        indexes answer without reading the table.
+        """
+        query = self.filtered_query(
+            status=status,
+            category=category,
+            make=make,
+            model=model,
+            min_year=min_year,
+            max_year=max_year,
+            min_rate=min_rate,
+            max_rate=max_rate,
+        )
+        result = await self.session.execute(
+            query.with_only_columns(func.count(), maintain_column_froms=True)
+        )
+        return result.scalar_one()
+
+    async def count_by_status(self) -> dict[CarStatus, int]:
+        """Number of cars in each status, including empty ones."""
+        result = await self.session.execute(
+            select(Car.status, func.count()).group_by(Car.status)
+        )
+        return {status: 0 for status in CarStatus} | dict(result.all())
@@ -0,0 +1,79 @@
+"""Change journal repository for data access."""
+
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy import delete, exists, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.change import Change, ChangeEntity
+
+# Transaction-level advisory lock serializing journal writers on PostgreSQL.
+CHANGE_LOCK_KEY = 0x6368616E
+
+
+class ChangeRepository:
+    """Repository for the journal of writes that clients sync from."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record(
+        self, entity: ChangeEntity, ids: Iterable[str], deleted: bool = False
+    ) -> None:
+        """Append one entry per record of ``entity`` in ``ids``.
+
+        Call it last in a transaction. On PostgreSQL it takes a lock held
+        until commit, so entries commit in ``seq`` order and a reader never
+        sees a later entry while an earlier one is still uncommitted. SQLite
+        serializes all writers anyway.
+        """
+        now = datetime.utcnow()
+        rows = [
+            {"entity": entity, "entity_id": id, "deleted": deleted, "changed_at": now}
+            for id in ids
+        ]
+        if not rows:
+            return
+        if self.session.get_bind().dialect.name == "postgresql":
+            await self.session.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOCK_KEY}
+            )
+        await self.session.execute(insert(Change), rows)
+
+    async def since(self, cursor: int, limit: int) -> list[Change]:
+        """Up to ``limit`` entries after ``cursor``, oldest first."""
+        result = await self.session.execute(
+            select(Change).where(Change.seq > cursor).order_by(Change.seq).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def latest(self) -> int:
+        """The highest ``seq`` recorded so far, or 0."""
+        result = await self.session.execute(
+            select(func.coalesce(func.max(Change.seq), 0))
+        )
+        return result.scalar_one()
+
+    async def compact(self, limit: int) -> int:
+        """Delete up to ``limit`` entries superseded by a later one.
+
+        A client that has not seen an entry will see the later entry for the
+        same record too, so dropping the earlier one loses nothing: every
+        cursor stays valid. The latest entry of each record, including the
+        tombstone of a deleted one, is kept.
+        """
+        later = aliased(Change)
+        superseded = exists().where(
+            later.entity == Change.entity,
+            later.entity_id == Change.entity_id,
+            later.seq > Change.seq,
+        )
+        batch = select(Change.seq).where(superseded).order_by(Change.seq).limit(limit)
+        result = await self.session.execute(
+            delete(Change)
+            .where(Change.seq.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
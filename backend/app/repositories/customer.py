@@ -1,11 +1,20 @@
 """Customer repository for data access."""
 
-from sqlalchemy import select
+import re
+
+from sqlalchemy import or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.customer import Customer
+from app.models.customer import SEARCH_COLUMNS, Customer
 from app.repositories.base import BaseRepository
 
+# Matches the tokens the FTS5 unicode61 tokenizer produces, so that "a.smith@"
+# is searched as the two prefixes "a" and "smith".
+SEARCH_TOKEN = re.compile(r"\w+")
+
+# LIKE wildcards and the escape character, escaped so terms match literally.
+LIKE_SPECIAL = re.compile(r"[\\%_]")
+
 
 class CustomerRepository(BaseRepository[Customer]):
     """Repository for Customer model operations."""
@@ -19,3 +28,39 @@ class CustomerRepository(BaseRepository[Customer]):
             select(Customer).where(Customer.email == email)
         )
         return result.scalar_one_or_none()
+
+    async def search(self, query: str, limit: int = 20) -> list[Customer]:
+        """Find customers whose searchable fields start with every query term.
+
+        On SQLite this uses the ``customers_fts`` index and orders results by
+        BM25 relevance; other databases fall back to prefix ``LIKE`` matching.
+        """
+        terms = SEARCH_TOKEN.findall(query)
+        if not terms:
+            return []
+
+        if self.session.get_bind().dialect.name == "sqlite":
+            match = " ".join(f'"{term}"*' for term in terms)
+            statement = select(Customer).from_statement(
+                text(
+                    "SELECT customers.* FROM customers_fts "
+                    "JOIN customers ON customers.rowid = customers_fts.rowid "
+                    "WHERE customers_fts MATCH :match "
+                    "ORDER BY customers_fts.rank LIMIT :limit"
+                ).bindparams(match=match, limit=limit)
+            )
+        else:
+            statement = select(Customer).limit(limit).order_by(Customer.last_name)
+            for term in terms:
+                pattern = LIKE_SPECIAL.sub(r"\\\g<0>", term) + "%"
+                statement = statement.where(
+                    or_(
+                        *(
+                            getattr(Customer, column).ilike(pattern, escape="\\")
+                            for column in SEARCH_COLUMNS
+                        )
+                    )
+                )
+
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
@@ -0,0 +1,80 @@
+"""Idempotency key repository for data access."""
+
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.idempotency import IdempotencyRecord
+
+
+class IdempotencyRepository:
+    """Repository for stored responses to idempotent requests."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, key: str, now: datetime) -> IdempotencyRecord | None:
+        """Get the unexpired record of ``key``."""
+        result = await self.session.execute(
+            select(IdempotencyRecord)
+            .where(IdempotencyRecord.key == key, IdempotencyRecord.expires_at > now)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def claim(
+        self, key: str, fingerprint: bytes, expires_at: datetime, now: datetime
+    ) -> bool:
+        """Record that the request with ``key`` is about to run.
+
+        An expired record of the key that was not purged yet is replaced. A
+        concurrent transaction holding the key makes the insert wait until
+        it finishes; returns ``False`` if that transaction stored the key.
+        Also returns ``False`` if SQLite stays locked by another process's
+        write for longer than its busy timeout.
+        """
+        purge = delete(IdempotencyRecord).where(
+            IdempotencyRecord.key == key, IdempotencyRecord.expires_at <= now
+        )
+        statement = insert(IdempotencyRecord).values(
+            key=key, fingerprint=fingerprint, expires_at=expires_at
+        )
+        try:
+            await self.session.execute(purge)
+            if self.session.get_bind().dialect.name == "postgresql":
+                # A failed statement aborts the whole transaction there.
+                async with self.session.begin_nested():
+                    await self.session.execute(statement)
+            else:
+                await self.session.execute(statement)
+        except IntegrityError:
+            return False
+        except OperationalError as exc:
+            if "database is locked" not in str(exc.orig):
+                raise
+            return False
+        return True
+
+    async def complete(self, key: str, status_code: int, body: str) -> None:
+        """Store the response to the request holding ``key``."""
+        await self.session.execute(
+            update(IdempotencyRecord)
+            .where(IdempotencyRecord.key == key)
+            .values(status_code=status_code, body=body)
+        )
+
+    async def purge_expired(self, now: datetime, limit: int) -> int:
+        """Delete up to ``limit`` records that expired before ``now``."""
+        batch = (
+            select(IdempotencyRecord.key)
+            .where(IdempotencyRecord.expires_at <= now)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            delete(IdempotencyRecord)
+            .where(IdempotencyRecord.key.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -0,0 +1,95 @@
+"""Job repository for data access."""
+
+from datetime import datetime
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job, JobStatus
+from app.repositories.base import BaseRepository
+
+
+class JobRepository(BaseRepository[Job]):
+    """Repository for Job model operations."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(Job, session)
+
+    async def get_filtered(
+        self,
+        status: JobStatus | None = None,
+        kind: str | None = None,
+        limit: int = 100,
+    ) -> list[Job]:
+        """Get the most recent jobs with optional filters."""
+        query = select(Job).order_by(Job.created_at.desc()).limit(limit)
+        if status is not None:
+            query = query.where(Job.status == status)
+        if kind is not None:
+            query = query.where(Job.kind == kind)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def claim_next(self, now: datetime, locked_until: datetime) -> Job | None:
+        """Atomically move the oldest due queued job to running.
+
+        The job is leased to the caller until ``locked_until``. The status
+        check in the UPDATE makes concurrent claims of the same row lose; on
+        PostgreSQL ``SKIP LOCKED`` also keeps them from waiting on each
+        other.
+        """
+        due = (
+            select(Job.id)
+            .where(Job.status == JobStatus.QUEUED, Job.run_after <= now)
+            .order_by(Job.run_after, Job.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(Job)
+            .where(Job.id == due, Job.status == JobStatus.QUEUED)
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                started_at=now,
+                locked_until=locked_until,
+            )
+            .returning(Job.id)
+        )
+        job_id = result.scalar_one_or_none()
+        if job_id is None:
+            return None
+        return await self.session.get(Job, job_id, populate_existing=True)
+
+    async def extend_lease(
+        self, job_id: str, attempt: int, locked_until: datetime
+    ) -> bool:
+        """Push back the lease of an attempt; ``False`` once it lost the job."""
+        result = await self.session.execute(
+            update(Job)
+            .where(
+                Job.id == job_id,
+                Job.status == JobStatus.RUNNING,
+                Job.attempts == attempt,
+            )
+            .values(locked_until=locked_until)
+        )
+        return result.rowcount > 0
+
+    async def requeue_expired(self, now: datetime) -> int:
+        """Re-queue running jobs whose lease ran out before ``now``.
+
+        Their worker is gone; jobs still leased may be running in another
+        process and are left alone. Jobs running from before leases existed
+        have none and are re-queued.
+        """
+        result = await self.session.execute(
+            update(Job)
+            .where(
+                Job.status == JobStatus.RUNNING,
+                or_(Job.locked_until.is_(None), Job.locked_until < now),
+            )
+            .values(status=JobStatus.QUEUED, run_after=now, locked_until=None)
+        )
+        return result.rowcount
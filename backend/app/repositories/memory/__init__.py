@@ -0,0 +1,26 @@
+"""In-memory repository backend.
+
+Drop-in replacements for the SQL repositories of cars, customers, bookings,
+daily rollups and the change journal, backed by indexed Python data
+structures. Selected with ``REPOSITORY_BACKEND=memory``; meant for tests and
+capacity simulations.
+"""
+
+from app.repositories.memory.base import InMemoryRepository
+from app.repositories.memory.booking import InMemoryBookingRepository
+from app.repositories.memory.car import InMemoryCarRepository
+from app.repositories.memory.change import InMemoryChangeRepository
+from app.repositories.memory.customer import InMemoryCustomerRepository
+from app.repositories.memory.rollup import InMemoryRollupRepository
+from app.repositories.memory.store import InMemoryStore, memory_store
+
+__all__ = [
+    "InMemoryStore",
+    "memory_store",
+    "InMemoryRepository",
+    "InMemoryCarRepository",
+    "InMemoryCustomerRepository",
+    "InMemoryBookingRepository",
+    "InMemoryRollupRepository",
+    "InMemoryChangeRepository",
+]
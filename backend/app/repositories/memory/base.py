@@ -0,0 +1,88 @@
+"""Base in-memory repository with common CRUD operations."""
+
+import enum
+from collections.abc import Collection
+from functools import cache
+from typing import Generic, TypeVar
+
+from sqlalchemy import Enum
+
+from app.models.base import Base
+from app.repositories.memory.store import MemoryTable, integrity_error
+
+ModelType = TypeVar("ModelType", bound=Base)
+
+
+@cache
+def _column_rules(model: type[Base]) -> list[tuple]:
+    """Per column of ``model``: key, default, enum class and nullability."""
+    return [
+        (
+            column.key,
+            column.default,
+            column.type.enum_class if isinstance(column.type, Enum) else None,
+            column.nullable,
+        )
+        for column in model.__table__.columns
+    ]
+
+
+def prepare_row(obj: Base) -> None:
+    """Do to ``obj`` what a flush and refresh would.
+
+    Fills in column defaults, converts enum values to the model's enum
+    class and rejects missing required values.
+    """
+    for key, default, enum_class, nullable in _column_rules(type(obj)):
+        value = original = getattr(obj, key)
+        if value is None and default is not None:
+            value = default.arg(None) if default.is_callable else default.arg
+        if enum_class is not None and not isinstance(value, enum_class | None):
+            if isinstance(value, enum.Enum):
+                value = enum_class[value.name]
+            else:
+                value = enum_class(value)
+        if value is None and not nullable:
+            raise integrity_error(
+                f"NOT NULL constraint failed: {obj.__tablename__}.{key}"
+            )
+        if value is not original:
+            setattr(obj, key, value)
+
+
+class InMemoryRepository(Generic[ModelType]):
+    """In-memory counterpart of :class:`~app.repositories.base.BaseRepository`."""
+
+    def __init__(self, model: type[ModelType], table: MemoryTable):
+        self.model = model
+        self.table = table
+
+    async def get_by_id(
+        self, id: str, fields: Collection[str] = ()
+    ) -> ModelType | None:
+        """Get a single record by ID; every column is in memory anyway."""
+        return self.table.get(id)
+
+    async def get_all(self, fields: Collection[str] = ()) -> list[ModelType]:
+        """Get all records; every column is in memory anyway."""
+        return list(self.table.rows.values())
+
+    async def count(self) -> int:
+        """Count all records."""
+        return len(self.table.rows)
+
+    async def create(self, obj: ModelType) -> ModelType:
+        """Create a new record."""
+        prepare_row(obj)
+        self.table.insert(obj)
+        return obj
+
+    async def update(self, obj: ModelType) -> ModelType:
+        """Update an existing record."""
+        prepare_row(obj)
+        self.table.reindex(obj)
+        return obj
+
+    async def delete(self, obj: ModelType) -> None:
+        """Delete a record."""
+        self.table.remove(obj)
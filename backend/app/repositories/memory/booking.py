@@ -0,0 +1,284 @@
+"""In-memory booking repository."""
+
+import heapq
+from collections import Counter, defaultdict
+from collections.abc import Callable, Collection
+from datetime import date, datetime
+from operator import attrgetter
+from typing import NamedTuple
+
+from app.models.archive import ArchivedBooking
+from app.models.booking import (
+    FINISHED_STATUSES,
+    OPEN_STATUSES,
+    VOID_STATUSES,
+    Booking,
+    BookingStatus,
+)
+from app.repositories.memory.base import InMemoryRepository
+from app.repositories.memory.store import InMemoryStore, MemoryTable
+
+# Store tables holding the records each relationship refers to.
+RELATED_TABLES = {"car": "cars", "customer": "customers"}
+
+
+class CustomerTotal(NamedTuple):
+    status: BookingStatus
+    bookings: int
+    spend: float
+    last_start: date
+
+
+class InMemoryBookingRepository(InMemoryRepository[Booking]):
+    """In-memory counterpart of :class:`~app.repositories.booking.BookingRepository`.
+
+    Bookings are indexed by car, customer and status, so overlap checks only
+    look at the bookings of one car. Archived bookings live in a second table
+    indexed the same way.
+    """
+
+    def __init__(self, store: InMemoryStore):
+        super().__init__(Booking, store.bookings)
+        self.store = store
+
+    def _tables(self, archived: bool) -> tuple[MemoryTable, ...]:
+        """The tables a read looks in, live bookings first."""
+        if archived:
+            return (self.table, self.store.archived_bookings)
+        return (self.table,)
+
+    def _load(self, bookings: list, include: Collection[str]) -> None:
+        """Attach the requested related records."""
+        for name in include:
+            table = getattr(self.store, RELATED_TABLES[name])
+            for booking in bookings:
+                setattr(booking, name, table.get(getattr(booking, f"{name}_id")))
+
+    async def get_by_id(
+        self,
+        id: str,
+        include: Collection[str] = (),
+        fields: Collection[str] = (),
+        archived: bool = False,
+    ) -> Booking | ArchivedBooking | None:
+        """Get a booking by ID with the requested relationships."""
+        for table in self._tables(archived):
+            booking = table.get(id)
+            if booking is not None:
+                self._load([booking], include)
+                return booking
+        return None
+
+    async def get_by_car_id(self, car_id: str) -> list[Booking]:
+        """Get all bookings for a specific car."""
+        return self.table.lookup("car_id", car_id)
+
+    async def get_by_customer_id(self, customer_id: str) -> list[Booking]:
+        """Get all bookings for a specific customer."""
+        return self.table.lookup("customer_id", customer_id)
+
+    async def get_overlapping_bookings(
+        self,
+        car_id: str,
+        start_date: date,
+        end_date: date,
+        exclude_booking_id: str | None = None,
+    ) -> list[Booking]:
+        """Get bookings that overlap with the given date range for a car.
+
+        Both ends are inclusive, as in the SQL repository.
+        """
+        return [
+            booking
+            for booking in self.table.lookup("car_id", car_id)
+            if booking.status in OPEN_STATUSES
+            and booking.start_date <= end_date
+            and booking.end_date >= start_date
+            and booking.id != exclude_booking_id
+        ]
+
+    async def expire_no_shows(self, started_before: date, limit: int) -> list:
+        """Expire up to ``limit`` reservations never picked up before their start.
+
+        Returns the expired bookings.
+        """
+        return self._transition(
+            BookingStatus.RESERVED,
+            BookingStatus.EXPIRED,
+            lambda booking: booking.start_date < started_before,
+            limit,
+        )
+
+    async def mark_overdue(self, ended_before: date, limit: int) -> list:
+        """Flag up to ``limit`` active rentals due back before ``ended_before``."""
+        return self._transition(
+            BookingStatus.ACTIVE,
+            BookingStatus.OVERDUE,
+            lambda booking: booking.end_date < ended_before,
+            limit,
+        )
+
+    def _transition(
+        self,
+        current: BookingStatus,
+        new: BookingStatus,
+        condition: Callable[[Booking], bool],
+        limit: int,
+    ) -> list[Booking]:
+        """Move up to ``limit`` bookings matching ``condition`` to ``new``."""
+        moved = []
+        for booking in self.table.lookup("status", current):
+            if len(moved) == limit:
+                break
+            if condition(booking):
+                moved.append(booking)
+        for booking in moved:
+            booking.status = new
+            self.table.reindex(booking)
+        return moved
+
+    async def get_filtered(
+        self,
+        status: BookingStatus | None = None,
+        car_id: str | None = None,
+        customer_id: str | None = None,
+        include: Collection[str] = (),
+        fields: Collection[str] = (),
+        archived: bool = False,
+    ) -> list[Booking | ArchivedBooking]:
+        """Get bookings with optional filters and related records.
+
+        Candidates come from the most selective index among the filters.
+        ``fields`` is accepted for parity; every column is in memory anyway.
+        """
+        filters = {
+            column: value
+            for column, value in (
+                ("car_id", car_id),
+                ("customer_id", customer_id),
+                ("status", status),
+            )
+            if value is not None
+        }
+        bookings = []
+        for table in self._tables(archived):
+            if filters:
+                column = min(filters, key=lambda c: table.count(c, filters[c]))
+                bookings.extend(
+                    booking
+                    for booking in table.lookup(column, filters[column])
+                    if all(getattr(booking, c) == v for c, v in filters.items())
+                )
+            else:
+                bookings.extend(table.rows.values())
+        self._load(bookings, include)
+        return bookings
+
+    async def get_customer_history(
+        self,
+        customer_id: str,
+        limit: int,
+        before: tuple[date, str] | None = None,
+        include: Collection[str] = (),
+        archived: bool = False,
+    ) -> list[Booking | ArchivedBooking]:
+        """Up to ``limit`` bookings of a customer, latest start date first.
+
+        ``before`` is the ``(start_date, id)`` the previous page ended at.
+        """
+        bookings = [
+            booking
+            for table in self._tables(archived)
+            for booking in table.lookup("customer_id", customer_id)
+            if before is None or (booking.start_date, booking.id) < before
+        ]
+        bookings = heapq.nlargest(
+            limit, bookings, key=attrgetter("start_date", "id")
+        )
+        self._load(bookings, include)
+        return bookings
+
+    async def customer_totals(self, customer_id: str, archived: bool = False) -> list:
+        """Count, summed cost and latest start of a customer's bookings by status."""
+        counts: Counter = Counter()
+        spend: defaultdict[BookingStatus, float] = defaultdict(float)
+        last_start: dict[BookingStatus, date] = {}
+        for table in self._tables(archived):
+            for booking in table.lookup("customer_id", customer_id):
+                status = booking.status
+                counts[status] += 1
+                spend[status] += float(booking.total_cost)
+                last_start[status] = max(
+                    last_start.get(status, booking.start_date), booking.start_date
+                )
+        return [
+            CustomerTotal(status, count, spend[status], last_start[status])
+            for status, count in counts.items()
+        ]
+
+    async def count_filtered(
+        self,
+        status: BookingStatus | None = None,
+        car_id: str | None = None,
+        customer_id: str | None = None,
+        archived: bool = False,
+    ) -> int:
+        """Count the bookings :meth:`get_filtered` would return."""
+        bookings = await self.get_filtered(
+            status=status, car_id=car_id, customer_id=customer_id, archived=archived
+        )
+        return len(bookings)
+
+    async def archive_finished(
+        self, ended_before: date, limit: int, now: datetime
+    ) -> int:
+        """Move up to ``limit`` bookings finished before ``ended_before``.
+
+        Returns how many were moved to the archive table.
+        """
+        moved = []
+        for status in FINISHED_STATUSES:
+            for booking in self.table.lookup("status", status):
+                if len(moved) == limit:
+                    break
+                if booking.end_date < ended_before and (
+                    booking.actual_return_date is None
+                    or booking.actual_return_date < ended_before
+                ):
+                    moved.append(booking)
+        columns = [column.key for column in Booking.__table__.columns]
+        for booking in moved:
+            self.table.remove(booking)
+            self.store.archived_bookings.insert(
+                ArchivedBooking(
+                    **{key: getattr(booking, key) for key in columns},
+                    archived_at=now,
+                )
+            )
+        return len(moved)
+
+    async def count_by_status(self) -> dict[BookingStatus, int]:
+        """Number of bookings in each status, including empty ones."""
+        return {
+            status: self.table.count("status", status) for status in BookingStatus
+        }
+
+    async def count_scheduled(self, day: date) -> tuple[int, int]:
+        """Bookings starting and ending on ``day``, except void ones."""
+        pickups = returns = 0
+        for booking in self.table.rows.values():
+            if booking.status in VOID_STATUSES:
+                continue
+            pickups += booking.start_date == day
+            returns += booking.end_date == day
+        return pickups, returns
+
+    async def get_recent(
+        self, limit: int, include: Collection[str] = ()
+    ) -> list[Booking]:
+        """The ``limit`` most recently created bookings, newest first."""
+        bookings = heapq.nlargest(
+            limit, self.table.rows.values(), key=attrgetter("created_at")
+        )
+        self._load(bookings, include)
+        return bookings
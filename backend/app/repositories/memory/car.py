@@ -0,0 +1,139 @@
+"""In-memory car repository."""
+
+from collections.abc import Collection
+from operator import attrgetter
+
+from app.models.booking import BookingStatus
+from app.models.car import Car, CarCategory, CarStatus
+from app.repositories.car import ASCII_LOWER
+from app.repositories.memory.base import InMemoryRepository
+from app.repositories.memory.store import InMemoryStore, integrity_error
+from app.schemas.car import CarSort
+
+SORT_KEYS = {
+    CarSort.DAILY_RATE: (attrgetter("daily_rate"), False),
+    CarSort.DAILY_RATE_DESC: (attrgetter("daily_rate"), True),
+    CarSort.YEAR: (attrgetter("year"), False),
+    CarSort.YEAR_DESC: (attrgetter("year"), True),
+}
+
+
+def _has_prefix(value: str, prefix: str) -> bool:
+    """Case-insensitive prefix test folding ASCII only, like SQLite's lower()."""
+    return value.translate(ASCII_LOWER).startswith(prefix.translate(ASCII_LOWER))
+
+
+class InMemoryCarRepository(InMemoryRepository[Car]):
+    """In-memory counterpart of :class:`~app.repositories.car.CarRepository`."""
+
+    def __init__(self, store: InMemoryStore):
+        super().__init__(Car, store.cars)
+        self.store = store
+
+    async def get_by_license_plate(self, license_plate: str) -> Car | None:
+        """Get a car by its license plate."""
+        found = self.table.lookup("license_plate", license_plate)
+        return found[0] if found else None
+
+    async def get_by_ids(self, ids: list[str]) -> list[Car]:
+        """Get the cars among ``ids`` that exist, in no particular order."""
+        cars = (self.table.get(id) for id in dict.fromkeys(ids))
+        return [car for car in cars if car is not None]
+
+    async def delete(self, obj: Car) -> None:
+        """Delete a car that no booking refers to."""
+        if self.store.bookings.count("car_id", obj.id):
+            raise integrity_error("NOT NULL constraint failed: bookings.car_id")
+        await super().delete(obj)
+
+    async def release_unrented(self, limit: int) -> list:
+        """Mark up to ``limit`` rented cars without an open rental as available.
+
+        Returns the released cars.
+        """
+        renting = {
+            booking.car_id
+            for status in (BookingStatus.ACTIVE, BookingStatus.OVERDUE)
+            for booking in self.store.bookings.lookup("status", status)
+        }
+        released = [
+            car
+            for car in self.table.lookup("status", CarStatus.RENTED)
+            if car.id not in renting
+        ][:limit]
+        for car in released:
+            car.status = CarStatus.AVAILABLE
+            self.table.reindex(car)
+        return released
+
+    async def get_filtered(
+        self,
+        status: CarStatus | None = None,
+        category: CarCategory | None = None,
+        make: str | None = None,
+        model: str | None = None,
+        min_year: int | None = None,
+        max_year: int | None = None,
+        min_rate: float | None = None,
+        max_rate: float | None = None,
+        sort: CarSort | None = None,
+        fields: Collection[str] = (),
+    ) -> list[Car]:
+        """Get cars with optional filters and ordering.
+
+        ``make`` and ``model`` are case-insensitive prefixes; year and rate
+        bounds are inclusive. ``fields`` is accepted for parity; every column
+        is in memory anyway.
+        """
+        if status is not None:
+            cars = self.table.lookup("status", status)
+        else:
+            cars = list(self.table.rows.values())
+
+        if category is not None:
+            cars = [car for car in cars if car.category == category]
+        if make:
+            cars = [car for car in cars if _has_prefix(car.make, make)]
+        if model:
+            cars = [car for car in cars if _has_prefix(car.model, model)]
+        if min_year is not None:
+            cars = [car for car in cars if car.year >= min_year]
+        if max_year is not None:
+            cars = [car for car in cars if car.year <= max_year]
+        if min_rate is not None:
+            cars = [car for car in cars if car.daily_rate >= min_rate]
+        if max_rate is not None:
+            cars = [car for car in cars if car.daily_rate <= max_rate]
+        if sort is not None:
+            key, reverse = SORT_KEYS[sort]
+            cars.sort(key=key, reverse=reverse)
+
+        return cars
+
+    async def count_filtered(
+        self,
+        status: CarStatus | None = None,
+        category: CarCategory | None = None,
+        make: str | None = None,
+        model: str | None = None,
+        min_year: int | None = None,
+        max_year: int | None = None,
+        min_rate: float | None = None,
+        max_rate: float | None = None,
+    ) -> int:
+        """Count the cars :meth:`get_filtered` would return."""
+        cars = await self.get_filtered(
+            status=status,
+            category=category,
+            make=make,
+            model=model,
+            min_year=min_year,
+            max_year=max_year,
+            min_rate=min_rate,
+            max_rate=max_rate,
+        )
+        return len(cars)
+
+    async def count_by_status(self) -> dict[CarStatus, int]:
+        """Number of cars in each status, including empty ones."""
+        return {status: self.table.count("status", status) for status in CarStatus}
@@ -0,0 +1,48 @@
+"""In-memory change journal repository."""
+
+from collections.abc import Iterable
+from datetime import datetime
+from itertools import islice
+
+from app.models.change import Change, ChangeEntity
+from app.repositories.memory.store import InMemoryStore
+
+
+class InMemoryChangeRepository:
+    """In-memory counterpart of :class:`~app.repositories.change.ChangeRepository`.
+
+    Superseded entries are dropped as soon as a later one is recorded, so
+    there is never anything left to compact.
+    """
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def record(
+        self, entity: ChangeEntity, ids: Iterable[str], deleted: bool = False
+    ) -> None:
+        """Append one entry per record of ``entity`` in ``ids``."""
+        now = datetime.utcnow()
+        for id in ids:
+            self.store.last_seq += 1
+            seq = self.store.last_seq
+            previous = self.store.latest_changes.get((entity, id))
+            if previous is not None:
+                del self.store.changes[previous]
+            self.store.latest_changes[entity, id] = seq
+            self.store.changes[seq] = Change(
+                seq=seq, entity=entity, entity_id=id, deleted=deleted, changed_at=now
+            )
+
+    async def since(self, cursor: int, limit: int) -> list[Change]:
+        """Up to ``limit`` entries after ``cursor``, oldest first."""
+        changes = self.store.changes.values()
+        return list(islice((c for c in changes if c.seq > cursor), limit))
+
+    async def latest(self) -> int:
+        """The highest ``seq`` recorded so far, or 0."""
+        return self.store.last_seq
+
+    async def compact(self, limit: int) -> int:
+        """Nothing to do: entries are compacted as they are recorded."""
+        return 0
@@ -0,0 +1,69 @@
+"""In-memory customer repository."""
+
+from app.models.customer import SEARCH_COLUMNS, Customer
+from app.repositories.customer import SEARCH_TOKEN
+from app.repositories.memory.base import InMemoryRepository
+from app.repositories.memory.store import InMemoryStore, integrity_error
+
+
+def _tokens(customer: Customer) -> set[str]:
+    """Lower-cased search tokens of a customer's searchable fields."""
+    return {
+        token
+        for column in SEARCH_COLUMNS
+        for token in SEARCH_TOKEN.findall(getattr(customer, column).lower())
+    }
+
+
+class InMemoryCustomerRepository(InMemoryRepository[Customer]):
+    """In-memory counterpart of :class:`~app.repositories.customer.CustomerRepository`.
+
+    Search goes through a token prefix index, like the SQLite full-text index.
+    """
+
+    def __init__(self, store: InMemoryStore):
+        super().__init__(Customer, store.customers)
+        self.store = store
+
+    async def get_by_email(self, email: str) -> Customer | None:
+        """Get a customer by their email address."""
+        found = self.table.lookup("email", email)
+        return found[0] if found else None
+
+    async def create(self, obj: Customer) -> Customer:
+        """Create a new customer."""
+        customer = await super().create(obj)
+        self.store.customer_search.add(customer.id, _tokens(customer))
+        return customer
+
+    async def update(self, obj: Customer) -> Customer:
+        """Update an existing customer."""
+        customer = await super().update(obj)
+        self.store.customer_search.remove(customer.id)
+        self.store.customer_search.add(customer.id, _tokens(customer))
+        return customer
+
+    async def delete(self, obj: Customer) -> None:
+        """Delete a customer no booking refers to."""
+        if self.store.bookings.count("customer_id", obj.id):
+            raise integrity_error("NOT NULL constraint failed: bookings.customer_id")
+        await super().delete(obj)
+        self.store.customer_search.remove(obj.id)
+
+    async def search(self, query: str, limit: int = 20) -> list[Customer]:
+        """Find customers whose searchable fields start with every query term.
+
+        Results are ordered by last name.
+        """
+        terms = SEARCH_TOKEN.findall(query.lower())
+        if not terms:
+            return []
+
+        ids = self.store.customer_search.starting_with(terms[0])
+        for term in terms[1:]:
+            ids &= self.store.customer_search.starting_with(term)
+        customers = sorted(
+            (self.table.rows[id] for id in ids),
+            key=lambda customer: (customer.last_name, customer.id),
+        )
+        return customers[:limit]
@@ -0,0 +1,170 @@
+"""In-memory daily rollup repository."""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+from itertools import chain
+from typing import NamedTuple
+
+from app.models.booking import VOID_STATUSES, Booking
+from app.models.car import CarCategory
+from app.repositories.memory.store import InMemoryStore
+from app.repositories.rollup import SUMMED_COLUMNS, contributions
+
+
+class CategoryRevenue(NamedTuple):
+    day: date
+    category: CarCategory | None
+    revenue: float
+    booked_days: int
+    rentals: int
+
+
+class CarUtilization(NamedTuple):
+    car_id: str
+    make: str
+    model: str
+    license_plate: str
+    category: CarCategory
+    booked_days: int
+    revenue: float
+
+
+class RentalLength(NamedTuple):
+    category: CarCategory | None
+    rentals: int
+    rental_days: int
+
+
+def _category_order(category: CarCategory | None) -> tuple[bool, str]:
+    """Sort key matching SQL ordering of the stored names, NULL first."""
+    return (category is not None, category.name if category else "")
+
+
+class InMemoryRollupRepository:
+    """In-memory counterpart of :class:`~app.repositories.rollup.RollupRepository`."""
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def record(
+        self, booking: Booking, category: CarCategory | None, sign: int = 1
+    ) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) a booking's contribution."""
+        self._apply(
+            contributions(
+                booking.car_id,
+                booking.start_date,
+                booking.rental_end,
+                booking.total_cost,
+                category,
+                sign,
+            )
+        )
+
+    async def retract(self, bookings: Iterable) -> None:
+        """Remove the contributions of many open bookings at once."""
+        for booking in bookings:
+            self._apply(
+                contributions(
+                    booking.car_id,
+                    booking.start_date,
+                    booking.end_date,
+                    booking.total_cost,
+                    None,
+                    -1,
+                )
+            )
+
+    def _apply(self, rows: list[dict]) -> None:
+        """Add ``rows`` to the rollups, dropping days no booking covers."""
+        rollups = self.store.rollups
+        for row in rows:
+            key = (row["day"], row["car_id"])
+            current = rollups.get(key)
+            if current is None:
+                current = rollups[key] = dict(row)
+            else:
+                if row["category"] is not None:
+                    current["category"] = row["category"]
+                for column in SUMMED_COLUMNS:
+                    current[column] += row[column]
+                current["revenue"] = round(current["revenue"], 2)
+            if current["booked_days"] == 0:
+                del rollups[key]
+
+    async def rebuild(self) -> None:
+        """Recompute all rollups from the live and archived bookings."""
+        self.store.rollups.clear()
+        for booking in chain(
+            self.store.bookings.rows.values(),
+            self.store.archived_bookings.rows.values(),
+        ):
+            if booking.status in VOID_STATUSES:
+                continue
+            car = self.store.cars.get(booking.car_id)
+            await self.record(booking, car.category if car else None)
+
+    def _between(self, start: date, end: date) -> Iterable[dict]:
+        rows = self.store.rollups.values()
+        return (row for row in rows if start <= row["day"] <= end)
+
+    async def revenue_by_category(self, start: date, end: date) -> list:
+        """Revenue, booked days and rentals per day and car category."""
+        totals: defaultdict[tuple, list] = defaultdict(lambda: [0.0, 0, 0])
+        for row in self._between(start, end):
+            total = totals[row["day"], row["category"]]
+            total[0] += row["revenue"]
+            total[1] += row["booked_days"]
+            total[2] += row["rentals"]
+        return [
+            CategoryRevenue(day, category, round(revenue, 2), booked_days, rentals)
+            for (day, category), (revenue, booked_days, rentals) in sorted(
+                totals.items(),
+                key=lambda item: (item[0][0], _category_order(item[0][1])),
+            )
+        ]
+
+    async def total_revenue(self, start: date, end: date) -> float:
+        """Revenue of all cars over an inclusive date range."""
+        return round(sum(row["revenue"] for row in self._between(start, end)), 2)
+
+    async def utilization_by_car(
+        self, start: date, end: date, category: CarCategory | None = None
+    ) -> list:
+        """Booked days per car over the period, including idle cars."""
+        booked: defaultdict[str, list] = defaultdict(lambda: [0, 0.0])
+        for row in self._between(start, end):
+            total = booked[row["car_id"]]
+            total[0] += row["booked_days"]
+            total[1] += row["revenue"]
+        rows = [
+            CarUtilization(
+                car.id,
+                car.make,
+                car.model,
+                car.license_plate,
+                car.category,
+                booked[car.id][0] if car.id in booked else 0,
+                round(booked[car.id][1], 2) if car.id in booked else 0,
+            )
+            for car in self.store.cars.rows.values()
+            if category is None or car.category == category
+        ]
+        rows.sort(key=lambda row: (-row.booked_days, row.car_id))
+        return rows
+
+    async def rental_length_by_category(self, start: date, end: date) -> list:
+        """Rentals started in the period and their total length per category."""
+        totals: defaultdict[CarCategory | None, list] = defaultdict(lambda: [0, 0])
+        for row in self._between(start, end):
+            if row["rentals"] > 0:
+                total = totals[row["category"]]
+                total[0] += row["rentals"]
+                total[1] += row["rental_days"]
+        return [
+            RentalLength(category, rentals, rental_days)
+            for category, (rentals, rental_days) in sorted(
+                totals.items(), key=lambda item: _category_order(item[0])
+            )
+        ]
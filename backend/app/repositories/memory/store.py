@@ -0,0 +1,203 @@
+"""Indexed in-memory tables shared by the in-memory repositories."""
+
+import bisect
+from collections import defaultdict
+from datetime import date
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+
+from app.models.base import Base
+from app.models.change import Change, ChangeEntity
+
+
+class ConstraintViolation(Exception):
+    """Driver-level error wrapped in the ``IntegrityError`` the store raises."""
+
+
+def integrity_error(message: str) -> IntegrityError:
+    """Build the ``IntegrityError`` a database would raise for ``message``."""
+    return IntegrityError(None, None, ConstraintViolation(message))
+
+
+class MemoryTable:
+    """Rows of one model keyed by ID, with unique and secondary hash indexes.
+
+    Index entries are ``{value: {id: None}}`` so that lookups keep insertion
+    order. Rows are the model instances themselves; callers change them in
+    place and call :meth:`reindex` afterwards, like a flush.
+    """
+
+    def __init__(
+        self, name: str, unique: tuple[str, ...] = (), indexed: tuple[str, ...] = ()
+    ):
+        self.name = name
+        self.rows: dict[str, Base] = {}
+        self.unique: dict[str, dict[Any, str]] = {column: {} for column in unique}
+        self.indexes: dict[str, defaultdict[Any, dict[str, None]]] = {
+            column: defaultdict(dict) for column in indexed
+        }
+        # Values each row was last indexed under.
+        self._keys: dict[str, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, id: str) -> Base | None:
+        return self.rows.get(id)
+
+    def lookup(self, column: str, value: Any) -> list:
+        """Rows whose indexed ``column`` equals ``value``, oldest first."""
+        if column in self.unique:
+            id = self.unique[column].get(value)
+            return [] if id is None else [self.rows[id]]
+        return [self.rows[id] for id in self.indexes[column].get(value, ())]
+
+    def count(self, column: str, value: Any) -> int:
+        """Number of rows whose indexed ``column`` equals ``value``."""
+        return len(self.indexes[column].get(value, ()))
+
+    def insert(self, obj: Base) -> None:
+        if obj.id in self.rows:
+            raise integrity_error(f"UNIQUE constraint failed: {self.name}.id")
+        keys = self._row_keys(obj)
+        self._check_unique(obj.id, keys)
+        self.rows[obj.id] = obj
+        self._add(obj.id, keys)
+
+    def reindex(self, obj: Base) -> None:
+        old = self._keys[obj.id]
+        new = self._row_keys(obj)
+        if new == old:
+            return
+        self._check_unique(obj.id, new)
+        self._discard(obj.id, old)
+        self._add(obj.id, new)
+
+    def remove(self, obj: Base) -> None:
+        self._discard(obj.id, self._keys.pop(obj.id))
+        del self.rows[obj.id]
+
+    def clear(self) -> None:
+        self.rows.clear()
+        self._keys.clear()
+        for index in (*self.unique.values(), *self.indexes.values()):
+            index.clear()
+
+    def _row_keys(self, obj: Base) -> dict[str, Any]:
+        columns = (*self.unique, *self.indexes)
+        return {column: getattr(obj, column) for column in columns}
+
+    def _check_unique(self, id: str, keys: dict[str, Any]) -> None:
+        for column, index in self.unique.items():
+            owner = index.get(keys[column])
+            if owner is not None and owner != id:
+                raise integrity_error(
+                    f"UNIQUE constraint failed: {self.name}.{column}"
+                )
+
+    def _add(self, id: str, keys: dict[str, Any]) -> None:
+        self._keys[id] = keys
+        for column, index in self.unique.items():
+            index[keys[column]] = id
+        for column, index in self.indexes.items():
+            index[keys[column]][id] = None
+
+    def _discard(self, id: str, keys: dict[str, Any]) -> None:
+        for column, index in self.unique.items():
+            if index.get(keys[column]) == id:
+                del index[keys[column]]
+        for column, index in self.indexes.items():
+            ids = index[keys[column]]
+            ids.pop(id, None)
+            if not ids:
+                del index[keys[column]]
+
+
+class PrefixIndex:
+    """Token index answering "which rows have a token starting with ...".
+
+    Tokens are kept in a sorted list, so a prefix lookup is a binary search
+    followed by a scan of the matching tokens only.
+    """
+
+    def __init__(self):
+        self._ids: dict[str, set[str]] = {}
+        self._tokens: list[str] = []
+        self._row_tokens: dict[str, set[str]] = {}
+
+    def add(self, id: str, tokens: set[str]) -> None:
+        self._row_tokens[id] = tokens
+        for token in tokens:
+            ids = self._ids.get(token)
+            if ids is None:
+                ids = self._ids[token] = set()
+                bisect.insort(self._tokens, token)
+            ids.add(id)
+
+    def remove(self, id: str) -> None:
+        for token in self._row_tokens.pop(id, ()):
+            ids = self._ids[token]
+            ids.discard(id)
+            if not ids:
+                del self._ids[token]
+                del self._tokens[bisect.bisect_left(self._tokens, token)]
+
+    def starting_with(self, prefix: str) -> set[str]:
+        """IDs of rows with at least one token starting with ``prefix``."""
+        found: set[str] = set()
+        tokens = self._tokens
+        position = bisect.bisect_left(tokens, prefix)
+        while position < len(tokens) and tokens[position].startswith(prefix):
+            found |= self._ids[tokens[position]]
+            position += 1
+        return found
+
+    def clear(self) -> None:
+        self._ids.clear()
+        self._tokens.clear()
+        self._row_tokens.clear()
+
+
+class InMemoryStore:
+    """All data of the in-memory backend.
+
+    There are no transactions: every repository call takes effect
+    immediately and is not undone when a request fails later on.
+    """
+
+    def __init__(self):
+        self.cars = MemoryTable("cars", unique=("license_plate",), indexed=("status",))
+        self.customers = MemoryTable("customers", unique=("email",))
+        self.bookings = MemoryTable(
+            "bookings", indexed=("car_id", "customer_id", "status")
+        )
+        self.archived_bookings = MemoryTable(
+            "bookings_archive", indexed=("car_id", "customer_id", "status")
+        )
+        self.customer_search = PrefixIndex()
+        # Daily rollup rows keyed by (day, car_id), as in ``daily_rollups``.
+        self.rollups: dict[tuple[date, str], dict] = {}
+        # The change journal in ``seq`` order, and the latest ``seq`` of each
+        # (entity, id) pair.
+        self.changes: dict[int, Change] = {}
+        self.latest_changes: dict[tuple[ChangeEntity, str], int] = {}
+        self.last_seq = 0
+
+    def clear(self) -> None:
+        """Remove all data."""
+        for table in (
+            self.cars,
+            self.customers,
+            self.bookings,
+            self.archived_bookings,
+        ):
+            table.clear()
+        self.customer_search.clear()
+        self.rollups.clear()
+        self.changes.clear()
+        self.latest_changes.clear()
+        self.last_seq = 0
+
+
+memory_store = InMemoryStore()
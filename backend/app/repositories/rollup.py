@@ -0,0 +1,297 @@
+"""Daily rollup repository for data access."""
+
+from collections.abc import Iterable
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import bindparam, delete, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.booking import Booking, BookingStatus
+from app.models.car import Car, CarCategory
+from app.models.rollup import DailyRollup
+
+SUMMED_COLUMNS = ("booked_days", "revenue", "rentals", "rental_days")
+
+# Rollups are maintained with native upserts, available on these dialects.
+_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+# Live and archived bookings, with the columns the rebuild reads.
+_ALL_BOOKINGS = """(
+        SELECT car_id, start_date, end_date, actual_return_date, total_cost, status
+        FROM bookings
+        UNION ALL
+        SELECT car_id, start_date, end_date, actual_return_date, total_cost, status
+        FROM bookings_archive
+    )"""
+
+# Expands every booking except cancelled and expired ones into one row per
+# covered day by joining it against a table of day offsets, then aggregates
+# them per (day, car).
+# Days are handled as Julian day numbers and only formatted once per group.
+# Revenue is split in whole cents, the remainder going to the first day,
+# exactly like record().
+_REBUILD_SQL = f"""
+INSERT INTO daily_rollups
+    (day, car_id, category, booked_days, revenue, rentals, rental_days)
+WITH RECURSIVE effective AS MATERIALIZED (
+    SELECT b.car_id, c.category,
+           CAST(julianday(b.start_date) AS INTEGER) AS first_day,
+           CAST(julianday(
+               CASE WHEN b.status = :completed AND b.actual_return_date IS NOT NULL
+                    THEN max(b.actual_return_date, date(b.start_date, '+1 day'))
+                    ELSE b.end_date END
+           ) - julianday(b.start_date) AS INTEGER) AS days,
+           CAST(round(b.total_cost * 100) AS INTEGER) AS cents
+    FROM {_ALL_BOOKINGS} b LEFT JOIN cars c ON c.id = b.car_id
+    WHERE b.status NOT IN (:cancelled, :expired) AND b.end_date > b.start_date
+),
+offsets(n) AS MATERIALIZED (
+    SELECT 0
+    UNION ALL
+    SELECT n + 1 FROM offsets WHERE n + 1 < (SELECT max(days) FROM effective)
+)
+SELECT date(day + 0.5), car_id, category, booked_days, revenue, rentals, rental_days
+FROM (
+    SELECT e.first_day + o.n AS day, e.car_id, max(e.category) AS category,
+           count(*) AS booked_days,
+           sum(e.cents / e.days
+               + CASE WHEN o.n = 0 THEN e.cents % e.days ELSE 0 END) / 100.0
+               AS revenue,
+           sum(o.n = 0) AS rentals,
+           sum(CASE WHEN o.n = 0 THEN e.days ELSE 0 END) AS rental_days
+    FROM effective e JOIN offsets o ON o.n < e.days
+    GROUP BY day, e.car_id
+)
+"""
+
+_REBUILD_SQL_POSTGRESQL = f"""
+INSERT INTO daily_rollups
+    (day, car_id, category, booked_days, revenue, rentals, rental_days)
+SELECT e.start_date + o.n, e.car_id, max(e.category), count(*),
+       sum(e.cents / e.days
+           + CASE WHEN o.n = 0 THEN e.cents % e.days ELSE 0 END) / 100.0,
+       count(*) FILTER (WHERE o.n = 0),
+       sum(CASE WHEN o.n = 0 THEN e.days ELSE 0 END)
+FROM (
+    SELECT b.car_id, c.category, b.start_date,
+           CASE WHEN b.status = :completed AND b.actual_return_date IS NOT NULL
+                THEN greatest(b.actual_return_date, b.start_date + 1)
+                ELSE b.end_date END - b.start_date AS days,
+           CAST(round(b.total_cost * 100) AS BIGINT) AS cents
+    FROM {_ALL_BOOKINGS} b LEFT JOIN cars c ON c.id = b.car_id
+    WHERE b.status NOT IN (:cancelled, :expired) AND b.end_date > b.start_date
+) e
+CROSS JOIN LATERAL generate_series(0, e.days - 1) AS o(n)
+GROUP BY e.start_date + o.n, e.car_id
+"""
+
+_REBUILD_STATEMENTS = {"sqlite": _REBUILD_SQL, "postgresql": _REBUILD_SQL_POSTGRESQL}
+
+
+# Rows per upsert statement, well below SQLite's bound parameter limit.
+_UPSERT_CHUNK = 1000
+
+
+def contributions(
+    car_id: str,
+    start: date,
+    end: date,
+    total_cost: float | Decimal,
+    category: CarCategory | None,
+    sign: int,
+) -> list[dict]:
+    """Rollup rows of one booking covering ``start`` up to ``end``."""
+    days = (end - start).days
+    if days <= 0:
+        return []
+    cents, remainder = divmod(round(float(total_cost) * 100), days)
+    return [
+        {
+            "day": start + timedelta(days=offset),
+            "car_id": car_id,
+            "category": category,
+            "booked_days": sign,
+            "revenue": sign * (cents + (remainder if offset == 0 else 0)) / 100,
+            "rentals": sign if offset == 0 else 0,
+            "rental_days": sign * days if offset == 0 else 0,
+        }
+        for offset in range(days)
+    ]
+
+
+class RollupRepository:
+    """Repository for maintaining and querying daily rollups."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record(
+        self, booking: Booking, category: CarCategory | None, sign: int = 1
+    ) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) a booking's contribution.
+
+        The booking covers the days from ``start_date`` up to, but excluding,
+        :attr:`Booking.rental_end`.
+        """
+        rows = contributions(
+            booking.car_id,
+            booking.start_date,
+            booking.rental_end,
+            booking.total_cost,
+            category,
+            sign,
+        )
+        await self._apply(rows, sign)
+
+    async def retract(self, bookings: Iterable) -> None:
+        """Remove the contributions of many open bookings at once.
+
+        Each of ``bookings`` needs a ``car_id``, ``start_date``, ``end_date``
+        and ``total_cost``; rows returned by a bulk status ``UPDATE`` will do.
+        Contributions to the same car and day are merged before writing.
+        """
+        merged: dict[tuple[date, str], dict] = {}
+        for booking in bookings:
+            for row in contributions(
+                booking.car_id,
+                booking.start_date,
+                booking.end_date,
+                booking.total_cost,
+                None,
+                -1,
+            ):
+                key = (row["day"], row["car_id"])
+                if key in merged:
+                    for column in SUMMED_COLUMNS:
+                        merged[key][column] += row[column]
+                else:
+                    merged[key] = row
+        rows = list(merged.values())
+        for offset in range(0, len(rows), _UPSERT_CHUNK):
+            await self._apply(rows[offset : offset + _UPSERT_CHUNK], -1)
+
+    async def _apply(self, rows: list[dict], sign: int) -> None:
+        """Add ``rows`` to the rollups, creating missing (day, car) rows."""
+        if not rows:
+            return
+        statement = self._dialect_option(_INSERTS)(DailyRollup).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[DailyRollup.day, DailyRollup.car_id],
+            set_={
+                "category": func.coalesce(
+                    statement.excluded.category, DailyRollup.category
+                ),
+                **{
+                    column: getattr(DailyRollup, column)
+                    + getattr(statement.excluded, column)
+                    for column in SUMMED_COLUMNS
+                },
+            },
+        )
+        await self.session.execute(statement)
+
+        if sign < 0:
+            # Drop days no booking covers any more so reports do not list them.
+            days = [row["day"] for row in rows]
+            await self.session.execute(
+                delete(DailyRollup).where(
+                    DailyRollup.car_id.in_({row["car_id"] for row in rows}),
+                    DailyRollup.day.between(min(days), max(days)),
+                    DailyRollup.booked_days == 0,
+                )
+            )
+
+    async def rebuild(self) -> None:
+        """Recompute all rollups from the live and archived bookings."""
+        rebuild_sql = self._dialect_option(_REBUILD_STATEMENTS)
+        await self.session.execute(delete(DailyRollup))
+        status_type = Booking.__table__.c.status.type
+        await self.session.execute(
+            text(rebuild_sql).bindparams(
+                bindparam("completed", BookingStatus.COMPLETED, type_=status_type),
+                bindparam("cancelled", BookingStatus.CANCELLED, type_=status_type),
+                bindparam("expired", BookingStatus.EXPIRED, type_=status_type),
+            )
+        )
+
+    def _dialect_option(self, options: dict):
+        """Pick the dialect-specific variant from ``options``."""
+        dialect = self.session.get_bind().dialect.name
+        if dialect not in options:
+            raise ValueError(f"Daily rollups are not supported on {dialect}")
+        return options[dialect]
+
+    async def revenue_by_category(self, start: date, end: date) -> list:
+        """Revenue, booked days and rentals per day and car category."""
+        query = (
+            select(
+                DailyRollup.day,
+                DailyRollup.category,
+                func.sum(DailyRollup.revenue).label("revenue"),
+                func.sum(DailyRollup.booked_days).label("booked_days"),
+                func.sum(DailyRollup.rentals).label("rentals"),
+            )
+            .where(DailyRollup.day.between(start, end))
+            .group_by(DailyRollup.day, DailyRollup.category)
+            .order_by(DailyRollup.day, DailyRollup.category)
+        )
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def total_revenue(self, start: date, end: date) -> float:
+        """Revenue of all cars over an inclusive date range."""
+        result = await self.session.execute(
+            select(func.coalesce(func.sum(DailyRollup.revenue), 0)).where(
+                DailyRollup.day.between(start, end)
+            )
+        )
+        return float(result.scalar_one())
+
+    async def utilization_by_car(
+        self, start: date, end: date, category: CarCategory | None = None
+    ) -> list:
+        """Booked days per car over the period, including idle cars."""
+        booked = (
+            select(
+                DailyRollup.car_id,
+                func.sum(DailyRollup.booked_days).label("booked_days"),
+                func.sum(DailyRollup.revenue).label("revenue"),
+            )
+            .where(DailyRollup.day.between(start, end))
+            .group_by(DailyRollup.car_id)
+            .subquery()
+        )
+        query = (
+            select(
+                Car.id.label("car_id"),
+                Car.make,
+                Car.model,
+                Car.license_plate,
+                Car.category,
+                func.coalesce(booked.c.booked_days, 0).label("booked_days"),
+                func.coalesce(booked.c.revenue, 0).label("revenue"),
+            )
+            .outerjoin(booked, booked.c.car_id == Car.id)
+            .order_by(func.coalesce(booked.c.booked_days, 0).desc(), Car.id)
+        )
+        if category is not None:
+            query = query.where(Car.category == category)
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def rental_length_by_category(self, start: date, end: date) -> list:
+        """Rentals started in the period and their total length per category."""
+        query = (
+            select(
+                DailyRollup.category,
+                func.sum(DailyRollup.rentals).label("rentals"),
+                func.sum(DailyRollup.rental_days).label("rental_days"),
+            )
+            .where(DailyRollup.day.between(start, end), DailyRollup.rentals > 0)
+            .group_by(DailyRollup.category)
+            .order_by(DailyRollup.category)
+        )
+        result = await self.session.execute(query)
+        return list(result.all())
@@ -4,6 +4,7 @@ from app.schemas.car import (
     CarCategory,
     CarCreate,
     CarResponse,
+    CarSort,
     CarStatus,
     CarUpdate,
 )
@@ -14,14 +15,51 @@ from app.schemas.customer import (
 )
 from app.schemas.booking import (
     BookingCreate,
+    BookingExpandedResponse,
     BookingResponse,
     BookingStatus,
     BookingUpdate,
+    CustomerBookingsResponse,
+    CustomerBookingSummary,
+)
+from app.schemas.admission import AdmissionStatusResponse
+from app.schemas.change import ChangeEntity, ChangeEntry, ChangeFeedResponse
+from app.schemas.common import CountResponse
+from app.schemas.dashboard import DashboardSummaryResponse
+from app.schemas.event import EventStreamStatusResponse
+from app.schemas.analytics import (
+    CarOccupancy,
+    IdleStreak,
+    OccupancyCurve,
+    OccupancyResponse,
+    UtilizationMatrixResponse,
+)
+from app.schemas.job import (
+    JobCreate,
+    JobResponse,
+    JobResultResponse,
+    SweepMetricsResponse,
+)
+from app.schemas.singleflight import (
+    SingleFlightEndpointStats,
+    SingleFlightStatusResponse,
+)
+from app.schemas.quote import (
+    QuoteBatchResponse,
+    QuoteItem,
+    QuoteRequest,
+    QuoteResponse,
+)
+from app.schemas.report import (
+    CarUtilizationRow,
+    CategoryRevenueRow,
+    RentalLengthRow,
 )
 
 __all__ = [
     "CarCategory",
     "CarStatus",
+    "CarSort",
     "CarCreate",
     "CarUpdate",
     "CarResponse",
@@ -31,5 +69,33 @@ __all__ = [
     "BookingStatus",
     "BookingCreate",
     "BookingUpdate",
+    "CustomerBookingsResponse",
+    "CustomerBookingSummary",
     "BookingResponse",
+    "BookingExpandedResponse",
+    "ChangeEntity",
+    "ChangeEntry",
+    "ChangeFeedResponse",
+    "CountResponse",
+    "DashboardSummaryResponse",
+    "EventStreamStatusResponse",
+    "CategoryRevenueRow",
+    "CarUtilizationRow",
+    "RentalLengthRow",
+    "OccupancyCurve",
+    "OccupancyResponse",
+    "IdleStreak",
+    "CarOccupancy",
+    "UtilizationMatrixResponse",
+    "QuoteItem",
+    "QuoteRequest",
+    "QuoteResponse",
+    "QuoteBatchResponse",
+    "JobCreate",
+    "JobResponse",
+    "JobResultResponse",
+    "SweepMetricsResponse",
+    "AdmissionStatusResponse",
+    "SingleFlightEndpointStats",
+    "SingleFlightStatusResponse",
 ]
@@ -0,0 +1,18 @@
+"""Admission control Pydantic schemas."""
+
+from pydantic import BaseModel
+
+
+class AdmissionStatusResponse(BaseModel):
+    """Schema for the admission controller's state and running totals."""
+
+    max_in_flight: int
+    in_flight: int
+    waiting: int
+    pool_wait_ms: float
+    admitted: int
+    queued: int
+    rate_limited: int
+    peak_in_flight: int
+    shed: dict[str, int]
+    admitted_by_priority: dict[str, int]
@@ -0,0 +1,57 @@
+"""Pydantic schemas for fleet analytics."""
+
+from datetime import date
+
+from pydantic import BaseModel
+
+from app.schemas.car import CarCategory
+
+
+class OccupancyCurve(BaseModel):
+    """Daily share of a category's cars that were booked."""
+
+    category: CarCategory
+    cars: int
+    occupancy: list[float]
+
+
+class OccupancyResponse(BaseModel):
+    """Occupancy curves per category over a period."""
+
+    start_date: date
+    end_date: date
+    curves: list[OccupancyCurve]
+
+
+class IdleStreak(BaseModel):
+    """A run of consecutive days a car was not booked."""
+
+    car_id: str
+    license_plate: str
+    category: CarCategory
+    start_date: date
+    end_date: date
+    days: int
+
+
+class CarOccupancy(BaseModel):
+    """One row of the utilization matrix."""
+
+    car_id: str
+    license_plate: str
+    category: CarCategory
+    booked_days: int
+    utilization: float
+    days: str
+
+
+class UtilizationMatrixResponse(BaseModel):
+    """Cars × days utilization matrix over a period.
+
+    Each car's ``days`` holds one character per day of the period, ``1`` if
+    the car was booked that day and ``0`` otherwise.
+    """
+
+    start_date: date
+    end_date: date
+    cars: list[CarOccupancy]
@@ -5,14 +5,19 @@ from enum import Enum
 
 from pydantic import BaseModel, ConfigDict
 
+from app.schemas.car import CarResponse
+from app.schemas.customer import CustomerResponse
+
 
 class BookingStatus(str, Enum):
     """Booking status enumeration."""
 
     RESERVED = "reserved"
     ACTIVE = "active"
+    OVERDUE = "overdue"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
+    EXPIRED = "expired"
 
 
 class BookingBase(BaseModel):
@@ -47,3 +52,33 @@ class BookingResponse(BookingBase):
     total_cost: float
     status: BookingStatus
     created_at: datetime
+
+
+BOOKING_INCLUDES = ("car", "customer")
+
+
+class BookingExpandedResponse(BookingResponse):
+    """Schema for booking response with optionally embedded relations."""
+
+    car: CarResponse | None = None
+    customer: CustomerResponse | None = None
+
+
+class CustomerBookingSummary(BaseModel):
+    """Schema for the totals of a customer's booking history."""
+
+    bookings: int
+    by_status: dict[BookingStatus, int]
+    # Cost of the bookings whose car was picked up.
+    total_spend: float
+    # Start date of the latest of those, if any.
+    last_rental: date | None
+
+
+class CustomerBookingsResponse(BaseModel):
+    """Schema for a page of a customer's bookings, latest first."""
+
+    bookings: list[BookingExpandedResponse]
+    # Cursor to pass for the next page; null on the last one.
+    next: str | None
+    summary: CustomerBookingSummary
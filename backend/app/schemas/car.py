@@ -23,6 +23,15 @@ class CarStatus(str, Enum):
     MAINTENANCE = "maintenance"
 
 
+class CarSort(str, Enum):
+    """Sort orders for car listings; a leading ``-`` means descending."""
+
+    DAILY_RATE = "daily_rate"
+    DAILY_RATE_DESC = "-daily_rate"
+    YEAR = "year"
+    YEAR_DESC = "-year"
+
+
 class CarBase(BaseModel):
     """Base schema for Car with common fields."""
 
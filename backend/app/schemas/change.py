@@ -0,0 +1,34 @@
+"""Pydantic schemas for the change feed."""
+
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class ChangeEntity(str, Enum):
+    """Kinds of records in the change feed."""
+
+    CAR = "car"
+    CUSTOMER = "customer"
+    BOOKING = "booking"
+
+
+class ChangeEntry(BaseModel):
+    """Schema for one changed record."""
+
+    seq: int
+    entity: ChangeEntity
+    id: str
+    deleted: bool
+    changed_at: datetime
+
+
+class ChangeFeedResponse(BaseModel):
+    """Schema for a page of the change feed."""
+
+    changes: list[ChangeEntry]
+    # Cursor to pass as ``since`` for the next page.
+    next: int
+    # Highest sequence number recorded; the feed is drained at ``next == latest``.
+    latest: int
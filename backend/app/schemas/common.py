@@ -0,0 +1,9 @@
+"""Pydantic schemas shared by several resources."""
+
+from pydantic import BaseModel
+
+
+class CountResponse(BaseModel):
+    """Schema for the size of a collection."""
+
+    count: int
@@ -0,0 +1,25 @@
+"""Pydantic schemas for the dashboard."""
+
+from datetime import date
+
+from pydantic import BaseModel
+
+from app.schemas.booking import BookingExpandedResponse, BookingStatus
+from app.schemas.car import CarStatus
+
+
+class DashboardSummaryResponse(BaseModel):
+    """Every figure the dashboard shows, computed in the database."""
+
+    today: date
+    period_start: date
+    period_end: date
+    cars_total: int
+    cars_by_status: dict[CarStatus, int]
+    customers_total: int
+    bookings_total: int
+    bookings_by_status: dict[BookingStatus, int]
+    pickups_today: int
+    returns_today: int
+    revenue: float
+    recent_bookings: list[BookingExpandedResponse]
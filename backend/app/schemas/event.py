@@ -0,0 +1,13 @@
+"""Pydantic schemas for pushed status events."""
+
+from pydantic import BaseModel
+
+
+class EventStreamStatusResponse(BaseModel):
+    """Schema for the event broadcaster's subscribers and counters."""
+
+    subscribers: int
+    subscribed: int
+    published: int
+    delivered: int
+    dropped: int
@@ -0,0 +1,86 @@
+"""Pydantic schemas for background jobs."""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class JobStatus(str, Enum):
+    """Job status enumeration."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobCreate(BaseModel):
+    """Schema for enqueueing a job."""
+
+    kind: str = Field(..., min_length=1, max_length=50)
+    payload: dict[str, Any] = {}
+    max_attempts: int | None = Field(None, ge=1, le=20)
+
+
+class JobResponse(BaseModel):
+    """Schema for job status responses."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    kind: str
+    status: JobStatus
+    payload: dict[str, Any]
+    error: str | None
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+
+class SweepResultResponse(BaseModel):
+    """Schema for what one booking sweep changed."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    expired: int
+    overdue: int
+    released: int
+    archived: int
+    purged: int
+    compacted: int
+    batches: int
+    seconds: float
+
+
+class SweepMetricsResponse(BaseModel):
+    """Schema for the booking sweeper's running totals."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    runs: int
+    failures: int
+    expired: int
+    overdue: int
+    released: int
+    archived: int
+    purged: int
+    compacted: int
+    last_run_at: datetime | None
+    last_result: SweepResultResponse | None
+    last_error: str | None
+
+
+class JobResultResponse(BaseModel):
+    """Schema for the result of a finished job."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    status: JobStatus
+    result: dict[str, Any] | None
+    error: str | None
@@ -0,0 +1,41 @@
+"""Pydantic schemas for price quotes."""
+
+from datetime import date
+
+from pydantic import BaseModel, Field
+
+MAX_QUOTES = 10_000
+
+
+class QuoteItem(BaseModel):
+    """A car and date range to price."""
+
+    car_id: str
+    start_date: date
+    end_date: date
+
+
+class QuoteRequest(BaseModel):
+    """Batch of rentals to price."""
+
+    items: list[QuoteItem] = Field(..., min_length=1, max_length=MAX_QUOTES)
+
+
+class QuoteResponse(QuoteItem):
+    """Price of one rental.
+
+    ``subtotal`` applies weekend and season multipliers to the daily rate,
+    ``discount`` is the long-rental discount taken off it.
+    """
+
+    days: int
+    daily_rate: float
+    subtotal: float
+    discount: float
+    total: float
+
+
+class QuoteBatchResponse(BaseModel):
+    """Quotes in the order of the request items."""
+
+    quotes: list[QuoteResponse]
@@ -0,0 +1,40 @@
+"""Pydantic schemas for reports."""
+
+from datetime import date
+
+from pydantic import BaseModel
+
+from app.schemas.car import CarCategory
+
+
+class CategoryRevenueRow(BaseModel):
+    """Revenue and activity of one car category on one day."""
+
+    day: date
+    category: CarCategory | None
+    revenue: float
+    booked_days: int
+    rentals: int
+
+
+class CarUtilizationRow(BaseModel):
+    """Share of the reporting period a car was booked."""
+
+    car_id: str
+    make: str
+    model: str
+    license_plate: str
+    category: CarCategory
+    booked_days: int
+    period_days: int
+    utilization: float
+    revenue: float
+
+
+class RentalLengthRow(BaseModel):
+    """Average length of rentals started in the period, per category."""
+
+    category: CarCategory | None
+    rentals: int
+    rental_days: int
+    average_days: float
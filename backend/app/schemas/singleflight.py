@@ -0,0 +1,17 @@
+"""Single-flight Pydantic schemas."""
+
+from pydantic import BaseModel
+
+
+class SingleFlightEndpointStats(BaseModel):
+    """Schema for one coalesced endpoint's counters."""
+
+    executed: int
+    coalesced: int
+
+
+class SingleFlightStatusResponse(BaseModel):
+    """Schema for the request coalescer's counters."""
+
+    in_flight: int
+    endpoints: dict[str, SingleFlightEndpointStats]
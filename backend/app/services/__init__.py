@@ -3,5 +3,23 @@
 from app.services.car import CarService
 from app.services.customer import CustomerService
 from app.services.booking import BookingService
+from app.services.report import ReportService
+from app.services.analytics import AnalyticsService
+from app.services.quote import QuoteService
+from app.services.job import JobService
+from app.services.idempotency import IdempotencyService
+from app.services.dashboard import DashboardService
+from app.services.change import ChangeService
 
-__all__ = ["CarService", "CustomerService", "BookingService"]
+__all__ = [
+    "CarService",
+    "CustomerService",
+    "BookingService",
+    "ReportService",
+    "AnalyticsService",
+    "QuoteService",
+    "JobService",
+    "IdempotencyService",
+    "DashboardService",
+    "ChangeService",
+]
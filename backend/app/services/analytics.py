@@ -0,0 +1,132 @@
+"""Analytics service for business logic."""
+
+import asyncio
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.analytics import category_occupancy, idle_streaks, occupancy_matrix
+from app.models.car import Car, CarCategory
+from app.repositories.analytics import AnalyticsRepository
+from app.schemas.analytics import (
+    CarOccupancy,
+    IdleStreak,
+    OccupancyCurve,
+    OccupancyResponse,
+    UtilizationMatrixResponse,
+)
+
+# Upper bound on the analyzed period, which sizes the cars × days matrix.
+MAX_PERIOD_DAYS = 3660
+
+CATEGORIES = list(CarCategory)
+EPOCH = date(1970, 1, 1)
+
+
+class AnalyticsService:
+    """Service for fleet utilization analytics over booking history."""
+
+    def __init__(self, analytics_repository: AnalyticsRepository):
+        self.analytics_repository = analytics_repository
+
+    async def _occupancy(
+        self, start_date: date, end_date: date, category: CarCategory | None
+    ) -> tuple[list[Car], np.ndarray]:
+        """Load the cars and their ``cars × days`` occupancy matrix."""
+        if start_date > end_date:
+            raise ValueError("Start date must not be after end date")
+        days = (end_date - start_date).days + 1
+        if days > MAX_PERIOD_DAYS:
+            raise ValueError(f"Period must not exceed {MAX_PERIOD_DAYS} days")
+
+        cars = await self.analytics_repository.get_cars(category)
+        intervals = await self.analytics_repository.load_intervals(
+            cars, start_date, end_date, category=category
+        )
+        # The kernels release the GIL for most of their work.
+        occupied = await asyncio.to_thread(
+            occupancy_matrix, intervals, len(cars), (start_date - EPOCH).days, days
+        )
+        return cars, occupied
+
+    async def occupancy_curves(
+        self,
+        start_date: date,
+        end_date: date,
+        category: CarCategory | None = None,
+    ) -> OccupancyResponse:
+        """Daily occupancy of each car category."""
+        cars, occupied = await self._occupancy(start_date, end_date, category)
+        codes = np.array(
+            [CATEGORIES.index(car.category) for car in cars], dtype=np.int64
+        )
+        curves, sizes = await asyncio.to_thread(
+            category_occupancy, occupied, codes, len(CATEGORIES)
+        )
+        return OccupancyResponse(
+            start_date=start_date,
+            end_date=end_date,
+            curves=[
+                OccupancyCurve(
+                    category=member,
+                    cars=int(sizes[code]),
+                    occupancy=np.round(curves[code], 4).tolist(),
+                )
+                for code, member in enumerate(CATEGORIES)
+                if category is None or member == category
+            ],
+        )
+
+    async def idle_streaks(
+        self,
+        start_date: date,
+        end_date: date,
+        min_days: int = 1,
+        category: CarCategory | None = None,
+        limit: int = 100,
+    ) -> list[IdleStreak]:
+        """Longest runs of consecutive idle days, longest first."""
+        cars, occupied = await self._occupancy(start_date, end_date, category)
+        car, first, length = await asyncio.to_thread(idle_streaks, occupied, min_days)
+        # Stable sort: ties keep car order, then chronological order.
+        top = np.argsort(-length, kind="stable")[:limit]
+        return [
+            IdleStreak(
+                car_id=cars[row].id,
+                license_plate=cars[row].license_plate,
+                category=cars[row].category,
+                start_date=start_date + timedelta(days=offset),
+                end_date=start_date + timedelta(days=offset + days - 1),
+                days=days,
+            )
+            for row, offset, days in zip(
+                car[top].tolist(), first[top].tolist(), length[top].tolist()
+            )
+        ]
+
+    async def utilization_matrix(
+        self,
+        start_date: date,
+        end_date: date,
+        category: CarCategory | None = None,
+    ) -> UtilizationMatrixResponse:
+        """Per-car, per-day booked flags with per-car utilization."""
+        cars, occupied = await self._occupancy(start_date, end_date, category)
+        booked = occupied.sum(axis=1)
+        days = occupied.shape[1]
+        rendered = np.where(occupied, b"1", b"0").view(f"S{days}").ravel()
+        return UtilizationMatrixResponse(
+            start_date=start_date,
+            end_date=end_date,
+            cars=[
+                CarOccupancy(
+                    car_id=car.id,
+                    license_plate=car.license_plate,
+                    category=car.category,
+                    booked_days=count,
+                    utilization=round(count / days, 4),
+                    days=flags.decode("ascii"),
+                )
+                for car, count, flags in zip(cars, booked.tolist(), rendered.tolist())
+            ],
+        )
@@ -1,41 +1,176 @@
 """Booking service for business logic."""
 
+from collections.abc import Collection
+from dataclasses import dataclass
 from datetime import date
 
-from app.models.booking import Booking, BookingStatus
-from app.models.car import CarStatus
+from sqlalchemy.exc import IntegrityError
+
+from app.events import EventPublisher, booking_event, car_event
+from app.models.archive import ArchivedBooking
+from app.models.booking import (
+    OPEN_STATUSES,
+    OVERLAP_CONSTRAINT,
+    RENTED_STATUSES,
+    Booking,
+    BookingStatus,
+)
+from app.models.car import Car, CarStatus
+from app.models.change import ChangeEntity
+from app.pricing import PricingRules, quote_total
 from app.repositories.booking import BookingRepository
 from app.repositories.car import CarRepository
+from app.repositories.change import ChangeRepository
 from app.repositories.customer import CustomerRepository
-from app.schemas.booking import BookingCreate
+from app.repositories.rollup import RollupRepository
+from app.schemas.booking import BookingCreate, CustomerBookingSummary
+
+
+@dataclass
+class CustomerBookingsPage:
+    """A page of a customer's bookings and the totals of all of them."""
+
+    bookings: list[Booking | ArchivedBooking]
+    next: str | None
+    summary: CustomerBookingSummary
+
+
+def history_cursor(booking: Booking | ArchivedBooking) -> str:
+    """Opaque cursor for the history page after ``booking``."""
+    return f"{booking.start_date.isoformat()},{booking.id}"
+
+
+def parse_history_cursor(cursor: str) -> tuple[date, str]:
+    """The ``(start_date, id)`` a :func:`history_cursor` points after."""
+    try:
+        day, booking_id = cursor.split(",")
+        return date.fromisoformat(day), booking_id
+    except ValueError:
+        raise ValueError(f"Invalid cursor '{cursor}'") from None
 
 
 class BookingService:
-    """Service for booking-related business logic."""
+    """Service for booking-related business logic.
+
+    Every write to a booking, and to the status of its car, is recorded in
+    the change journal and pushed to event subscribers.
+    """
 
     def __init__(
         self,
         booking_repository: BookingRepository,
         car_repository: CarRepository,
         customer_repository: CustomerRepository,
+        rollup_repository: RollupRepository,
+        change_repository: ChangeRepository,
+        event_publisher: EventPublisher,
+        pricing_rules: PricingRules,
     ):
         self.booking_repository = booking_repository
         self.car_repository = car_repository
         self.customer_repository = customer_repository
+        self.rollup_repository = rollup_repository
+        self.change_repository = change_repository
+        self.event_publisher = event_publisher
+        self.pricing_rules = pricing_rules
 
-    async def get_booking(self, booking_id: str) -> Booking | None:
-        """Get a booking by ID."""
-        return await self.booking_repository.get_by_id(booking_id)
+    async def get_booking(
+        self,
+        booking_id: str,
+        include: Collection[str] = (),
+        fields: Collection[str] = (),
+        archived: bool = False,
+    ) -> Booking | ArchivedBooking | None:
+        """Get a booking by ID, optionally loading related records.
+
+        Only the ``fields`` columns of the booking are loaded if given. With
+        ``archived``, archived bookings are found too.
+        """
+        return await self.booking_repository.get_by_id(
+            booking_id, include=include, fields=fields, archived=archived
+        )
 
     async def get_bookings(
         self,
         status: BookingStatus | None = None,
         car_id: str | None = None,
         customer_id: str | None = None,
-    ) -> list[Booking]:
-        """Get all bookings with optional filters."""
+        include: Collection[str] = (),
+        fields: Collection[str] = (),
+        archived: bool = False,
+    ) -> list[Booking | ArchivedBooking]:
+        """Get all bookings with optional filters and related records.
+
+        Only the ``fields`` columns of the bookings are loaded if given. With
+        ``archived``, matching archived bookings follow the live ones.
+        """
         return await self.booking_repository.get_filtered(
-            status=status, car_id=car_id, customer_id=customer_id
+            status=status,
+            car_id=car_id,
+            customer_id=customer_id,
+            include=include,
+            fields=fields,
+            archived=archived,
+        )
+
+    async def count_bookings(
+        self,
+        status: BookingStatus | None = None,
+        car_id: str | None = None,
+        customer_id: str | None = None,
+        archived: bool = False,
+    ) -> int:
+        """Count the bookings :meth:`get_bookings` would return."""
+        return await self.booking_repository.count_filtered(
+            status=status, car_id=car_id, customer_id=customer_id, archived=archived
+        )
+
+    async def get_customer_bookings(
+        self,
+        customer_id: str,
+        limit: int,
+        cursor: str | None = None,
+        include: Collection[str] = (),
+        archived: bool = False,
+    ) -> CustomerBookingsPage | None:
+        """A page of a customer's bookings, latest first, and their totals.
+
+        Pages are cut by ``(start_date, id)`` keys instead of offsets, so a
+        page costs the same however deep it is and bookings made meanwhile
+        never shift later pages. The summary covers every booking of the
+        customer and comes from one aggregate query, not from the page.
+        With ``archived``, archived bookings are listed and counted too.
+        Returns ``None`` for an unknown customer.
+        """
+        before = parse_history_cursor(cursor) if cursor else None
+        if not await self.customer_repository.get_by_id(customer_id):
+            return None
+
+        bookings = await self.booking_repository.get_customer_history(
+            customer_id,
+            limit + 1,
+            before=before,
+            include=include,
+            archived=archived,
+        )
+        more = len(bookings) > limit
+        bookings = bookings[:limit]
+
+        totals = await self.booking_repository.customer_totals(
+            customer_id, archived=archived
+        )
+        rented = [total for total in totals if total.status in RENTED_STATUSES]
+        summary = CustomerBookingSummary(
+            bookings=sum(total.bookings for total in totals),
+            by_status={status: 0 for status in BookingStatus}
+            | {total.status: total.bookings for total in totals},
+            total_spend=round(sum(float(total.spend) for total in rented), 2),
+            last_rental=max((total.last_start for total in rented), default=None),
+        )
+        return CustomerBookingsPage(
+            bookings=bookings,
+            next=history_cursor(bookings[-1]) if more else None,
+            summary=summary,
         )
 
     async def create_booking(self, data: BookingCreate) -> Booking:
@@ -63,8 +198,9 @@ class BookingService:
         if overlapping:
             raise ValueError("Car is not available for the selected dates")
 
-        days = (data.end_date - data.start_date).days
-        total_cost = float(car.daily_rate) * days
+        total_cost = quote_total(
+            self.pricing_rules, float(car.daily_rate), data.start_date, data.end_date
+        )
 
         booking = Booking(
             car_id=data.car_id,
@@ -74,7 +210,16 @@ class BookingService:
             total_cost=total_cost,
             status=BookingStatus.RESERVED,
         )
-        return await self.booking_repository.create(booking)
+        try:
+            booking = await self.booking_repository.create(booking)
+        except IntegrityError as exc:
+            # A concurrent booking won the race past the check above.
+            if OVERLAP_CONSTRAINT not in str(exc.orig):
+                raise
+            raise ValueError("Car is not available for the selected dates") from exc
+        await self.rollup_repository.record(booking, car.category)
+        await self._record_changes(booking)
+        return booking
 
     async def pickup_car(self, booking_id: str) -> Booking | None:
         """Start a rental (reserved -> active)."""
@@ -90,41 +235,64 @@ class BookingService:
             await self.car_repository.update(car)
 
         booking.status = BookingStatus.ACTIVE
-        return await self.booking_repository.update(booking)
+        booking = await self.booking_repository.update(booking)
+        await self._record_changes(booking, car)
+        return booking
 
     async def return_car(self, booking_id: str) -> Booking | None:
-        """Complete a rental (active -> completed)."""
+        """Complete a rental (active or overdue -> completed)."""
         booking = await self.booking_repository.get_by_id(booking_id)
         if not booking:
             return None
-        if booking.status != BookingStatus.ACTIVE:
-            raise ValueError("Only active bookings can be returned")
+        if booking.status not in [BookingStatus.ACTIVE, BookingStatus.OVERDUE]:
+            raise ValueError("Only active or overdue bookings can be returned")
 
         car = await self.car_repository.get_by_id(booking.car_id)
         if car:
             car.status = CarStatus.AVAILABLE
             await self.car_repository.update(car)
 
+        # An early or late return changes the days the rental covers.
+        category = car.category if car else None
+        await self.rollup_repository.record(booking, category, sign=-1)
         booking.status = BookingStatus.COMPLETED
         booking.actual_return_date = date.today()
-        return await self.booking_repository.update(booking)
+        await self.rollup_repository.record(booking, category)
+        booking = await self.booking_repository.update(booking)
+        await self._record_changes(booking, car)
+        return booking
 
     async def cancel_booking(self, booking_id: str) -> Booking | None:
         """Cancel a booking."""
         booking = await self.booking_repository.get_by_id(booking_id)
         if not booking:
             return None
-        if booking.status not in [BookingStatus.RESERVED, BookingStatus.ACTIVE]:
-            raise ValueError("Only reserved or active bookings can be cancelled")
+        if booking.status not in OPEN_STATUSES:
+            raise ValueError(
+                "Only reserved, active or overdue bookings can be cancelled"
+            )
 
-        if booking.status == BookingStatus.ACTIVE:
-            car = await self.car_repository.get_by_id(booking.car_id)
-            if car:
-                car.status = CarStatus.AVAILABLE
-                await self.car_repository.update(car)
+        car = await self.car_repository.get_by_id(booking.car_id)
+        released = car if booking.status != BookingStatus.RESERVED else None
+        if released:
+            released.status = CarStatus.AVAILABLE
+            await self.car_repository.update(released)
 
+        await self.rollup_repository.record(
+            booking, car.category if car else None, sign=-1
+        )
         booking.status = BookingStatus.CANCELLED
-        return await self.booking_repository.update(booking)
+        booking = await self.booking_repository.update(booking)
+        await self._record_changes(booking, released)
+        return booking
+
+    async def _record_changes(self, booking: Booking, car: Car | None = None) -> None:
+        """Journal and push a written booking and, if its status changed, its car."""
+        if car is not None:
+            await self.change_repository.record(ChangeEntity.CAR, [car.id])
+            self.event_publisher.publish(car_event(car))
+        await self.change_repository.record(ChangeEntity.BOOKING, [booking.id])
+        self.event_publisher.publish(booking_event(booking))
 
     async def check_availability(
         self, car_id: str, start_date: date, end_date: date
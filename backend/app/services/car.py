@@ -1,27 +1,103 @@
 """Car service for business logic."""
 
+from collections.abc import Collection
+
+from app.events import EventPublisher, car_event
 from app.models.car import Car, CarCategory, CarStatus
+from app.models.change import ChangeEntity
 from app.repositories.car import CarRepository
-from app.schemas.car import CarCreate, CarUpdate
+from app.repositories.change import ChangeRepository
+from app.schemas.car import CarCreate, CarSort, CarUpdate
+
+
+def check_ranges(
+    min_year: int | None,
+    max_year: int | None,
+    min_rate: float | None,
+    max_rate: float | None,
+) -> None:
+    """Reject year and rate ranges whose lower bound exceeds the upper one."""
+    if min_year is not None and max_year is not None and min_year > max_year:
+        raise ValueError("min_year cannot be greater than max_year")
+    if min_rate is not None and max_rate is not None and min_rate > max_rate:
+        raise ValueError("min_rate cannot be greater than max_rate")
 
 
 class CarService:
-    """Service for car-related business logic."""
+    """Service for car-related business logic.
 
-    def __init__(self, repository: CarRepository):
+    Every write is recorded in the change journal and pushed to event
+    subscribers.
+    """
+
+    def __init__(
+        self,
+        repository: CarRepository,
+        changes: ChangeRepository,
+        events: EventPublisher,
+    ):
         self.repository = repository
+        self.changes = changes
+        self.events = events
 
-    async def get_car(self, car_id: str) -> Car | None:
-        """Get a car by ID."""
-        return await self.repository.get_by_id(car_id)
+    async def get_car(self, car_id: str, fields: Collection[str] = ()) -> Car | None:
+        """Get a car by ID, loading only ``fields`` if given."""
+        return await self.repository.get_by_id(car_id, fields=fields)
 
     async def get_cars(
         self,
         status: CarStatus | None = None,
         category: CarCategory | None = None,
+        make: str | None = None,
+        model: str | None = None,
+        min_year: int | None = None,
+        max_year: int | None = None,
+        min_rate: float | None = None,
+        max_rate: float | None = None,
+        sort: CarSort | None = None,
+        fields: Collection[str] = (),
     ) -> list[Car]:
-        """Get all cars with optional filters."""
-        return await self.repository.get_filtered(status=status, category=category)
+        """Get all cars with optional filters and ordering.
+
+        Only the ``fields`` columns are loaded if given.
+        """
+        check_ranges(min_year, max_year, min_rate, max_rate)
+        return await self.repository.get_filtered(
+            status=status,
+            category=category,
+            make=make,
+            model=model,
+            min_year=min_year,
+            max_year=max_year,
+            min_rate=min_rate,
+            max_rate=max_rate,
+            sort=sort,
+            fields=fields,
+        )
+
+    async def count_cars(
+        self,
+        status: CarStatus | None = None,
+        category: CarCategory | None = None,
+        make: str | None = None,
+        model: str | None = None,
+        min_year: int | None = None,
+        max_year: int | None = None,
+        min_rate: float | None = None,
+        max_rate: float | None = None,
+    ) -> int:
+        """Count the cars :meth:`get_cars` would return."""
+        check_ranges(min_year, max_year, min_rate, max_rate)
+        return await self.repository.count_filtered(
+            status=status,
+            category=category,
+            make=make,
+            model=model,
+            min_year=min_year,
+            max_year=max_year,
+            min_rate=min_rate,
+            max_rate=max_rate,
+        )
 
     async def create_car(self, data: CarCreate) -> Car:
         """Create a new car."""
@@ -39,7 +115,10 @@ class CarService:
             daily_rate=data.daily_rate,
             category=data.category,
         )
-        return await self.repository.create(car)
+        car = await self.repository.create(car)
+        await self.changes.record(ChangeEntity.CAR, [car.id])
+        self.events.publish(car_event(car))
+        return car
 
     async def update_car(self, car_id: str, data: CarUpdate) -> Car | None:
         """Update an existing car."""
@@ -58,7 +137,10 @@ class CarService:
         for field, value in update_data.items():
             setattr(car, field, value)
 
-        return await self.repository.update(car)
+        car = await self.repository.update(car)
+        await self.changes.record(ChangeEntity.CAR, [car.id])
+        self.events.publish(car_event(car))
+        return car
 
     async def delete_car(self, car_id: str) -> bool:
         """Delete a car."""
@@ -66,4 +148,6 @@ class CarService:
         if not car:
             return False
         await self.repository.delete(car)
+        await self.changes.record(ChangeEntity.CAR, [car_id], deleted=True)
+        self.events.publish(car_event(car, deleted=True))
         return True
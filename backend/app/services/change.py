@@ -0,0 +1,35 @@
+"""Change feed service for business logic."""
+
+from app.repositories.change import ChangeRepository
+from app.schemas.change import ChangeEntry, ChangeFeedResponse
+
+
+class ChangeService:
+    """Service for clients syncing cars, customers and bookings incrementally.
+
+    A client starts by reading ``latest``, then loads the full collections,
+    and from then on only fetches the changes after its cursor. Only the
+    latest change of each record is kept, so a page lists every record
+    written since the cursor once, at the position of its last write.
+    """
+
+    def __init__(self, change_repository: ChangeRepository):
+        self.change_repository = change_repository
+
+    async def get_changes(self, since: int, limit: int) -> ChangeFeedResponse:
+        """Up to ``limit`` changes after the cursor ``since``."""
+        changes = await self.change_repository.since(since, limit)
+        return ChangeFeedResponse(
+            changes=[
+                ChangeEntry(
+                    seq=change.seq,
+                    entity=change.entity.value,
+                    id=change.entity_id,
+                    deleted=change.deleted,
+                    changed_at=change.changed_at,
+                )
+                for change in changes
+            ],
+            next=changes[-1].seq if changes else since,
+            latest=await self.change_repository.latest(),
+        )
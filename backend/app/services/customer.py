@@ -1,23 +1,41 @@
 """Customer service for business logic."""
 
+from collections.abc import Collection
+
+from app.models.change import ChangeEntity
 from app.models.customer import Customer
+from app.repositories.change import ChangeRepository
 from app.repositories.customer import CustomerRepository
 from app.schemas.customer import CustomerCreate, CustomerUpdate
 
 
 class CustomerService:
-    """Service for customer-related business logic."""
+    """Service for customer-related business logic.
+
+    Every write is recorded in the change journal.
+    """
 
-    def __init__(self, repository: CustomerRepository):
+    def __init__(self, repository: CustomerRepository, changes: ChangeRepository):
         self.repository = repository
+        self.changes = changes
+
+    async def get_customer(
+        self, customer_id: str, fields: Collection[str] = ()
+    ) -> Customer | None:
+        """Get a customer by ID, loading only ``fields`` if given."""
+        return await self.repository.get_by_id(customer_id, fields=fields)
+
+    async def get_customers(self, fields: Collection[str] = ()) -> list[Customer]:
+        """Get all customers, loading only ``fields`` if given."""
+        return await self.repository.get_all(fields=fields)
 
-    async def get_customer(self, customer_id: str) -> Customer | None:
-        """Get a customer by ID."""
-        return await self.repository.get_by_id(customer_id)
+    async def count_customers(self) -> int:
+        """Count all customers."""
+        return await self.repository.count()
 
-    async def get_customers(self) -> list[Customer]:
-        """Get all customers."""
-        return await self.repository.get_all()
+    async def search_customers(self, query: str, limit: int = 20) -> list[Customer]:
+        """Search customers by name, email, phone or driver license prefix."""
+        return await self.repository.search(query, limit=limit)
 
     async def create_customer(self, data: CustomerCreate) -> Customer:
         """Create a new customer."""
@@ -32,7 +50,9 @@ class CustomerService:
             phone=data.phone,
             driver_license=data.driver_license,
         )
-        return await self.repository.create(customer)
+        customer = await self.repository.create(customer)
+        await self.changes.record(ChangeEntity.CUSTOMER, [customer.id])
+        return customer
 
     async def update_customer(
         self, customer_id: str, data: CustomerUpdate
@@ -51,7 +71,9 @@ class CustomerService:
         for field, value in update_data.items():
             setattr(customer, field, value)
 
-        return await self.repository.update(customer)
+        customer = await self.repository.update(customer)
+        await self.changes.record(ChangeEntity.CUSTOMER, [customer.id])
+        return customer
 
     async def delete_customer(self, customer_id: str) -> bool:
         """Delete a customer."""
@@ -59,4 +81,5 @@ class CustomerService:
         if not customer:
             return False
         await self.repository.delete(customer)
+        await self.changes.record(ChangeEntity.CUSTOMER, [customer_id], deleted=True)
         return True
@@ -0,0 +1,110 @@
+"""Dashboard service for business logic."""
+
+import time
+from datetime import date
+
+from app.repositories.booking import BookingRepository
+from app.repositories.car import CarRepository
+from app.repositories.customer import CustomerRepository
+from app.repositories.rollup import RollupRepository
+from app.schemas.booking import BOOKING_INCLUDES, BookingExpandedResponse
+from app.schemas.dashboard import DashboardSummaryResponse
+
+RECENT_BOOKINGS = 5
+
+
+class SummaryCache:
+    """Summaries by period, each kept for a fixed number of seconds."""
+
+    def __init__(self):
+        self._entries: dict[tuple, tuple[float, DashboardSummaryResponse]] = {}
+
+    def get(self, key: tuple) -> DashboardSummaryResponse | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def put(self, key: tuple, summary: DashboardSummaryResponse, ttl: float) -> None:
+        now = time.monotonic()
+        self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+        self._entries[key] = (now + ttl, summary)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+summary_cache = SummaryCache()
+
+
+class DashboardService:
+    """Service computing the dashboard KPIs with aggregate queries.
+
+    With a positive ``ttl``, a summary is served from ``cache`` for that
+    many seconds, so figures may lag writes by up to ``ttl``.
+    """
+
+    def __init__(
+        self,
+        car_repository: CarRepository,
+        customer_repository: CustomerRepository,
+        booking_repository: BookingRepository,
+        rollup_repository: RollupRepository,
+        ttl: float = 0.0,
+        cache: SummaryCache = summary_cache,
+    ):
+        self.car_repository = car_repository
+        self.customer_repository = customer_repository
+        self.booking_repository = booking_repository
+        self.rollup_repository = rollup_repository
+        self.ttl = ttl
+        self.cache = cache
+
+    async def summary(
+        self,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        today: date | None = None,
+    ) -> DashboardSummaryResponse:
+        """KPIs for today and revenue over an inclusive period.
+
+        The period defaults to the current month up to ``today``.
+        """
+        today = today or date.today()
+        start_date = start_date or today.replace(day=1)
+        end_date = end_date or today
+        if start_date > end_date:
+            raise ValueError("Start date must not be after end date")
+
+        key = (today, start_date, end_date)
+        if self.ttl > 0 and (cached := self.cache.get(key)) is not None:
+            return cached
+
+        cars = await self.car_repository.count_by_status()
+        bookings = await self.booking_repository.count_by_status()
+        pickups, returns = await self.booking_repository.count_scheduled(today)
+        recent = await self.booking_repository.get_recent(
+            RECENT_BOOKINGS, include=BOOKING_INCLUDES
+        )
+        summary = DashboardSummaryResponse(
+            today=today,
+            period_start=start_date,
+            period_end=end_date,
+            cars_total=sum(cars.values()),
+            cars_by_status=cars,
+            customers_total=await self.customer_repository.count(),
+            bookings_total=sum(bookings.values()),
+            bookings_by_status=bookings,
+            pickups_today=pickups,
+            returns_today=returns,
+            revenue=round(
+                await self.rollup_repository.total_revenue(start_date, end_date), 2
+            ),
+            recent_bookings=[
+                BookingExpandedResponse.model_validate(booking, from_attributes=True)
+                for booking in recent
+            ],
+        )
+        if self.ttl > 0:
+            self.cache.put(key, summary, self.ttl)
+        return summary
@@ -0,0 +1,137 @@
+"""Idempotency service for replaying responses to retried requests."""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.exceptions import AppException, ConflictException
+from app.models.idempotency import IdempotencyRecord
+from app.repositories.idempotency import IdempotencyRepository
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(method: str, path: str, body: bytes) -> bytes:
+    """SHA-256 identifying a request, to detect a key reused for another."""
+    digest = hashlib.sha256(f"{method} {path}\n".encode())
+    digest.update(body)
+    return digest.digest()
+
+
+class KeyLocks:
+    """One lock per key, dropped once nobody holds or waits for it."""
+
+    def __init__(self):
+        self._locks: dict[str, tuple[asyncio.Lock, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        lock, users = self._locks.get(key, (None, 0))
+        lock = lock or asyncio.Lock()
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+
+# Requests with the same key in this process queue up here instead of on
+# the database.
+key_locks = KeyLocks()
+
+
+class IdempotencyService:
+    """Runs a request at most once per ``Idempotency-Key``.
+
+    The first request with a key runs and its response is stored in the
+    same transaction as its changes. Retries with the same key get the
+    stored response back, and concurrent ones wait for the first to finish.
+    Requests that fail store nothing, so their retries run again.
+
+    :data:`key_locks` only queues requests within one process. Across
+    processes the database does: on PostgreSQL a duplicate waits on the
+    first request's row, while SQLite may give up on its write lock, and the
+    duplicate gets a ``409`` to retry. The service commits the request's
+    transaction itself, before it releases the key's lock; a commit left to
+    the session dependency would come after a waiting duplicate looked for
+    the record, so that duplicate would run again.
+    """
+
+    def __init__(
+        self,
+        repository: IdempotencyRepository,
+        key: str | None,
+        fingerprint: bytes,
+        ttl: timedelta,
+        locks: KeyLocks = key_locks,
+    ):
+        self.repository = repository
+        self.key = key
+        self.fingerprint = fingerprint
+        self.ttl = ttl
+        self.locks = locks
+
+    async def run(
+        self,
+        action: Callable[[], Awaitable[Any]],
+        response_model: type[BaseModel],
+        status_code: int = 200,
+    ) -> Any:
+        """Run ``action``, or replay the response it gave for this key."""
+        if self.key is None:
+            return await action()
+
+        async with self.locks.hold(self.key):
+            now = datetime.utcnow()
+            record = await self.repository.get(self.key, now)
+            if record is None:
+                claimed = await self.repository.claim(
+                    self.key, self.fingerprint, now + self.ttl, now
+                )
+                if claimed:
+                    result = response_model.model_validate(
+                        await action(), from_attributes=True
+                    ).model_dump(mode="json")
+                    await self.repository.complete(
+                        self.key, status_code, json.dumps(result, separators=(",", ":"))
+                    )
+                    # Commit before the next request with the key may look;
+                    # see the class docstring.
+                    await self.repository.session.commit()
+                    return result
+                # Another process ran the key and committed meanwhile, or
+                # holds SQLite's write lock and may still be running it.
+                record = await self.repository.get(self.key, now)
+                if record is None:
+                    raise ConflictException(
+                        "A request with this Idempotency-Key is in progress"
+                    )
+            return self._replay(record)
+
+    def _replay(self, record: IdempotencyRecord) -> Response:
+        if record.fingerprint != self.fingerprint:
+            raise AppException(
+                "Idempotency-Key was already used for a different request",
+                status_code=422,
+            )
+        return Response(
+            content=record.body,
+            status_code=record.status_code,
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"},
+        )
@@ -0,0 +1,43 @@
+"""Job service for business logic."""
+
+from app.jobs import JOB_HANDLERS, notify_workers
+from app.models.job import Job, JobStatus
+from app.repositories.job import JobRepository
+from app.schemas.job import JobCreate
+
+
+class JobService:
+    """Service for enqueueing and inspecting background jobs."""
+
+    def __init__(self, repository: JobRepository, default_max_attempts: int = 3):
+        self.repository = repository
+        self.default_max_attempts = default_max_attempts
+
+    async def enqueue(self, data: JobCreate) -> Job:
+        """Queue a job for the worker pool."""
+        if data.kind not in JOB_HANDLERS:
+            raise ValueError(
+                f"Unknown job kind '{data.kind}'; "
+                f"expected any of: {', '.join(sorted(JOB_HANDLERS))}"
+            )
+        job = Job(
+            kind=data.kind,
+            payload=data.payload,
+            max_attempts=data.max_attempts or self.default_max_attempts,
+        )
+        job = await self.repository.create(job)
+        notify_workers()
+        return job
+
+    async def get_job(self, job_id: str) -> Job | None:
+        """Get a job by ID."""
+        return await self.repository.get_by_id(job_id)
+
+    async def get_jobs(
+        self,
+        status: JobStatus | None = None,
+        kind: str | None = None,
+        limit: int = 100,
+    ) -> list[Job]:
+        """Get the most recent jobs with optional filters."""
+        return await self.repository.get_filtered(status=status, kind=kind, limit=limit)
@@ -0,0 +1,64 @@
+"""Quote service for business logic."""
+
+import numpy as np
+
+from app.pricing import PricingRules, price
+from app.repositories.car import CarRepository
+from app.schemas.quote import QuoteItem, QuoteResponse
+
+
+class QuoteService:
+    """Service for pricing rentals in batches."""
+
+    def __init__(self, car_repository: CarRepository, rules: PricingRules):
+        self.car_repository = car_repository
+        self.rules = rules
+
+    async def quote(self, items: list[QuoteItem]) -> list[QuoteResponse]:
+        """Price every item with one car lookup and one vectorized pass."""
+        invalid = [
+            index
+            for index, item in enumerate(items)
+            if item.start_date >= item.end_date
+        ]
+        if invalid:
+            raise ValueError(
+                "Start date must be before end date (items "
+                f"{', '.join(map(str, invalid[:10]))})"
+            )
+
+        cars = await self.car_repository.get_by_ids(
+            list({item.car_id for item in items})
+        )
+        rates = {car.id: float(car.daily_rate) for car in cars}
+        missing = sorted({item.car_id for item in items} - rates.keys())
+        if missing:
+            raise ValueError(f"Cars not found: {', '.join(missing[:10])}")
+
+        daily_rates = np.array([rates[item.car_id] for item in items])
+        quotes = price(
+            self.rules,
+            daily_rates,
+            np.array([item.start_date for item in items], dtype="datetime64[D]"),
+            np.array([item.end_date for item in items], dtype="datetime64[D]"),
+        )
+        return [
+            QuoteResponse(
+                car_id=item.car_id,
+                start_date=item.start_date,
+                end_date=item.end_date,
+                days=days,
+                daily_rate=rate,
+                subtotal=subtotal,
+                discount=discount,
+                total=total,
+            )
+            for item, days, rate, subtotal, discount, total in zip(
+                items,
+                quotes.days.tolist(),
+                daily_rates.tolist(),
+                quotes.subtotal.tolist(),
+                quotes.discount.tolist(),
+                quotes.total.tolist(),
+            )
+        ]
@@ -0,0 +1,81 @@
+"""Report service for business logic."""
+
+from datetime import date
+
+from app.models.car import CarCategory
+from app.repositories.rollup import RollupRepository
+from app.schemas.report import CarUtilizationRow, CategoryRevenueRow, RentalLengthRow
+
+
+class ReportService:
+    """Service for management reports backed by daily rollups."""
+
+    def __init__(self, rollup_repository: RollupRepository):
+        self.rollup_repository = rollup_repository
+
+    @staticmethod
+    def _validate_period(start_date: date, end_date: date) -> None:
+        if start_date > end_date:
+            raise ValueError("Start date must not be after end date")
+
+    async def revenue_by_category(
+        self, start_date: date, end_date: date
+    ) -> list[CategoryRevenueRow]:
+        """Daily revenue per car category over an inclusive date range."""
+        self._validate_period(start_date, end_date)
+        rows = await self.rollup_repository.revenue_by_category(start_date, end_date)
+        return [
+            CategoryRevenueRow(
+                day=row.day,
+                category=row.category,
+                revenue=round(float(row.revenue), 2),
+                booked_days=row.booked_days,
+                rentals=row.rentals,
+            )
+            for row in rows
+        ]
+
+    async def utilization_by_car(
+        self,
+        start_date: date,
+        end_date: date,
+        category: CarCategory | None = None,
+    ) -> list[CarUtilizationRow]:
+        """Booked share of an inclusive date range for every car."""
+        self._validate_period(start_date, end_date)
+        period_days = (end_date - start_date).days + 1
+        rows = await self.rollup_repository.utilization_by_car(
+            start_date, end_date, category=category
+        )
+        return [
+            CarUtilizationRow(
+                car_id=row.car_id,
+                make=row.make,
+                model=row.model,
+                license_plate=row.license_plate,
+                category=row.category,
+                booked_days=row.booked_days,
+                period_days=period_days,
+                utilization=round(row.booked_days / period_days, 4),
+                revenue=round(float(row.revenue), 2),
+            )
+            for row in rows
+        ]
+
+    async def rental_length_by_category(
+        self, start_date: date, end_date: date
+    ) -> list[RentalLengthRow]:
+        """Average rental length of rentals starting in an inclusive range."""
+        self._validate_period(start_date, end_date)
+        rows = await self.rollup_repository.rental_length_by_category(
+            start_date, end_date
+        )
+        return [
+            RentalLengthRow(
+                category=row.category,
+                rentals=row.rentals,
+                rental_days=row.rental_days,
+                average_days=round(row.rental_days / row.rentals, 2),
+            )
+            for row in rows
+        ]
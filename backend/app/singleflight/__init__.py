@@ -0,0 +1,19 @@
+"""Coalescing of concurrent identical read requests."""
+
+from app.singleflight.endpoints import ENDPOINTS, VARY_HEADERS, match_endpoint
+from app.singleflight.group import SingleFlight
+from app.singleflight.middleware import (
+    RequestCoalescer,
+    SingleFlightMetrics,
+    SingleFlightMiddleware,
+)
+
+__all__ = [
+    "ENDPOINTS",
+    "RequestCoalescer",
+    "SingleFlight",
+    "SingleFlightMetrics",
+    "SingleFlightMiddleware",
+    "VARY_HEADERS",
+    "match_endpoint",
+]
@@ -0,0 +1,26 @@
+"""Endpoints whose concurrent identical requests may be coalesced."""
+
+import re
+
+# Only side-effect-free GET endpoints whose response depends on nothing but
+# the URL and the headers in ``VARY_HEADERS`` belong here.
+ENDPOINTS: dict[str, re.Pattern] = {
+    "car-availability": re.compile(r"^/api/v1/cars/[^/]+/availability$"),
+    "cars": re.compile(r"^/api/v1/cars(/count)?$"),
+    "car": re.compile(r"^/api/v1/cars/(?!count$)[^/]+$"),
+    "reports": re.compile(r"^/api/v1/reports/[^/]+$"),
+    "analytics": re.compile(r"^/api/v1/analytics/[^/]+$"),
+    "dashboard": re.compile(r"^/api/v1/dashboard/summary$"),
+}
+
+# Request headers that can change a response; they are part of the key.
+# Requests sharing a response also share its compressed body.
+VARY_HEADERS = (b"accept", b"accept-encoding")
+
+
+def match_endpoint(path: str, names: list[str]) -> str | None:
+    """Name of the first of the endpoints ``names`` that serves ``path``."""
+    for name in names:
+        if ENDPOINTS[name].match(path):
+            return name
+    return None
@@ -0,0 +1,47 @@
+"""Sharing one in-flight computation between identical callers."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Runs at most one computation per key at a time.
+
+    Callers asking for a key that is already being computed wait for that
+    computation and get its result (or exception) instead of starting their
+    own. Nothing is cached: once a computation finishes, the next caller
+    starts a new one.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self, key: Hashable, compute: Callable[[], Awaitable[T]]
+    ) -> tuple[T, bool]:
+        """Get the result for ``key``, and whether it was shared.
+
+        The computation runs in its own task, so a caller that is cancelled
+        (for example because its client disconnected) does not cancel it
+        for the others.
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Retrieved so that a failure nobody waited for is not logged.
+            task.exception()
@@ -0,0 +1,88 @@
+"""ASGI middleware coalescing concurrent identical GET requests."""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.singleflight.endpoints import ENDPOINTS, VARY_HEADERS, match_endpoint
+from app.singleflight.group import SingleFlight
+
+
+@dataclass
+class SingleFlightMetrics:
+    """Per endpoint: responses computed, and requests that shared one."""
+
+    executed: Counter = field(default_factory=Counter)
+    coalesced: Counter = field(default_factory=Counter)
+
+
+class RequestCoalescer:
+    """The endpoints to coalesce, the requests in flight and the counters."""
+
+    def __init__(self, endpoints: list[str]):
+        unknown = set(endpoints) - ENDPOINTS.keys()
+        if unknown:
+            raise ValueError(f"Unknown single-flight endpoints: {sorted(unknown)}")
+        self.endpoints = list(endpoints)
+        self.group: SingleFlight[list[Message]] = SingleFlight()
+        self.metrics = SingleFlightMetrics()
+
+    def status(self) -> dict:
+        """Per-endpoint counters, as served by the single-flight API."""
+        return {
+            "in_flight": len(self.group),
+            "endpoints": {
+                name: {
+                    "executed": self.metrics.executed[name],
+                    "coalesced": self.metrics.coalesced[name],
+                }
+                for name in self.endpoints
+            },
+        }
+
+
+class SingleFlightMiddleware:
+    """Serve concurrent identical GET requests from one computation.
+
+    The first request for a URL runs the application and its response
+    messages are recorded; identical requests arriving before it finishes
+    wait and are sent the same status, headers and body.
+    """
+
+    def __init__(self, app: ASGIApp, coalescer: RequestCoalescer):
+        self.app = app
+        self.coalescer = coalescer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        endpoint = None
+        if scope["type"] == "http" and scope["method"] == "GET":
+            endpoint = match_endpoint(scope["path"], self.coalescer.endpoints)
+        if endpoint is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        key = (
+            scope["path"],
+            scope["query_string"],
+            tuple(headers.get(name) for name in VARY_HEADERS),
+        )
+
+        async def compute() -> list[Message]:
+            messages: list[Message] = []
+
+            async def record(message: Message) -> None:
+                messages.append(message)
+
+            await self.app(scope, receive, record)
+            return messages
+
+        messages, shared = await self.coalescer.group.do(key, compute)
+        metrics = self.coalescer.metrics
+        if shared:
+            metrics.coalesced[endpoint] += 1
+        else:
+            metrics.executed[endpoint] += 1
+        for message in messages:
+            await send(message)
@@ -0,0 +1,184 @@
+"""Tests for admission control and load shedding."""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.admission import (
+    POOL_SATURATED,
+    QUEUE_FULL,
+    QUEUE_TIMEOUT,
+    AdmissionController,
+    PoolWaitTracker,
+    Priority,
+    TokenBuckets,
+    classify,
+)
+from app.main import app
+
+
+CARS_URL = "/api/v1/cars"
+ADMISSION_URL = "/api/v1/admission"
+
+
+def saturated_pool() -> PoolWaitTracker:
+    pool = PoolWaitTracker(weight=1.0, half_life=3600)
+    pool.observe(5.0)
+    return pool
+
+
+class TestPriorities:
+    """Tests for classifying requests."""
+
+    def test_classify(self):
+        assert classify("POST", "/api/v1/bookings/b1/pickup") == Priority.CRITICAL
+        assert classify("POST", "/api/v1/bookings/b1/return") == Priority.CRITICAL
+        assert classify("POST", "/api/v1/bookings") == Priority.WRITE
+        assert classify("GET", "/api/v1/bookings") == Priority.READ
+        assert classify("HEAD", "/api/v1/customers") == Priority.READ
+        assert classify("GET", "/api/v1/cars") == Priority.BROWSE
+        assert classify("GET", "/api/v1/cars/c1/availability") == Priority.BROWSE
+        assert classify("POST", "/api/v1/cars") == Priority.WRITE
+        assert classify("POST", "/api/v1/quotes") == Priority.BROWSE
+        assert classify("GET", "/api/v1/reports/revenue") == Priority.BROWSE
+
+
+class TestLimits:
+    """Tests for token buckets and the pool wait average."""
+
+    def test_token_bucket_allows_burst_then_refills(self):
+        buckets = TokenBuckets(rate=2.0, burst=3)
+        assert [buckets.take("a", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert buckets.take("a", now=0.0) == pytest.approx(0.5)
+        assert buckets.take("b", now=0.0) == 0.0
+        assert buckets.take("a", now=1.0) == 0.0
+
+    def test_token_bucket_forgets_least_recent_clients(self):
+        buckets = TokenBuckets(rate=1.0, burst=1, max_clients=2)
+        buckets.take("a", now=0.0)
+        buckets.take("b", now=0.0)
+        buckets.take("c", now=0.0)
+        assert buckets.take("a", now=0.0) == 0.0
+        assert buckets.take("c", now=0.0) > 0
+
+    def test_pool_wait_average_decays(self):
+        pool = PoolWaitTracker(weight=0.5, half_life=1.0)
+        pool.observe(1.0, now=0.0)
+        assert pool.current(now=0.0) == pytest.approx(0.5)
+        pool.observe(1.0, now=0.0)
+        assert pool.current(now=0.0) == pytest.approx(0.75)
+        assert pool.current(now=2.0) == pytest.approx(0.1875)
+
+
+@pytest.mark.asyncio
+class TestController:
+    """Tests for admitting, queueing and shedding requests."""
+
+    async def test_lower_priorities_get_a_smaller_share(self):
+        controller = AdmissionController(max_in_flight=4, queue_timeout=0.01)
+        assert await controller.acquire(Priority.BROWSE) is None
+        assert await controller.acquire(Priority.BROWSE) is None
+        assert await controller.acquire(Priority.BROWSE) == QUEUE_TIMEOUT
+        assert await controller.acquire(Priority.CRITICAL) is None
+        assert await controller.acquire(Priority.CRITICAL) is None
+        assert controller.in_flight == 4
+        assert controller.metrics.shed == {QUEUE_TIMEOUT: 1}
+        assert controller.waiting == 0
+
+    async def test_release_admits_highest_priority_first(self):
+        controller = AdmissionController(max_in_flight=1, queue_timeout=5)
+        assert await controller.acquire(Priority.WRITE) is None
+        order = []
+
+        async def request(priority):
+            assert await controller.acquire(priority) is None
+            order.append(priority)
+            controller.release()
+
+        tasks = [
+            asyncio.create_task(request(priority))
+            for priority in (Priority.READ, Priority.CRITICAL, Priority.READ)
+        ]
+        await asyncio.sleep(0)
+        assert controller.waiting == 3
+        controller.release()
+        await asyncio.gather(*tasks)
+        assert order == [Priority.CRITICAL, Priority.READ, Priority.READ]
+        assert controller.in_flight == 0
+
+    async def test_full_queue_sheds(self):
+        controller = AdmissionController(max_in_flight=1, max_queue=1)
+        assert await controller.acquire(Priority.WRITE) is None
+        waiter = asyncio.create_task(controller.acquire(Priority.WRITE))
+        await asyncio.sleep(0)
+        assert await controller.acquire(Priority.WRITE) == QUEUE_FULL
+        controller.release()
+        assert await waiter is None
+        assert controller.in_flight == 1
+
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        controller = AdmissionController(max_in_flight=1)
+        assert await controller.acquire(Priority.WRITE) is None
+        waiter = asyncio.create_task(controller.acquire(Priority.WRITE))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert controller.waiting == 0
+        controller.release()
+        assert controller.in_flight == 0
+
+    async def test_pool_pressure_sheds_reads_only(self):
+        controller = AdmissionController(max_in_flight=10, pool=saturated_pool())
+        assert await controller.acquire(Priority.BROWSE) == POOL_SATURATED
+        assert await controller.acquire(Priority.READ) == POOL_SATURATED
+        assert await controller.acquire(Priority.WRITE) is None
+        assert await controller.acquire(Priority.CRITICAL) is None
+
+
+@pytest.mark.asyncio
+class TestAdmissionAPI:
+    """Tests for the admission middleware and status endpoint."""
+
+    async def test_status(self, client: AsyncClient):
+        await client.get(CARS_URL)
+        response = await client.get(ADMISSION_URL)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["in_flight"] == 0
+        assert data["admitted"] >= 1
+        assert data["admitted_by_priority"]["browse"] >= 1
+
+    async def test_client_over_rate_gets_429(
+        self, client: AsyncClient, monkeypatch
+    ):
+        monkeypatch.setattr(
+            app.state.admission, "buckets", TokenBuckets(rate=0.5, burst=1)
+        )
+        assert (await client.get(CARS_URL)).status_code == 200
+        response = await client.get(CARS_URL)
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "2"
+        # Health checks and the status endpoint are never limited.
+        assert (await client.get("/health")).status_code == 200
+
+    async def test_shed_request_gets_503(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(app.state.admission, "pool", saturated_pool())
+        response = await client.get(CARS_URL)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert response.json()["reason"] == POOL_SATURATED
+
+        response = await client.post(
+            CARS_URL,
+            json={
+                "make": "Toyota",
+                "model": "Camry",
+                "year": 2024,
+                "license_plate": "ADM-0001",
+                "daily_rate": 50.00,
+                "category": "standard",
+            },
+        )
+        assert response.status_code == 201
@@ -0,0 +1,179 @@
+"""Tests for fleet analytics kernels and endpoints."""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+
+from app.analytics import (
+    BookingIntervals,
+    category_occupancy,
+    idle_streaks,
+    occupancy_matrix,
+)
+
+
+ANALYTICS_URL = "/api/v1/analytics"
+BOOKINGS_URL = "/api/v1/bookings"
+CARS_URL = "/api/v1/cars"
+CUSTOMERS_URL = "/api/v1/customers"
+
+SAMPLE_CUSTOMER = {
+    "first_name": "Alice",
+    "last_name": "Smith",
+    "email": "alice.smith@example.com",
+    "phone": "+1234567890",
+    "driver_license": "DL-999999",
+}
+
+
+def future_date(days_ahead: int) -> str:
+    """Return an ISO-formatted date N days from today."""
+    return (date.today() + timedelta(days=days_ahead)).isoformat()
+
+
+def period(start: int, end: int) -> dict:
+    """Query params for a period relative to today."""
+    return {"start_date": future_date(start), "end_date": future_date(end)}
+
+
+class TestOccupancyKernels:
+    """Tests for the NumPy kernels against straightforward loops."""
+
+    def _random_intervals(self, rng, cars: int, count: int) -> BookingIntervals:
+        start = rng.integers(-20, 80, count)
+        return BookingIntervals(
+            car=rng.integers(0, cars, count),
+            start=start,
+            end=start + rng.integers(1, 15, count),
+        )
+
+    def test_matrix_matches_loop(self):
+        rng = np.random.default_rng(1)
+        intervals = self._random_intervals(rng, cars=7, count=60)
+        occupied = occupancy_matrix(intervals, cars=7, first_day=0, days=60)
+
+        expected = np.zeros((7, 60), dtype=bool)
+        for car, start, end in zip(intervals.car, intervals.start, intervals.end):
+            expected[car, max(start, 0) : max(min(end, 60), 0)] = True
+        assert np.array_equal(occupied, expected)
+
+    def test_idle_streaks_match_loop(self):
+        rng = np.random.default_rng(2)
+        occupied = rng.random((5, 40)) < 0.6
+        car, first, length = idle_streaks(occupied, min_days=2)
+
+        expected = []
+        for row in range(5):
+            day = 0
+            while day < 40:
+                if occupied[row, day]:
+                    day += 1
+                    continue
+                stop = day
+                while stop < 40 and not occupied[row, stop]:
+                    stop += 1
+                if stop - day >= 2:
+                    expected.append((row, day, stop - day))
+                day = stop
+        assert list(zip(car.tolist(), first.tolist(), length.tolist())) == expected
+
+    def test_category_occupancy(self):
+        occupied = np.array([[1, 1, 0], [0, 1, 0], [1, 0, 0]], dtype=bool)
+        curves, sizes = category_occupancy(occupied, np.array([0, 0, 2]), 3)
+        assert sizes.tolist() == [2, 0, 1]
+        assert curves.tolist() == [[0.5, 1.0, 0.0], [0.0] * 3, [1.0, 0.0, 0.0]]
+
+
+@pytest.mark.asyncio
+class TestAnalyticsEndpoints:
+    """Tests for /api/v1/analytics."""
+
+    async def _setup(self, client: AsyncClient) -> tuple[dict, dict]:
+        customer = (await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+        cars = []
+        for n, category in enumerate(("standard", "luxury")):
+            resp = await client.post(
+                CARS_URL,
+                json={
+                    "make": "Toyota",
+                    "model": "Camry",
+                    "year": 2024,
+                    "license_plate": f"ANL-{n}",
+                    "daily_rate": 50.0,
+                    "category": category,
+                },
+            )
+            cars.append(resp.json())
+        standard, luxury = cars
+        for start, end in ((1, 3), (6, 8)):
+            await client.post(
+                BOOKINGS_URL,
+                json={
+                    "car_id": standard["id"],
+                    "customer_id": customer["id"],
+                    "start_date": future_date(start),
+                    "end_date": future_date(end),
+                },
+            )
+        cancelled = await client.post(
+            BOOKINGS_URL,
+            json={
+                "car_id": luxury["id"],
+                "customer_id": customer["id"],
+                "start_date": future_date(1),
+                "end_date": future_date(5),
+            },
+        )
+        await client.post(f"{BOOKINGS_URL}/{cancelled.json()['id']}/cancel")
+        return standard, luxury
+
+    async def test_utilization_matrix(self, client: AsyncClient):
+        standard, luxury = await self._setup(client)
+
+        response = await client.get(
+            f"{ANALYTICS_URL}/utilization-matrix", params=period(0, 9)
+        )
+        assert response.status_code == 200
+        rows = {row["car_id"]: row for row in response.json()["cars"]}
+        assert rows[standard["id"]]["days"] == "0110001100"
+        assert rows[standard["id"]]["booked_days"] == 4
+        assert rows[standard["id"]]["utilization"] == 0.4
+        assert rows[luxury["id"]]["days"] == "0" * 10
+
+    async def test_occupancy_curves(self, client: AsyncClient):
+        await self._setup(client)
+
+        response = await client.get(
+            f"{ANALYTICS_URL}/occupancy",
+            params={**period(0, 3), "category": "standard"},
+        )
+        assert response.status_code == 200
+        assert response.json()["curves"] == [
+            {"category": "standard", "cars": 1, "occupancy": [0.0, 1.0, 1.0, 0.0]}
+        ]
+
+    async def test_idle_streaks(self, client: AsyncClient):
+        standard, luxury = await self._setup(client)
+
+        response = await client.get(
+            f"{ANALYTICS_URL}/idle-streaks", params={**period(0, 9), "min_days": 2}
+        )
+        assert response.status_code == 200
+        streaks = [(s["car_id"], s["start_date"], s["days"]) for s in response.json()]
+        assert streaks == [
+            (luxury["id"], future_date(0), 10),
+            (standard["id"], future_date(3), 3),
+            (standard["id"], future_date(8), 2),
+        ]
+
+    async def test_invalid_periods(self, client: AsyncClient):
+        response = await client.get(
+            f"{ANALYTICS_URL}/occupancy", params=period(5, 1)
+        )
+        assert response.status_code == 400
+        response = await client.get(
+            f"{ANALYTICS_URL}/occupancy", params=period(0, 5000)
+        )
+        assert response.status_code == 400
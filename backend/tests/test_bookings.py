@@ -4,6 +4,9 @@ from datetime import date, timedelta
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
+
+from tests.conftest import engine
 
 
 BOOKINGS_URL = "/api/v1/bookings"
@@ -419,3 +422,135 @@ class TestReturnCar:
         response = await client.post(f"{BOOKINGS_URL}/{booking_id}/return")
         assert response.status_code == 400
         assert "active" in response.json()["detail"].lower()
+
+
+@pytest.mark.asyncio
+class TestBookingIncludes:
+    """Tests for ?include=car,customer on GET /api/v1/bookings."""
+
+    async def _create_booking(self, client: AsyncClient, n: int) -> dict:
+        car = (
+            await client.post(CARS_URL, json={**SAMPLE_CAR, "license_plate": f"INC-{n}"})
+        ).json()
+        customer = (
+            await client.post(
+                CUSTOMERS_URL,
+                json={**SAMPLE_CUSTOMER, "email": f"include{n}@example.com"},
+            )
+        ).json()
+        resp = await client.post(
+            BOOKINGS_URL,
+            json={
+                "car_id": car["id"],
+                "customer_id": customer["id"],
+                "start_date": future_date(1),
+                "end_date": future_date(3),
+            },
+        )
+        return resp.json()
+
+    async def test_relations_omitted_by_default(self, client: AsyncClient):
+        booking = await self._create_booking(client, 1)
+
+        response = await client.get(BOOKINGS_URL)
+        assert response.status_code == 200
+        assert "car" not in response.json()[0]
+        assert "customer" not in response.json()[0]
+        assert response.json()[0]["actual_return_date"] is None
+
+        detail = await client.get(f"{BOOKINGS_URL}/{booking['id']}")
+        assert "car" not in detail.json()
+
+    async def test_list_embeds_relations(self, client: AsyncClient):
+        for n in range(3):
+            await self._create_booking(client, n)
+
+        response = await client.get(BOOKINGS_URL, params={"include": "car,customer"})
+        assert response.status_code == 200
+        for booking in response.json():
+            assert booking["car"]["id"] == booking["car_id"]
+            assert booking["customer"]["id"] == booking["customer_id"]
+
+    async def test_list_query_count_is_bounded(self, client: AsyncClient):
+        for n in range(5):
+            await self._create_booking(client, n)
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            response = await client.get(
+                BOOKINGS_URL, params={"include": "car,customer"}
+            )
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+        assert response.status_code == 200
+        assert len([s for s in statements if s.lstrip().startswith("SELECT")]) == 3
+
+    async def test_detail_embeds_single_relation(self, client: AsyncClient):
+        booking = await self._create_booking(client, 1)
+
+        response = await client.get(
+            f"{BOOKINGS_URL}/{booking['id']}", params={"include": "car"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["car"]["license_plate"] == "INC-1"
+        assert "customer" not in data
+
+    async def test_unknown_include_rejected(self, client: AsyncClient):
+        response = await client.get(BOOKINGS_URL, params={"include": "car,invoice"})
+        assert response.status_code == 400
+        assert "invoice" in response.json()["detail"]
+
+    async def test_fields_with_relations(self, client: AsyncClient):
+        for n in range(3):
+            await self._create_booking(client, n)
+
+        response = await client.get(
+            BOOKINGS_URL, params={"fields": "status", "include": "car,customer"}
+        )
+        assert response.status_code == 200
+        for booking in response.json():
+            assert set(booking) == {"status", "car", "customer"}
+            assert booking["status"] == "reserved"
+            assert booking["car"]["license_plate"].startswith("INC-")
+            assert "created_at" in booking["customer"]
+
+    async def test_counts(self, client: AsyncClient):
+        booking = await self._create_booking(client, 1)
+        await self._create_booking(client, 2)
+        await client.post(f"{BOOKINGS_URL}/{booking['id']}/cancel")
+
+        response = await client.get(f"{BOOKINGS_URL}/count")
+        assert response.json() == {"count": 2}
+        response = await client.get(
+            f"{BOOKINGS_URL}/count", params={"status": "cancelled"}
+        )
+        assert response.json() == {"count": 1}
+
+        response = await client.head(
+            BOOKINGS_URL, params={"car_id": booking["car_id"]}
+        )
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == "1"
+
+        response = await client.get(BOOKINGS_URL, params={"status": "reserved"})
+        assert response.headers["X-Total-Count"] == "1"
+
+    async def test_detail_fields(self, client: AsyncClient):
+        booking = await self._create_booking(client, 1)
+
+        response = await client.get(
+            f"{BOOKINGS_URL}/{booking['id']}",
+            params={"fields": "start_date,end_date,total_cost"},
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "start_date": booking["start_date"],
+            "end_date": booking["end_date"],
+            "total_cost": booking["total_cost"],
+        }
@@ -2,6 +2,12 @@
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event, func
+from sqlalchemy.dialects import sqlite
+
+from app.repositories.car import CarRepository
+from app.schemas.car import CarCategory, CarSort, CarStatus
+from tests.conftest import engine
 
 
 CARS_URL = "/api/v1/cars"
@@ -106,6 +112,189 @@ class TestListCars:
         assert response.status_code == 200
         assert len(response.json()) == 1
 
+    async def test_list_cars_total_count_header(self, client: AsyncClient):
+        await client.post(CARS_URL, json=SAMPLE_CAR)
+        response = await client.get(CARS_URL)
+        assert response.headers["X-Total-Count"] == "1"
+
+
+@pytest.mark.asyncio
+class TestCountCars:
+    """Tests for GET /api/v1/cars/count and HEAD /api/v1/cars."""
+
+    async def test_count_with_filters(self, client: AsyncClient):
+        await client.post(CARS_URL, json=SAMPLE_CAR)
+        await client.post(
+            CARS_URL,
+            json={**SAMPLE_CAR, "license_plate": "SUV-1", "category": "suv"},
+        )
+
+        response = await client.get(f"{CARS_URL}/count")
+        assert response.status_code == 200
+        assert response.json() == {"count": 2}
+
+        response = await client.get(
+            f"{CARS_URL}/count", params={"category": "suv", "status": "available"}
+        )
+        assert response.json() == {"count": 1}
+
+    async def test_count_rejects_inverted_range(self, client: AsyncClient):
+        response = await client.get(
+            f"{CARS_URL}/count", params={"min_year": 2024, "max_year": 2020}
+        )
+        assert response.status_code == 400
+
+    async def test_head_returns_count_without_body(self, client: AsyncClient):
+        await client.post(CARS_URL, json=SAMPLE_CAR)
+
+        response = await client.head(CARS_URL, params={"category": "standard"})
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == "1"
+        assert response.content == b""
+
+        response = await client.head(CARS_URL, params={"category": "luxury"})
+        assert response.headers["X-Total-Count"] == "0"
+
+
+@pytest.mark.asyncio
+class TestSearchCars:
+    """Tests for range filters, prefixes and sorting on GET /api/v1/cars."""
+
+    FLEET = [
+        ("Toyota", "Camry", 2020, 45.0, "standard"),
+        ("Toyota", "RAV4", 2023, 75.0, "suv"),
+        ("Tesla", "Model 3", 2022, 95.0, "luxury"),
+        ("Honda", "Civic", 2018, 35.0, "economy"),
+    ]
+
+    async def _create_fleet(self, client: AsyncClient) -> None:
+        for n, (make, model, year, rate, category) in enumerate(self.FLEET):
+            await client.post(
+                CARS_URL,
+                json={
+                    "make": make,
+                    "model": model,
+                    "year": year,
+                    "license_plate": f"SRCH-{n}",
+                    "daily_rate": rate,
+                    "category": category,
+                },
+            )
+
+    async def test_make_and_model_prefix(self, client: AsyncClient):
+        await self._create_fleet(client)
+
+        response = await client.get(CARS_URL, params={"make": "t"})
+        assert len(response.json()) == 3
+        response = await client.get(CARS_URL, params={"make": "TOY", "model": "ra"})
+        assert [c["model"] for c in response.json()] == ["RAV4"]
+
+    async def test_non_ascii_make_prefix(self, client: AsyncClient):
+        await client.post(
+            CARS_URL,
+            json={**SAMPLE_CAR, "make": "Škoda", "license_plate": "SRCH-SK"},
+        )
+
+        response = await client.get(CARS_URL, params={"make": "ŠKO"})
+        assert [c["make"] for c in response.json()] == ["Škoda"]
+
+    async def test_year_and_rate_ranges(self, client: AsyncClient):
+        await self._create_fleet(client)
+
+        response = await client.get(
+            CARS_URL, params={"min_year": 2020, "max_year": 2022}
+        )
+        assert {c["model"] for c in response.json()} == {"Camry", "Model 3"}
+        response = await client.get(CARS_URL, params={"min_rate": 40, "max_rate": 75})
+        assert {c["model"] for c in response.json()} == {"Camry", "RAV4"}
+
+    async def test_sorting(self, client: AsyncClient):
+        await self._create_fleet(client)
+
+        response = await client.get(CARS_URL, params={"sort": "daily_rate"})
+        assert [c["daily_rate"] for c in response.json()] == [35.0, 45.0, 75.0, 95.0]
+        response = await client.get(CARS_URL, params={"sort": "-year"})
+        assert [c["year"] for c in response.json()] == [2023, 2022, 2020, 2018]
+
+    async def test_inverted_range_rejected(self, client: AsyncClient):
+        response = await client.get(CARS_URL, params={"min_rate": 80, "max_rate": 20})
+        assert response.status_code == 400
+
+    async def test_invalid_sort_rejected(self, client: AsyncClient):
+        response = await client.get(CARS_URL, params={"sort": "make"})
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+class TestCarQueryPlans:
+    """Each common listing shape must be served by an index without sorting."""
+
+    async def _plan(self, count: bool = False, **filters) -> str:
+        query = CarRepository(None).filtered_query(**filters)
+        if count:
+            query = query.with_only_columns(func.count(), maintain_column_froms=True)
+        sql = query.compile(
+            dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}
+        )
+        async with engine.connect() as conn:
+            rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            return "\n".join(row[-1] for row in rows)
+
+    @pytest.mark.parametrize(
+        "filters, index",
+        [
+            (
+                {
+                    "status": CarStatus.AVAILABLE,
+                    "category": CarCategory.SUV,
+                    "sort": CarSort.DAILY_RATE,
+                },
+                "ix_cars_status_category_daily_rate",
+            ),
+            (
+                {
+                    "status": CarStatus.AVAILABLE,
+                    "category": CarCategory.SUV,
+                    "min_rate": 20,
+                    "max_rate": 80,
+                },
+                "ix_cars_status_category_daily_rate",
+            ),
+            (
+                {
+                    "status": CarStatus.AVAILABLE,
+                    "min_rate": 20,
+                    "max_rate": 80,
+                    "sort": CarSort.DAILY_RATE_DESC,
+                },
+                "ix_cars_status_daily_rate",
+            ),
+            (
+                {"status": CarStatus.AVAILABLE, "min_year": 2020, "sort": CarSort.YEAR},
+                "ix_cars_status_year",
+            ),
+            ({"make": "toy", "model": "ca"}, "ix_cars_make_model"),
+        ],
+    )
+    async def test_query_shape_uses_index(self, filters, index):
+        plan = await self._plan(**filters)
+        assert f"USING INDEX {index}" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.parametrize(
+        "filters, index",
+        [
+            (
+                {"status": CarStatus.AVAILABLE, "category": CarCategory.SUV},
+                "ix_cars_status_category_daily_rate",
+            ),
+            ({"status": CarStatus.RENTED, "min_year": 2020}, "ix_cars_status_year"),
+        ],
+    )
+    async def test_count_is_index_only(self, filters, index):
+        plan = await self._plan(count=True, **filters)
+        assert f"USING COVERING INDEX {index}" in plan
+
 
 @pytest.mark.asyncio
 class TestGetCar:
@@ -123,9 +312,76 @@ class TestGetCar:
     async def test_get_car_not_found(self, client: AsyncClient):
         response = await client.get(f"{CARS_URL}/nonexistent-id")
         assert response.status_code == 404
+
+    async def test_get_car_by_other_uuid_spelling(self, client: AsyncClient):
+        """Test that only the canonical form of a car's UUID finds it."""
+        create_resp = await client.post(CARS_URL, json=SAMPLE_CAR)
+        car_id = create_resp.json()["id"]
+
+        for other in (car_id.upper(), car_id.replace("-", ""), f"{{{car_id}}}"):
+            response = await client.get(f"{CARS_URL}/{other}")
+            assert response.status_code == 404
         assert response.json()["detail"] == "Car not found"
 
 
+@pytest.mark.asyncio
+class TestCarFields:
+    """Tests for ?fields= on GET /api/v1/cars."""
+
+    async def test_list_returns_only_selected_fields(self, client: AsyncClient):
+        await client.post(CARS_URL, json=SAMPLE_CAR)
+
+        response = await client.get(
+            CARS_URL, params={"fields": "id,license_plate,status"}
+        )
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "id": response.json()[0]["id"],
+                "license_plate": "ABC-1234",
+                "status": "available",
+            }
+        ]
+
+    async def test_list_selects_only_selected_columns(self, client: AsyncClient):
+        await client.post(CARS_URL, json=SAMPLE_CAR)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await client.get(CARS_URL, params={"fields": "license_plate,status"})
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+        (select,) = [s for s in statements if s.lstrip().startswith("SELECT")]
+        columns = select.split("FROM")[0]
+        assert "cars.license_plate" in columns
+        assert "cars.daily_rate" not in columns
+        assert "cars.created_at" not in columns
+
+    async def test_detail_returns_only_selected_fields(self, client: AsyncClient):
+        car_id = (await client.post(CARS_URL, json=SAMPLE_CAR)).json()["id"]
+
+        response = await client.get(
+            f"{CARS_URL}/{car_id}", params={"fields": "daily_rate, category"}
+        )
+        assert response.status_code == 200
+        assert response.json() == {"daily_rate": 49.99, "category": "standard"}
+
+    async def test_all_fields_by_default(self, client: AsyncClient):
+        await client.post(CARS_URL, json=SAMPLE_CAR)
+
+        response = await client.get(CARS_URL, params={"fields": ""})
+        assert set(response.json()[0]) == {*SAMPLE_CAR, "id", "status", "created_at"}
+
+    async def test_unknown_field_rejected(self, client: AsyncClient):
+        response = await client.get(CARS_URL, params={"fields": "id,vin"})
+        assert response.status_code == 400
+        assert "vin" in response.json()["detail"]
+
+
 @pytest.mark.asyncio
 class TestUpdateCar:
     """Tests for PUT /api/v1/cars/{id}."""
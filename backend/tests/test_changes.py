@@ -0,0 +1,171 @@
+"""Tests for the change feed."""
+
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.jobs import sweep_bookings
+from tests.conftest import TestSessionLocal
+
+
+CHANGES_URL = "/api/v1/changes"
+CARS_URL = "/api/v1/cars"
+CUSTOMERS_URL = "/api/v1/customers"
+BOOKINGS_URL = "/api/v1/bookings"
+
+SAMPLE_CAR = {
+    "make": "Toyota",
+    "model": "Camry",
+    "year": 2024,
+    "license_plate": "CHG-0001",
+    "daily_rate": 50.00,
+}
+
+SAMPLE_CUSTOMER = {
+    "first_name": "Alice",
+    "last_name": "Smith",
+    "email": "alice.smith@example.com",
+    "phone": "+1234567890",
+    "driver_license": "DL-123456",
+}
+
+
+def future_date(days_ahead: int) -> str:
+    """Return an ISO-formatted date N days from today."""
+    return (date.today() + timedelta(days=days_ahead)).isoformat()
+
+
+async def changes_since(client: AsyncClient, since: int, **params) -> dict:
+    response = await client.get(CHANGES_URL, params={"since": since, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def entries(feed: dict) -> list[tuple]:
+    return [(c["entity"], c["id"], c["deleted"]) for c in feed["changes"]]
+
+
+@pytest.mark.asyncio
+class TestChangeFeed:
+    """Tests for GET /api/v1/changes."""
+
+    async def test_empty(self, client: AsyncClient):
+        feed = await changes_since(client, 0)
+        assert feed == {"changes": [], "next": 0, "latest": 0}
+
+    async def test_records_every_write(self, client: AsyncClient):
+        car = (await client.post(CARS_URL, json=SAMPLE_CAR)).json()
+        customer = (await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+        feed = await changes_since(client, 0)
+        assert entries(feed) == [
+            ("car", car["id"], False),
+            ("customer", customer["id"], False),
+        ]
+        assert feed["next"] == feed["latest"] == feed["changes"][-1]["seq"]
+        cursor = feed["next"]
+
+        booking = (
+            await client.post(
+                BOOKINGS_URL,
+                json={
+                    "car_id": car["id"],
+                    "customer_id": customer["id"],
+                    "start_date": future_date(0),
+                    "end_date": future_date(2),
+                },
+            )
+        ).json()
+        await client.post(f"{BOOKINGS_URL}/{booking['id']}/pickup")
+        await client.put(
+            f"{CUSTOMERS_URL}/{customer['id']}", json={"phone": "+1987654321"}
+        )
+        feed = await changes_since(client, cursor)
+        assert entries(feed) == [
+            ("booking", booking["id"], False),
+            ("car", car["id"], False),
+            ("booking", booking["id"], False),
+            ("customer", customer["id"], False),
+        ]
+        cursor = feed["next"]
+
+        await client.post(f"{BOOKINGS_URL}/{booking['id']}/return")
+        other = (
+            await client.post(
+                CUSTOMERS_URL,
+                json={**SAMPLE_CUSTOMER, "email": "bob@example.com"},
+            )
+        ).json()
+        await client.delete(f"{CUSTOMERS_URL}/{other['id']}")
+        feed = await changes_since(client, cursor)
+        assert entries(feed) == [
+            ("car", car["id"], False),
+            ("booking", booking["id"], False),
+            ("customer", other["id"], False),
+            ("customer", other["id"], True),
+        ]
+        assert await changes_since(client, feed["next"]) == {
+            "changes": [],
+            "next": feed["next"],
+            "latest": feed["next"],
+        }
+
+    async def test_failed_write_is_not_recorded(self, client: AsyncClient):
+        await client.post(CARS_URL, json=SAMPLE_CAR)
+        latest = (await changes_since(client, 0))["latest"]
+        response = await client.post(CARS_URL, json=SAMPLE_CAR)
+        assert response.status_code == 400
+        assert (await changes_since(client, 0))["latest"] == latest
+
+    async def test_pages(self, client: AsyncClient):
+        for n in range(5):
+            await client.post(
+                CARS_URL, json={**SAMPLE_CAR, "license_plate": f"CHG-{n}"}
+            )
+        seen = []
+        cursor = 0
+        while True:
+            feed = await changes_since(client, cursor, limit=2)
+            if not feed["changes"]:
+                break
+            assert len(feed["changes"]) <= 2
+            seen += [c["seq"] for c in feed["changes"]]
+            cursor = feed["next"]
+        assert seen == sorted(seen)
+        assert len(seen) == 5
+        assert cursor == feed["latest"]
+
+    async def test_invalid_parameters(self, client: AsyncClient):
+        assert (await client.get(CHANGES_URL, params={"since": -1})).status_code == 422
+        assert (await client.get(CHANGES_URL, params={"limit": 0})).status_code == 422
+
+    async def test_sweeper_records_and_compacts(self, client: AsyncClient):
+        car = (await client.post(CARS_URL, json=SAMPLE_CAR)).json()
+        customer = (await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+        booking = (
+            await client.post(
+                BOOKINGS_URL,
+                json={
+                    "car_id": car["id"],
+                    "customer_id": customer["id"],
+                    "start_date": future_date(1),
+                    "end_date": future_date(3),
+                },
+            )
+        ).json()
+        cursor = (await changes_since(client, 0))["next"]
+
+        result = await sweep_bookings(
+            TestSessionLocal, date.today() + timedelta(days=5), no_show_grace_days=0
+        )
+        assert result.expired == 1
+        # The booking's creation was superseded by its expiry.
+        assert result.compacted == 1
+        feed = await changes_since(client, cursor)
+        assert entries(feed) == [("booking", booking["id"], False)]
+        feed = await changes_since(client, 0)
+        assert entries(feed) == [
+            ("car", car["id"], False),
+            ("customer", customer["id"], False),
+            ("booking", booking["id"], False),
+        ]
@@ -0,0 +1,118 @@
+"""Tests for negotiated response compression."""
+
+import gzip
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.compression import CODECS, CompressionMiddleware, available, negotiate
+
+
+CARS_URL = "/api/v1/cars"
+
+
+def make_car(n: int) -> dict:
+    return {
+        "make": "Toyota",
+        "model": "Camry",
+        "year": 2024,
+        "license_plate": f"CMP-{n:04d}",
+        "daily_rate": 50.00,
+        "category": "standard",
+    }
+
+
+async def stream_rows():
+    for n in range(100):
+        yield f"row {n},{'x' * 50}\n".encode()
+
+
+def stream_app(media_type: str = "text/csv") -> Starlette:
+    async def rows(request):
+        return StreamingResponse(stream_rows(), media_type=media_type)
+
+    async def small(request):
+        return JSONResponse({"ok": True})
+
+    return Starlette(routes=[Route("/rows", rows), Route("/small", small)])
+
+
+def raw_client(app, min_size: int = 1024) -> AsyncClient:
+    """A client that does not decode, to see the bytes on the wire."""
+    wrapped = CompressionMiddleware(app, codings=["gzip"], min_size=min_size)
+    return AsyncClient(transport=ASGITransport(app=wrapped), base_url="http://test")
+
+
+class TestNegotiation:
+    """Tests for choosing a content coding."""
+
+    def test_negotiate(self):
+        codings = ["zstd", "br", "gzip"]
+        assert negotiate("gzip, deflate, br, zstd", codings) == "zstd"
+        assert negotiate("gzip, br;q=0.9", codings) == "gzip"
+        assert negotiate("br;q=0.5, gzip;q=0.8", codings) == "gzip"
+        assert negotiate("*", codings) == "zstd"
+        assert negotiate("*;q=0.1, gzip;q=0", ["gzip"]) is None
+        assert negotiate("identity", codings) is None
+        assert negotiate("", codings) is None
+        assert negotiate("gzip;q=nonsense", codings) is None
+
+    def test_available(self):
+        assert available(["gzip"]) == ["gzip"]
+        assert set(available(["zstd", "br", "gzip"])) == set(CODECS)
+        with pytest.raises(ValueError, match="lz4"):
+            available(["lz4"])
+
+
+@pytest.mark.asyncio
+class TestCompressionMiddleware:
+    """Tests for compressing response bodies."""
+
+    async def test_streamed_response_is_compressed_incrementally(self):
+        async with raw_client(stream_app()) as client:
+            async with client.stream(
+                "GET", "/rows", headers={"Accept-Encoding": "gzip"}
+            ) as response:
+                body = b"".join([chunk async for chunk in response.aiter_raw()])
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert gzip.decompress(body) == b"".join(
+            f"row {n},{'x' * 50}\n".encode() for n in range(100)
+        )
+
+    async def test_small_and_unwanted_responses_are_left_alone(self):
+        async with raw_client(stream_app()) as client:
+            small = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+            identity = await client.get("/rows", headers={"Accept-Encoding": "br"})
+        assert small.json() == {"ok": True}
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in identity.headers
+
+    async def test_event_streams_are_not_compressed(self):
+        async with raw_client(stream_app("text/event-stream")) as client:
+            response = await client.get("/rows", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    async def test_api_compresses_large_lists(self, client: AsyncClient):
+        for n in range(20):
+            await client.post(CARS_URL, json=make_car(n))
+
+        for coding in CODECS:
+            response = await client.get(CARS_URL, headers={"Accept-Encoding": coding})
+            assert response.status_code == 200
+            assert response.headers["content-encoding"] == coding
+            assert int(response.headers["content-length"]) < len(response.content)
+            assert len(response.json()) == 20
+
+        response = await client.get(CARS_URL, headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        # A single car is below the size threshold.
+        single = await client.get(
+            f"{CARS_URL}/{response.json()[0]['id']}",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert "content-encoding" not in single.headers
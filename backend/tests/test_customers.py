@@ -1,10 +1,21 @@
 """Tests for Customer CRUD operations."""
 
+from datetime import date, datetime, timedelta
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.cli.rebuild import ensure_search_index
+from app.models.archive import ArchivedBooking
+from app.models.booking import BookingStatus
+from app.models.keys import uuid7
+from tests.conftest import TestSessionLocal, engine
 
 
 CUSTOMERS_URL = "/api/v1/customers"
+CARS_URL = "/api/v1/cars"
+BOOKINGS_URL = "/api/v1/bookings"
 
 SAMPLE_CUSTOMER = {
     "first_name": "John",
@@ -92,6 +103,52 @@ class TestGetCustomer:
         assert response.json()["detail"] == "Customer not found"
 
 
+@pytest.mark.asyncio
+class TestCountCustomers:
+    """Tests for customer totals."""
+
+    async def test_count(self, client: AsyncClient):
+        await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)
+
+        response = await client.get(f"{CUSTOMERS_URL}/count")
+        assert response.status_code == 200
+        assert response.json() == {"count": 1}
+
+        response = await client.head(CUSTOMERS_URL)
+        assert response.headers["X-Total-Count"] == "1"
+        assert response.content == b""
+
+        response = await client.get(CUSTOMERS_URL)
+        assert response.headers["X-Total-Count"] == "1"
+
+
+@pytest.mark.asyncio
+class TestCustomerFields:
+    """Tests for ?fields= on GET /api/v1/customers."""
+
+    async def test_list_returns_only_selected_fields(self, client: AsyncClient):
+        await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)
+
+        response = await client.get(
+            CUSTOMERS_URL, params={"fields": "first_name,last_name"}
+        )
+        assert response.status_code == 200
+        assert response.json() == [{"first_name": "John", "last_name": "Doe"}]
+
+    async def test_detail_returns_only_selected_fields(self, client: AsyncClient):
+        created = (await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+
+        response = await client.get(
+            f"{CUSTOMERS_URL}/{created['id']}", params={"fields": "id,email"}
+        )
+        assert response.status_code == 200
+        assert response.json() == {"id": created["id"], "email": created["email"]}
+
+    async def test_unknown_field_rejected(self, client: AsyncClient):
+        response = await client.get(CUSTOMERS_URL, params={"fields": "password"})
+        assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 class TestUpdateCustomer:
     """Tests for PUT /api/v1/customers/{id}."""
@@ -154,3 +211,206 @@ class TestDeleteCustomer:
     async def test_delete_customer_not_found(self, client: AsyncClient):
         response = await client.delete(f"{CUSTOMERS_URL}/nonexistent-id")
         assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+class TestSearchCustomers:
+    """Tests for GET /api/v1/customers/search."""
+
+    async def _create_customers(self, client: AsyncClient) -> None:
+        await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)
+        await client.post(
+            CUSTOMERS_URL,
+            json={
+                "first_name": "Jane",
+                "last_name": "Johnson",
+                "email": "jane.j@example.com",
+                "phone": "+4477700000",
+                "driver_license": "UK-555123",
+            },
+        )
+
+    async def test_search_by_name_prefix(self, client: AsyncClient):
+        await self._create_customers(client)
+
+        response = await client.get(f"{CUSTOMERS_URL}/search", params={"q": "joh"})
+        assert response.status_code == 200
+        names = {c["first_name"] for c in response.json()}
+        assert names == {"John", "Jane"}
+
+        response = await client.get(
+            f"{CUSTOMERS_URL}/search", params={"q": "jan joh"}
+        )
+        assert [c["first_name"] for c in response.json()] == ["Jane"]
+
+    async def test_missing_index_is_backfilled_at_startup(self, client: AsyncClient):
+        await self._create_customers(client)
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP TABLE customers_fts"))
+            await ensure_search_index(conn)
+
+        response = await client.get(f"{CUSTOMERS_URL}/search", params={"q": "joh"})
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+
+    async def test_search_by_email_phone_and_license(self, client: AsyncClient):
+        await self._create_customers(client)
+
+        for q in ("john.doe@", "44777", "UK-555"):
+            response = await client.get(f"{CUSTOMERS_URL}/search", params={"q": q})
+            assert len(response.json()) == 1, q
+
+    async def test_search_index_follows_updates_and_deletes(self, client: AsyncClient):
+        create_resp = await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)
+        customer_id = create_resp.json()["id"]
+
+        await client.put(f"{CUSTOMERS_URL}/{customer_id}", json={"last_name": "Zed"})
+        response = await client.get(f"{CUSTOMERS_URL}/search", params={"q": "doe j"})
+        assert response.json()[0]["last_name"] == "Zed"  # email still matches
+        response = await client.get(f"{CUSTOMERS_URL}/search", params={"q": "zed"})
+        assert len(response.json()) == 1
+
+        await client.delete(f"{CUSTOMERS_URL}/{customer_id}")
+        response = await client.get(f"{CUSTOMERS_URL}/search", params={"q": "zed"})
+        assert response.json() == []
+
+    async def test_search_ignores_fts_syntax(self, client: AsyncClient):
+        await self._create_customers(client)
+
+        response = await client.get(
+            f"{CUSTOMERS_URL}/search", params={"q": '"OR * NEAR('}
+        )
+        assert response.status_code == 200
+        assert response.json() == []
+
+    async def test_search_requires_query(self, client: AsyncClient):
+        response = await client.get(f"{CUSTOMERS_URL}/search")
+        assert response.status_code == 422
+
+
+def days_from_now(days: int) -> date:
+    return date.today() + timedelta(days=days)
+
+
+@pytest.mark.asyncio
+class TestCustomerBookings:
+    """Tests for GET /api/v1/customers/{id}/bookings."""
+
+    async def _book(self, client: AsyncClient, car: dict, customer: dict, start: int):
+        response = await client.post(
+            BOOKINGS_URL,
+            json={
+                "car_id": car["id"],
+                "customer_id": customer["id"],
+                "start_date": days_from_now(start).isoformat(),
+                "end_date": days_from_now(start + 2).isoformat(),
+            },
+        )
+        return response.json()
+
+    async def _history(self, client: AsyncClient) -> tuple[dict, dict, list[dict]]:
+        customer = (await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+        car = (
+            await client.post(
+                CARS_URL,
+                json={
+                    "make": "Toyota",
+                    "model": "Camry",
+                    "year": 2024,
+                    "license_plate": "HIS-001",
+                    "daily_rate": 50.0,
+                },
+            )
+        ).json()
+        bookings = [await self._book(client, car, customer, 3 * n) for n in range(5)]
+        await client.post(f"{BOOKINGS_URL}/{bookings[0]['id']}/pickup")
+        await client.post(f"{BOOKINGS_URL}/{bookings[0]['id']}/return")
+        await client.post(f"{BOOKINGS_URL}/{bookings[1]['id']}/cancel")
+        return car, customer, bookings
+
+    async def test_pages_latest_first(self, client: AsyncClient):
+        _, customer, bookings = await self._history(client)
+        url = f"{CUSTOMERS_URL}/{customer['id']}/bookings"
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = await client.get(url, params=params)
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(booking["id"] for booking in data["bookings"])
+            cursor = data["next"]
+            if cursor is None:
+                break
+        assert seen == [booking["id"] for booking in reversed(bookings)]
+
+    async def test_summary(self, client: AsyncClient):
+        _, customer, bookings = await self._history(client)
+        response = await client.get(
+            f"{CUSTOMERS_URL}/{customer['id']}/bookings",
+            params={"limit": 1, "include": "car"},
+        )
+        data = response.json()
+        assert len(data["bookings"]) == 1
+        assert data["bookings"][0]["car"]["license_plate"] == "HIS-001"
+        assert "customer" not in data["bookings"][0]
+        summary = data["summary"]
+        assert summary["bookings"] == 5
+        assert summary["by_status"]["reserved"] == 3
+        assert summary["by_status"]["completed"] == 1
+        assert summary["by_status"]["cancelled"] == 1
+        assert summary["by_status"]["active"] == 0
+        assert summary["total_spend"] == bookings[0]["total_cost"]
+        assert summary["last_rental"] == bookings[0]["start_date"]
+
+    async def test_archived(self, client: AsyncClient):
+        car, customer, _ = await self._history(client)
+        async with TestSessionLocal() as session, session.begin():
+            session.add(
+                ArchivedBooking(
+                    id=uuid7(),
+                    car_id=car["id"],
+                    customer_id=customer["id"],
+                    start_date=days_from_now(-400),
+                    end_date=days_from_now(-398),
+                    total_cost=80,
+                    status=BookingStatus.COMPLETED,
+                    created_at=datetime(2025, 1, 1),
+                    archived_at=datetime(2026, 1, 1),
+                )
+            )
+        url = f"{CUSTOMERS_URL}/{customer['id']}/bookings"
+
+        live = (await client.get(url, params={"limit": 10})).json()
+        assert len(live["bookings"]) == 5
+        assert live["summary"]["bookings"] == 5
+
+        data = (await client.get(url, params={"limit": 10, "archived": True})).json()
+        assert len(data["bookings"]) == 6
+        assert data["bookings"][-1]["start_date"] == days_from_now(-400).isoformat()
+        assert data["summary"]["bookings"] == 6
+        assert data["summary"]["by_status"]["completed"] == 2
+        assert data["summary"]["total_spend"] == live["summary"]["total_spend"] + 80
+
+    async def test_no_bookings(self, client: AsyncClient):
+        customer = (await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+        response = await client.get(f"{CUSTOMERS_URL}/{customer['id']}/bookings")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["bookings"] == []
+        assert data["next"] is None
+        assert data["summary"]["bookings"] == 0
+        assert data["summary"]["total_spend"] == 0
+        assert data["summary"]["last_rental"] is None
+
+    async def test_unknown_customer(self, client: AsyncClient):
+        response = await client.get(f"{CUSTOMERS_URL}/nonexistent-id/bookings")
+        assert response.status_code == 404
+
+    async def test_invalid_cursor(self, client: AsyncClient):
+        customer = (await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+        response = await client.get(
+            f"{CUSTOMERS_URL}/{customer['id']}/bookings", params={"cursor": "junk"}
+        )
+        assert response.status_code == 400
@@ -0,0 +1,177 @@
+"""Tests for the dashboard summary endpoint."""
+
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.config import settings
+from app.models.booking import Booking, BookingStatus
+from app.services.dashboard import summary_cache
+from tests.conftest import TestSessionLocal, engine
+
+
+SUMMARY_URL = "/api/v1/dashboard/summary"
+CARS_URL = "/api/v1/cars"
+CUSTOMERS_URL = "/api/v1/customers"
+BOOKINGS_URL = "/api/v1/bookings"
+
+
+def days_from_now(days: int) -> date:
+    return date.today() + timedelta(days=days)
+
+
+async def create_car(client: AsyncClient, plate: str) -> dict:
+    response = await client.post(
+        CARS_URL,
+        json={
+            "make": "Toyota",
+            "model": "Camry",
+            "year": 2024,
+            "license_plate": plate,
+            "daily_rate": 50.0,
+        },
+    )
+    return response.json()
+
+
+async def create_customer(client: AsyncClient, email: str) -> dict:
+    response = await client.post(
+        CUSTOMERS_URL,
+        json={
+            "first_name": "Alice",
+            "last_name": "Smith",
+            "email": email,
+            "phone": "+1234567890",
+            "driver_license": f"DL-{email}",
+        },
+    )
+    return response.json()
+
+
+async def create_booking(
+    client: AsyncClient, car: dict, customer: dict, start: int, end: int
+) -> dict:
+    response = await client.post(
+        BOOKINGS_URL,
+        json={
+            "car_id": car["id"],
+            "customer_id": customer["id"],
+            "start_date": days_from_now(start).isoformat(),
+            "end_date": days_from_now(end).isoformat(),
+        },
+    )
+    return response.json()
+
+
+@pytest.mark.asyncio
+class TestDashboardSummary:
+    """Tests for GET /api/v1/dashboard/summary."""
+
+    async def test_empty(self, client: AsyncClient):
+        response = await client.get(SUMMARY_URL)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["today"] == date.today().isoformat()
+        assert data["period_start"] == date.today().replace(day=1).isoformat()
+        assert data["cars_total"] == 0
+        assert data["cars_by_status"] == {
+            "available": 0,
+            "rented": 0,
+            "maintenance": 0,
+        }
+        assert set(data["bookings_by_status"]) == {s.value for s in BookingStatus}
+        assert data["revenue"] == 0
+        assert data["recent_bookings"] == []
+
+    async def test_kpis(self, client: AsyncClient):
+        car = await create_car(client, "DSH-1")
+        other = await create_car(client, "DSH-2")
+        await client.put(f"{CARS_URL}/{other['id']}", json={"status": "maintenance"})
+        alice = await create_customer(client, "alice@example.com")
+        bob = await create_customer(client, "bob@example.com")
+        today = await create_booking(client, car, alice, 0, 4)
+        later = await create_booking(client, car, bob, 5, 7)
+        await create_booking(client, car, bob, 10, 12)
+        await client.post(f"{BOOKINGS_URL}/{later['id']}/cancel")
+        async with TestSessionLocal() as session, session.begin():
+            session.add(
+                Booking(
+                    car_id=car["id"],
+                    customer_id=alice["id"],
+                    start_date=days_from_now(-3),
+                    end_date=days_from_now(0),
+                    total_cost=150,
+                    status=BookingStatus.ACTIVE,
+                )
+            )
+
+        response = await client.get(
+            SUMMARY_URL,
+            params={
+                "start_date": days_from_now(0).isoformat(),
+                "end_date": days_from_now(1).isoformat(),
+            },
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["cars_total"] == 2
+        assert data["cars_by_status"]["available"] == 1
+        assert data["cars_by_status"]["maintenance"] == 1
+        assert data["customers_total"] == 2
+        assert data["bookings_total"] == 4
+        assert data["bookings_by_status"]["reserved"] == 2
+        assert data["bookings_by_status"]["cancelled"] == 1
+        assert data["bookings_by_status"]["active"] == 1
+        assert data["pickups_today"] == 1
+        assert data["returns_today"] == 1
+        # Two of the four days of the booking starting today.
+        assert data["revenue"] == today["total_cost"] / 2
+        assert len(data["recent_bookings"]) == 4
+        assert data["recent_bookings"][0]["car"]["license_plate"] == "DSH-1"
+        assert "customer" in data["recent_bookings"][0]
+
+    async def test_query_count_is_bounded(self, client: AsyncClient):
+        car = await create_car(client, "DSH-1")
+        customer = await create_customer(client, "alice@example.com")
+        for n in range(8):
+            await create_booking(client, car, customer, 2 * n, 2 * n + 1)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            response = await client.get(SUMMARY_URL)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+        assert len(response.json()["recent_bookings"]) == 5
+        assert len([s for s in statements if s.lstrip().startswith("SELECT")]) == 8
+
+    async def test_inverted_period_rejected(self, client: AsyncClient):
+        response = await client.get(
+            SUMMARY_URL,
+            params={
+                "start_date": days_from_now(1).isoformat(),
+                "end_date": days_from_now(0).isoformat(),
+            },
+        )
+        assert response.status_code == 400
+
+    async def test_cached_for_ttl(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(settings, "dashboard_cache_ttl", 60.0)
+        summary_cache.clear()
+        try:
+            await create_car(client, "DSH-1")
+            assert (await client.get(SUMMARY_URL)).json()["cars_total"] == 1
+            await create_car(client, "DSH-2")
+            assert (await client.get(SUMMARY_URL)).json()["cars_total"] == 1
+
+            summary_cache.clear()
+            assert (await client.get(SUMMARY_URL)).json()["cars_total"] == 2
+        finally:
+            summary_cache.clear()
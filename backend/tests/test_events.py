@@ -0,0 +1,265 @@
+"""Tests for pushed car and booking status events."""
+
+import asyncio
+import json
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.admission.priority import EXEMPT_PATHS
+from app.events import (
+    EventBroadcaster,
+    EventFilter,
+    EventPublisher,
+    StatusEvent,
+    broadcaster,
+    event_stream,
+)
+from app.jobs import sweep_bookings
+from tests.conftest import TestSessionLocal
+
+
+EVENTS_URL = "/api/v1/events"
+CARS_URL = "/api/v1/cars"
+CUSTOMERS_URL = "/api/v1/customers"
+BOOKINGS_URL = "/api/v1/bookings"
+
+SAMPLE_CAR = {
+    "make": "Toyota",
+    "model": "Camry",
+    "year": 2024,
+    "license_plate": "EVT-0001",
+    "daily_rate": 50.00,
+    "category": "suv",
+}
+
+SAMPLE_CUSTOMER = {
+    "first_name": "Alice",
+    "last_name": "Smith",
+    "email": "alice.smith@example.com",
+    "phone": "+1234567890",
+    "driver_license": "DL-123456",
+}
+
+
+def future_date(days_ahead: int) -> str:
+    """Return an ISO-formatted date N days from today."""
+    return (date.today() + timedelta(days=days_ahead)).isoformat()
+
+
+def car_event(car_id: str, status: str, category: str = "suv") -> StatusEvent:
+    return StatusEvent("car", car_id, car_id, status, category=category)
+
+
+def received(subscription) -> list[tuple]:
+    """The (entity, status) of every event queued for ``subscription``."""
+    events = []
+    while not subscription._queue.empty():
+        event = subscription._queue.get_nowait()
+        events.append((event.entity, event.status))
+    return events
+
+
+@pytest.mark.asyncio
+class TestBroadcaster:
+    """Tests for fanning events out to filtered subscribers."""
+
+    async def test_filters(self):
+        events = EventBroadcaster()
+        everything = events.subscribe()
+        one_car = events.subscribe(EventFilter(car_id="c1"))
+        suvs = events.subscribe(EventFilter(category="suv"))
+        available_suvs = events.subscribe(
+            EventFilter(category="suv", status="available")
+        )
+        assert len(events) == 4
+
+        events.publish(car_event("c1", "rented"))
+        events.publish(car_event("c2", "available"))
+        events.publish(car_event("c3", "available", category="economy"))
+        events.publish(StatusEvent("booking", "b1", "c1", "active"))
+
+        assert len(received(everything)) == 4
+        assert received(one_car) == [("car", "rented"), ("booking", "active")]
+        assert received(suvs) == [("car", "rented"), ("car", "available")]
+        assert received(available_suvs) == [("car", "available")]
+        assert events.metrics.delivered == 9
+
+    async def test_drops_slow_subscriber(self):
+        events = EventBroadcaster(queue_size=2)
+        slow = events.subscribe()
+        fast = events.subscribe()
+        for n in range(3):
+            events.publish(car_event("c1", "available"))
+            await fast.get()
+
+        assert slow.dropped and slow.closed
+        assert not fast.closed
+        assert await slow.get() is None
+        assert events.status()["subscribers"] == 1
+        assert events.status()["dropped"] == 1
+
+    async def test_close_wakes_subscribers(self):
+        events = EventBroadcaster()
+        subscription = events.subscribe(EventFilter(car_id="c1"))
+        waiter = asyncio.create_task(subscription.get())
+        await asyncio.sleep(0)
+        events.close()
+        assert await waiter is None
+        assert not subscription.dropped
+        assert len(events) == 0
+        subscription.close()
+        assert len(events) == 0
+
+    async def test_stream(self):
+        events = EventBroadcaster(queue_size=1)
+        subscription = events.subscribe()
+        stream = event_stream(subscription, heartbeat=0.01)
+
+        assert await anext(stream) == ": keep-alive\n\n"
+        events.publish(car_event("c1", "available"))
+        message = await anext(stream)
+        assert message.startswith("event: car\ndata: ")
+        assert json.loads(message.split("data: ")[1])["status"] == "available"
+
+        events.publish(car_event("c1", "rented"))
+        events.publish(car_event("c1", "available"))
+        assert await anext(stream) == "event: overflow\ndata: {}\n\n"
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+
+    async def test_stream_closes_subscription_when_cancelled(self):
+        events = EventBroadcaster()
+        stream = event_stream(events.subscribe(), heartbeat=60)
+        task = asyncio.create_task(anext(stream))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert len(events) == 0
+
+    async def test_published_on_commit_only(self):
+        events = EventBroadcaster()
+        subscription = events.subscribe()
+        # Without a session, as on the in-memory backend, at once.
+        EventPublisher(events).publish(car_event("c1", "maintenance"))
+        assert received(subscription) == [("car", "maintenance")]
+        async with TestSessionLocal() as session:
+            publisher = EventPublisher(events, session)
+            await session.begin()
+            publisher.publish(car_event("c1", "rented"))
+            await session.rollback()
+            await session.begin()
+            publisher.publish(car_event("c1", "available"))
+            assert received(subscription) == []
+            await session.commit()
+        assert received(subscription) == [("car", "available")]
+
+
+@pytest.mark.asyncio
+class TestStatusEvents:
+    """Tests for events pushed by the services, the sweeper and the API."""
+
+    async def test_services_publish(self, client: AsyncClient):
+        with broadcaster.subscribe() as subscription:
+            car = (await client.post(CARS_URL, json=SAMPLE_CAR)).json()
+            customer = (
+                await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)
+            ).json()
+            booking = (
+                await client.post(
+                    BOOKINGS_URL,
+                    json={
+                        "car_id": car["id"],
+                        "customer_id": customer["id"],
+                        "start_date": future_date(0),
+                        "end_date": future_date(2),
+                    },
+                )
+            ).json()
+            await client.post(f"{BOOKINGS_URL}/{booking['id']}/pickup")
+            await client.post(f"{BOOKINGS_URL}/{booking['id']}/return")
+
+            assert received(subscription) == [
+                ("car", "available"),
+                ("booking", "reserved"),
+                ("car", "rented"),
+                ("booking", "active"),
+                ("car", "available"),
+                ("booking", "completed"),
+            ]
+
+            response = await client.post(CARS_URL, json=SAMPLE_CAR)
+            assert response.status_code == 400
+            other = (
+                await client.post(
+                    CARS_URL, json={**SAMPLE_CAR, "license_plate": "EVT-0002"}
+                )
+            ).json()
+            await client.delete(f"{CARS_URL}/{other['id']}")
+            assert received(subscription) == [
+                ("car", "available"),
+                ("car", "available"),
+            ]
+
+    async def test_sweeper_publishes(self, client: AsyncClient):
+        car = (await client.post(CARS_URL, json=SAMPLE_CAR)).json()
+        customer = (await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+        await client.post(
+            BOOKINGS_URL,
+            json={
+                "car_id": car["id"],
+                "customer_id": customer["id"],
+                "start_date": future_date(1),
+                "end_date": future_date(3),
+            },
+        )
+        await client.put(f"{CARS_URL}/{car['id']}", json={"status": "rented"})
+
+        with broadcaster.subscribe(EventFilter(car_id=car["id"])) as subscription:
+            await sweep_bookings(
+                TestSessionLocal,
+                date.today() + timedelta(days=5),
+                no_show_grace_days=0,
+            )
+            assert received(subscription) == [
+                ("booking", "expired"),
+                ("car", "available"),
+            ]
+
+    async def test_stream_endpoint(self, client: AsyncClient):
+        subscribers = len(broadcaster)
+        car = (await client.post(CARS_URL, json=SAMPLE_CAR)).json()
+
+        async def listen():
+            return await client.get(
+                EVENTS_URL, params={"car_id": car["id"], "status": "maintenance"}
+            )
+
+        listener = asyncio.create_task(listen())
+        while len(broadcaster) == subscribers:
+            await asyncio.sleep(0.01)
+        await client.put(f"{CARS_URL}/{car['id']}", json={"daily_rate": 60})
+        await client.put(f"{CARS_URL}/{car['id']}", json={"status": "maintenance"})
+        status = (await client.get(f"{EVENTS_URL}/status")).json()
+        assert status["subscribers"] == subscribers + 1
+        broadcaster.close()
+
+        response = await listener
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "content-encoding" not in response.headers
+        [message] = response.text.strip().split("\n\n")
+        data = json.loads(message.removeprefix("event: car\ndata: "))
+        assert data["id"] == car["id"]
+        assert data["status"] == "maintenance"
+        assert data["category"] == "suv"
+
+    async def test_invalid_filter(self, client: AsyncClient):
+        response = await client.get(EVENTS_URL, params={"status": "parked"})
+        assert response.status_code == 422
+
+    async def test_exempt_from_admission(self):
+        assert EXEMPT_PATHS.match("/api/v1/events")
+        assert EXEMPT_PATHS.match("/api/v1/events/status")
+        assert not EXEMPT_PATHS.match("/api/v1/events/other")
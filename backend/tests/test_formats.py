@@ -0,0 +1,109 @@
+"""Tests for MessagePack content negotiation."""
+
+import uuid
+from datetime import datetime, timezone
+
+import msgpack
+import pytest
+from httpx import AsyncClient
+
+from app.formats import msgpack_to_json, prefers_msgpack
+
+
+CARS_URL = "/api/v1/cars"
+QUOTES_URL = "/api/v1/quotes"
+MSGPACK = "application/msgpack"
+
+SAMPLE_CAR = {
+    "make": "Toyota",
+    "model": "Camry",
+    "year": 2024,
+    "license_plate": "MPK-0001",
+    "daily_rate": 50.00,
+    "category": "standard",
+}
+
+
+class TestNegotiation:
+    """Tests for choosing the body format."""
+
+    def test_prefers_msgpack(self):
+        assert prefers_msgpack("application/msgpack")
+        assert prefers_msgpack("application/x-msgpack, application/json;q=0.5")
+        assert not prefers_msgpack("application/json, application/msgpack")
+        assert not prefers_msgpack("application/msgpack;q=0.5, */*")
+        assert not prefers_msgpack("*/*")
+        assert not prefers_msgpack("")
+
+    def test_native_types_in_request_bodies(self):
+        car_id = uuid.uuid4()
+        body = msgpack.packb(
+            {
+                "car_id": car_id.bytes,
+                "day": datetime(2026, 3, 2, tzinfo=timezone.utc),
+                "at": datetime(2026, 3, 2, 9, 30, tzinfo=timezone.utc),
+            },
+            datetime=True,
+        )
+        assert msgpack_to_json(body) == (
+            f'{{"car_id":"{car_id}","day":"2026-03-02",'
+            f'"at":"2026-03-02T09:30:00+00:00"}}'
+        ).encode()
+
+
+@pytest.mark.asyncio
+class TestMessagePackAPI:
+    """Tests for MessagePack requests and responses."""
+
+    async def test_list_as_msgpack(self, client: AsyncClient):
+        await client.post(CARS_URL, json=SAMPLE_CAR)
+        as_json = await client.get(CARS_URL)
+        response = await client.get(CARS_URL, headers={"Accept": MSGPACK})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == MSGPACK
+        assert "Accept" in response.headers["vary"]
+        assert "Accept" in as_json.headers["vary"]
+        assert msgpack.unpackb(response.content) == as_json.json()
+        assert len(response.content) < len(as_json.content)
+
+    async def test_errors_as_msgpack(self, client: AsyncClient):
+        response = await client.get(f"{CARS_URL}/missing", headers={"Accept": MSGPACK})
+        assert response.status_code == 404
+        assert msgpack.unpackb(response.content) == {"detail": "Car not found"}
+
+    async def test_bulk_request_body(self, client: AsyncClient):
+        car = (await client.post(CARS_URL, json=SAMPLE_CAR)).json()
+        body = msgpack.packb(
+            {
+                "items": [
+                    {
+                        "car_id": car["id"],
+                        "start_date": datetime(2026, 3, 2, tzinfo=timezone.utc),
+                        "end_date": "2026-03-05",
+                    }
+                ]
+            },
+            datetime=True,
+        )
+        response = await client.post(
+            QUOTES_URL,
+            content=body,
+            headers={"Content-Type": MSGPACK, "Accept": MSGPACK},
+        )
+        assert response.status_code == 200
+        quote = msgpack.unpackb(response.content)["quotes"][0]
+        assert quote["start_date"] == "2026-03-02"
+        assert quote["days"] == 3
+
+    async def test_rejected_request_bodies(self, client: AsyncClient):
+        response = await client.post(
+            CARS_URL,
+            content=msgpack.packb(SAMPLE_CAR),
+            headers={"Content-Type": MSGPACK},
+        )
+        assert response.status_code == 415
+        response = await client.post(
+            QUOTES_URL, content=b"\xc1", headers={"Content-Type": MSGPACK}
+        )
+        assert response.status_code == 400
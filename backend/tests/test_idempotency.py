@@ -0,0 +1,227 @@
+"""Tests for idempotency keys on booking POSTs."""
+
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.exceptions import ConflictException
+from app.jobs import sweep_bookings
+from app.models import IdempotencyRecord
+from app.repositories.idempotency import IdempotencyRepository
+from app.services.booking import BookingService
+from app.services.idempotency import (
+    REPLAYED_HEADER,
+    IdempotencyService,
+    KeyLocks,
+    key_locks,
+)
+from tests.conftest import TEST_DATABASE_URL, TestSessionLocal
+
+
+BOOKINGS_URL = "/api/v1/bookings"
+CARS_URL = "/api/v1/cars"
+CUSTOMERS_URL = "/api/v1/customers"
+
+SAMPLE_CAR = {
+    "make": "Toyota",
+    "model": "Camry",
+    "year": 2024,
+    "license_plate": "IDM-0001",
+    "daily_rate": 50.00,
+    "category": "standard",
+}
+
+SAMPLE_CUSTOMER = {
+    "first_name": "Alice",
+    "last_name": "Smith",
+    "email": "alice.smith@example.com",
+    "phone": "+1234567890",
+    "driver_license": "DL-777777",
+}
+
+
+def future_date(days_ahead: int) -> str:
+    """Return an ISO-formatted date N days from today."""
+    return (date.today() + timedelta(days=days_ahead)).isoformat()
+
+
+async def _booking_data(client: AsyncClient) -> dict:
+    car = (await client.post(CARS_URL, json=SAMPLE_CAR)).json()
+    customer = (await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+    return {
+        "car_id": car["id"],
+        "customer_id": customer["id"],
+        "start_date": future_date(1),
+        "end_date": future_date(3),
+    }
+
+
+async def _count(model) -> int:
+    async with TestSessionLocal() as session:
+        return await session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.mark.asyncio
+class TestIdempotency:
+    """Tests for replaying responses to retried requests."""
+
+    async def test_retry_replays_created_booking(self, client: AsyncClient):
+        data = await _booking_data(client)
+        headers = {"Idempotency-Key": "create-1"}
+
+        first = await client.post(BOOKINGS_URL, json=data, headers=headers)
+        retry = await client.post(BOOKINGS_URL, json=data, headers=headers)
+
+        assert first.status_code == retry.status_code == 201
+        assert retry.json() == first.json()
+        assert REPLAYED_HEADER not in first.headers
+        assert retry.headers[REPLAYED_HEADER] == "true"
+        bookings = (await client.get(BOOKINGS_URL)).json()
+        assert len(bookings) == 1
+
+    async def test_without_key_requests_run_again(self, client: AsyncClient):
+        data = await _booking_data(client)
+        assert (await client.post(BOOKINGS_URL, json=data)).status_code == 201
+        response = await client.post(BOOKINGS_URL, json=data)
+        assert response.status_code == 400
+        assert "not available" in response.json()["detail"]
+
+    async def test_key_reused_for_other_request(self, client: AsyncClient):
+        data = await _booking_data(client)
+        headers = {"Idempotency-Key": "create-1"}
+        await client.post(BOOKINGS_URL, json=data, headers=headers)
+
+        response = await client.post(
+            BOOKINGS_URL, json={**data, "end_date": future_date(4)}, headers=headers
+        )
+        assert response.status_code == 422
+        booking_id = (await client.get(BOOKINGS_URL)).json()[0]["id"]
+        response = await client.post(
+            f"{BOOKINGS_URL}/{booking_id}/pickup", headers=headers
+        )
+        assert response.status_code == 422
+
+    async def test_retried_pickup_replays(self, client: AsyncClient):
+        data = await _booking_data(client)
+        data["start_date"] = date.today().isoformat()
+        booking = (await client.post(BOOKINGS_URL, json=data)).json()
+        url = f"{BOOKINGS_URL}/{booking['id']}/pickup"
+        headers = {"Idempotency-Key": "pickup-1"}
+
+        first = await client.post(url, headers=headers)
+        retry = await client.post(url, headers=headers)
+        assert first.status_code == retry.status_code == 200
+        assert retry.json()["status"] == "active"
+        assert retry.headers[REPLAYED_HEADER] == "true"
+        # Without the key the second pickup is rejected.
+        assert (await client.post(url)).status_code == 400
+
+    async def test_failures_are_not_stored(self, client: AsyncClient):
+        url = f"{BOOKINGS_URL}/missing/cancel"
+        headers = {"Idempotency-Key": "cancel-1"}
+        for _ in range(2):
+            response = await client.post(url, headers=headers)
+            assert response.status_code == 404
+            assert REPLAYED_HEADER not in response.headers
+        assert await _count(IdempotencyRecord) == 0
+
+    async def test_concurrent_duplicates_wait_for_the_first(
+        self, client: AsyncClient, monkeypatch
+    ):
+        data = await _booking_data(client)
+        create_booking = BookingService.create_booking
+        calls = 0
+
+        async def slow_create(self, data):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return await create_booking(self, data)
+
+        monkeypatch.setattr(BookingService, "create_booking", slow_create)
+        headers = {"Idempotency-Key": "create-1"}
+        responses = await asyncio.gather(
+            *(client.post(BOOKINGS_URL, json=data, headers=headers) for _ in range(3))
+        )
+
+        assert calls == 1
+        assert [r.status_code for r in responses] == [201, 201, 201]
+        assert len({r.json()["id"] for r in responses}) == 1
+        assert sum(REPLAYED_HEADER in r.headers for r in responses) == 2
+        assert len(key_locks) == 0
+
+    async def test_expired_keys_are_purged_and_reusable(self, client: AsyncClient):
+        data = await _booking_data(client)
+        headers = {"Idempotency-Key": "create-1"}
+        first = await client.post(BOOKINGS_URL, json=data, headers=headers)
+
+        result = await sweep_bookings(
+            TestSessionLocal,
+            date.today(),
+            batch_size=1,
+            now=datetime.utcnow() + timedelta(days=2),
+        )
+        assert result.purged == 1
+        assert await _count(IdempotencyRecord) == 0
+
+        data["start_date"], data["end_date"] = future_date(10), future_date(12)
+        second = await client.post(BOOKINGS_URL, json=data, headers=headers)
+        assert second.status_code == 201
+        assert second.json()["id"] != first.json()["id"]
+
+    async def test_database_locked_by_another_process(self):
+        """Test that SQLite locked by another process's write gives a 409."""
+        # Another process, which gives up on SQLite's write lock quickly.
+        other = create_async_engine(TEST_DATABASE_URL, connect_args={"timeout": 0.1})
+        calls = 0
+
+        async def action():
+            nonlocal calls
+            calls += 1
+            return {}
+
+        async with TestSessionLocal() as holder, holder.begin():
+            holder.add(
+                IdempotencyRecord(
+                    key="create-2",
+                    fingerprint=b"other",
+                    expires_at=datetime.utcnow() + timedelta(hours=1),
+                )
+            )
+            await holder.flush()
+            async with AsyncSession(other) as session, session.begin():
+                service = IdempotencyService(
+                    IdempotencyRepository(session),
+                    key="create-1",
+                    fingerprint=b"request",
+                    ttl=timedelta(hours=1),
+                    locks=KeyLocks(),
+                )
+                with pytest.raises(ConflictException):
+                    await service.run(action, BaseModel, 201)
+        await other.dispose()
+        assert calls == 0
+
+
+@pytest.mark.asyncio
+class TestKeyLocks:
+    """Tests for the per-key locks."""
+
+    async def test_locks_are_dropped_when_released(self):
+        locks = KeyLocks()
+        order = []
+
+        async def hold(name):
+            async with locks.hold("key"):
+                order.append(name)
+                await asyncio.sleep(0)
+                order.append(name)
+
+        await asyncio.gather(hold("a"), hold("b"))
+        assert order == ["a", "a", "b", "b"]
+        assert len(locks) == 0
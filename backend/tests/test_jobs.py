@@ -0,0 +1,304 @@
+"""Tests for the background job queue."""
+
+import asyncio
+import csv
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.config import settings
+from app.jobs import JOB_HANDLERS, JobWorkerPool, job
+from app.models.job import Job, JobStatus
+from tests.conftest import TestSessionLocal
+
+
+JOBS_URL = "/api/v1/jobs"
+BOOKINGS_URL = "/api/v1/bookings"
+CARS_URL = "/api/v1/cars"
+CUSTOMERS_URL = "/api/v1/customers"
+
+SAMPLE_CAR = {
+    "make": "Toyota",
+    "model": "Camry",
+    "year": 2024,
+    "license_plate": "JOB-0001",
+    "daily_rate": 50.00,
+    "category": "standard",
+}
+
+SAMPLE_CUSTOMER = {
+    "first_name": "Alice",
+    "last_name": "Smith",
+    "email": "alice.smith@example.com",
+    "phone": "+1234567890",
+    "driver_license": "DL-999999",
+}
+
+FLAKY_CALLS: list[int] = []
+
+
+@job("test-flaky")
+async def flaky(context, payload):
+    """Fail until the attempt given in the payload."""
+    FLAKY_CALLS.append(context.attempt)
+    if context.attempt < payload["succeed_on"]:
+        raise RuntimeError(f"attempt {context.attempt} failed")
+    return {"attempt": context.attempt}
+
+
+SLOW_CALLS: list[int] = []
+
+
+@job("test-slow")
+async def slow(context, payload):
+    """Take longer than a short lease."""
+    SLOW_CALLS.append(context.attempt)
+    await asyncio.sleep(payload["seconds"])
+    return {}
+
+
+def future_date(days_ahead: int) -> str:
+    """Return an ISO-formatted date N days from today."""
+    return (date.today() + timedelta(days=days_ahead)).isoformat()
+
+
+async def make_pool(process_workers: int = 0) -> JobWorkerPool:
+    pool = JobWorkerPool(
+        TestSessionLocal,
+        concurrency=2,
+        poll_interval=0.05,
+        retry_backoff=0.01,
+        process_workers=process_workers,
+    )
+    await pool.start()
+    return pool
+
+
+@pytest_asyncio.fixture
+async def pool():
+    """Run a worker pool against the test database."""
+    pool = await make_pool()
+    yield pool
+    await pool.stop()
+
+
+async def wait_for(client: AsyncClient, job_id: str) -> dict:
+    """Poll a job until it has finished."""
+    for _ in range(200):
+        job = (await client.get(f"{JOBS_URL}/{job_id}")).json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+async def seed_bookings(client: AsyncClient, count: int) -> None:
+    car = (await client.post(CARS_URL, json=SAMPLE_CAR)).json()
+    customer = (await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+    for n in range(count):
+        response = await client.post(
+            BOOKINGS_URL,
+            json={
+                "car_id": car["id"],
+                "customer_id": customer["id"],
+                "start_date": future_date(1 + 3 * n),
+                "end_date": future_date(2 + 3 * n),
+            },
+        )
+        assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+class TestJobs:
+    """Test suite for the job queue."""
+
+    async def test_enqueue_returns_queued_job(self, client: AsyncClient):
+        """Test that a job is accepted and queued."""
+        response = await client.post(JOBS_URL, json={"kind": "rebuild"})
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "queued"
+        assert data["attempts"] == 0
+        assert data["max_attempts"] == settings.job_max_attempts
+
+        response = await client.get(JOBS_URL, params={"status": "queued"})
+        assert [j["id"] for j in response.json()] == [data["id"]]
+
+    async def test_unknown_kind(self, client: AsyncClient):
+        """Test that unknown job kinds are rejected."""
+        response = await client.post(JOBS_URL, json={"kind": "nope"})
+        assert response.status_code == 400
+
+    async def test_get_job_not_found(self, client: AsyncClient):
+        """Test getting a job that does not exist."""
+        response = await client.get(f"{JOBS_URL}/nonexistent-id")
+        assert response.status_code == 404
+
+    async def test_result_before_finish(self, client: AsyncClient):
+        """Test that the result of an unfinished job is a conflict."""
+        job_id = (await client.post(JOBS_URL, json={"kind": "rebuild"})).json()["id"]
+        response = await client.get(f"{JOBS_URL}/{job_id}/result")
+        assert response.status_code == 409
+
+    async def test_rebuild_job(self, client: AsyncClient, pool):
+        """Test running a rebuild job to completion."""
+        response = await client.post(
+            JOBS_URL, json={"kind": "rebuild", "payload": {"targets": ["rollups"]}}
+        )
+        finished = await wait_for(client, response.json()["id"])
+        assert finished["status"] == "succeeded"
+        assert finished["attempts"] == 1
+
+        response = await client.get(f"{JOBS_URL}/{finished['id']}/result")
+        assert response.json()["result"] == {"targets": ["rollups"]}
+
+    async def test_retries_with_backoff(self, client: AsyncClient, pool):
+        """Test that a failing job is retried until it succeeds."""
+        FLAKY_CALLS.clear()
+        response = await client.post(
+            JOBS_URL, json={"kind": "test-flaky", "payload": {"succeed_on": 3}}
+        )
+        finished = await wait_for(client, response.json()["id"])
+        assert finished["status"] == "succeeded"
+        assert finished["attempts"] == 3
+        assert finished["error"] is None
+        assert FLAKY_CALLS == [1, 2, 3]
+
+    async def test_fails_after_max_attempts(self, client: AsyncClient, pool):
+        """Test that a job fails once its attempts are used up."""
+        FLAKY_CALLS.clear()
+        response = await client.post(
+            JOBS_URL,
+            json={
+                "kind": "test-flaky",
+                "payload": {"succeed_on": 5},
+                "max_attempts": 2,
+            },
+        )
+        finished = await wait_for(client, response.json()["id"])
+        assert finished["status"] == "failed"
+        assert finished["attempts"] == 2
+        assert finished["error"] == "RuntimeError: attempt 2 failed"
+        assert FLAKY_CALLS == [1, 2]
+
+    async def test_export_bookings(self, client: AsyncClient, tmp_path, monkeypatch):
+        """Test exporting bookings to CSV through the process pool."""
+        monkeypatch.setattr(settings, "export_dir", str(tmp_path))
+        await seed_bookings(client, 5)
+        pool = await make_pool(process_workers=1)
+        try:
+            response = await client.post(
+                JOBS_URL,
+                json={"kind": "export-bookings", "payload": {"chunk_size": 2}},
+            )
+            finished = await wait_for(client, response.json()["id"])
+        finally:
+            await pool.stop()
+        assert finished["status"] == "succeeded"
+
+        result = (await client.get(f"{JOBS_URL}/{finished['id']}/result")).json()
+        assert result["result"]["rows"] == 5
+        with open(result["result"]["path"], newline="") as file:
+            rows = list(csv.DictReader(file))
+        assert len(rows) == 5
+        assert {row["status"] for row in rows} == {"reserved"}
+
+        response = await client.get(f"{JOBS_URL}/{finished['id']}/download")
+        assert response.status_code == 200
+        assert response.text.count("\n") == 6
+
+    async def test_worker_survives_errors(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that a failing claim does not stop the worker."""
+        claim = JobWorkerPool._claim
+        failures = []
+
+        async def flaky_claim(self):
+            if not failures:
+                failures.append(1)
+                raise RuntimeError("database is locked")
+            return await claim(self)
+
+        monkeypatch.setattr(JobWorkerPool, "_claim", flaky_claim)
+        pool = JobWorkerPool(TestSessionLocal, concurrency=1, poll_interval=0.05)
+        await pool.start()
+        try:
+            response = await client.post(JOBS_URL, json={"kind": "rebuild"})
+            finished = await wait_for(client, response.json()["id"])
+        finally:
+            await pool.stop()
+        assert failures == [1]
+        assert finished["status"] == "succeeded"
+
+    async def test_interrupted_jobs_are_requeued(self, client: AsyncClient):
+        """Test that jobs whose lease ran out are picked up again on start."""
+        job_id = (await client.post(JOBS_URL, json={"kind": "rebuild"})).json()["id"]
+        async with TestSessionLocal() as session:
+            await session.execute(
+                update(Job).values(
+                    status=JobStatus.RUNNING,
+                    attempts=1,
+                    locked_until=datetime.utcnow() - timedelta(seconds=1),
+                )
+            )
+            await session.commit()
+
+        pool = await make_pool()
+        try:
+            finished = await wait_for(client, job_id)
+        finally:
+            await pool.stop()
+        assert finished["status"] == "succeeded"
+        assert finished["attempts"] == 2
+
+    async def test_leased_jobs_are_not_requeued(self, client: AsyncClient):
+        """Test that a job another process is running is left alone."""
+        job_id = (await client.post(JOBS_URL, json={"kind": "rebuild"})).json()["id"]
+        async with TestSessionLocal() as session:
+            await session.execute(
+                update(Job).values(
+                    status=JobStatus.RUNNING,
+                    attempts=1,
+                    locked_until=datetime.utcnow() + timedelta(minutes=1),
+                )
+            )
+            await session.commit()
+
+        pool = await make_pool()
+        try:
+            await asyncio.sleep(0.2)
+        finally:
+            await pool.stop()
+        running = (await client.get(f"{JOBS_URL}/{job_id}")).json()
+        assert running["status"] == "running"
+        assert running["attempts"] == 1
+
+    async def test_heartbeat_keeps_lease(self, client: AsyncClient):
+        """Test that a job outliving its lease is not run a second time."""
+        SLOW_CALLS.clear()
+        pools = [
+            JobWorkerPool(TestSessionLocal, poll_interval=0.02, lease=0.15)
+            for _ in range(2)
+        ]
+        for pool in pools:
+            await pool.start()
+        try:
+            response = await client.post(
+                JOBS_URL, json={"kind": "test-slow", "payload": {"seconds": 0.6}}
+            )
+            finished = await wait_for(client, response.json()["id"])
+        finally:
+            for pool in pools:
+                await pool.stop()
+        assert finished["status"] == "succeeded"
+        assert finished["attempts"] == 1
+        assert SLOW_CALLS == [1]
+
+
+def test_flaky_handler_registered():
+    """Test that the job decorator registers handlers by kind."""
+    assert JOB_HANDLERS["test-flaky"] is flaky
@@ -0,0 +1,255 @@
+"""Tests for versioned schema migrations."""
+
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import joinedload
+
+from app.cli.main import main
+from app.config import settings
+from app.migrations import (
+    LATEST_VERSION,
+    SchemaVersionError,
+    check_schema,
+    migrate,
+    schema_version,
+)
+from app.models import Base, Booking
+
+# A key from before keys were UUIDs, as long as a UUID in binary form;
+# one character less and it would be that long with its tag.
+LEGACY_ID = "legacy-booking16"
+
+
+def _engine(tmp_path, name: str = "migrate.db"):
+    return create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}")
+
+
+async def _schema(engine) -> dict[str, tuple]:
+    """Every object of the database; tables by their columns and foreign keys.
+
+    Key columns keep the ``VARCHAR(36)`` type they were created with when
+    migration 12 converts their values, so it counts as ``BLOB``.
+    """
+    schema = {}
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT type, name, tbl_name, sql FROM sqlite_master "
+                "WHERE name != 'schema_version'"
+            )
+        )
+        for kind, name, table, sql in result.all():
+            if kind != "table" or sql.startswith("CREATE VIRTUAL"):
+                schema[name] = (kind, table, sql)
+                continue
+            columns = await conn.execute(text(f"PRAGMA table_info('{name}')"))
+            keys = await conn.execute(text(f"PRAGMA foreign_key_list('{name}')"))
+            schema[name] = (
+                [
+                    (column, "BLOB" if type_ == "VARCHAR(36)" else type_, notnull, pk)
+                    for _, column, type_, notnull, _, pk in columns.all()
+                ],
+                # Referenced table, column and referenced column.
+                sorted(tuple(row[2:5]) for row in keys.all()),
+            )
+    return schema
+
+
+async def _scalar(engine, sql: str):
+    async with engine.connect() as conn:
+        return (await conn.execute(text(sql))).scalar()
+
+
+@pytest.mark.asyncio
+class TestMigrations:
+    """Tests for migrate() and the startup schema check."""
+
+    async def test_fresh_database_matches_models(self, tmp_path):
+        """Test that migrating an empty database yields the model schema."""
+        migrated = _engine(tmp_path)
+        applied = await migrate(migrated)
+        assert [m.version for m in applied] == list(range(1, LATEST_VERSION + 1))
+        assert await schema_version(migrated) == LATEST_VERSION
+
+        created = _engine(tmp_path, "create_all.db")
+        async with created.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        assert await _schema(migrated) == await _schema(created)
+        await migrated.dispose()
+        await created.dispose()
+
+    async def test_migrate_is_idempotent(self, tmp_path):
+        """Test that an up-to-date database applies nothing."""
+        engine = _engine(tmp_path)
+        await migrate(engine)
+        assert await migrate(engine) == []
+        await engine.dispose()
+
+    async def test_migrate_to_target(self, tmp_path):
+        """Test stopping at an intermediate version and resuming."""
+        engine = _engine(tmp_path)
+        applied = await migrate(engine, target=3)
+        assert [m.version for m in applied] == [1, 2, 3]
+        assert await schema_version(engine) == 3
+        assert await _scalar(
+            engine, "SELECT count(*) FROM sqlite_master WHERE name = 'jobs'"
+        ) == 0
+
+        applied = await migrate(engine)
+        assert applied[0].version == 4
+        assert await schema_version(engine) == LATEST_VERSION
+        await engine.dispose()
+
+    async def test_versions_keep_their_schema(self, tmp_path):
+        """Test that a version has the schema it had, not the models' one."""
+        engine = _engine(tmp_path)
+        await migrate(engine, target=4)
+        assert await _scalar(
+            engine,
+            "SELECT group_concat(name) FROM sqlite_master "
+            "WHERE name IN ('daily_rollups', 'bookings_archive', "
+            "'ix_bookings_status_start_date')",
+        ) == "daily_rollups"
+        assert await _scalar(
+            engine, "SELECT type FROM pragma_table_info('cars') WHERE name = 'id'"
+        ) == "VARCHAR(36)"
+        await engine.dispose()
+
+    async def test_adopts_unversioned_database(self, tmp_path):
+        """Test that a database created before versioning gains what it lacks."""
+        engine = _engine(tmp_path)
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[
+                    Base.metadata.tables[name]
+                    for name in ("cars", "customers", "bookings")
+                ],
+            )
+            # The shape of a database from before search, rollups and jobs.
+            for statement in (
+                "DROP TRIGGER customers_fts_insert",
+                "DROP TRIGGER customers_fts_update",
+                "DROP TRIGGER customers_fts_delete",
+                "DROP TABLE customers_fts",
+                "DROP INDEX ix_bookings_car_interval",
+                "DROP INDEX ix_cars_make_model",
+            ):
+                await conn.execute(text(statement))
+            await conn.execute(
+                text(
+                    "INSERT INTO cars VALUES ('car-1', 'Toyota', 'Camry', 2024, "
+                    "'ABC-1', 50, 'STANDARD', 'AVAILABLE', '2024-01-01 00:00:00')"
+                )
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO customers VALUES ('cust-1', 'Ann', 'Lee', "
+                    "'ann@example.com', '+1', 'DL-1', '2024-01-01 00:00:00')"
+                )
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO bookings VALUES ('b-1', 'car-1', 'cust-1', "
+                    "'2024-03-01', '2024-03-04', NULL, 150, 'RESERVED', "
+                    "'2024-01-01 00:00:00')"
+                )
+            )
+        assert await schema_version(engine) == 0
+
+        await migrate(engine)
+        assert await _scalar(
+            engine,
+            "SELECT count(*) FROM sqlite_master WHERE name IN "
+            "('ix_bookings_car_interval', 'ix_cars_make_model', 'customers_fts', "
+            "'customers_fts_insert', 'jobs', 'daily_rollups')",
+        ) == 6
+        assert await _scalar(
+            engine, "SELECT count(*) FROM customers_fts WHERE customers_fts MATCH 'ann'"
+        ) == 1
+        assert await _scalar(
+            engine, "SELECT sum(booked_days) FROM daily_rollups"
+        ) == 3
+        await engine.dispose()
+
+    async def test_converts_text_keys(self, tmp_path):
+        """Test that keys stored as UUID text become 16 bytes, keeping their value."""
+        engine = _engine(tmp_path)
+        await migrate(engine, target=11)
+        car_id, customer_id = str(uuid.uuid4()), str(uuid.uuid4())
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO cars VALUES (:id, 'Toyota', 'Camry', 2024, "
+                    "'ABC-1', 50, 'STANDARD', 'AVAILABLE', '2024-01-01 00:00:00')"
+                ),
+                {"id": car_id},
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO customers VALUES (:id, 'Ann', 'Lee', "
+                    "'ann@example.com', '+1', 'DL-1', '2024-01-01 00:00:00')"
+                ),
+                {"id": customer_id},
+            )
+            for booking_id in ("b-1", LEGACY_ID, LEGACY_ID[:-1]):
+                await conn.execute(
+                    text(
+                        "INSERT INTO bookings VALUES (:id, :car_id, :customer_id, "
+                        "'2024-03-01', '2024-03-04', NULL, 150, 'RESERVED', "
+                        "'2024-01-01 00:00:00')"
+                    ),
+                    {"id": booking_id, "car_id": car_id, "customer_id": customer_id},
+                )
+
+        await migrate(engine)
+        assert await _scalar(
+            engine,
+            "SELECT group_concat(typeof(id) || length(id) || typeof(car_id) "
+            "|| length(car_id)) FROM bookings",
+        ) == "blob4blob16,blob17blob16,blob17blob16"
+        async with AsyncSession(engine) as session:
+            for booking_id in ("b-1", LEGACY_ID, LEGACY_ID[:-1]):
+                booking = await session.get(
+                    Booking, booking_id, options=[joinedload("*")]
+                )
+                assert booking.id == booking_id
+                assert (booking.car.id, booking.customer_id) == (car_id, customer_id)
+        await engine.dispose()
+
+    async def test_check_schema(self, tmp_path):
+        """Test the startup check against outdated and newer databases."""
+        engine = _engine(tmp_path)
+        with pytest.raises(SchemaVersionError, match="rent-a-car migrate"):
+            await check_schema(engine)
+
+        await check_schema(engine, auto_migrate=True)
+        assert await schema_version(engine) == LATEST_VERSION
+        await check_schema(engine)
+
+        async with engine.begin() as conn:
+            await conn.execute(text("UPDATE schema_version SET version = 999"))
+        with pytest.raises(SchemaVersionError, match="newer"):
+            await check_schema(engine)
+        await engine.dispose()
+
+
+def test_migrate_command(tmp_path, monkeypatch, capsys):
+    """Test ``rent-a-car migrate`` and its ``--status`` report."""
+    monkeypatch.setattr(
+        settings, "database_url", f"sqlite+aiosqlite:///{tmp_path / 'cli.db'}"
+    )
+    main(["migrate", "--to", "2"])
+    assert "Applied 2: Customer full-text search index" in capsys.readouterr().out
+
+    main(["migrate", "--status"])
+    output = capsys.readouterr().out
+    assert f"Schema version 2 of {LATEST_VERSION}" in output
+    assert "pending" in output
+
+    main(["migrate"])
+    main(["migrate"])
+    assert "Schema is up to date" in capsys.readouterr().out
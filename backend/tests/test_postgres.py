@@ -0,0 +1,475 @@
+"""Tests that run the application against PostgreSQL.
+
+These need a throwaway PostgreSQL server and are skipped unless
+``TEST_POSTGRES_URL`` points at it, e.g.::
+
+    TEST_POSTGRES_URL=postgresql+asyncpg://postgres@localhost:5432/rent_a_car_test
+
+Every test drops and recreates the ``public`` schema of that database.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+if not POSTGRES_URL:
+    pytest.skip("TEST_POSTGRES_URL is not set", allow_module_level=True)
+pytest.importorskip("asyncpg")
+
+from app.cli.rebuild import rebuild_rollups  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import create_engine, get_db  # noqa: E402
+from app.events import EventPublisher, broadcaster  # noqa: E402
+from app.jobs import sweep_bookings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.migrations import LATEST_VERSION, migrate, schema_version  # noqa: E402
+from app.models import Base, Booking, Car, Job  # noqa: E402
+from app.models.booking import OVERLAP_CONSTRAINT, BookingStatus  # noqa: E402
+from app.repositories.booking import BookingRepository  # noqa: E402
+from app.repositories.car import CarRepository  # noqa: E402
+from app.repositories.change import ChangeRepository  # noqa: E402
+from app.repositories.customer import CustomerRepository  # noqa: E402
+from app.repositories.idempotency import IdempotencyRepository  # noqa: E402
+from app.repositories.job import JobRepository  # noqa: E402
+from app.repositories.rollup import RollupRepository  # noqa: E402
+from app.schemas.booking import BookingCreate, BookingResponse  # noqa: E402
+from app.services.booking import BookingService  # noqa: E402
+from app.services.idempotency import (  # noqa: E402
+    REPLAYED_HEADER,
+    IdempotencyService,
+    KeyLocks,
+)
+
+engine = create_engine(POSTGRES_URL)
+PostgresSessionLocal = async_sessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False
+)
+
+BOOKINGS_URL = "/api/v1/bookings"
+CARS_URL = "/api/v1/cars"
+CUSTOMERS_URL = "/api/v1/customers"
+OLD_CAR_ID = "6f1c2b9e-3a4d-4e5f-8a6b-7c8d9e0f1a2b"
+# A car from before keys were UUIDs, as long as a UUID in binary form.
+LEGACY_CAR_ID = "legacy-car-00016"
+
+SAMPLE_CAR = {
+    "make": "Toyota",
+    "model": "Camry",
+    "year": 2024,
+    "license_plate": "PG-0001",
+    "daily_rate": 50.00,
+    "category": "standard",
+}
+
+SAMPLE_CUSTOMER = {
+    "first_name": "Alice",
+    "last_name": "Smith",
+    "email": "alice.smith@example.com",
+    "phone": "+1234567890",
+    "driver_license": "DL-555555",
+}
+
+
+async def _schema() -> dict[str, set[tuple]]:
+    """Columns, indexes and constraints of the ``public`` schema."""
+    queries = {
+        "columns": "SELECT table_name, column_name, data_type, is_nullable "
+        "FROM information_schema.columns WHERE table_schema = 'public'",
+        "indexes": "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = 'public'",
+        "constraints": "SELECT conrelid::regclass::text, conname, "
+        "pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE connamespace = 'public'::regnamespace",
+    }
+    async with engine.connect() as conn:
+        return {
+            name: set(map(tuple, (await conn.execute(text(query))).all()))
+            for name, query in queries.items()
+        }
+
+
+def days_from_now(days: int) -> date:
+    return date.today() + timedelta(days=days)
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def postgres_schema():
+    """Migrate an empty ``public`` schema before each test."""
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP SCHEMA public CASCADE"))
+        await conn.execute(text("CREATE SCHEMA public"))
+    await migrate(engine)
+    yield
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def pg_client():
+    """Create a test client whose requests use the PostgreSQL database."""
+
+    async def get_postgres_db():
+        async with PostgresSessionLocal() as session:
+            async with session.begin():
+                yield session
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = get_postgres_db
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            yield ac
+    finally:
+        app.dependency_overrides[get_db] = previous
+
+
+async def _setup(client: AsyncClient) -> tuple[dict, dict]:
+    car = (await client.post(CARS_URL, json=SAMPLE_CAR)).json()
+    customer = (await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+    return car, customer
+
+
+async def _book(client: AsyncClient, car: dict, customer: dict, start: int, end: int):
+    return await client.post(
+        BOOKINGS_URL,
+        json={
+            "car_id": car["id"],
+            "customer_id": customer["id"],
+            "start_date": days_from_now(start).isoformat(),
+            "end_date": days_from_now(end).isoformat(),
+        },
+    )
+
+
+async def _create_in_own_session(data: BookingCreate) -> Booking:
+    async with PostgresSessionLocal() as session:
+        async with session.begin():
+            service = BookingService(
+                booking_repository=BookingRepository(session),
+                car_repository=CarRepository(session),
+                customer_repository=CustomerRepository(session),
+                rollup_repository=RollupRepository(session),
+                change_repository=ChangeRepository(session),
+                event_publisher=EventPublisher(broadcaster, session),
+                pricing_rules=settings.pricing,
+            )
+            return await service.create_booking(data)
+
+
+async def _rollups() -> list[tuple]:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT day, car_id, booked_days, round(revenue, 2), rentals, "
+                "rental_days FROM daily_rollups ORDER BY day, car_id"
+            )
+        )
+        return [tuple(row) for row in result.all()]
+
+
+@pytest.mark.asyncio
+class TestPostgres:
+    """Tests for the PostgreSQL backend."""
+
+    async def test_migrates_to_latest_version(self):
+        """Test that migrations install the booking exclusion constraint."""
+        assert await schema_version(engine) == LATEST_VERSION
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text("SELECT contype::text FROM pg_constraint WHERE conname = :name"),
+                {"name": OVERLAP_CONSTRAINT},
+            )
+            assert result.scalar_one() == "x"
+
+    async def test_migrated_schema_matches_models(self):
+        """Test that migrating an empty database yields the model schema."""
+        migrated = await _schema()
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA public CASCADE"))
+            await conn.execute(text("CREATE SCHEMA public"))
+            await conn.run_sync(Base.metadata.create_all)
+        created = await _schema()
+        for name in ("columns", "indexes", "constraints"):
+            assert {
+                row for row in migrated[name] if "schema_version" not in row[0]
+            } == created[name], name
+
+    async def test_converts_text_keys(self, pg_client: AsyncClient):
+        """Test that varchar UUID keys become bytea, keeping their value."""
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA public CASCADE"))
+            await conn.execute(text("CREATE SCHEMA public"))
+        await migrate(engine, target=11)
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO cars VALUES (:id, 'Toyota', 'Camry', 2024, "
+                    "'PG-OLD', 50, 'STANDARD', 'AVAILABLE', now())"
+                ),
+                {"id": OLD_CAR_ID},
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO cars VALUES (:id, 'Honda', 'Civic', 2024, "
+                    "'PG-LEGACY', 40, 'ECONOMY', 'AVAILABLE', now())"
+                ),
+                {"id": LEGACY_CAR_ID},
+            )
+
+        await migrate(engine)
+        async with engine.connect() as conn:
+            types = await conn.execute(
+                text(
+                    "SELECT DISTINCT data_type FROM information_schema.columns "
+                    "WHERE table_schema = 'public' "
+                    "AND (column_name IN ('car_id', 'customer_id') "
+                    "OR (column_name = 'id' AND table_name IN "
+                    "('cars', 'customers', 'bookings', 'bookings_archive')))"
+                )
+            )
+            assert types.scalars().all() == ["bytea"]
+            foreign_keys = await conn.scalar(
+                text("SELECT count(*) FROM pg_constraint WHERE contype = 'f'")
+            )
+            assert foreign_keys == 4
+            overlap = await conn.scalar(
+                text("SELECT count(*) FROM pg_constraint WHERE conname = :name"),
+                {"name": OVERLAP_CONSTRAINT},
+            )
+            assert overlap == 1
+
+        car = (await pg_client.get(f"{CARS_URL}/{OLD_CAR_ID}")).json()
+        assert car["license_plate"] == "PG-OLD"
+        legacy = (await pg_client.get(f"{CARS_URL}/{LEGACY_CAR_ID}")).json()
+        assert (legacy["id"], legacy["license_plate"]) == (LEGACY_CAR_ID, "PG-LEGACY")
+        customer = (await pg_client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+        assert (await _book(pg_client, car, customer, 1, 3)).status_code == 201
+        assert (await _book(pg_client, car, customer, 2, 4)).status_code == 400
+
+    async def test_rejects_overlapping_bookings(self, pg_client: AsyncClient):
+        """Test overlap checks through the range-based query."""
+        car, customer = await _setup(pg_client)
+        first = await _book(pg_client, car, customer, 5, 8)
+        assert first.status_code == 201
+
+        for start, end in [(6, 7), (3, 5), (8, 10), (1, 12)]:
+            resp = await _book(pg_client, car, customer, start, end)
+            assert resp.status_code == 400
+        assert (await _book(pg_client, car, customer, 9, 11)).status_code == 201
+
+        await pg_client.post(f"{BOOKINGS_URL}/{first.json()['id']}/cancel")
+        assert (await _book(pg_client, car, customer, 6, 7)).status_code == 201
+
+    async def test_customer_search_matches_terms_literally(
+        self, pg_client: AsyncClient
+    ):
+        """Test that ``_`` in a search term is not a LIKE wildcard."""
+        await pg_client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)
+        for query, found in [("smi", 1), ("s_ith", 0), ("_", 0)]:
+            response = await pg_client.get(
+                f"{CUSTOMERS_URL}/search", params={"q": query}
+            )
+            assert len(response.json()) == found, query
+
+    async def test_concurrent_double_booking(
+        self, pg_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that exactly one of two racing bookings succeeds."""
+        car, customer = await _setup(pg_client)
+        # Let both requests pass the availability check before either inserts.
+        barrier = asyncio.Barrier(2)
+        check = BookingRepository.get_overlapping_bookings
+
+        async def racing_check(self, *args, **kwargs):
+            overlapping = await check(self, *args, **kwargs)
+            await barrier.wait()
+            return overlapping
+
+        monkeypatch.setattr(
+            BookingRepository, "get_overlapping_bookings", racing_check
+        )
+        requests = [
+            BookingCreate(
+                car_id=car["id"],
+                customer_id=customer["id"],
+                start_date=days_from_now(start),
+                end_date=days_from_now(start + 3),
+            )
+            for start in (5, 6)
+        ]
+
+        results = await asyncio.gather(
+            *(_create_in_own_session(data) for data in requests),
+            return_exceptions=True,
+        )
+        created = [r for r in results if isinstance(r, Booking)]
+        rejected = [r for r in results if isinstance(r, ValueError)]
+        assert len(created) == 1
+        assert len(rejected) == 1
+        assert "not available" in str(rejected[0])
+        assert isinstance(rejected[0].__cause__, IntegrityError)
+
+        resp = await pg_client.get(BOOKINGS_URL, params={"car_id": car["id"]})
+        assert len(resp.json()) == 1
+
+    async def test_constraint_backs_up_the_check(self, pg_client: AsyncClient):
+        """Test that the database refuses overlaps the service never saw."""
+        car, customer = await _setup(pg_client)
+        assert (await _book(pg_client, car, customer, 5, 8)).status_code == 201
+
+        async with PostgresSessionLocal() as session:
+            repository = BookingRepository(session)
+            with pytest.raises(IntegrityError, match=OVERLAP_CONSTRAINT):
+                await repository.create(
+                    Booking(
+                        car_id=car["id"],
+                        customer_id=customer["id"],
+                        start_date=days_from_now(8),
+                        end_date=days_from_now(9),
+                        total_cost=50.0,
+                        status=BookingStatus.RESERVED,
+                    )
+                )
+
+    async def test_rollups_match_rebuild(self, pg_client: AsyncClient):
+        """Test incremental rollups and the sweeper against a rebuild."""
+        car, customer = await _setup(pg_client)
+        other = (
+            await pg_client.post(
+                CARS_URL, json={**SAMPLE_CAR, "license_plate": "PG-0002"}
+            )
+        ).json()
+        await _book(pg_client, car, customer, 1, 4)
+        await _book(pg_client, other, customer, 2, 5)
+        await _book(pg_client, car, customer, 6, 9)
+
+        result = await sweep_bookings(
+            PostgresSessionLocal, days_from_now(4), no_show_grace_days=0
+        )
+        assert result.expired == 2
+        incremental = await _rollups()
+        async with engine.begin() as conn:
+            await rebuild_rollups(conn)
+        assert incremental == await _rollups()
+        assert {day for day, *_ in incremental} == {
+            days_from_now(d) for d in (6, 7, 8)
+        }
+
+    async def test_make_prefix_in_code_point_order(self):
+        """Test that make prefixes match, and use the index, in any collation."""
+        async with PostgresSessionLocal() as session:
+            makes = ["Toyota", "TOYOTA X", "To-yota", "Tp", "Tõyota"]
+            for n, make in enumerate(makes):
+                session.add(
+                    Car(
+                        make=make,
+                        model="Camry",
+                        year=2024,
+                        license_plate=f"PG-{n}",
+                        daily_rate=50,
+                    )
+                )
+            await session.flush()
+            repository = CarRepository(session)
+            for prefix, makes in [
+                ("toy", ["TOYOTA X", "Toyota"]),
+                ("TO", ["TOYOTA X", "To-yota", "Toyota"]),
+                ("to" + chr(sys.maxunicode), []),
+            ]:
+                found = await repository.get_filtered(make=prefix)
+                assert sorted(car.make for car in found) == makes, prefix
+
+            await session.execute(text("SET LOCAL enable_seqscan = off"))
+            query = repository.filtered_query(make="toy").compile(
+                engine.sync_engine, compile_kwargs={"literal_binds": True}
+            )
+            plan = await session.execute(text(f"EXPLAIN {query}"))
+            assert "ix_cars_make_model" in "\n".join(row[0] for row in plan)
+
+    async def test_concurrent_job_claims(self):
+        """Test that concurrent workers never claim the same job."""
+        now = datetime.utcnow()
+        async with PostgresSessionLocal() as session:
+            async with session.begin():
+                session.add_all(
+                    Job(kind="rebuild", payload={}, run_after=now) for _ in range(3)
+                )
+
+        async def claim() -> str | None:
+            async with PostgresSessionLocal() as session:
+                async with session.begin():
+                    job = await JobRepository(session).claim_next(
+                        now, now + timedelta(minutes=1)
+                    )
+                    return job.id if job else None
+
+        claimed = await asyncio.gather(*(claim() for _ in range(4)))
+        assert claimed.count(None) == 1
+        assert len(set(claimed) - {None}) == 3
+
+    async def test_idempotency_key_across_processes(
+        self, pg_client: AsyncClient
+    ):
+        """Test that a duplicate from another process waits and replays."""
+        car, customer = await _setup(pg_client)
+        data = BookingCreate(
+            car_id=car["id"],
+            customer_id=customer["id"],
+            start_date=days_from_now(5),
+            end_date=days_from_now(7),
+        )
+        first_claimed = asyncio.Event()
+        release_first = asyncio.Event()
+        runs = 0
+
+        async def create():
+            async with PostgresSessionLocal() as session:
+                async with session.begin():
+                    service = IdempotencyService(
+                        IdempotencyRepository(session),
+                        key="create-1",
+                        fingerprint=b"request",
+                        ttl=timedelta(hours=1),
+                        # Separate processes do not share the key locks.
+                        locks=KeyLocks(),
+                    )
+
+                    async def action():
+                        nonlocal runs
+                        runs += 1
+                        first_claimed.set()
+                        await release_first.wait()
+                        return await BookingService(
+                            booking_repository=BookingRepository(session),
+                            car_repository=CarRepository(session),
+                            customer_repository=CustomerRepository(session),
+                            rollup_repository=RollupRepository(session),
+                            change_repository=ChangeRepository(session),
+                            event_publisher=EventPublisher(broadcaster, session),
+                            pricing_rules=settings.pricing,
+                        ).create_booking(data)
+
+                    return await service.run(action, BookingResponse, 201)
+
+        first = asyncio.create_task(create())
+        await first_claimed.wait()
+        second = asyncio.create_task(create())
+        await asyncio.sleep(0.2)
+        # The duplicate is blocked on the key the first request holds.
+        assert not second.done()
+        release_first.set()
+        created, replayed = await asyncio.gather(first, second)
+
+        assert runs == 1
+        assert replayed.status_code == 201
+        assert replayed.headers[REPLAYED_HEADER] == "true"
+        assert json.loads(replayed.body) == created
@@ -0,0 +1,194 @@
+"""Tests for the pricing engine and Quote endpoints."""
+
+import warnings
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+from pydantic import ValidationError
+
+from app.config import settings
+from app.pricing import DurationDiscount, PricingRules, Season, price
+
+
+QUOTES_URL = "/api/v1/quotes"
+BOOKINGS_URL = "/api/v1/bookings"
+CARS_URL = "/api/v1/cars"
+CUSTOMERS_URL = "/api/v1/customers"
+
+RULES = PricingRules(
+    weekend_multiplier=1.5,
+    seasons=[Season(start="12-20", end="01-05", multiplier=2.0)],
+    duration_discounts=[
+        DurationDiscount(min_days=7, discount=0.1),
+        DurationDiscount(min_days=28, discount=0.25),
+    ],
+)
+
+
+def quote_item(car_id: str, start_date: str, end_date: str) -> dict:
+    """A quote request item."""
+    return {"car_id": car_id, "start_date": start_date, "end_date": end_date}
+
+
+def next_monday(weeks_ahead: int = 1) -> date:
+    """A Monday at least ``weeks_ahead`` weeks from today."""
+    today = date.today()
+    return today + timedelta(days=7 * weeks_ahead - today.weekday())
+
+
+class TestPricingEngine:
+    """Tests for app.pricing.price."""
+
+    def test_plain_daily_rate_by_default(self):
+        quotes = price(
+            PricingRules(),
+            [50.0, 33.33],
+            ["2026-03-02", "2026-03-02"],
+            ["2026-03-05", "2026-03-09"],
+        )
+        assert quotes.days.tolist() == [3, 7]
+        assert quotes.total.tolist() == [150.0, 233.31]
+
+    def test_weekend_season_and_discount(self):
+        quotes = price(
+            RULES,
+            [100.0, 100.0, 100.0, 100.0],
+            # Fri-Sun, Mon-Sun, across new year (Wed 2025-12-31 - Fri), 28 days
+            ["2026-03-06", "2026-03-02", "2025-12-31", "2026-03-02"],
+            ["2026-03-09", "2026-03-09", "2026-01-03", "2026-03-30"],
+        )
+        assert quotes.subtotal.tolist() == [400.0, 800.0, 600.0, 3200.0]
+        assert quotes.discount.tolist() == [0.0, 80.0, 0.0, 800.0]
+        assert quotes.total.tolist() == [400.0, 720.0, 600.0, 2400.0]
+
+    def test_matches_day_by_day_loop(self):
+        rng = np.random.default_rng(3)
+        starts = np.datetime64("2025-11-01") + rng.integers(0, 120, 200)
+        ends = starts + rng.integers(1, 40, 200)
+        rates = np.round(rng.uniform(20, 200, 200), 2)
+        quotes = price(RULES, rates, starts, ends)
+
+        table = RULES.season_table()
+        for i in range(200):
+            subtotal = 0.0
+            day = starts[i].item()
+            while day < ends[i].item():
+                factor = 1.5 if day.weekday() >= 5 else 1.0
+                subtotal += rates[i] * factor * table[day.month - 1, day.day - 1]
+                day += timedelta(days=1)
+            days = (ends[i] - starts[i]).astype(int)
+            rate = 0.25 if days >= 28 else 0.1 if days >= 7 else 0.0
+            expected = round(subtotal, 2) - round(round(subtotal, 2) * rate, 2)
+            assert quotes.total[i] == pytest.approx(expected, abs=0.011)
+
+    def test_season_table_uses_day_units(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            table = RULES.season_table()
+        assert table[11, 19] == table[0, 4] == 2.0
+        assert table[0, 5] == table[11, 18] == 1.0
+
+    def test_weekend_days_are_weekdays(self):
+        with pytest.raises(ValidationError):
+            PricingRules(weekend_days=[5, 7])
+        with pytest.raises(ValidationError):
+            PricingRules(weekend_days=[-1])
+
+
+@pytest.mark.asyncio
+class TestQuotes:
+    """Tests for POST /api/v1/quotes."""
+
+    async def _create_car(self, client: AsyncClient, plate: str, rate: float) -> dict:
+        resp = await client.post(
+            CARS_URL,
+            json={
+                "make": "Toyota",
+                "model": "Camry",
+                "year": 2024,
+                "license_plate": plate,
+                "daily_rate": rate,
+                "category": "standard",
+            },
+        )
+        return resp.json()
+
+    async def test_batch_quotes(self, client: AsyncClient):
+        first = await self._create_car(client, "QTE-1", 50.0)
+        second = await self._create_car(client, "QTE-2", 80.0)
+        items = [
+            quote_item(first["id"], "2026-03-02", "2026-03-05"),
+            quote_item(second["id"], "2026-03-02", "2026-03-04"),
+            quote_item(first["id"], "2026-03-10", "2026-03-11"),
+        ]
+
+        response = await client.post(QUOTES_URL, json={"items": items})
+        assert response.status_code == 200
+        quotes = response.json()["quotes"]
+        assert [q["total"] for q in quotes] == [150.0, 160.0, 50.0]
+        assert [q["car_id"] for q in quotes] == [item["car_id"] for item in items]
+        assert quotes[0]["days"] == 3
+        assert quotes[0]["daily_rate"] == 50.0
+
+    async def test_rules_from_settings(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(settings, "pricing", RULES)
+        car = await self._create_car(client, "QTE-1", 100.0)
+
+        response = await client.post(
+            QUOTES_URL,
+            json={"items": [quote_item(car["id"], "2026-03-02", "2026-03-09")]},
+        )
+        quote = response.json()["quotes"][0]
+        assert (quote["subtotal"], quote["discount"], quote["total"]) == (
+            800.0,
+            80.0,
+            720.0,
+        )
+
+    async def test_booking_cost_matches_quote(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(settings, "pricing", RULES)
+        car = await self._create_car(client, "QTE-1", 45.5)
+        customer = await client.post(
+            CUSTOMERS_URL,
+            json={
+                "first_name": "Alice",
+                "last_name": "Smith",
+                "email": "alice@example.com",
+                "phone": "+1234567890",
+                "driver_license": "DL-1",
+            },
+        )
+        start = next_monday()
+        item = quote_item(
+            car["id"],
+            (start + timedelta(days=3)).isoformat(),
+            (start + timedelta(days=12)).isoformat(),
+        )
+
+        quote = await client.post(QUOTES_URL, json={"items": [item]})
+        booking = await client.post(
+            BOOKINGS_URL, json={**item, "customer_id": customer.json()["id"]}
+        )
+        assert booking.status_code == 201
+        assert booking.json()["total_cost"] == quote.json()["quotes"][0]["total"]
+
+    async def test_invalid_items(self, client: AsyncClient):
+        car = await self._create_car(client, "QTE-1", 50.0)
+
+        response = await client.post(
+            QUOTES_URL,
+            json={"items": [quote_item("missing", "2026-03-02", "2026-03-05")]},
+        )
+        assert response.status_code == 400
+        assert "missing" in response.json()["detail"]
+
+        response = await client.post(
+            QUOTES_URL,
+            json={"items": [quote_item(car["id"], "2026-03-05", "2026-03-05")]},
+        )
+        assert response.status_code == 400
+
+        response = await client.post(QUOTES_URL, json={"items": []})
+        assert response.status_code == 422
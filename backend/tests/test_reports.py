@@ -0,0 +1,188 @@
+"""Tests for Report endpoints and daily rollups."""
+
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.cli.rebuild import rebuild_rollups
+from tests.conftest import engine
+
+
+REPORTS_URL = "/api/v1/reports"
+BOOKINGS_URL = "/api/v1/bookings"
+CARS_URL = "/api/v1/cars"
+CUSTOMERS_URL = "/api/v1/customers"
+
+SAMPLE_CAR = {
+    "make": "Toyota",
+    "model": "Camry",
+    "year": 2024,
+    "license_plate": "RPT-0001",
+    "daily_rate": 50.00,
+    "category": "standard",
+}
+
+SAMPLE_CUSTOMER = {
+    "first_name": "Alice",
+    "last_name": "Smith",
+    "email": "alice.smith@example.com",
+    "phone": "+1234567890",
+    "driver_license": "DL-999999",
+}
+
+
+def future_date(days_ahead: int) -> str:
+    """Return an ISO-formatted date N days from today."""
+    return (date.today() + timedelta(days=days_ahead)).isoformat()
+
+
+def period(start: int = 0, end: int = 30) -> dict:
+    """Query params for a report period relative to today."""
+    return {"start_date": future_date(start), "end_date": future_date(end)}
+
+
+async def _rollups() -> list[tuple]:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT day, car_id, category, booked_days, round(revenue, 2), "
+                "rentals, rental_days FROM daily_rollups "
+                "ORDER BY day, car_id"
+            )
+        )
+        return [tuple(row) for row in result.all()]
+
+
+@pytest.mark.asyncio
+class TestReports:
+    """Tests for /api/v1/reports and rollup maintenance."""
+
+    async def _create_car(self, client: AsyncClient, **overrides) -> dict:
+        resp = await client.post(CARS_URL, json={**SAMPLE_CAR, **overrides})
+        return resp.json()
+
+    async def _create_customer(self, client: AsyncClient) -> dict:
+        resp = await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)
+        return resp.json()
+
+    async def _book(
+        self, client: AsyncClient, car: dict, customer: dict, start: int, end: int
+    ) -> dict:
+        resp = await client.post(
+            BOOKINGS_URL,
+            json={
+                "car_id": car["id"],
+                "customer_id": customer["id"],
+                "start_date": future_date(start),
+                "end_date": future_date(end),
+            },
+        )
+        assert resp.status_code == 201
+        return resp.json()
+
+    async def test_revenue_by_category(self, client: AsyncClient):
+        car = await self._create_car(client, daily_rate=33.33)
+        customer = await self._create_customer(client)
+        await self._book(client, car, customer, 1, 4)
+
+        response = await client.get(f"{REPORTS_URL}/revenue", params=period())
+        assert response.status_code == 200
+        data = response.json()
+        assert [row["day"] for row in data] == [future_date(d) for d in (1, 2, 3)]
+        assert {row["category"] for row in data} == {"standard"}
+        assert [row["booked_days"] for row in data] == [1, 1, 1]
+        assert [row["rentals"] for row in data] == [1, 0, 0]
+        assert round(sum(row["revenue"] for row in data), 2) == 99.99
+
+    async def test_utilization_includes_idle_cars(self, client: AsyncClient):
+        busy = await self._create_car(client)
+        idle = await self._create_car(
+            client, license_plate="RPT-0002", category="luxury"
+        )
+        customer = await self._create_customer(client)
+        await self._book(client, busy, customer, 1, 6)
+
+        response = await client.get(
+            f"{REPORTS_URL}/utilization", params=period(1, 10)
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [row["car_id"] for row in data] == [busy["id"], idle["id"]]
+        assert data[0]["booked_days"] == 5
+        assert data[0]["period_days"] == 10
+        assert data[0]["utilization"] == 0.5
+        assert data[0]["revenue"] == 250.0
+        assert data[1]["booked_days"] == 0
+        assert data[1]["utilization"] == 0.0
+
+        response = await client.get(
+            f"{REPORTS_URL}/utilization",
+            params={**period(1, 10), "category": "luxury"},
+        )
+        assert [row["car_id"] for row in response.json()] == [idle["id"]]
+
+    async def test_rental_length(self, client: AsyncClient):
+        car = await self._create_car(client)
+        customer = await self._create_customer(client)
+        await self._book(client, car, customer, 1, 3)
+        await self._book(client, car, customer, 5, 10)
+
+        response = await client.get(f"{REPORTS_URL}/rental-length", params=period())
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "category": "standard",
+                "rentals": 2,
+                "rental_days": 7,
+                "average_days": 3.5,
+            }
+        ]
+
+    async def test_cancel_removes_contribution(self, client: AsyncClient):
+        car = await self._create_car(client)
+        customer = await self._create_customer(client)
+        booking = await self._book(client, car, customer, 1, 4)
+
+        await client.post(f"{BOOKINGS_URL}/{booking['id']}/cancel")
+
+        assert await _rollups() == []
+        response = await client.get(f"{REPORTS_URL}/revenue", params=period())
+        assert response.json() == []
+
+    async def test_early_return_shrinks_rental(self, client: AsyncClient):
+        car = await self._create_car(client)
+        customer = await self._create_customer(client)
+        booking = await self._book(client, car, customer, 0, 3)
+
+        await client.post(f"{BOOKINGS_URL}/{booking['id']}/pickup")
+        await client.post(f"{BOOKINGS_URL}/{booking['id']}/return")
+
+        rows = await _rollups()
+        assert len(rows) == 1
+        assert rows[0][0] == future_date(0)
+        assert rows[0][3:] == (1, 150.0, 1, 1)
+
+    async def test_rebuild_matches_incremental(self, client: AsyncClient):
+        car = await self._create_car(client, daily_rate=33.33)
+        other = await self._create_car(client, license_plate="RPT-0002")
+        customer = await self._create_customer(client)
+        await self._book(client, car, customer, 1, 4)
+        await self._book(client, other, customer, 2, 9)
+        returned = await self._book(client, other, customer, 0, 1)
+        await client.post(f"{BOOKINGS_URL}/{returned['id']}/pickup")
+        await client.post(f"{BOOKINGS_URL}/{returned['id']}/return")
+        cancelled = await self._book(client, car, customer, 10, 12)
+        await client.post(f"{BOOKINGS_URL}/{cancelled['id']}/cancel")
+
+        incremental = await _rollups()
+        async with engine.begin() as conn:
+            await rebuild_rollups(conn)
+        assert await _rollups() == incremental
+
+    async def test_inverted_period(self, client: AsyncClient):
+        response = await client.get(
+            f"{REPORTS_URL}/revenue", params={**period(), "start_date": future_date(40)}
+        )
+        assert response.status_code == 400
@@ -0,0 +1,663 @@
+"""Conformance tests run against both repository backends."""
+
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.exc import IntegrityError
+
+from app.api.dependencies import get_memory_store
+from app.config import settings
+from app.main import app
+from app.models import Booking, Car, Customer
+from app.models.booking import BookingStatus
+from app.models.car import CarCategory, CarStatus
+from app.models.change import ChangeEntity
+from app.repositories import (
+    BookingRepository,
+    CarRepository,
+    ChangeRepository,
+    CustomerRepository,
+    RollupRepository,
+)
+from app.repositories.memory import (
+    InMemoryBookingRepository,
+    InMemoryCarRepository,
+    InMemoryChangeRepository,
+    InMemoryCustomerRepository,
+    InMemoryRollupRepository,
+    InMemoryStore,
+)
+from app.schemas.car import CarSort
+from tests.conftest import TestSessionLocal
+
+
+@dataclass
+class Repositories:
+    cars: CarRepository
+    customers: CustomerRepository
+    bookings: BookingRepository
+    rollups: RollupRepository
+    changes: ChangeRepository
+
+
+@pytest_asyncio.fixture(params=["sql", "memory"])
+async def repos(request):
+    """The repositories of one backend, sharing a session or store."""
+    if request.param == "memory":
+        store = InMemoryStore()
+        yield Repositories(
+            InMemoryCarRepository(store),
+            InMemoryCustomerRepository(store),
+            InMemoryBookingRepository(store),
+            InMemoryRollupRepository(store),
+            InMemoryChangeRepository(store),
+        )
+    else:
+        async with TestSessionLocal() as session:
+            yield Repositories(
+                CarRepository(session),
+                CustomerRepository(session),
+                BookingRepository(session),
+                RollupRepository(session),
+                ChangeRepository(session),
+            )
+
+
+def days_from_now(days: int) -> date:
+    return date.today() + timedelta(days=days)
+
+
+def make_car(plate: str, **fields) -> Car:
+    values = {
+        "make": "Toyota",
+        "model": "Camry",
+        "year": 2024,
+        "daily_rate": 50.0,
+        **fields,
+    }
+    return Car(license_plate=plate, **values)
+
+
+def make_customer(email: str, **fields) -> Customer:
+    values = {
+        "first_name": "Alice",
+        "last_name": "Smith",
+        "phone": "+1234567890",
+        "driver_license": "DL-999999",
+        **fields,
+    }
+    return Customer(email=email, **values)
+
+
+async def add_booking(
+    repos: Repositories,
+    car: Car,
+    customer: Customer,
+    start: int,
+    end: int,
+    status: BookingStatus = BookingStatus.RESERVED,
+) -> Booking:
+    booking = await repos.bookings.create(
+        Booking(
+            car_id=car.id,
+            customer_id=customer.id,
+            start_date=days_from_now(start),
+            end_date=days_from_now(end),
+            total_cost=50.0 * (end - start),
+            status=status,
+        )
+    )
+    await repos.rollups.record(booking, car.category)
+    return booking
+
+
+async def fleet(repos: Repositories) -> tuple[Car, Car, Customer]:
+    car = await repos.cars.create(make_car("CNF-0001"))
+    other = await repos.cars.create(
+        make_car("CNF-0002", category=CarCategory.LUXURY, daily_rate=120.0)
+    )
+    customer = await repos.customers.create(make_customer("alice@example.com"))
+    return car, other, customer
+
+
+@pytest.mark.asyncio
+class TestRepositoryConformance:
+    """Tests that both backends behave the same."""
+
+    async def test_create_applies_defaults(self, repos: Repositories):
+        """Test that created records get their ID and column defaults."""
+        car = await repos.cars.create(make_car("CNF-0001"))
+        assert len(car.id) == 36
+        assert car.status == CarStatus.AVAILABLE
+        assert car.category == CarCategory.STANDARD
+        assert car.created_at is not None
+        assert await repos.cars.get_by_id(car.id) is car
+        assert await repos.cars.get_by_id("missing") is None
+
+    async def test_update_and_delete(self, repos: Repositories):
+        """Test that updates are visible through lookups and deletes stick."""
+        car = await repos.cars.create(make_car("CNF-0001"))
+        car.license_plate = "CNF-0009"
+        car.status = CarStatus.MAINTENANCE
+        await repos.cars.update(car)
+
+        assert await repos.cars.get_by_license_plate("CNF-0001") is None
+        assert (await repos.cars.get_by_license_plate("CNF-0009")).id == car.id
+        in_maintenance = await repos.cars.get_filtered(status=CarStatus.MAINTENANCE)
+        assert [c.id for c in in_maintenance] == [car.id]
+
+        await repos.cars.delete(car)
+        assert await repos.cars.get_by_id(car.id) is None
+        assert await repos.cars.get_all() == []
+
+    async def test_unique_license_plate(self, repos: Repositories):
+        """Test that a duplicate license plate is rejected."""
+        await repos.cars.create(make_car("CNF-0001"))
+        with pytest.raises(IntegrityError):
+            await repos.cars.create(make_car("CNF-0001"))
+
+    async def test_unique_email_on_update(self, repos: Repositories):
+        """Test that changing an email to a taken one is rejected."""
+        await repos.customers.create(make_customer("alice@example.com"))
+        bob = await repos.customers.create(make_customer("bob@example.com"))
+        bob.email = "alice@example.com"
+        with pytest.raises(IntegrityError):
+            await repos.customers.update(bob)
+
+    async def test_required_columns(self, repos: Repositories):
+        """Test that a record missing a required value is rejected."""
+        with pytest.raises(IntegrityError):
+            await repos.cars.create(
+                Car(model="Camry", year=2024, license_plate="X", daily_rate=1)
+            )
+
+    async def test_car_filters(self, repos: Repositories):
+        """Test car filters, case-insensitive prefixes and ordering."""
+        cars = [
+            make_car("CNF-0001", make="Toyota", year=2020, daily_rate=40),
+            make_car(
+                "CNF-0002", make="toyota", model="Corolla", year=2022, daily_rate=35
+            ),
+            make_car(
+                "CNF-0003",
+                make="Citroën",
+                model="C4",
+                year=2023,
+                daily_rate=55,
+                category=CarCategory.ECONOMY,
+            ),
+            make_car(
+                "CNF-0004",
+                make="BMW",
+                model="X5",
+                year=2024,
+                daily_rate=150,
+                category=CarCategory.LUXURY,
+            ),
+        ]
+        for car in cars:
+            await repos.cars.create(car)
+        cars[3].status = CarStatus.RENTED
+        await repos.cars.update(cars[3])
+
+        async def plates(**filters) -> list[str]:
+            return [c.license_plate for c in await repos.cars.get_filtered(**filters)]
+
+        assert sorted(await plates(make="TOY")) == ["CNF-0001", "CNF-0002"]
+        assert await plates(make="toy", model="co") == ["CNF-0002"]
+        assert await plates(make="CITROË") == []
+        assert await plates(make="citro") == ["CNF-0003"]
+        assert await plates(make="toy" + chr(sys.maxunicode)) == []
+        assert await plates(make="to_") == []
+        assert await plates(category=CarCategory.ECONOMY) == ["CNF-0003"]
+        assert await plates(status=CarStatus.RENTED) == ["CNF-0004"]
+        assert sorted(await plates(min_year=2022, max_year=2023)) == [
+            "CNF-0002",
+            "CNF-0003",
+        ]
+        assert await plates(min_rate=40, max_rate=55, sort=CarSort.DAILY_RATE_DESC) == [
+            "CNF-0003",
+            "CNF-0001",
+        ]
+        assert await plates(sort=CarSort.YEAR) == [
+            "CNF-0001",
+            "CNF-0002",
+            "CNF-0003",
+            "CNF-0004",
+        ]
+        assert await repos.cars.count() == 4
+        assert await repos.cars.count_filtered(make="TOY") == 2
+        assert await repos.cars.count_filtered(status=CarStatus.RENTED) == 1
+        assert await repos.cars.count_filtered(min_year=2022, max_rate=100) == 2
+        found = await repos.cars.get_by_ids([cars[0].id, "missing", cars[2].id])
+        assert sorted(c.license_plate for c in found) == ["CNF-0001", "CNF-0003"]
+
+    async def test_customer_search(self, repos: Repositories):
+        """Test prefix search across the searchable customer fields."""
+        alice = await repos.customers.create(
+            make_customer("alice.smith@example.com", driver_license="DL-100")
+        )
+        bob = await repos.customers.create(
+            make_customer(
+                "bob@mail.test",
+                first_name="Bob",
+                last_name="Jones",
+                phone="555-0199",
+                driver_license="XY-200",
+            )
+        )
+
+        async def found(query: str, limit: int = 20) -> set[str]:
+            return {c.id for c in await repos.customers.search(query, limit=limit)}
+
+        assert await found("ali") == {alice.id}
+        assert await found("a.smith@") == {alice.id}
+        assert await found("SMITH alice") == {alice.id}
+        assert await found("0199") == {bob.id}
+        assert await found("199") == set()
+        assert await found("xy") == {bob.id}
+        assert await found("bob smith") == set()
+        assert await found("!!!") == set()
+        assert len(await found("dl xy")) == 0
+        assert len(await repos.customers.search("smith", limit=1)) == 1
+
+        bob.last_name = "Smithers"
+        await repos.customers.update(bob)
+        assert await found("smith") == {alice.id, bob.id}
+        assert await found("jones") == set()
+
+    async def test_overlapping_bookings(self, repos: Repositories):
+        """Test that overlaps include both ends and ignore closed bookings."""
+        car, other, customer = await fleet(repos)
+        booking = await add_booking(repos, car, customer, 5, 8)
+        await add_booking(repos, car, customer, 10, 12, BookingStatus.CANCELLED)
+        await add_booking(repos, other, customer, 5, 8)
+
+        async def overlapping(start: int, end: int, **kwargs) -> list[str]:
+            found = await repos.bookings.get_overlapping_bookings(
+                car.id, days_from_now(start), days_from_now(end), **kwargs
+            )
+            return [b.id for b in found]
+
+        for start, end in [(6, 7), (3, 5), (8, 9), (1, 20)]:
+            assert await overlapping(start, end) == [booking.id]
+        assert await overlapping(1, 4) == []
+        assert await overlapping(9, 12) == []
+        assert await overlapping(6, 7, exclude_booking_id=booking.id) == []
+
+    async def test_booking_filters(self, repos: Repositories):
+        """Test booking filters, per-car and per-customer lookups and includes."""
+        car, other, customer = await fleet(repos)
+        bob = await repos.customers.create(make_customer("bob@example.com"))
+        first = await add_booking(repos, car, customer, 1, 2)
+        second = await add_booking(repos, other, customer, 1, 2, BookingStatus.ACTIVE)
+        third = await add_booking(repos, car, bob, 4, 6)
+
+        async def ids(**filters) -> set[str]:
+            return {b.id for b in await repos.bookings.get_filtered(**filters)}
+
+        assert await ids() == {first.id, second.id, third.id}
+        assert await ids(car_id=car.id) == {first.id, third.id}
+        assert await ids(customer_id=customer.id) == {first.id, second.id}
+        assert await ids(status=BookingStatus.ACTIVE) == {second.id}
+        assert await ids(car_id=car.id, customer_id=bob.id) == {third.id}
+        assert await ids(car_id=other.id, status=BookingStatus.RESERVED) == set()
+        assert await repos.bookings.count_filtered() == 3
+        assert await repos.bookings.count_filtered(car_id=car.id) == 2
+        assert (
+            await repos.bookings.count_filtered(
+                customer_id=customer.id, status=BookingStatus.ACTIVE
+            )
+            == 1
+        )
+        assert {b.id for b in await repos.bookings.get_by_car_id(car.id)} == {
+            first.id,
+            third.id,
+        }
+        assert {b.id for b in await repos.bookings.get_by_customer_id(bob.id)} == {
+            third.id
+        }
+
+        expanded = await repos.bookings.get_filtered(
+            customer_id=bob.id, include=("car", "customer")
+        )
+        assert expanded[0].car.license_plate == "CNF-0001"
+        assert expanded[0].customer.email == "bob@example.com"
+        loaded = await repos.bookings.get_by_id(second.id, include=("car",))
+        assert loaded.car.category == CarCategory.LUXURY
+
+    async def test_dashboard_aggregates(self, repos: Repositories):
+        """Test status breakdowns, today's schedule and recent bookings."""
+        car, other, customer = await fleet(repos)
+        other.status = CarStatus.MAINTENANCE
+        await repos.cars.update(other)
+        first = await add_booking(repos, car, customer, 0, 2)
+        second = await add_booking(repos, car, customer, -2, 0, BookingStatus.ACTIVE)
+        third = await add_booking(repos, other, customer, 0, 1, BookingStatus.EXPIRED)
+
+        cars = await repos.cars.count_by_status()
+        assert cars == {
+            CarStatus.AVAILABLE: 1,
+            CarStatus.RENTED: 0,
+            CarStatus.MAINTENANCE: 1,
+        }
+        bookings = await repos.bookings.count_by_status()
+        assert bookings[BookingStatus.RESERVED] == 1
+        assert bookings[BookingStatus.EXPIRED] == 1
+        assert bookings[BookingStatus.COMPLETED] == 0
+        assert await repos.bookings.count_scheduled(days_from_now(0)) == (1, 1)
+        assert await repos.bookings.count_scheduled(days_from_now(2)) == (0, 1)
+
+        recent = await repos.bookings.get_recent(2, include=("car",))
+        assert [b.id for b in recent] == [third.id, second.id]
+        assert recent[0].car.license_plate == "CNF-0002"
+        assert first not in recent
+
+    async def test_referenced_car_cannot_be_deleted(self, repos: Repositories):
+        """Test that cars and customers with bookings cannot be deleted."""
+        car, _, customer = await fleet(repos)
+        await add_booking(repos, car, customer, 1, 2)
+        with pytest.raises(IntegrityError):
+            await repos.cars.delete(car)
+
+    async def test_lifecycle_transitions(self, repos: Repositories):
+        """Test batched expiry and overdue flagging."""
+        car, other, customer = await fleet(repos)
+        stale = [await add_booking(repos, car, customer, n, n + 1) for n in (1, 3, 5)]
+        fresh = await add_booking(repos, car, customer, 9, 10)
+        rental = await add_booking(repos, other, customer, 1, 2, BookingStatus.ACTIVE)
+
+        expired = await repos.bookings.expire_no_shows(days_from_now(7), limit=2)
+        assert len(expired) == 2
+        assert {row.car_id for row in expired} == {car.id}
+        assert {float(row.total_cost) for row in expired} == {50.0}
+        expired += await repos.bookings.expire_no_shows(days_from_now(7), limit=2)
+        assert len(expired) == 3
+        assert {(row.start_date, row.end_date) for row in expired} == {
+            (b.start_date, b.end_date) for b in stale
+        }
+        assert await repos.bookings.expire_no_shows(days_from_now(7), limit=2) == []
+
+        remaining = await repos.bookings.get_filtered(status=BookingStatus.RESERVED)
+        assert [b.id for b in remaining] == [fresh.id]
+
+        assert await repos.bookings.mark_overdue(days_from_now(2), limit=10) == []
+        overdue = await repos.bookings.mark_overdue(days_from_now(3), limit=10)
+        assert [row.car_id for row in overdue] == [other.id]
+        overdue = await repos.bookings.get_filtered(status=BookingStatus.OVERDUE)
+        assert [b.id for b in overdue] == [rental.id]
+
+    async def test_release_unrented(self, repos: Repositories):
+        """Test that only rented cars without an open rental are released."""
+        car, other, customer = await fleet(repos)
+        for rented in (car, other):
+            rented.status = CarStatus.RENTED
+            await repos.cars.update(rented)
+        await add_booking(repos, other, customer, 1, 2, BookingStatus.OVERDUE)
+
+        released = await repos.cars.release_unrented(limit=10)
+        assert [row.id for row in released] == [car.id]
+        available = await repos.cars.get_filtered(status=CarStatus.AVAILABLE)
+        assert [c.id for c in available] == [car.id]
+
+    async def test_change_journal(self, repos: Repositories):
+        """Test that only the latest change of each record survives compaction."""
+        await repos.changes.record(ChangeEntity.CAR, ["car-1", "car-2"])
+        await repos.changes.record(ChangeEntity.CAR, ["car-1"])
+        await repos.changes.record(ChangeEntity.CUSTOMER, ["cust-1"], deleted=True)
+        assert await repos.changes.latest() == 4
+        assert [c.seq for c in await repos.changes.since(2, limit=10)] == [3, 4]
+
+        assert await repos.changes.compact(limit=10) in (0, 1)
+        changes = await repos.changes.since(0, limit=10)
+        assert [(c.seq, c.entity, c.entity_id, c.deleted) for c in changes] == [
+            (2, ChangeEntity.CAR, "car-2", False),
+            (3, ChangeEntity.CAR, "car-1", False),
+            (4, ChangeEntity.CUSTOMER, "cust-1", True),
+        ]
+        assert [c.seq for c in await repos.changes.since(0, limit=2)] == [2, 3]
+        assert await repos.changes.compact(limit=10) == 0
+
+    async def test_archive_finished(self, repos: Repositories):
+        """Test batched archiving and reads that include the archive."""
+        car, other, customer = await fleet(repos)
+        done = BookingStatus.COMPLETED
+        completed = await add_booking(repos, car, customer, -40, -35, done)
+        cancelled = await add_booking(
+            repos, other, customer, -30, -28, BookingStatus.CANCELLED
+        )
+        late = await add_booking(repos, car, customer, -30, -25, done)
+        late.actual_return_date = days_from_now(-5)
+        await repos.bookings.update(late)
+        active = await add_booking(
+            repos, other, customer, -20, -15, BookingStatus.ACTIVE
+        )
+        recent = await add_booking(repos, car, customer, -4, -2, done)
+        start, end = days_from_now(-60), days_from_now(0)
+        await repos.rollups.rebuild()
+        revenue = await repos.rollups.total_revenue(start, end)
+        now = datetime(2026, 1, 1)
+
+        cutoff = days_from_now(-10)
+        assert await repos.bookings.archive_finished(cutoff, limit=1, now=now) == 1
+        assert await repos.bookings.archive_finished(cutoff, limit=10, now=now) == 1
+        assert await repos.bookings.archive_finished(cutoff, limit=10, now=now) == 0
+
+        live = {late.id, active.id, recent.id}
+        archived = {completed.id, cancelled.id}
+        bookings = await repos.bookings.get_filtered(archived=True)
+        assert {b.id for b in bookings[:3]} == live
+        assert {b.id for b in bookings[3:]} == archived
+        assert {b.id for b in await repos.bookings.get_filtered()} == live
+        assert await repos.bookings.count_filtered() == 3
+        assert await repos.bookings.count_filtered(archived=True) == 5
+        assert [
+            b.id
+            for b in await repos.bookings.get_filtered(
+                car_id=other.id, status=BookingStatus.CANCELLED, archived=True
+            )
+        ] == [cancelled.id]
+
+        assert await repos.bookings.get_by_id(completed.id) is None
+        loaded = await repos.bookings.get_by_id(
+            completed.id, include=("car",), archived=True
+        )
+        assert loaded.status == BookingStatus.COMPLETED
+        assert loaded.car.license_plate == "CNF-0001"
+        assert loaded.archived_at == now
+
+        await repos.rollups.rebuild()
+        assert await repos.rollups.total_revenue(start, end) == revenue
+
+    async def test_customer_history(self, repos: Repositories):
+        """Test keyset pages and totals of a customer's bookings."""
+        car, other, customer = await fleet(repos)
+        done = BookingStatus.COMPLETED
+        old = await add_booking(repos, car, customer, -40, -35, done)
+        await add_booking(repos, other, customer, -30, -28, BookingStatus.CANCELLED)
+        same_day = [
+            await add_booking(repos, car, customer, -10, -8, done),
+            await add_booking(repos, other, customer, -10, -9, done),
+        ]
+        await add_booking(repos, car, customer, 5, 7)
+        bob = await repos.customers.create(make_customer("bob@example.com"))
+        await add_booking(repos, other, bob, 1, 3)
+        await repos.bookings.archive_finished(
+            days_from_now(-20), limit=10, now=datetime(2026, 1, 1)
+        )
+
+        history = repos.bookings.get_customer_history
+        first = await history(customer.id, 2, include=("car",))
+        assert [b.start_date for b in first] == [days_from_now(5), days_from_now(-10)]
+        assert first[0].car.license_plate == "CNF-0001"
+        assert first[1].id == max(b.id for b in same_day)
+        cursor = (first[-1].start_date, first[-1].id)
+        rest = await history(customer.id, 10, before=cursor)
+        assert [b.id for b in rest] == [min(b.id for b in same_day)]
+        everything = await history(customer.id, 10, before=cursor, archived=True)
+        assert len(everything) == 3
+        assert everything[-1].id == old.id
+
+        totals = {
+            row.status: row
+            for row in await repos.bookings.customer_totals(customer.id)
+        }
+        assert set(totals) == {done, BookingStatus.RESERVED}
+        assert totals[done].bookings == 2
+        assert float(totals[done].spend) == 150.0
+        assert totals[done].last_start == days_from_now(-10)
+        totals = {
+            row.status: row
+            for row in await repos.bookings.customer_totals(
+                customer.id, archived=True
+            )
+        }
+        assert totals[done].bookings == 3
+        assert float(totals[done].spend) == 400.0
+        assert totals[BookingStatus.CANCELLED].bookings == 1
+
+    async def test_rollup_reports(self, repos: Repositories):
+        """Test report queries on incremental rollups and after a rebuild."""
+        car, other, customer = await fleet(repos)
+        await repos.cars.create(make_car("CNF-0003", category=CarCategory.ECONOMY))
+        await add_booking(repos, car, customer, 1, 4)
+        await add_booking(repos, other, customer, 2, 3)
+        cancelled = await add_booking(repos, other, customer, 5, 6)
+        await repos.rollups.record(cancelled, other.category, sign=-1)
+        cancelled.status = BookingStatus.CANCELLED
+        await repos.bookings.update(cancelled)
+
+        start, end = days_from_now(0), days_from_now(10)
+
+        async def reports() -> tuple[list, list, list]:
+            revenue = [
+                (r.day, r.category, float(r.revenue), r.booked_days, r.rentals)
+                for r in await repos.rollups.revenue_by_category(start, end)
+            ]
+            utilization = [
+                (r.license_plate, r.booked_days, round(float(r.revenue), 2))
+                for r in await repos.rollups.utilization_by_car(start, end)
+            ]
+            lengths = [
+                (r.category, r.rentals, r.rental_days)
+                for r in await repos.rollups.rental_length_by_category(start, end)
+            ]
+            return revenue, utilization, lengths
+
+        incremental = await reports()
+        revenue, utilization, lengths = incremental
+        assert revenue == [
+            (days_from_now(1), CarCategory.STANDARD, 50.0, 1, 1),
+            (days_from_now(2), CarCategory.LUXURY, 50.0, 1, 1),
+            (days_from_now(2), CarCategory.STANDARD, 50.0, 1, 0),
+            (days_from_now(3), CarCategory.STANDARD, 50.0, 1, 0),
+        ]
+        assert utilization == [
+            ("CNF-0001", 3, 150.0),
+            ("CNF-0002", 1, 50.0),
+            ("CNF-0003", 0, 0),
+        ]
+        assert lengths == [(CarCategory.LUXURY, 1, 1), (CarCategory.STANDARD, 1, 3)]
+        assert [
+            r.license_plate
+            for r in await repos.rollups.utilization_by_car(
+                start, end, category=CarCategory.ECONOMY
+            )
+        ] == ["CNF-0003"]
+
+        assert await repos.rollups.total_revenue(start, end) == 200.0
+
+        await repos.rollups.rebuild()
+        assert await reports() == incremental
+
+
+@pytest_asyncio.fixture
+async def memory_client(client: AsyncClient, monkeypatch: pytest.MonkeyPatch):
+    """A test client whose requests use a fresh in-memory store."""
+    store = InMemoryStore()
+    monkeypatch.setattr(settings, "repository_backend", "memory")
+    app.dependency_overrides[get_memory_store] = lambda: store
+    yield client, store
+    del app.dependency_overrides[get_memory_store]
+
+
+@pytest.mark.asyncio
+class TestMemoryBackend:
+    """Tests for serving the API from the in-memory backend."""
+
+    async def test_booking_flow(self, memory_client):
+        """Test booking a car end to end without touching the database."""
+        client, store = memory_client
+        car = (
+            await client.post(
+                "/api/v1/cars",
+                json={
+                    "make": "Toyota",
+                    "model": "Camry",
+                    "year": 2024,
+                    "license_plate": "MEM-0001",
+                    "daily_rate": 50.0,
+                },
+            )
+        ).json()
+        customer = (
+            await client.post(
+                "/api/v1/customers",
+                json={
+                    "first_name": "Alice",
+                    "last_name": "Smith",
+                    "email": "alice@example.com",
+                    "phone": "+1234567890",
+                    "driver_license": "DL-1",
+                },
+            )
+        ).json()
+        booking = {
+            "car_id": car["id"],
+            "customer_id": customer["id"],
+            "start_date": days_from_now(2).isoformat(),
+            "end_date": days_from_now(4).isoformat(),
+        }
+
+        resp = await client.post("/api/v1/bookings", json=booking)
+        assert resp.status_code == 201
+        assert resp.json()["total_cost"] == 100.0
+        booking_id = resp.json()["id"]
+        assert (await client.post("/api/v1/bookings", json=booking)).status_code == 400
+
+        resp = await client.get(
+            f"/api/v1/bookings/{booking_id}", params={"include": "car"}
+        )
+        assert resp.json()["car"]["license_plate"] == "MEM-0001"
+        resp = await client.get("/api/v1/cars", params={"fields": "license_plate"})
+        assert resp.json() == [{"license_plate": "MEM-0001"}]
+        resp = await client.get("/api/v1/dashboard/summary")
+        assert resp.json()["bookings_by_status"]["reserved"] == 1
+        assert resp.json()["recent_bookings"][0]["customer"]["first_name"] == "Alice"
+        resp = await client.get("/api/v1/customers/search", params={"q": "ali"})
+        assert [c["id"] for c in resp.json()] == [customer["id"]]
+
+        resp = await client.post(f"/api/v1/bookings/{booking_id}/cancel")
+        assert resp.json()["status"] == "cancelled"
+        assert store.rollups == {}
+        assert len(store.bookings) == 1
+
+        async with TestSessionLocal() as session:
+            assert await CarRepository(session).get_all() == []
+
+    async def test_duplicate_plate(self, memory_client):
+        """Test that uniqueness checks run against the in-memory store."""
+        client, _ = memory_client
+        car = {
+            "make": "Toyota",
+            "model": "Camry",
+            "year": 2024,
+            "license_plate": "MEM-0001",
+            "daily_rate": 50.0,
+        }
+        assert (await client.post("/api/v1/cars", json=car)).status_code == 201
+        assert (await client.post("/api/v1/cars", json=car)).status_code == 400
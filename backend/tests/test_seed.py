@@ -0,0 +1,191 @@
+"""Tests for the synthetic data generator."""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.cli.seed import SeedConfig, seed_database
+
+TODAY = date(2025, 6, 1)
+
+
+async def _seed(tmp_path, name: str = "seed.db", **overrides):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}")
+    config = SeedConfig(
+        cars=20,
+        customers=50,
+        bookings=1_000,
+        batch_size=300,
+        today=TODAY,
+        **overrides,
+    )
+    report = await seed_database(engine, config)
+    return engine, report
+
+
+async def _scalar(engine, sql: str):
+    async with engine.connect() as conn:
+        return (await conn.execute(text(sql))).scalar()
+
+
+@pytest.mark.asyncio
+class TestSeed:
+    """Tests for ``rent-a-car seed``."""
+
+    async def test_row_counts(self, tmp_path):
+        engine, report = await _seed(tmp_path)
+        assert (report.cars, report.customers, report.bookings) == (20, 50, 1_000)
+        assert await _scalar(engine, "SELECT count(*) FROM bookings") == 1_000
+        assert await _scalar(engine, "SELECT count(*) FROM cars") == 20
+        assert await _scalar(engine, "SELECT count(*) FROM customers") == 50
+        await engine.dispose()
+
+    async def test_no_overlapping_bookings_per_car(self, tmp_path):
+        engine, _ = await _seed(tmp_path)
+        overlaps = await _scalar(
+            engine,
+            "SELECT count(*) FROM bookings a JOIN bookings b "
+            "ON a.car_id = b.car_id AND a.id < b.id "
+            "AND a.start_date <= b.end_date AND a.end_date >= b.start_date",
+        )
+        assert overlaps == 0
+        await engine.dispose()
+
+    async def test_dates_and_cost_are_consistent(self, tmp_path):
+        engine, _ = await _seed(tmp_path)
+        assert (
+            await _scalar(
+                engine, "SELECT count(*) FROM bookings WHERE start_date >= end_date"
+            )
+            == 0
+        )
+        mismatched = await _scalar(
+            engine,
+            "SELECT count(*) FROM bookings b JOIN cars c ON c.id = b.car_id "
+            "WHERE abs(b.total_cost - round(c.daily_rate * "
+            "(julianday(b.end_date) - julianday(b.start_date)), 2)) > 0.005",
+        )
+        assert mismatched == 0
+        await engine.dispose()
+
+    async def test_statuses_follow_today(self, tmp_path):
+        engine, _ = await _seed(tmp_path)
+        today = TODAY.isoformat()
+        assert (
+            await _scalar(
+                engine,
+                "SELECT count(*) FROM bookings WHERE status = 'ACTIVE' "
+                f"AND NOT (start_date <= '{today}' AND end_date >= '{today}')",
+            )
+            == 0
+        )
+        assert (
+            await _scalar(
+                engine,
+                "SELECT count(*) FROM bookings WHERE status = 'RESERVED' "
+                f"AND start_date <= '{today}'",
+            )
+            == 0
+        )
+        rented_mismatch = await _scalar(
+            engine,
+            "SELECT count(*) FROM cars c WHERE (c.status = 'RENTED') != EXISTS "
+            "(SELECT 1 FROM bookings b WHERE b.car_id = c.id AND b.status = 'ACTIVE')",
+        )
+        assert rented_mismatch == 0
+        yesterday = (TODAY - timedelta(days=1)).isoformat()
+        assert await _scalar(
+            engine,
+            "SELECT count(*) FROM bookings WHERE status = 'COMPLETED' "
+            f"AND actual_return_date <= '{yesterday}'",
+        )
+        await engine.dispose()
+
+    async def test_seeding_twice_appends(self, tmp_path):
+        engine, _ = await _seed(tmp_path)
+        await seed_database(
+            engine,
+            SeedConfig(cars=5, customers=10, bookings=100, batch_size=300, today=TODAY),
+        )
+        assert await _scalar(engine, "SELECT count(*) FROM cars") == 25
+        assert await _scalar(engine, "SELECT count(*) FROM customers") == 60
+        assert await _scalar(engine, "SELECT count(*) FROM bookings") == 1_100
+        assert (
+            await _scalar(engine, "SELECT count(DISTINCT created_at) FROM cars") == 1
+        )
+        await engine.dispose()
+
+    async def test_search_index_populated(self, tmp_path):
+        engine, _ = await _seed(tmp_path)
+        indexed = await _scalar(
+            engine,
+            "SELECT count(*) FROM customers_fts WHERE customers_fts MATCH 'example'",
+        )
+        assert indexed == 50
+        triggers = await _scalar(
+            engine,
+            "SELECT count(*) FROM sqlite_master "
+            "WHERE type = 'trigger' AND name LIKE 'customers_fts_%'",
+        )
+        assert triggers == 3
+        await engine.dispose()
+
+    async def test_keys_are_binary_uuid7(self, tmp_path):
+        engine, _ = await _seed(tmp_path)
+        for table in ("cars", "customers", "bookings"):
+            assert await _scalar(
+                engine,
+                f"SELECT count(*) FROM {table} WHERE typeof(id) = 'blob' "
+                "AND length(id) = 16 AND substr(hex(id), 13, 1) = '7'",
+            ) == await _scalar(engine, f"SELECT count(*) FROM {table}")
+        # The time prefix of a booking's key is its creation time.
+        assert await _scalar(
+            engine,
+            "SELECT count(*) FROM bookings "
+            "WHERE substr(hex(id), 1, 12) != printf('%012X', "
+            "CAST(round((julianday(created_at) - 2440587.5) * 86400000) AS INTEGER))",
+        ) == 0
+        await engine.dispose()
+
+    async def test_same_seed_is_reproducible(self, tmp_path):
+        first, _ = await _seed(tmp_path, "first.db")
+        second, _ = await _seed(tmp_path, "second.db")
+        query = (
+            "SELECT group_concat(hex(id) || hex(car_id) || start_date, ',') "
+            "FROM (SELECT * FROM bookings ORDER BY id)"
+        )
+        assert await _scalar(first, query) == await _scalar(second, query)
+        await first.dispose()
+        await second.dispose()
+
+    async def test_rollups_are_opt_in(self, tmp_path):
+        engine, _ = await _seed(tmp_path)
+        assert await _scalar(engine, "SELECT count(*) FROM daily_rollups") == 0
+        await engine.dispose()
+
+        engine, _ = await _seed(tmp_path, "rollups.db", rollups=True)
+        rollup_revenue = await _scalar(
+            engine, "SELECT round(sum(revenue), 2) FROM daily_rollups"
+        )
+        booking_revenue = await _scalar(
+            engine,
+            "SELECT round(sum(total_cost), 2) FROM bookings "
+            "WHERE status != 'CANCELLED'",
+        )
+        assert rollup_revenue == booking_revenue
+        await engine.dispose()
+
+    async def test_failed_seed_restores_search_triggers(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bad.db'}")
+        config = SeedConfig(cars=5, customers=10, bookings=100, batch_size=0)
+        with pytest.raises(ValueError):
+            await seed_database(engine, config)
+        triggers = await _scalar(
+            engine,
+            "SELECT count(*) FROM sqlite_master "
+            "WHERE type = 'trigger' AND name LIKE 'customers_fts_%'",
+        )
+        assert triggers == 3
+        await engine.dispose()
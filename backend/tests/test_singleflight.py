@@ -0,0 +1,130 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.main import app
+from app.services.booking import BookingService
+from app.singleflight import SingleFlight
+
+
+CARS_URL = "/api/v1/cars"
+SINGLE_FLIGHT_URL = "/api/v1/single-flight"
+
+SAMPLE_CAR = {
+    "make": "Toyota",
+    "model": "Camry",
+    "year": 2024,
+    "license_plate": "SFL-0001",
+    "daily_rate": 50.00,
+    "category": "standard",
+}
+
+
+def future_date(days_ahead: int) -> str:
+    """Return an ISO-formatted date N days from today."""
+    return (date.today() + timedelta(days=days_ahead)).isoformat()
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    """Tests for sharing one computation between identical callers."""
+
+    async def test_concurrent_callers_share_one_computation(self):
+        group = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return calls
+
+        waiters = [asyncio.create_task(group.do("key", compute)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+        assert calls == 1
+        assert results == [(1, False), (1, True), (1, True)]
+        assert len(group) == 0
+        assert await group.do("key", compute) == (2, False)
+
+    async def test_failure_reaches_every_caller(self):
+        group = SingleFlight()
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            raise RuntimeError("boom")
+
+        waiters = [asyncio.create_task(group.do("key", compute)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+
+    async def test_cancelled_caller_does_not_cancel_the_others(self):
+        group = SingleFlight()
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.create_task(group.do("key", compute))
+        follower = asyncio.create_task(group.do("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await follower == ("done", True)
+        assert leader.cancelled()
+
+
+@pytest.mark.asyncio
+class TestSingleFlightAPI:
+    """Tests for coalescing identical API requests."""
+
+    async def test_identical_availability_requests_are_coalesced(
+        self, client: AsyncClient, monkeypatch
+    ):
+        car_id = (await client.post(CARS_URL, json=SAMPLE_CAR)).json()["id"]
+        check_availability = BookingService.check_availability
+        release = asyncio.Event()
+        calls = 0
+
+        async def gated(self, *args):
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return await check_availability(self, *args)
+
+        monkeypatch.setattr(BookingService, "check_availability", gated)
+        coalescer = app.state.single_flight
+        before = coalescer.metrics.coalesced["car-availability"]
+        url = f"{CARS_URL}/{car_id}/availability"
+        params = {"start_date": future_date(1), "end_date": future_date(3)}
+        other = {"start_date": future_date(5), "end_date": future_date(6)}
+
+        requests = [
+            asyncio.create_task(client.get(url, params=params)) for _ in range(5)
+        ]
+        requests.append(asyncio.create_task(client.get(url, params=other)))
+        while calls < 2:
+            await asyncio.sleep(0.01)
+        release.set()
+        responses = await asyncio.gather(*requests)
+
+        assert calls == 2
+        assert [r.status_code for r in responses] == [200] * 6
+        assert {r.text for r in responses[:5]} == {responses[0].text}
+        assert responses[0].json() == {"available": True, "conflicts": []}
+        assert coalescer.metrics.coalesced["car-availability"] - before == 4
+
+        status = (await client.get(SINGLE_FLIGHT_URL)).json()
+        assert status["in_flight"] == 0
+        assert status["endpoints"]["car-availability"]["coalesced"] >= 4
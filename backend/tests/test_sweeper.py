@@ -0,0 +1,230 @@
+"""Tests for the booking lifecycle sweeper."""
+
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.cli.rebuild import rebuild_rollups
+from app.jobs import JOB_HANDLERS, JobContext, sweep_bookings
+from tests.conftest import TestSessionLocal, engine
+
+
+BOOKINGS_URL = "/api/v1/bookings"
+CARS_URL = "/api/v1/cars"
+CUSTOMERS_URL = "/api/v1/customers"
+JOBS_URL = "/api/v1/jobs"
+
+SAMPLE_CAR = {
+    "make": "Toyota",
+    "model": "Camry",
+    "year": 2024,
+    "license_plate": "SWP-0001",
+    "daily_rate": 50.00,
+    "category": "standard",
+}
+
+SAMPLE_CUSTOMER = {
+    "first_name": "Alice",
+    "last_name": "Smith",
+    "email": "alice.smith@example.com",
+    "phone": "+1234567890",
+    "driver_license": "DL-999999",
+}
+
+
+def future_date(days_ahead: int) -> str:
+    """Return an ISO-formatted date N days from today."""
+    return (date.today() + timedelta(days=days_ahead)).isoformat()
+
+
+def days_from_now(days: int) -> date:
+    return date.today() + timedelta(days=days)
+
+
+async def _rollups() -> list[tuple]:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT day, car_id, booked_days, round(revenue, 2), rentals, "
+                "rental_days FROM daily_rollups ORDER BY day, car_id"
+            )
+        )
+        return [tuple(row) for row in result.all()]
+
+
+@pytest.mark.asyncio
+class TestSweeper:
+    """Tests for expiring no-shows and flagging overdue rentals."""
+
+    async def _setup(self, client: AsyncClient) -> tuple[dict, dict]:
+        car = (await client.post(CARS_URL, json=SAMPLE_CAR)).json()
+        customer = (await client.post(CUSTOMERS_URL, json=SAMPLE_CUSTOMER)).json()
+        return car, customer
+
+    async def _book(
+        self, client: AsyncClient, car: dict, customer: dict, start: int, end: int
+    ) -> dict:
+        resp = await client.post(
+            BOOKINGS_URL,
+            json={
+                "car_id": car["id"],
+                "customer_id": customer["id"],
+                "start_date": future_date(start),
+                "end_date": future_date(end),
+            },
+        )
+        assert resp.status_code == 201
+        return resp.json()
+
+    async def _status(self, client: AsyncClient, booking: dict) -> str:
+        resp = await client.get(f"{BOOKINGS_URL}/{booking['id']}")
+        return resp.json()["status"]
+
+    async def test_expires_no_shows_after_grace(self, client: AsyncClient):
+        """Test that reservations expire once their grace period has passed."""
+        car, customer = await self._setup(client)
+        stale = await self._book(client, car, customer, 1, 3)
+        recent = await self._book(client, car, customer, 4, 6)
+        await self._book(client, car, customer, 8, 12)
+
+        result = await sweep_bookings(
+            TestSessionLocal, days_from_now(5), no_show_grace_days=1
+        )
+        assert result.expired == 1
+        assert await self._status(client, stale) == "expired"
+        assert await self._status(client, recent) == "reserved"
+
+        # The expired reservation no longer blocks its dates.
+        resp = await client.get(
+            f"{CARS_URL}/{car['id']}/availability",
+            params={
+                "start_date": future_date(1),
+                "end_date": future_date(3),
+            },
+        )
+        assert resp.json()["available"] is True
+
+    async def test_expired_bookings_leave_rollups(self, client: AsyncClient):
+        """Test that incremental rollups match a rebuild after a sweep."""
+        car, customer = await self._setup(client)
+        other = (
+            await client.post(
+                CARS_URL, json={**SAMPLE_CAR, "license_plate": "SWP-0002"}
+            )
+        ).json()
+        await self._book(client, car, customer, 1, 4)
+        await self._book(client, other, customer, 2, 5)
+        await self._book(client, car, customer, 6, 9)
+
+        await sweep_bookings(
+            TestSessionLocal, days_from_now(4), no_show_grace_days=0, batch_size=1
+        )
+        incremental = await _rollups()
+        async with engine.begin() as conn:
+            await rebuild_rollups(conn)
+        assert incremental == await _rollups()
+        assert {day for day, *_ in incremental} == {
+            future_date(d) for d in (6, 7, 8)
+        }
+
+    async def test_sweeps_in_batches(self, client: AsyncClient):
+        """Test that bounded batches still expire every stale reservation."""
+        car, customer = await self._setup(client)
+        for n in range(5):
+            await self._book(client, car, customer, 1 + 2 * n, 2 + 2 * n)
+
+        result = await sweep_bookings(
+            TestSessionLocal, days_from_now(20), no_show_grace_days=0, batch_size=2
+        )
+        assert result.expired == 5
+        # Three expiry batches, the last one short, plus one overdue batch,
+        # one car release batch, one idempotency key batch and three batches
+        # compacting the journal entries the expiries superseded.
+        assert result.compacted == 5
+        assert result.batches == 9
+
+    async def test_archives_finished_bookings(self, client: AsyncClient):
+        """Test that bookings finished months ago move to the archive."""
+        car, customer = await self._setup(client)
+        old = await self._book(client, car, customer, 1, 3)
+        await self._book(client, car, customer, 90, 92)
+
+        result = await sweep_bookings(TestSessionLocal, days_from_now(100))
+        assert (result.expired, result.archived) == (2, 0)
+
+        result = await sweep_bookings(
+            TestSessionLocal, days_from_now(100), archive_after_months=2
+        )
+        assert result.archived == 1
+        assert (await client.get(f"{BOOKINGS_URL}/{old['id']}")).status_code == 404
+        resp = await client.get(
+            f"{BOOKINGS_URL}/{old['id']}", params={"archived": "true"}
+        )
+        assert resp.json()["status"] == "expired"
+        resp = await client.get(
+            BOOKINGS_URL, params={"customer_id": customer["id"], "archived": "true"}
+        )
+        assert [b["id"] for b in resp.json()][1:] == [old["id"]]
+        assert resp.headers["X-Total-Count"] == "2"
+        resp = await client.get(f"{BOOKINGS_URL}/count", params={"archived": "true"})
+        assert resp.json()["count"] == 2
+
+    async def test_flags_overdue_rentals(self, client: AsyncClient):
+        """Test that unreturned rentals become overdue and can still be returned."""
+        car, customer = await self._setup(client)
+        booking = await self._book(client, car, customer, 0, 2)
+        await client.post(f"{BOOKINGS_URL}/{booking['id']}/pickup")
+
+        result = await sweep_bookings(
+            TestSessionLocal, days_from_now(3), overdue_grace_days=1
+        )
+        assert result.overdue == 0
+        result = await sweep_bookings(
+            TestSessionLocal, days_from_now(4), overdue_grace_days=1
+        )
+        assert result.overdue == 1
+        assert result.released == 0
+        assert await self._status(client, booking) == "overdue"
+        car_status = (await client.get(f"{CARS_URL}/{car['id']}")).json()["status"]
+        assert car_status == "rented"
+
+        resp = await client.post(f"{BOOKINGS_URL}/{booking['id']}/return")
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "completed"
+
+    async def test_releases_cars_without_rental(self, client: AsyncClient):
+        """Test that rented cars without an open rental become available."""
+        car, _ = await self._setup(client)
+        await client.put(f"{CARS_URL}/{car['id']}", json={"status": "rented"})
+
+        result = await sweep_bookings(TestSessionLocal, date.today())
+        assert result.released == 1
+        car_status = (await client.get(f"{CARS_URL}/{car['id']}")).json()["status"]
+        assert car_status == "available"
+
+    async def test_releases_cars_in_batches(self, client: AsyncClient):
+        """Test that bounded batches still release every idle rented car."""
+        for n in range(5):
+            car = {**SAMPLE_CAR, "license_plate": f"SWP-REL{n}"}
+            car = (await client.post(CARS_URL, json=car)).json()
+            await client.put(f"{CARS_URL}/{car['id']}", json={"status": "rented"})
+
+        result = await sweep_bookings(TestSessionLocal, date.today(), batch_size=2)
+        assert result.released == 5
+        response = await client.get(CARS_URL, params={"status": "rented"})
+        assert response.json() == []
+
+    async def test_sweep_job_and_metrics(self, client: AsyncClient):
+        """Test the sweep job kind and the sweeper metrics endpoint."""
+        before = (await client.get(f"{JOBS_URL}/sweeper")).json()
+        result = await JOB_HANDLERS["sweep-bookings"](
+            JobContext(job_id="job", attempt=1, session_maker=TestSessionLocal), {}
+        )
+        assert result["expired"] == 0
+
+        after = (await client.get(f"{JOBS_URL}/sweeper")).json()
+        assert after["runs"] == before["runs"] + 1
+        assert after["last_result"]["batches"] == 5
+        assert after["last_error"] is None
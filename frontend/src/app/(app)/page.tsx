@@ -21,9 +21,7 @@ import { Button } from "@/components/ui/button";
 import { Skeleton } from "@/components/ui/skeleton";
 import { PageHeader } from "@/components/shared/page-header";
 import { StatusBadge } from "@/components/shared/status-badge";
-import { useCars } from "@/lib/hooks/use-cars";
-import { useBookings } from "@/lib/hooks/use-bookings";
-import { useCustomers } from "@/lib/hooks/use-customers";
+import { useDashboardSummary } from "@/lib/hooks/use-dashboard";
 import { format } from "date-fns";
 
 function StatCardSkeleton() {
@@ -52,41 +50,20 @@ function TableSkeleton() {
 }
 
 export default function DashboardPage() {
-  const { cars, isLoading: carsLoading, isError: carsError } = useCars();
-  const {
-    bookings,
-    isLoading: bookingsLoading,
-    isError: bookingsError,
-  } = useBookings();
-  const {
-    customers,
-    isLoading: customersLoading,
-    isError: customersError,
-  } = useCustomers();
+  const { summary, isLoading, isError } = useDashboardSummary();
 
-  const isLoading = carsLoading || bookingsLoading || customersLoading;
-  const isError = carsError || bookingsError || customersError;
-
-  const totalCars = cars?.length ?? 0;
-  const availableCars = cars?.filter((c) => c.status === "available").length ?? 0;
-  const activeRentals =
-    bookings?.filter((b) => b.status === "active").length ?? 0;
-  const totalCustomers = customers?.length ?? 0;
+  const totalCars = summary?.cars_total ?? 0;
+  const availableCars = summary?.cars_by_status.available ?? 0;
+  const activeRentals = summary?.bookings_by_status.active ?? 0;
+  const totalCustomers = summary?.customers_total ?? 0;
 
   const carsByStatus = {
-    available: cars?.filter((c) => c.status === "available").length ?? 0,
-    rented: cars?.filter((c) => c.status === "rented").length ?? 0,
-    maintenance: cars?.filter((c) => c.status === "maintenance").length ?? 0,
+    available: availableCars,
+    rented: summary?.cars_by_status.rented ?? 0,
+    maintenance: summary?.cars_by_status.maintenance ?? 0,
   };
 
-  const recentBookings = bookings
-    ? [...bookings]
-        .sort(
-          (a, b) =>
-            new Date(b.created_at).getTime() - new Date(a.created_at).getTime()
-        )
-        .slice(0, 5)
-    : [];
+  const recentBookings = summary?.recent_bookings ?? [];
 
   if (isError) {
     return (
@@ -268,10 +245,7 @@ export default function DashboardPage() {
               </TableHeader>
               <TableBody>
                 {recentBookings.map((booking) => {
-                  const car = cars?.find((c) => c.id === booking.car_id);
-                  const customer = customers?.find(
-                    (c) => c.id === booking.customer_id
-                  );
+                  const { car, customer } = booking;
                   return (
                     <TableRow key={booking.id}>
                       <TableCell>
@@ -6,8 +6,10 @@ const statusStyles = {
   maintenance: "bg-yellow-100 text-yellow-800",
   reserved: "bg-purple-100 text-purple-800",
   active: "bg-blue-100 text-blue-800",
+  overdue: "bg-orange-100 text-orange-800",
   completed: "bg-gray-100 text-gray-800",
   cancelled: "bg-red-100 text-red-800",
+  expired: "bg-gray-100 text-gray-500",
 } as const;
 
 export type StatusType = keyof typeof statusStyles;
@@ -2,6 +2,12 @@
 
 import { SWRConfig } from "swr";
 import { fetcher } from "@/lib/api/client";
+import { useStatusEvents } from "@/lib/hooks/use-status-events";
+
+function StatusEvents() {
+  useStatusEvents();
+  return null;
+}
 
 export function SWRProvider({ children }: { children: React.ReactNode }) {
   return (
@@ -13,6 +19,7 @@ export function SWRProvider({ children }: { children: React.ReactNode }) {
         dedupingInterval: 2000,
       }}
     >
+      <StatusEvents />
       {children}
     </SWRConfig>
   );
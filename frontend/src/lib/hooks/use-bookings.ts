@@ -8,6 +8,8 @@ function buildBookingQueryString(filters?: BookingFilters): string {
   if (filters.status) params.set("status", filters.status);
   if (filters.car_id) params.set("car_id", filters.car_id);
   if (filters.customer_id) params.set("customer_id", filters.customer_id);
+  if (filters.include?.length) params.set("include", filters.include.join(","));
+  if (filters.archived) params.set("archived", "true");
   const qs = params.toString();
   return qs ? `?${qs}` : "";
 }
@@ -43,7 +45,9 @@ export function useBookingMutations() {
   async function invalidateBookings() {
     await mutate(
       (key: string) =>
-        typeof key === "string" && key.startsWith("/bookings"),
+        typeof key === "string" &&
+        (key.startsWith("/bookings") ||
+          /^\/customers\/[^/?]+\/bookings/.test(key)),
       undefined,
       { revalidate: true }
     );
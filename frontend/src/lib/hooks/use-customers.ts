@@ -1,5 +1,9 @@
 import useSWR, { useSWRConfig } from "swr";
 import { api } from "@/lib/api/client";
+import type {
+  CustomerBookingsPage,
+  CustomerBookingsParams,
+} from "@/types/booking";
 import type { Customer, CustomerCreate, CustomerUpdate } from "@/types/customer";
 
 export function useCustomers() {
@@ -26,6 +30,28 @@ export function useCustomer(id: string | null) {
   };
 }
 
+export function useCustomerBookings(
+  id: string | null,
+  params?: CustomerBookingsParams
+) {
+  const query = new URLSearchParams();
+  if (params?.limit) query.set("limit", String(params.limit));
+  if (params?.cursor) query.set("cursor", params.cursor);
+  if (params?.include?.length) query.set("include", params.include.join(","));
+  if (params?.archived) query.set("archived", "true");
+  const qs = query.toString();
+  const { data, error, isLoading, mutate } = useSWR<CustomerBookingsPage>(
+    id ? `/customers/${id}/bookings${qs ? `?${qs}` : ""}` : null
+  );
+
+  return {
+    page: data,
+    isLoading,
+    isError: error,
+    mutate,
+  };
+}
+
 export function useCustomerMutations() {
   const { mutate } = useSWRConfig();
 
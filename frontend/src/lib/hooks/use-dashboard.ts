@@ -0,0 +1,14 @@
+import useSWR from "swr";
+import type { DashboardSummary } from "@/types/dashboard";
+
+export function useDashboardSummary() {
+  const { data, error, isLoading, mutate } =
+    useSWR<DashboardSummary>("/dashboard/summary");
+
+  return {
+    summary: data,
+    isLoading,
+    isError: error,
+    mutate,
+  };
+}
@@ -0,0 +1,46 @@
+import { useEffect } from "react";
+import { useSWRConfig } from "swr";
+import { config } from "@/config";
+import type { StatusEvent } from "@/types/event";
+
+const EVENTS_URL = `${config.apiUrl}/api/v1/events`;
+
+function startsWithAny(key: unknown, prefixes: string[]): boolean {
+  return (
+    typeof key === "string" && prefixes.some((prefix) => key.startsWith(prefix))
+  );
+}
+
+// Revalidates cached cars, bookings and the dashboard whenever the server
+// pushes a change, instead of polling. The browser reconnects on its own
+// after an overflow or a dropped connection; data is revalidated then too,
+// since events sent while disconnected are lost.
+export function useStatusEvents() {
+  const { mutate } = useSWRConfig();
+
+  useEffect(() => {
+    const source = new EventSource(EVENTS_URL);
+    const revalidate = (prefixes: string[]) =>
+      mutate((key) => startsWithAny(key, prefixes), undefined, {
+        revalidate: true,
+      });
+
+    function onEvent(message: MessageEvent<string>) {
+      const event: StatusEvent = JSON.parse(message.data);
+      revalidate(
+        event.entity === "car"
+          ? ["/cars", "/dashboard"]
+          : ["/bookings", "/customers/", "/dashboard"]
+      );
+    }
+
+    source.addEventListener("car", onEvent);
+    source.addEventListener("booking", onEvent);
+    let connected = false;
+    source.addEventListener("open", () => {
+      if (connected) revalidate(["/cars", "/bookings", "/dashboard"]);
+      connected = true;
+    });
+    return () => source.close();
+  }, [mutate]);
+}
@@ -1,4 +1,15 @@
-export type BookingStatus = "reserved" | "active" | "completed" | "cancelled";
+import type { Car } from "./car";
+import type { Customer } from "./customer";
+
+export type BookingStatus =
+  | "reserved"
+  | "active"
+  | "overdue"
+  | "completed"
+  | "cancelled"
+  | "expired";
+
+export type BookingInclude = "car" | "customer";
 
 export interface Booking {
   id: string;
@@ -10,6 +21,8 @@ export interface Booking {
   total_cost: number;
   status: BookingStatus;
   created_at: string;
+  car?: Car;
+  customer?: Customer;
 }
 
 export interface BookingCreate {
@@ -23,4 +36,26 @@ export interface BookingFilters {
   status?: BookingStatus;
   car_id?: string;
   customer_id?: string;
+  include?: BookingInclude[];
+  archived?: boolean;
+}
+
+export interface CustomerBookingSummary {
+  bookings: number;
+  by_status: Record<BookingStatus, number>;
+  total_spend: number;
+  last_rental: string | null;
+}
+
+export interface CustomerBookingsPage {
+  bookings: Booking[];
+  next: string | null;
+  summary: CustomerBookingSummary;
+}
+
+export interface CustomerBookingsParams {
+  limit?: number;
+  cursor?: string;
+  include?: BookingInclude[];
+  archived?: boolean;
 }
@@ -0,0 +1,17 @@
+import type { Booking, BookingStatus } from "./booking";
+import type { CarStatus } from "./car";
+
+export interface DashboardSummary {
+  today: string;
+  period_start: string;
+  period_end: string;
+  cars_total: number;
+  cars_by_status: Record<CarStatus, number>;
+  customers_total: number;
+  bookings_total: number;
+  bookings_by_status: Record<BookingStatus, number>;
+  pickups_today: number;
+  returns_today: number;
+  revenue: number;
+  recent_bookings: Booking[];
+}
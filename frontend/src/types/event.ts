@@ -0,0 +1,9 @@
+export interface StatusEvent {
+  entity: "car" | "booking";
+  id: string;
+  car_id: string;
+  status: string;
+  category: string | null;
+  customer_id: string | null;
+  deleted: boolean;
+}